@@ -0,0 +1,15 @@
+"""Benchmarks for the ViTables hot paths.
+
+The suite times the non-GUI data paths (buffers, cell formatting, queries,
+CSV import/export, population of the tree of databases...) on synthetic
+files and writes the results as JSON, so regressions can be tracked across
+versions. Run it from the top level directory of the source tree::
+
+    python -m benchmarks run --scale quick --output results.json
+    python -m benchmarks compare old.json results.json
+
+See :mod:`benchmarks.runner` for details. Some modules can also be run on
+their own, for instance::
+
+    python -m benchmarks.bench_formatting
+"""
@@ -0,0 +1,7 @@
+"""Entry point of the benchmarks suite (see :mod:`benchmarks.runner`)."""
+
+import sys
+
+from benchmarks import runner
+
+sys.exit(runner.main())
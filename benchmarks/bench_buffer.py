@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Time `Buffer.readBuffer`, the method that fills leaf views with data.
+
+Buffers are created with a cold cache for every repeat, so reads hit the
+file (and the HDF5 chunk cache of the file handle).
+"""
+
+import numpy as np
+import tables
+
+from vitables.vttables import buffer
+
+#: The number of rows of every chunk read.
+CHUNK_ROWS = 10000
+
+#: The number of chunks read by every benchmark.
+NCHUNKS = 20
+
+
+class _BufferBenchmark:
+    """Open a leaf and create a buffer for it."""
+
+    kind = None
+    nodepath = None
+
+    def setup(self, data):
+        self.h5file = tables.open_file(data.path(self.kind), 'r')
+        self.leaf = self.h5file.get_node(self.nodepath)
+        self.rbuffer = buffer.Buffer(self.leaf)
+        self.nrows = self.rbuffer.total_nrows()
+
+    def teardown(self):
+        self.rbuffer = None
+        self.h5file.close()
+
+    def readChunks(self, starts):
+        for start in starts:
+            self.rbuffer.readBuffer(start, start + CHUNK_ROWS)
+
+    def sequentialStarts(self):
+        """The first rows of consecutive chunks from the middle of the leaf.
+
+        Chunks never go past the end of the leaf, so short leaves are
+        read from an earlier row (or with fewer chunks).
+        """
+
+        first = max(min(self.nrows // 2,
+                        self.nrows - NCHUNKS * CHUNK_ROWS), 0)
+        return range(first, min(first + NCHUNKS * CHUNK_ROWS,
+                                self.nrows - CHUNK_ROWS + 1), CHUNK_ROWS)
+
+
+class LongTable(_BufferBenchmark):
+    """Read chunks of every column of a long table."""
+
+    kind = 'long_table'
+    nodepath = '/table'
+
+    def setup(self, data):
+        super(LongTable, self).setup(data)
+        # Views read only the displayed columns of tables
+        self.rbuffer.readBuffer(0, CHUNK_ROWS)
+        self.rbuffer.readColumns(range(len(self.leaf.colnames)))
+        self.rbuffer.clearCache()
+
+    def time_sequential(self):
+        """Scroll down chunk after chunk from the middle of the table."""
+
+        self.readChunks(self.sequentialStarts())
+
+    def time_random(self):
+        """Jump to random places of the table."""
+
+        rng = np.random.default_rng(0)
+        self.readChunks(rng.integers(0, self.nrows - CHUNK_ROWS, NCHUNKS))
+
+
+class WideTable(_BufferBenchmark):
+    """Read the columns of a chunk of a wide table."""
+
+    kind = 'wide_table'
+    nodepath = '/table'
+
+    def time_all_columns(self):
+        self.rbuffer.readBuffer(0, CHUNK_ROWS)
+        self.rbuffer.readColumns(range(len(self.leaf.colnames)))
+
+    def time_visible_columns(self):
+        """Read the columns displayed in a viewport."""
+
+        self.rbuffer.readBuffer(0, CHUNK_ROWS)
+        self.rbuffer.readColumns(range(20))
+
+
+class RawArray(_BufferBenchmark):
+    """Read (and touch) chunks of a contiguous, uncompressed array."""
+
+    kind = 'raw_array'
+    nodepath = '/array'
+
+    def readChunks(self, starts):
+        # Mapped chunks are views, so they are copied as displaying them
+        # would do
+        for start in starts:
+            self.rbuffer.readBuffer(start, start + CHUNK_ROWS)
+            np.array(self.rbuffer.chunk)
+
+    def time_random(self):
+        """Jump to random places of the array (memory mapped)."""
+
+        rng = np.random.default_rng(0)
+        self.readChunks(rng.integers(0, self.nrows - CHUNK_ROWS, NCHUNKS))
+
+    def time_random_hdf5(self):
+        """Jump to random places of the array (read by the HDF5 library).
+        """
+
+        self.rbuffer.mapped = None
+        self.time_random()
+
+
+class VLArray(_BufferBenchmark):
+    """Read chunks of a VLArray."""
+
+    kind = 'vlarray'
+    nodepath = '/vlarray'
+
+    def time_sequential(self):
+        self.readChunks(self.sequentialStarts())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Time the import and export of `CSV` files (see :mod:`vitables.vtcsv`).
+"""
+
+import os
+
+import tables
+
+from vitables.vtcsv import csvutils
+
+
+class ImportCSV:
+    """Import a CSV file into a table."""
+
+    repeat = 3
+
+    def setup(self, data):
+        self.csv_filepath = data.path('csv')
+        self.h5_filepath = data.tempPath('.h5')
+        self.h5file = tables.open_file(self.h5_filepath, 'w')
+        self.input_handler = open(self.csv_filepath, 'r')
+
+    def teardown(self):
+        self.input_handler.close()
+        self.h5file.close()
+        os.remove(self.h5_filepath)
+
+    def time_table(self):
+        nrows, descr, has_header = csvutils.tableInfo(self.input_handler)
+        dataset = self.h5file.create_table('/', 'imported', descr,
+                                           expectedrows=nrows)
+        csvutils.fillDataset(dataset, self.input_handler, has_header)
+
+
+class ExportCSV:
+    """Export a table with as many rows as the generated CSV file."""
+
+    repeat = 3
+
+    def setup(self, data):
+        self.h5_filepath = data.tempPath('.h5')
+        self.h5file = tables.open_file(self.h5_filepath, 'w')
+        with tables.open_file(data.path('long_table'), 'r') as source:
+            self.table = source.root.table.copy(
+                self.h5file.root, 'head', stop=data.sizes['csv_rows'])
+        self.csv_filepath = data.tempPath('.csv')
+
+    def teardown(self):
+        self.h5file.close()
+        os.remove(self.h5_filepath)
+        os.remove(self.csv_filepath)
+
+    def time_table(self):
+        with open(self.csv_filepath, 'wb') as out_handler:
+            csvutils.writeDataset(self.table, out_handler, add_header=True)
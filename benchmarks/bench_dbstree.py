@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Time `DBsTreeModel.lazyAddChildren`, the method that populates the tree of
+databases when a group is expanded.
+"""
+
+import os
+
+from qtpy import QtCore
+
+from vitables.h5db import dbstreemodel
+
+
+class LazyAddChildren:
+    """Expand a group with many children."""
+
+    repeat = 3
+
+    def setup(self, data):
+        self.filepath = data.path('many_children')
+        self.model = dbstreemodel.DBsTreeModel(None, None)
+        self.model.openDBDoc(self.filepath, 'r')
+        root = self.model.index(0, 0, QtCore.QModelIndex())
+        self.model.lazyAddChildren(root)
+        self.group = self.model.index(0, 0, root)
+
+    def teardown(self):
+        # The model has no views, so files are closed directly
+        self.model.getDBDoc(self.filepath).closeH5File()
+        self.model.tmp_dbdoc.closeH5File()
+        os.remove(self.model.tmp_filepath)
+        self.model = None
+
+    def time_expand_group(self):
+        self.model.lazyAddChildren(self.group)
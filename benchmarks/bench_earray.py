@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Measure the paint throughput of EArrays whose main dimension is not 0.
+
+The cells of a chunk read from a (4, N, 3) EArray (extendable dimension 1)
+are accessed and formatted the way `LeafModel.data` does it. Cells are
+accessed with ``np.take`` plus ``np.squeeze`` (the way `Buffer.EArrayCell`
+worked before) and by indexing a view of the chunk with the main dimension
+first (the way it works now).
+
+The `PaintEArray` benchmark is run by the benchmarks suite (see
+:mod:`benchmarks.runner`).
+
+Usage::
+
+    python -m benchmarks.bench_earray [nrows]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from vitables import utils
+
+
+def takeCells(chunk, maindim):
+    """Access every cell of the chunk with np.take and np.squeeze."""
+
+    nrows = chunk.shape[maindim]
+    return [np.squeeze(np.take(chunk, [row], axis=maindim), axis=maindim)
+            for row in range(nrows)]
+
+
+def viewCells(chunk, maindim):
+    """Access every cell of the chunk via a view with the main dim first."""
+
+    rows_view = np.moveaxis(chunk, maindim, 0)
+    return [rows_view[row] for row in range(len(rows_view))]
+
+
+def paint(access, chunk, maindim):
+    """Access and format every cell of the chunk."""
+
+    return [utils.formatArrayContent(cell) for cell in access(chunk, maindim)]
+
+
+def timeit(function, *args):
+    """The wall time (in seconds) spent by function."""
+
+    t_0 = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - t_0
+
+
+class PaintEArray:
+    """Access and format the cells of a (4, 10000, 3) EArray chunk."""
+
+    def setup(self, data):
+        self.chunk = np.arange(4 * 10000 * 3, dtype='float64').reshape(
+            4, 10000, 3)
+
+    def time_view_access(self):
+        viewCells(self.chunk, 1)
+
+    def time_view_paint(self):
+        paint(viewCells, self.chunk, 1)
+
+
+def main(nrows=10000):
+    maindim = 1
+    chunk = np.arange(4 * nrows * 3, dtype='float64').reshape(4, nrows, 3)
+    print(f'Painting a (4, {nrows}, 3) EArray chunk (main dimension 1)')
+    take_time = timeit(takeCells, chunk, maindim)
+    view_time = timeit(viewCells, chunk, maindim)
+    print(f'  access: take {take_time:8.3f} s, view {view_time:8.3f} s, '
+          f'speedup {take_time / view_time:6.1f}x')
+    take_time = timeit(paint, takeCells, chunk, maindim)
+    view_time = timeit(paint, viewCells, chunk, maindim)
+    print(f'   paint: take {take_time:8.3f} s, view {view_time:8.3f} s, '
+          f'{nrows / view_time:10.0f} cells/s')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
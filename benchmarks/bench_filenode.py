@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Time the preparation of filenodes for being displayed (see
+:mod:`vitables.filenodeutils`) and the reading of their lines.
+"""
+
+import numpy as np
+import tables
+
+import vitables.filenodeutils as fnutils
+from vitables.vttables import filenodebuffer
+
+#: The number of lines of every chunk read.
+CHUNK_ROWS = 10000
+
+#: The number of chunks read.
+NCHUNKS = 20
+
+
+class OpenFilenode:
+    """Index the lines of a filenode."""
+
+    repeat = 3
+
+    def setup(self, data):
+        self.h5file = tables.open_file(data.path('filenode'), 'r')
+        self.leaf = self.h5file.root.filenode
+
+    def teardown(self):
+        self.h5file.close()
+
+    def time_line_offsets(self):
+        fnutils.lineOffsets(self.leaf)
+
+
+class ReadFilenode(OpenFilenode):
+    """Read chunks of lines of an indexed filenode."""
+
+    def setup(self, data):
+        super(ReadFilenode, self).setup(data)
+        self.fnbuffer = filenodebuffer.FilenodeBuffer(
+            self.leaf, fnutils.lineOffsets(self.leaf))
+
+    def teardown(self):
+        self.fnbuffer = None
+        super(ReadFilenode, self).teardown()
+
+    def time_random(self):
+        """Jump to random places of the filenode."""
+
+        rng = np.random.default_rng(0)
+        nrows = self.fnbuffer.total_nrows()
+        for start in rng.integers(0, nrows - CHUNK_ROWS, NCHUNKS):
+            self.fnbuffer.readBuffer(start, start + CHUNK_ROWS)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Compare per-cell and per-chunk formatting of leaf view cells.
+
+The chunk of a 10,000 x 50 table is formatted cell by cell (the way
+`LeafModel.data` formatted cells before rendering was done per chunk) and
+column by column (the way `LeafModel.renderColumn` does it).
+
+Chunks of pandas DataFrames are formatted cell by cell (the way
+`DataFrameModel.data` did it) and column by column (the way
+`DataFrameModel.renderColumn` and `DataFrameModel.renderChunk` do it) too.
+
+Columns of times are formatted with ``time.strftime`` cell by cell (the
+way the time series extension did it) and in bulk (the way
+:func:`vitables.extensions.timeseries.tsformat.formatColumn` does it).
+
+The `FormatChunk`, `FormatFrame` and `FormatTimes` benchmarks are run by
+the benchmarks suite (see :mod:`benchmarks.runner`).
+
+Usage::
+
+    python -m benchmarks.bench_formatting [nrows] [ncols]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from vitables import utils
+from vitables.extensions.timeseries import tsformat
+from vitables.vttables import df_model
+
+
+def makeChunks(nrows, ncols):
+    """Build float64 and string chunks like the ones read from a table."""
+
+    rng = np.random.default_rng(0)
+    floats = rng.standard_normal((nrows, ncols)) * 1000
+    strings = np.char.add(b'row', np.arange(nrows * ncols).astype('S12'))
+    strings = strings.reshape(nrows, ncols)
+    return {'float64': floats, 'string': strings}
+
+
+def perCell(chunk):
+    """Format every cell of the chunk separately."""
+
+    nrows, ncols = chunk.shape
+    return [[utils.formatArrayContent(chunk[row][col])
+             for col in range(ncols)] for row in range(nrows)]
+
+
+def perChunk(chunk):
+    """Format the chunk one column at a time."""
+
+    return [utils.formatArrayColumn(chunk[:, col])
+            for col in range(chunk.shape[1])]
+
+
+def timeit(function, chunk):
+    """The wall time (in seconds) spent by function formatting chunk."""
+
+    t_0 = time.perf_counter()
+    function(chunk)
+    return time.perf_counter() - t_0
+
+
+class FormatChunk:
+    """Format a 2,000 x 10 chunk the ways `LeafModel` can do it."""
+
+    def setup(self, data):
+        self.chunks = makeChunks(2000, 10)
+        self.vlrows = [np.arange(row % 16) for row in range(10000)]
+        self.strings = [f'string {row}' for row in range(10000)]
+
+    def time_float_per_chunk(self):
+        perChunk(self.chunks['float64'])
+
+    def time_float_per_cell(self):
+        perCell(self.chunks['float64'])
+
+    def time_string_per_chunk(self):
+        perChunk(self.chunks['string'])
+
+    def time_string_per_cell(self):
+        perCell(self.chunks['string'])
+
+    def time_vlarray_rows(self):
+        """Cells of VLArrays are arrays of variable length."""
+
+        [utils.formatArrayContent(row) for row in self.vlrows]
+
+    def time_vlstrings(self):
+        [utils.formatStringContent(row) for row in self.strings]
+
+    def time_objects(self):
+        [utils.formatObjectContent(row) for row in self.vlrows]
+
+
+def makeFrame(nrows, ncols):
+    """Build a DataFrame chunk with a 2-levels index and a string column."""
+
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    index = pd.MultiIndex.from_arrays(
+        [pd.date_range('2020-01-01', periods=nrows, freq='min'),
+         np.arange(nrows)])
+    columns = {f'c{col}': rng.standard_normal(nrows) * 1000
+               for col in range(ncols - 1)}
+    columns['label'] = [f'row {row}' for row in range(nrows)]
+    return pd.DataFrame(columns, index=index)
+
+
+class FormatFrame:
+    """Format a 2,000 x 10 DataFrame chunk and its index labels."""
+
+    def setup(self, data):
+        self.frame = makeFrame(2000, 10)
+
+    def time_frame_per_cell(self):
+        frame = self.frame
+        nrows, ncols = frame.shape
+        [[str(frame.iat[row, col]) for col in range(ncols)]
+         for row in range(nrows)]
+        [[str(frame.index[row][level]) for level in range(2)]
+         for row in range(nrows)]
+
+    def time_frame_per_chunk(self):
+        frame = self.frame
+        [df_model.renderValues(frame.iloc[:, col])
+         for col in range(frame.shape[1])]
+        [df_model.renderValues(frame.index.get_level_values(level))
+         for level in range(2)]
+
+
+class FormatTimes:
+    """Format a column of 10,000 times with the default format."""
+
+    def setup(self, data):
+        rng = np.random.default_rng(0)
+        self.seconds = rng.random(10000) * 2e9
+        self.ts_format = '%c'
+
+    def formatter(self, content):
+        return time.strftime(self.ts_format, time.gmtime(content))
+
+    def time_times_per_cell(self):
+        [self.formatter(content) for content in self.seconds]
+
+    def time_times_bulk(self):
+        tsformat.formatColumn(self.seconds,
+                              tsformat.secondsToDatetimes(self.seconds),
+                              self.ts_format, self.formatter)
+
+
+def main(nrows=10000, ncols=50):
+    print(f'Formatting a {nrows} x {ncols} chunk')
+    for kind, chunk in makeChunks(nrows, ncols).items():
+        cell_time = timeit(perCell, chunk)
+        chunk_time = timeit(perChunk, chunk)
+        print(f'{kind:>8}: per cell {cell_time:8.3f} s, '
+              f'per chunk {chunk_time:8.3f} s, '
+              f'speedup {cell_time / chunk_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
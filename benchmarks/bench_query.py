@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Time `Query.queryTable`, the method that filters tables.
+
+The long table is queried with a condition selected by about 1% of its
+rows. The results are written to a temporary database like the one of
+the `Query results` node.
+"""
+
+import os
+
+import tables
+
+from vitables.queries import query
+
+
+class QueryTable:
+    """Query the long table with and without a column of row indices."""
+
+    repeat = 3
+
+    def setup(self, data):
+        self.h5file = tables.open_file(data.path('long_table'), 'r')
+        self.table = self.h5file.root.table
+        self.tmp_filepath = data.tempPath('.h5')
+        self.tmp_h5file = tables.open_file(self.tmp_filepath, 'w')
+        self.tmp_h5file.create_group('/', '_p_query_results')
+
+    def teardown(self):
+        self.tmp_h5file.close()
+        os.remove(self.tmp_filepath)
+        self.h5file.close()
+
+    def description(self, indices_field_name):
+        return {
+            'src_filepath': self.h5file.filename,
+            'src_path': self.table._v_pathname,
+            'title': 'value > 2.33',
+            'condition': 'value > 2.33',
+            'condvars': {},
+            'rows_range': (0, self.table.nrows, 1),
+            'ft_name': 'result',
+            'indices_field_name': indices_field_name,
+        }
+
+    def time_without_indices(self):
+        query.Query(self.tmp_h5file, None, self.table,
+                    self.description('')).queryTable()
+
+    def time_with_indices(self):
+        query.Query(self.tmp_h5file, None, self.table,
+                    self.description('row_index')).queryTable()
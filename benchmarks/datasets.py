@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Generators of the synthetic files used by the benchmarks.
+
+Files are generated the first time they are needed and kept in a data
+directory, so later runs reuse them. The size of every file is given by
+the scale of the run (see `SCALES`): the ``quick`` scale is meant for
+checking the suite and catching gross regressions, the ``full`` scale
+reproduces the large files ViTables has to deal with (10^8-row tables,
+groups with 10^5 children...).
+
+Every generated file is deterministic for a given scale, so results of
+different runs (and versions of ViTables) are comparable.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import tables
+from tables.nodes import filenode
+
+__docformat__ = 'restructuredtext'
+
+#: The sizes of the generated files for every scale.
+SCALES = {
+    'quick': {
+        'long_rows': 10 ** 6,
+        'wide_rows': 10 ** 4,
+        'wide_cols': 200,
+        'vlarray_rows': 10 ** 5,
+        'filenode_lines': 10 ** 5,
+        'children': 10 ** 3,
+        'csv_rows': 10 ** 5,
+        'raw_rows': 10 ** 6,
+    },
+    'full': {
+        'long_rows': 10 ** 8,
+        'wide_rows': 10 ** 5,
+        'wide_cols': 1000,
+        'vlarray_rows': 10 ** 7,
+        'filenode_lines': 10 ** 7,
+        'children': 10 ** 5,
+        'csv_rows': 10 ** 6,
+        'raw_rows': 5 * 10 ** 7,
+    },
+}
+
+#: The number of rows written at once by the generators.
+WRITE_CHUNK = 10 ** 6
+
+#: The filters of the generated datasets.
+FILTERS = tables.Filters(complevel=5, complib='blosc')
+
+
+def longTable(filepath, nrows):
+    """A table with three columns (an integer, a float and a string).
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nrows`: the number of rows of the table
+    """
+
+    description = {'id': tables.Int64Col(pos=0),
+                   'value': tables.Float64Col(pos=1),
+                   'label': tables.StringCol(8, pos=2)}
+    rng = np.random.default_rng(0)
+    with tables.open_file(filepath, 'w') as h5file:
+        table = h5file.create_table('/', 'table', description,
+                                    filters=FILTERS, expectedrows=nrows)
+        for start in range(0, nrows, WRITE_CHUNK):
+            stop = min(start + WRITE_CHUNK, nrows)
+            rows = np.empty(stop - start, dtype=table.dtype)
+            rows['id'] = np.arange(start, stop)
+            rows['value'] = rng.standard_normal(stop - start)
+            rows['label'] = np.char.add(b'r', (rows['id'] % 10 ** 6).astype(
+                'S7'))
+            table.append(rows)
+
+
+def wideTable(filepath, nrows, ncols):
+    """A table with many float columns.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nrows`: the number of rows of the table
+    - `ncols`: the number of columns of the table
+    """
+
+    description = {f'c{col:04d}': tables.Float64Col(pos=col)
+                   for col in range(ncols)}
+    chunk = max(WRITE_CHUNK // ncols, 1)
+    with tables.open_file(filepath, 'w') as h5file:
+        table = h5file.create_table('/', 'table', description,
+                                    filters=FILTERS, expectedrows=nrows)
+        for start in range(0, nrows, chunk):
+            stop = min(start + chunk, nrows)
+            rows = np.empty(stop - start, dtype=table.dtype)
+            for col, name in enumerate(table.colnames):
+                rows[name] = np.arange(start, stop) + col / ncols
+            table.append(rows)
+
+
+def rawArray(filepath, nrows):
+    """A contiguous, uncompressed array of 16 float32 columns.
+
+    It looks like the raw dumps of detectors, which are memory mapped by
+    the buffer.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nrows`: the number of rows of the array
+    """
+
+    ncols = 16
+    with tables.open_file(filepath, 'w') as h5file:
+        array = h5file.create_array('/', 'array', atom=tables.Float32Atom(),
+                                    shape=(nrows, ncols))
+        for start in range(0, nrows, WRITE_CHUNK):
+            stop = min(start + WRITE_CHUNK, nrows)
+            array[start:stop] = np.arange(
+                start * ncols, stop * ncols, dtype='float32').reshape(
+                    stop - start, ncols)
+
+
+def vlarray(filepath, nrows):
+    """A VLArray of integer rows with lengths between 0 and 15.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nrows`: the number of rows of the VLArray
+    """
+
+    with tables.open_file(filepath, 'w') as h5file:
+        array = h5file.create_vlarray('/', 'vlarray', tables.Int32Atom(),
+                                      filters=FILTERS, expectedrows=nrows)
+        for row in range(nrows):
+            array.append(np.arange(row % 16, dtype='int32'))
+
+
+def filenodeFile(filepath, nlines):
+    """A filenode containing a text file.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nlines`: the number of lines of the text file
+    """
+
+    with tables.open_file(filepath, 'w') as h5file:
+        node = filenode.new_node(h5file, where='/', name='filenode')
+        try:
+            for start in range(0, nlines, WRITE_CHUNK):
+                stop = min(start + WRITE_CHUNK, nlines)
+                node.write(''.join(f'line {line}, some text\n'
+                                   for line in range(start, stop)).encode())
+        finally:
+            node.close()
+
+
+def manyChildren(filepath, nchildren):
+    """A group with many small arrays.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nchildren`: the number of children of the group
+    """
+
+    data = np.arange(3)
+    with tables.open_file(filepath, 'w') as h5file:
+        group = h5file.create_group('/', 'group')
+        for child in range(nchildren):
+            h5file.create_array(group, f'array{child:06d}', data)
+
+
+def csvFile(filepath, nrows):
+    """A CSV file with an integer column and two float columns.
+
+    :Parameters:
+
+    - `filepath`: the file being created
+    - `nrows`: the number of rows of the file
+    """
+
+    rng = np.random.default_rng(0)
+    with open(filepath, 'wb') as out_handler:
+        for start in range(0, nrows, WRITE_CHUNK):
+            stop = min(start + WRITE_CHUNK, nrows)
+            rows = np.empty(stop - start, dtype=[('id', 'i8'), ('x', 'f8'),
+                                                 ('y', 'f8')])
+            rows['id'] = np.arange(start, stop)
+            rows['x'] = rng.standard_normal(stop - start)
+            rows['y'] = rng.standard_normal(stop - start)
+            np.savetxt(out_handler, rows, fmt=['%d', '%.6f', '%.6f'],
+                       delimiter=',')
+
+
+#: The generators of every kind of file: the generator, the size parameters
+#: of the scale it takes and the file extension.
+GENERATORS = {
+    'long_table': (longTable, ('long_rows',), '.h5'),
+    'wide_table': (wideTable, ('wide_rows', 'wide_cols'), '.h5'),
+    'raw_array': (rawArray, ('raw_rows',), '.h5'),
+    'vlarray': (vlarray, ('vlarray_rows',), '.h5'),
+    'filenode': (filenodeFile, ('filenode_lines',), '.h5'),
+    'many_children': (manyChildren, ('children',), '.h5'),
+    'csv': (csvFile, ('csv_rows',), '.csv'),
+}
+
+
+class Datasets:
+    """The synthetic files of a benchmarks run.
+
+    :Parameters:
+
+    - `data_dir`: the directory where files are kept
+    - `scale`: the name of the scale of the run (a key of `SCALES`)
+    """
+
+    def __init__(self, data_dir, scale='quick'):
+        """Setup the data directory."""
+
+        self.data_dir = data_dir
+        self.scale = scale
+        self.sizes = SCALES[scale]
+        os.makedirs(data_dir, exist_ok=True)
+
+    def path(self, kind):
+        """The path of a file, generating the file if needed.
+
+        File names include the sizes of the file, so files of different
+        scales can live in the same directory.
+
+        :Parameter kind: the kind of file (a key of `GENERATORS`)
+        :Returns: the full path of the file
+        """
+
+        generator, size_names, extension = GENERATORS[kind]
+        sizes = [self.sizes[name] for name in size_names]
+        name = '_'.join([kind] + [str(size) for size in sizes]) + extension
+        filepath = os.path.join(self.data_dir, name)
+        if not os.path.exists(filepath):
+            # Generate the file under a temporary name, so interrupted
+            # runs don't leave truncated files behind
+            fd, temp_path = tempfile.mkstemp(extension, kind,
+                                             dir=self.data_dir)
+            os.close(fd)
+            try:
+                generator(temp_path, *sizes)
+                os.replace(temp_path, filepath)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return filepath
+
+    def tempPath(self, suffix):
+        """A new temporary file in the data directory.
+
+        The caller is responsible of removing it.
+
+        :Parameter suffix: the extension of the file
+        """
+
+        fd, filepath = tempfile.mkstemp(suffix, 'tmp_', dir=self.data_dir)
+        os.close(fd)
+        return filepath
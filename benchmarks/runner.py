@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Run the benchmarks suite and write the results as JSON.
+
+Benchmarks are written in the `asv` style: every class of the modules
+listed in `SUITE` whose name doesn't start with an underscore and which
+has ``time_*`` methods is a benchmark. For every repeat the runner calls
+the ``setup(datasets)`` method of a new instance (if it exists), times the
+``time_*`` method and calls ``teardown()`` (if it exists). Only the
+``time_*`` method is timed. The class attribute ``repeat`` overrides the
+default number of repeats.
+
+Usage::
+
+    python -m benchmarks run [--scale quick|full] [--output FILE]
+                             [--data-dir DIR] [--repeat N] [--filter TEXT]
+    python -m benchmarks compare OLD.json NEW.json [--threshold 1.2]
+
+The JSON file contains the versions of ViTables and of its dependencies
+and, for every benchmark, the timings (in seconds) of every repeat and
+their statistics. Comparing the results of two versions flags the
+benchmarks that got slower than a given threshold.
+"""
+
+import argparse
+import datetime
+import gc
+import importlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import tables
+
+from benchmarks import datasets
+
+__docformat__ = 'restructuredtext'
+
+#: The modules of the suite.
+SUITE = ['bench_buffer', 'bench_formatting', 'bench_earray', 'bench_query',
+         'bench_csv', 'bench_dbstree', 'bench_filenode']
+
+#: The default number of timed repeats of every benchmark.
+REPEAT = 5
+
+#: The ratio of timings above which a benchmark is flagged as a regression.
+THRESHOLD = 1.2
+
+
+def discover(pattern=''):
+    """Find the benchmarks of the suite.
+
+    :Parameter pattern: only benchmarks whose name contains this text are
+      returned
+    :Returns: a list of `(name, class, method name)` tuples
+    """
+
+    found = []
+    for module_name in SUITE:
+        module = importlib.import_module(f'benchmarks.{module_name}')
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if (cls.__module__ != module.__name__) or \
+                    class_name.startswith('_'):
+                continue
+            for method in sorted(vars(cls)):
+                if not method.startswith('time_'):
+                    continue
+                name = f'{module_name}.{class_name}.{method}'
+                if pattern in name:
+                    found.append((name, cls, method))
+    return found
+
+
+def timeBenchmark(cls, method, data, repeat):
+    """Time a benchmark.
+
+    :Parameters:
+
+    - `cls`: the benchmark class
+    - `method`: the name of the timed method
+    - `data`: the :class:`benchmarks.datasets.Datasets` of the run
+    - `repeat`: the number of repeats (unless the class sets it)
+
+    :Returns: the list of timings (in seconds)
+    """
+
+    timings = []
+    for _ in range(getattr(cls, 'repeat', repeat)):
+        instance = cls()
+        if hasattr(instance, 'setup'):
+            instance.setup(data)
+        try:
+            gc.collect()
+            t_0 = time.perf_counter()
+            getattr(instance, method)()
+            timings.append(time.perf_counter() - t_0)
+        finally:
+            if hasattr(instance, 'teardown'):
+                instance.teardown()
+    return timings
+
+
+def gitRevision():
+    """The git revision of the source tree (None if unknown)."""
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(scale):
+    """Describe the environment of a run.
+
+    :Parameter scale: the scale of the run
+    """
+
+    from vitables.preferences import vtconfig
+    return {
+        'vitables': vtconfig.getVersion(),
+        'revision': gitRevision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'tables': tables.__version__,
+        'hdf5': tables.hdf5_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'scale': scale,
+        'sizes': datasets.SCALES[scale],
+    }
+
+
+def run(args):
+    """Run the suite and write the results.
+
+    :Parameter args: the parsed command line arguments
+    """
+
+    # Some benchmarks need a Qt application (but no display)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from qtpy import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    data = datasets.Datasets(args.data_dir, args.scale)
+    results = {}
+    for name, cls, method in discover(args.filter):
+        try:
+            timings = timeBenchmark(cls, method, data, args.repeat)
+        except Exception as e:
+            print(f'{name:60} FAILED: {e!r}')
+            results[name] = {'error': repr(e)}
+            continue
+        results[name] = {
+            'unit': 's',
+            'timings': timings,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.fmean(timings),
+            'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.,
+        }
+        print(f'{name:60} {results[name]["median"]:10.4f} s')
+    del app
+
+    report = {'metadata': metadata(args.scale), 'results': results}
+    with open(args.output, 'w') as out_handler:
+        json.dump(report, out_handler, indent=2)
+    print(f'Results written to {args.output}')
+
+
+def compare(args):
+    """Compare the results of two runs.
+
+    :Parameter args: the parsed command line arguments
+    :Returns: the number of regressions
+    """
+
+    with open(args.old) as old_handler:
+        old = json.load(old_handler)['results']
+    with open(args.new) as new_handler:
+        new = json.load(new_handler)['results']
+    regressions = 0
+    for name in sorted(set(old) & set(new)):
+        if ('median' not in old[name]) or ('median' not in new[name]):
+            continue
+        ratio = new[name]['median'] / old[name]['median']
+        flag = ''
+        if ratio > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f'{name:60} {old[name]["median"]:10.4f} '
+              f'{new[name]["median"]:10.4f} {ratio:6.2f}x{flag}')
+    return regressions
+
+
+def main(argv=None):
+    """Parse the command line and run the requested command."""
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite')
+    run_parser.add_argument('--scale', choices=sorted(datasets.SCALES),
+                            default='quick')
+    run_parser.add_argument('--output', default='benchmarks.json')
+    run_parser.add_argument(
+        '--data-dir', default=os.path.join(tempfile.gettempdir(),
+                                           'vitables-benchmarks'))
+    run_parser.add_argument('--repeat', type=int, default=REPEAT)
+    run_parser.add_argument('--filter', default='')
+    compare_parser = commands.add_parser('compare',
+                                         help='compare two results files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        run(args)
+        return 0
+    return 1 if compare(args) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
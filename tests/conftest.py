@@ -1,18 +1,66 @@
 """Configuration file for our tests.
 
 Here we create fixtures that are not directly required by test functions.
+
+The fixtures of the GUI scenarios (see `test_scenarios.py`) measure the
+wall time, the peak memory and the stalls of the event loop of every
+step of a scenario. Use ``--scenario-scale=full`` to run them with files
+as large as those ViTables has to deal with and ``--scenario-report=FILE``
+to save their measurements as JSON.
 """
 
+import json
 import os
 import sys
+import time
 
 import pytest
 import tables
-from qtpy import QtWidgets
+from qtpy import QtCore, QtWidgets
 
 import vitables.vtapp
+from vitables import metacache
 from vitables.preferences import vtconfig
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
+#: The sizes used by the GUI scenarios for every scale.
+SCENARIO_SCALES = {
+    'quick': {
+        'huge_rows': 10 ** 9,
+        'children': 2000,
+        'query_rows': 10 ** 5,
+        'page_downs': 200,
+        'slider_drags': 50,
+    },
+    'full': {
+        'huge_rows': 10 ** 9,
+        'children': 10 ** 5,
+        'query_rows': 10 ** 7,
+        'page_downs': 10 ** 4,
+        'slider_drags': 1000,
+    },
+}
+
+#: The interval between ticks of the event loop monitor (in milliseconds).
+MONITOR_INTERVAL = 10
+
+#: Delays of the monitor ticks longer than this are stalls (in seconds).
+STALL_THRESHOLD = 0.05
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('vitables', 'ViTables GUI scenarios')
+    group.addoption('--scenario-scale', choices=sorted(SCENARIO_SCALES),
+                    default='quick',
+                    help='size of the files used by the GUI scenarios')
+    group.addoption('--scenario-report', metavar='FILE', default=None,
+                    help='write the measurements of the GUI scenarios '
+                    'as JSON to FILE')
+
 
 class Launcher:
     def __init__(self):
@@ -25,10 +73,245 @@ class Launcher:
         self.gui = self.vtapp_object.gui
 
 
+def currentRSS():
+    """The resident set size of the process in bytes (None if unknown)."""
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peakRSS():
+    """The peak resident set size of the process in bytes (None if unknown).
+    """
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def childIndex(model, parent, name):
+    """The index of the child of `parent` with the given name."""
+
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        if model.nodeFromIndex(index).name == name:
+            return index
+    raise KeyError(name)
+
+
+def waitUntil(condition, timeout=10000):
+    """Run the event loop until a condition holds or a timeout expires.
+
+    :Parameters:
+
+    - `condition`: a callable returning True when the wait is over
+    - `timeout`: the maximum waiting time (in milliseconds)
+    """
+
+    deadline = QtCore.QDeadlineTimer(timeout)
+    while not (condition() or deadline.hasExpired()):
+        QtCore.QCoreApplication.processEvents(
+            QtCore.QEventLoop.AllEvents, 50)
+
+
+def runTask(task):
+    """Start a scan task and return its result once it has finished.
+
+    :Parameter task: the :class:`vitables.vttables.scantask.ScanTask`
+      being run
+    """
+
+    results = []
+    task.scanFinished.connect(results.append)
+    task.start()
+    waitUntil(lambda: results)
+    assert results, 'the task did not finish'
+    return results[0]
+
+
+class EventLoopMonitor(QtCore.QObject):
+    """Detect the stalls of the event loop.
+
+    A timer ticks every `MONITOR_INTERVAL` milliseconds while the event
+    loop runs. Any tick delayed more than `STALL_THRESHOLD` seconds is a
+    stall: during that time the GUI didn't respond to the user. The
+    memory in use is sampled on every tick too.
+    """
+
+    def __init__(self, parent=None):
+        """Setup the timer."""
+
+        super(EventLoopMonitor, self).__init__(parent)
+        self.stalls = []
+        self.rss_samples = []
+        self.last_tick = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(MONITOR_INTERVAL)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        """Start monitoring."""
+
+        self.last_tick = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        """Stop monitoring."""
+
+        self.timer.stop()
+
+    def tick(self):
+        """Record the delay since the previous tick."""
+
+        now = time.perf_counter()
+        delay = now - self.last_tick - MONITOR_INTERVAL / 1000
+        if delay > STALL_THRESHOLD:
+            self.stalls.append(delay)
+        rss = currentRSS()
+        if rss is not None:
+            self.rss_samples.append(rss)
+        self.last_tick = now
+
+
+class Scenario:
+    """A scripted sequence of user actions on the application.
+
+    Every step of the scenario is run outside the event loop (like the
+    slots called by the event loop would do) and then the pending events
+    are processed until the GUI settles. The measurements of every step
+    are kept in `steps`.
+
+    :Parameters:
+
+    - `name`: the name of the scenario
+    - `app`: the running `QApplication`
+    - `sizes`: the sizes of the files for the scale of the run
+    """
+
+    def __init__(self, name, app, sizes):
+        """Setup the measurements."""
+
+        self.name = name
+        self.app = app
+        self.sizes = sizes
+        self.steps = []
+        self.monitor = EventLoopMonitor()
+        self.started = None
+
+    def start(self):
+        """Start measuring."""
+
+        self.started = time.perf_counter()
+        self.monitor.start()
+
+    def finish(self):
+        """Stop measuring.
+
+        :Returns: the measurements of the scenario
+        """
+
+        self.settle()
+        self.monitor.stop()
+        return {
+            'scenario': self.name,
+            'wall_time': time.perf_counter() - self.started,
+            'peak_rss': peakRSS(),
+            'steps': self.steps,
+        }
+
+    def settle(self, until=None, timeout=60):
+        """Process pending events.
+
+        :Parameters:
+
+        - `until`: a callable returning True when the GUI has settled (by
+          default events are processed only once)
+        - `timeout`: the maximum waiting time (in seconds)
+        """
+
+        deadline = time.perf_counter() + timeout
+        while True:
+            self.app.processEvents(QtCore.QEventLoop.AllEvents,
+                                   MONITOR_INTERVAL)
+            if (until is None) or until():
+                break
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f'{self.name}: the GUI did not settle')
+            time.sleep(MONITOR_INTERVAL / 1000)
+        # Let the monitor tick so the last delay gets measured
+        self.app.processEvents(QtCore.QEventLoop.AllEvents)
+
+    def step(self, name, action, repeat=1, until=None):
+        """Run and measure a step of the scenario.
+
+        :Parameters:
+
+        - `name`: the name of the step
+        - `action`: a callable doing the step. It is passed the number of
+          the current repetition
+        - `repeat`: the number of times the action is done
+        - `until`: a callable returning True once the GUI has settled
+          after the action
+
+        :Returns: the measurements of the step
+        """
+
+        first_stall = len(self.monitor.stalls)
+        first_sample = len(self.monitor.rss_samples)
+        t_0 = time.perf_counter()
+        for repetition in range(repeat):
+            action(repetition)
+            self.settle(until)
+        wall_time = time.perf_counter() - t_0
+        stalls = self.monitor.stalls[first_stall:]
+        samples = self.monitor.rss_samples[first_sample:]
+        measurements = {
+            'step': name,
+            'repeat': repeat,
+            'wall_time': wall_time,
+            'stalls': len(stalls),
+            'max_stall': max(stalls, default=0.),
+            'stall_time': sum(stalls),
+            'peak_rss': max(samples, default=currentRSS()),
+        }
+        self.steps.append(measurements)
+        return measurements
+
+
+@pytest.fixture(scope='session', autouse=True)
+def metadata_cache(tmp_path_factory):
+    """Keep the metadata cache of the tests out of the user cache."""
+    cache = metacache.MetadataCache(
+        str(tmp_path_factory.mktemp('cache') / metacache.CACHE_FILENAME))
+    metacache._cache = cache
+    yield cache
+    cache.close()
+    metacache._cache = None
+
 @pytest.fixture(scope='module')
 def launcher():
     return Launcher()
 
+@pytest.fixture(scope='session')
+def child_index():
+    """Find the index of a node of the tree of databases by its name."""
+    return childIndex
+
+@pytest.fixture(scope='session')
+def wait_until():
+    """Run the event loop until a condition holds."""
+    return waitUntil
+
+@pytest.fixture(scope='session')
+def run_task():
+    """Run a scan task until it finishes and get its result."""
+    return runTask
+
 @pytest.fixture(scope='module')
 def h5file():
     if not os.path.exists('testfile.h5'):
@@ -36,3 +319,30 @@ def h5file():
         print(create_testfile)
     yield tables.open_file('testfile.h5', 'r')
     os.remove('testfile.h5')
+
+@pytest.fixture(scope='session')
+def scenario_sizes(request):
+    """The sizes of the files used by the GUI scenarios."""
+    return SCENARIO_SCALES[request.config.getoption('--scenario-scale')]
+
+@pytest.fixture(scope='session')
+def scenario_report(request):
+    """The measurements of the GUI scenarios run in this session."""
+    report = []
+    yield report
+    filepath = request.config.getoption('--scenario-report')
+    if filepath and report:
+        scale = request.config.getoption('--scenario-scale')
+        with open(filepath, 'w') as out_handler:
+            json.dump({'scale': scale, 'sizes': SCENARIO_SCALES[scale],
+                       'scenarios': report}, out_handler, indent=2)
+
+@pytest.fixture()
+def scenario(launcher, request, scenario_sizes, scenario_report):
+    """A measured GUI scenario run on a visible main window."""
+    launcher.gui.show()
+    scenario = Scenario(request.node.name, launcher.app, scenario_sizes)
+    scenario.start()
+    yield scenario
+    scenario_report.append(scenario.finish())
+    launcher.gui.hide()
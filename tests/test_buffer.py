@@ -0,0 +1,344 @@
+"""Test class for buffer.py"""
+
+import logging
+
+import numpy as np
+import pytest
+import tables
+
+from vitables.vttables import buffer
+
+
+@pytest.fixture()
+def h5leaves(tmp_path):
+    """A file with some leaves of different kinds."""
+
+    h5file = tables.open_file(str(tmp_path / 'buffer.h5'), 'w')
+    description = {'a': tables.Int64Col(pos=0), 'b': tables.Float64Col(pos=1)}
+    table = h5file.create_table('/', 'table', description)
+    rows = np.zeros(5000, dtype=table.dtype)
+    rows['a'] = np.arange(5000)
+    rows['b'] = np.arange(5000) / 2
+    table.append(rows)
+    # Chunked, so it is read through the blocks cache
+    h5file.create_carray('/', 'array', obj=np.arange(5000 * 3).reshape(5000, 3),
+                         chunkshape=(100, 3))
+    h5file.create_array('/', 'contiguous',
+                        np.arange(5000 * 3).reshape(5000, 3))
+    earray = h5file.create_earray('/', 'earray', tables.Int32Atom(), (2, 0))
+    earray.append(np.arange(2 * 3000, dtype='int32').reshape(2, 3000))
+    vlarray = h5file.create_vlarray('/', 'vlarray', tables.Int32Atom())
+    for i in range(3000):
+        vlarray.append(np.arange(i % 5))
+    h5file.flush()
+    yield h5file
+    h5file.close()
+
+
+class TestBuffer:
+    @pytest.mark.parametrize('name', ['table', 'array', 'contiguous',
+                                      'earray', 'vlarray'])
+    def test_readBuffer(self, h5leaves, name):
+        leaf = h5leaves.get_node('/' + name)
+        rbuffer = buffer.Buffer(leaf, block_size=700)
+        for start, stop in [(0, 100), (650, 2100), (1400, 2000), (10, 20)]:
+            rbuffer.readBuffer(start, stop)
+            expected = leaf.read(start, stop)
+            if name == 'table':
+                rbuffer.readColumns([0, 1])
+                for col, field in enumerate(leaf.colnames):
+                    assert np.array_equal(rbuffer.chunk[col], expected[field])
+            elif name == 'vlarray':
+                assert len(rbuffer.chunk) == len(expected)
+                for row, expected_row in zip(rbuffer.chunk, expected):
+                    assert np.array_equal(row, expected_row)
+            else:
+                assert np.array_equal(rbuffer.chunk, expected)
+
+    def test_EArrayCell(self, h5leaves):
+        # The main dimension of the EArray is not the first one
+        leaf = h5leaves.root.earray
+        rbuffer = buffer.Buffer(leaf, block_size=700)
+        assert rbuffer.total_nrows() == 3000
+        rbuffer.readBuffer(650, 2100)
+        for row in (0, 49, 1449):
+            assert np.array_equal(rbuffer.getCell(row, 0),
+                                  leaf[:, 650 + row])
+        # Cells are views of the chunk, not copies
+        assert np.shares_memory(rbuffer.getCell(10, 0), rbuffer.chunk)
+        assert len(rbuffer.getColumn(0)) == 1450
+
+    def test_cacheHits(self, h5leaves):
+        leaf = h5leaves.root.array
+        rbuffer = buffer.Buffer(leaf, block_size=1000)
+        rbuffer.readBuffer(1000, 3000)
+        cached = dict(rbuffer.blocks)
+        rbuffer.readBuffer(1200, 2800)
+        # No block has been read again
+        for b in (1, 2):
+            assert rbuffer.blocks[(b, None)] is cached[(b, None)]
+
+    def test_readAhead(self, h5leaves):
+        leaf = h5leaves.root.array
+        rbuffer = buffer.Buffer(leaf, block_size=1000)
+        rbuffer.readBuffer(0, 1000)
+        rbuffer.readBuffer(1000, 2000)
+        # Browsing downwards reads the next block ahead of time
+        assert (2, None) in rbuffer.blocks
+        rbuffer.readBuffer(4000, 5000)
+        rbuffer.readBuffer(3000, 4000)
+        # Browsing upwards reads the previous block ahead of time
+        assert rbuffer.direction == -1
+        assert (2, None) in rbuffer.blocks
+
+    def test_cacheBudget(self, h5leaves):
+        leaf = h5leaves.root.array
+        block_nbytes = 500 * leaf.rowsize
+        rbuffer = buffer.Buffer(leaf, cache_size=3 * block_nbytes,
+                                block_size=500)
+        for start in range(0, 5000, 500):
+            rbuffer.readBuffer(start, start + 500)
+            assert rbuffer.cache_nbytes <= 3 * block_nbytes
+        assert len(rbuffer.blocks) == 3
+        assert np.array_equal(rbuffer.chunk, leaf.read(4500, 5000))
+
+    def test_columnProjection(self, h5leaves):
+        leaf = h5leaves.root.table
+        rbuffer = buffer.Buffer(leaf, block_size=1000)
+        rbuffer.readBuffer(0, 1000)
+        # Table columns are not read until they are needed
+        assert not rbuffer.chunk
+        assert rbuffer.requestColumns([1], None)
+        assert list(rbuffer.chunk) == [1]
+        assert rbuffer.getCell(10, 1) == 5.
+        # Paging reads only the columns already read
+        rbuffer.readBuffer(2000, 3000)
+        assert list(rbuffer.chunk) == [1]
+        assert {col for b, col in rbuffer.blocks} == {1}
+        assert np.array_equal(rbuffer.getColumn(0), np.arange(2000, 3000))
+        assert sorted(rbuffer.chunk) == [0, 1]
+
+    def test_requestBuffer(self, h5leaves, tmp_path, wait_until):
+        from qtpy import QtCore
+        from vitables.vttables import reader
+
+        app = QtCore.QCoreApplication.instance() or \
+            QtCore.QCoreApplication([])
+        filepath = h5leaves.filename
+        h5leaves.close()
+        h5file = tables.open_file(filepath, 'r')
+        try:
+            breader = reader.BufferReader()
+            rbuffer = buffer.Buffer(h5file.root.array, block_size=1000,
+                                    reader=breader)
+            loaded = []
+            # A stale request is cancelled by a newer one
+            assert not rbuffer.requestBuffer(0, 1000, lambda: loaded.append(0))
+            assert not rbuffer.requestBuffer(3000, 4000,
+                                             lambda: loaded.append(3000))
+            wait_until(lambda: loaded)
+            assert loaded == [3000]
+            assert np.array_equal(rbuffer.chunk,
+                                  h5file.root.array.read(3000, 4000))
+            # Cached chunks are read immediately
+            assert rbuffer.requestBuffer(3200, 3800, None)
+            # Table columns are read in background too
+            rbuffer = buffer.Buffer(h5file.root.table, block_size=1000,
+                                    reader=breader)
+            rbuffer.readBuffer(0, 1000)
+            assert not rbuffer.requestColumns([0, 1], loaded.append)
+            wait_until(lambda: len(loaded) > 1)
+            assert loaded[1] == [0, 1]
+            assert rbuffer.getCell(999, 0) == 999
+            breader.releaseFile(filepath)
+            breader.stop()
+        finally:
+            h5file.close()
+
+    def test_alignedBlockSize(self, h5leaves):
+        # Tiny rows: blocks are made of whole HDF5 chunks
+        table = h5leaves.create_table('/', 'tiny', {'x': tables.Int8Col()},
+                                      chunkshape=(4096,))
+        table.append(np.zeros(20000, dtype=table.dtype))
+        rbuffer = buffer.Buffer(table)
+        assert rbuffer.block_size == 4096
+        assert rbuffer.chunkLength(200, 10000) == 8192
+        rbuffer.readBuffer(5000, 6000)
+        rbuffer.readColumns([0])
+        assert list(rbuffer.blocks) == [(1, 0)]
+        # Huge rows: the memory budget bounds blocks and chunks
+        array = h5leaves.create_earray('/', 'huge', tables.Float64Atom(),
+                                       (0, 2 ** 15), chunkshape=(4, 1024))
+        array.append(np.zeros((1000, 2 ** 15)))
+        rbuffer = buffer.Buffer(array, cache_size=2 ** 24)
+        assert rbuffer.block_size == 8
+        assert rbuffer.chunkLength(10, 10000) == 32
+        assert rbuffer.chunkLength(100, 10000) == 104
+
+    def test_columnWindow(self, h5leaves):
+        array = h5leaves.create_carray('/', 'wide', tables.Int32Atom(),
+                                       (100, 3000), chunkshape=(10, 100))
+        array[:] = np.arange(100 * 3000, dtype='int32').reshape(100, 3000)
+        rbuffer = buffer.Buffer(array, block_size=50)
+        assert rbuffer.windowed
+        assert rbuffer.column_block_size == 200
+        rbuffer.setColumnWindow(350, 650)
+        rbuffer.readBuffer(20, 70)
+        assert np.array_equal(rbuffer.chunk, array[20:70, 350:650])
+        assert rbuffer.getCell(3, 4) == array[23, 354]
+        # Only the column blocks of the window are read
+        assert {page[0] for b, page in rbuffer.blocks} == {200, 400, 600}
+        rbuffer.setColumnWindow(2900, 3100)
+        rbuffer.readBuffer(0, 100)
+        assert np.array_equal(rbuffer.chunk, array[:, 2900:])
+
+    def test_setHyperslab(self, h5leaves):
+        cube = np.arange(30 * 4 * 500).reshape(30, 4, 500)
+        array = h5leaves.create_carray('/', 'cube', obj=cube,
+                                       chunkshape=(5, 2, 100))
+        rbuffer = buffer.Buffer(array, block_size=10)
+        assert rbuffer.sliceable
+        # Axis 2 as rows and axis 0 as columns, the index of axis 1 is 3
+        rbuffer.setHyperslab(2, 0, [0, 3, 0])
+        assert rbuffer.total_nrows() == 500
+        assert rbuffer.ncols == 30
+        rbuffer.readBuffer(95, 130)
+        assert np.array_equal(rbuffer.chunk, cube[:, 3, 95:130].T)
+        assert rbuffer.getCell(0, 7) == cube[7, 3, 95]
+        # Blocks of other hyperslabs are not reused
+        rbuffer.setHyperslab(2, 0, [0, 1, 0])
+        rbuffer.readBuffer(95, 130)
+        assert np.array_equal(rbuffer.chunk, cube[:, 1, 95:130].T)
+
+    def test_stats(self, h5leaves):
+        leaf = h5leaves.root.table
+        rbuffer = buffer.Buffer(leaf, block_size=1000)
+        rbuffer.readBuffer(0, 1000)
+        rbuffer.stats.reset()
+        assert rbuffer.requestColumns([0, 1], None)
+        # Two missing blocks (one per column) read with two reads
+        stats = rbuffer.stats.snapshot()
+        assert (stats['block_hits'], stats['block_misses']) == (0, 2)
+        assert stats['reads'] == 2
+        assert stats['rows_read'] == 2000
+        assert stats['bytes_read'] == 2000 * 8
+        assert stats['read_time'] > 0
+        # Cached blocks are not read again
+        assert rbuffer.requestBuffer(500, 1000, None)
+        assert rbuffer.stats.block_hits == 2
+        assert rbuffer.stats.block_misses == 2
+        assert rbuffer.stats.hitRatio() == 0.5
+
+    def test_memoryMap(self, h5leaves):
+        from vitables.vttables import reader
+
+        leaf = h5leaves.root.contiguous
+        rbuffer = buffer.Buffer(leaf, block_size=1000,
+                                reader=reader.BufferReader())
+        assert rbuffer.mapped is not None
+        # Chunks are views of the map, read without the cache or the reader
+        assert rbuffer.requestBuffer(1500, 3500, None)
+        assert np.array_equal(rbuffer.chunk, leaf.read(1500, 3500))
+        assert np.shares_memory(rbuffer.chunk, rbuffer.mapped)
+        assert not rbuffer.blocks
+        assert rbuffer.stats.rows_read == 2000
+        rbuffer.reader.stop()
+        # Hyperslabs of N-D arrays are views of the map too
+        cube = np.arange(30 * 4 * 50, dtype='>i4').reshape(30, 4, 50)
+        h5leaves.create_array('/', 'cube', cube)
+        h5leaves.flush()
+        rbuffer = buffer.Buffer(h5leaves.root.cube, block_size=10)
+        assert rbuffer.mapped is not None
+        rbuffer.setHyperslab(2, 0, [0, 3, 0])
+        rbuffer.readBuffer(5, 40)
+        assert np.array_equal(rbuffer.chunk, cube[:, 3, 5:40].T)
+        # Chunked or compressed leaves are read through the HDF5 library
+        carray = h5leaves.create_carray(
+            '/', 'compressed', obj=np.arange(1000),
+            filters=tables.Filters(complevel=1))
+        for leaf in (h5leaves.root.array, carray, h5leaves.root.table):
+            assert buffer.Buffer(leaf).mapped is None
+
+    def test_memoryMapDrivers(self, tmp_path):
+        # Files kept in memory cannot be mapped
+        filepath = str(tmp_path / 'core.h5')
+        with tables.open_file(filepath, 'w', driver='H5FD_CORE') as h5file:
+            leaf = h5file.create_array('/', 'array', np.arange(100))
+            assert buffer.Buffer(leaf).mapped is None
+        # Data are found after the user block
+        filepath = str(tmp_path / 'userblock.h5')
+        with tables.open_file(filepath, 'w', user_block_size=4096) as h5file:
+            leaf = h5file.create_array('/', 'array', np.arange(100.))
+            h5file.flush()
+            rbuffer = buffer.Buffer(leaf)
+            assert rbuffer.mapped is not None
+            rbuffer.readBuffer(0, 100)
+            assert np.array_equal(rbuffer.chunk, np.arange(100.))
+
+    def test_vlarrayPreviews(self, h5leaves, monkeypatch):
+        vlarray = h5leaves.create_vlarray('/', 'long_rows', tables.Int32Atom())
+        for row in range(40):
+            vlarray.append(np.arange(1000 if row % 4 == 0 else row % 4))
+        rbuffer = buffer.Buffer(vlarray, block_size=16)
+        assert rbuffer.rowLengths(0, 40) is None
+        # Whole rows are read in runs bounded by the read budget
+        monkeypatch.setattr(buffer, 'VLROWS_READ_SIZE', 8000)
+        rbuffer.readBuffer(0, 40)
+        assert [len(row) for row in rbuffer.chunk[:4]] == [100, 1, 2, 3]
+        assert np.array_equal(rbuffer.chunk[4], np.arange(100))
+        assert rbuffer.max_vlrow_nbytes == 4000
+        assert list(rbuffer.rowLengths(3, 6)) == [3, 1000, 1]
+        assert rbuffer.isTruncated(8) and not rbuffer.isTruncated(9)
+        assert np.array_equal(rbuffer.readRow(8), np.arange(1000))
+        assert rbuffer.stats.bytes_read == (10 * 1000 + 30 * 2) * 4
+        # Object VLArrays are not truncated
+        assert buffer.Buffer(h5leaves.create_vlarray(
+            '/', 'objects', tables.ObjectAtom())).preview_length is None
+
+    @pytest.mark.parametrize('name', ['table', 'array', 'earray',
+                                      'vlarray'])
+    def test_readPastEnd(self, h5leaves, name, caplog):
+        leaf = h5leaves.get_node('/' + name)
+        rbuffer = buffer.Buffer(leaf, block_size=1000)
+        # Rows past the end of the leaf are read as empty chunks
+        with caplog.at_level(logging.ERROR):
+            rbuffer.readBuffer(10 ** 6, 10 ** 6 + 100)
+            if rbuffer.projected:
+                rbuffer.readColumns([0])
+        assert not caplog.records
+        data = rbuffer.chunk[0] if rbuffer.projected else rbuffer.chunk
+        assert np.size(data) == 0
+
+    def test_backgroundPreviews(self, h5leaves, wait_until):
+        from qtpy import QtCore
+        from vitables.vttables import reader
+
+        app = QtCore.QCoreApplication.instance() or \
+            QtCore.QCoreApplication([])
+        vlarray = h5leaves.create_vlarray('/', 'long_rows', tables.Int32Atom())
+        for row in range(40):
+            vlarray.append(np.arange(1000 if row % 4 == 0 else row % 4))
+        filepath = h5leaves.filename
+        h5leaves.close()
+        h5file = tables.open_file(filepath, 'r')
+        try:
+            breader = reader.BufferReader()
+            rbuffer = buffer.Buffer(h5file.root.long_rows, block_size=16,
+                                    reader=breader)
+            # Requests carry the reading parameters, not the buffer
+            description = breader.describeRequest(rbuffer, [(0, 0, None)],
+                                                  None)
+            assert not any(isinstance(item, buffer.Buffer)
+                           for item in description)
+            loaded = []
+            assert not rbuffer.requestBuffer(0, 40, lambda: loaded.append(0))
+            wait_until(lambda: loaded)
+            # The row lengths and the timings are applied on delivery
+            assert [len(row) for row in rbuffer.chunk[:4]] == [100, 1, 2, 3]
+            assert list(rbuffer.rowLengths(3, 6)) == [3, 1000, 1]
+            assert rbuffer.max_vlrow_nbytes == 4000
+            assert rbuffer.stats.bytes_read == (10 * 1000 + 30 * 2) * 4
+            breader.releaseFile(filepath)
+            breader.stop()
+        finally:
+            h5file.close()
@@ -0,0 +1,108 @@
+"""Test class for colstats.py"""
+
+import numpy as np
+import pytest
+import tables
+from qtpy import QtCore
+
+from vitables.vttables import colstats, scantask
+
+
+@pytest.fixture()
+def stats_file(tmp_path):
+    """A file with a table and a matrix."""
+
+    h5file = tables.open_file(str(tmp_path / 'colstats.h5'), 'w')
+    rows = np.zeros(20000, dtype=[('a', 'i8'), ('b', 'f8'), ('c', 'S2')])
+    rng = np.random.default_rng(0)
+    rows['a'] = rng.integers(-1000, 1000, 20000)
+    rows['b'] = rng.normal(5., 2., 20000)
+    rows['b'][::9] = np.nan
+    h5file.create_table('/', 'table', rows)
+    h5file.create_carray('/', 'matrix', obj=rng.random((20000, 3)),
+                         chunkshape=(500, 3))
+    h5file.flush()
+    yield h5file
+    h5file.close()
+
+
+class TestColumnStats:
+    def test_update(self):
+        values = np.random.default_rng(1).normal(0., 3., 10000)
+        values[::10] = np.nan
+        stats = colstats.ColumnStats()
+        # Later chunks widen the range of the histogram
+        for chunk in np.array_split(np.sort(values)[::-1], 7):
+            stats.update(chunk)
+        result = stats.result()
+        valid = values[~np.isnan(values)]
+        assert result['count'] == valid.size
+        assert result['nulls'] == 1000
+        assert result['min'] == valid.min()
+        assert result['max'] == valid.max()
+        assert result['mean'] == pytest.approx(valid.mean())
+        assert result['std'] == pytest.approx(valid.std())
+        assert sum(result['counts']) == valid.size
+        edges = result['edges']
+        assert len(edges) == len(result['counts']) + 1
+        assert edges[0] <= valid.min() and valid.max() <= edges[-1]
+        counts, _ = np.histogram(valid, bins=edges)
+        assert counts.tolist() == result['counts']
+
+    def test_columnScan(self, stats_file, monkeypatch):
+        # Several chunks per scan
+        monkeypatch.setattr(colstats, 'SCAN_MEMORY', 2 ** 15)
+        table = stats_file.root.table
+        stats = colstats.ColumnStats()
+        scan = colstats.ColumnScan(table, 0)
+        assert scan.kind() == 'column_stats:a'
+        assert list(scan.run(table, stats))[-1] == 1.
+        assert stats.result()['max'] == table.col('a').max()
+        matrix = stats_file.root.matrix
+        stats = colstats.ColumnStats()
+        list(colstats.ColumnScan(matrix, 2).run(matrix, stats))
+        assert stats.result()['mean'] == pytest.approx(matrix[:, 2].mean())
+        with pytest.raises(TypeError):
+            colstats.ColumnScan(table, 2)
+
+    def test_scanner(self, launcher, tmp_path, run_task):
+        filepath = str(tmp_path / 'scanner.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_array('/', 'array', np.arange(1000.))
+        # Writable files are scanned in the GUI thread, not cached
+        with tables.open_file(filepath, 'a') as h5file:
+            scanner = colstats.StatsScanner(h5file.root.array, 0)
+            assert not scanner.background
+            assert run_task(scanner)['mean'] == 499.5
+            assert scanner.cachedResult() is None
+        # Read-only files are scanned in background and cached
+        with tables.open_file(filepath, 'r') as h5file:
+            scanner = colstats.StatsScanner(h5file.root.array, 0)
+            assert scanner.background
+            assert scanner.cachedResult() is None
+            assert run_task(scanner)['count'] == 1000
+            scanner = colstats.StatsScanner(h5file.root.array, 0)
+            assert scanner.cachedResult()['max'] == 999.
+            scanner.cancel()
+            assert run_task(scanner) is None
+
+    def test_releaseFile(self, launcher, tmp_path, monkeypatch):
+        # Many small chunks, so the scan is still running when released
+        monkeypatch.setattr(colstats, 'SCAN_MEMORY', 2 ** 10)
+        filepath = str(tmp_path / 'release.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_array('/', 'array', np.arange(500000.))
+        with tables.open_file(filepath, 'r') as h5file:
+            scanner = colstats.StatsScanner(h5file.root.array, 0)
+            results = []
+            scanner.scanFinished.connect(results.append)
+            scanner.start()
+            assert scanner in scantask._running_tasks
+            scantask.releaseFile(filepath)
+            assert not scanner.thread.is_alive()
+        # The worker handle has been closed
+        with tables.open_file(filepath, 'a'):
+            pass
+        QtCore.QCoreApplication.processEvents()
+        assert results == [None]
+        assert scanner not in scantask._running_tasks
@@ -0,0 +1,58 @@
+"""Test class for the columnar organization extension"""
+
+import numpy as np
+import tables
+from qtpy import QtCore
+
+from vitables.extensions.columnorg import columnar_org
+
+
+class TestColumnarOrg:
+    def test_sharedNavigation(self, launcher, tmp_path, monkeypatch,
+                              child_index, wait_until):
+        nrows = 100000
+        filepath = str(tmp_path / 'grouped.h5')
+        # Compressed arrays are not memory mapped, they are read in the
+        # background
+        filters = tables.Filters(complevel=1)
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_carray('/', 'ints', obj=np.arange(nrows),
+                                 filters=filters)
+            h5file.create_carray('/', 'floats', obj=np.arange(nrows) / 2,
+                                 filters=filters)
+
+        vtapp = launcher.vtapp_object
+        tree_model = launcher.gui.dbs_tree_model
+        tree_view = launcher.gui.dbs_tree_view
+        vtapp.fileOpen(filepath, 'r')
+        root = tree_model.index(0, 0, QtCore.QModelIndex())
+        tree_view.expand(root)
+        datasheets = []
+        for name in ('ints', 'floats'):
+            tree_view.activateNode(child_index(tree_model, root, name))
+            datasheets.append(launcher.gui.workspace.subWindowList()[-1])
+        group = columnar_org.GroupedArrays(views=datasheets)
+        models = [datasheet.leaf_model for datasheet in datasheets]
+        assert all(model.navigation is group.navigation
+                   for model in models)
+
+        batches = []
+        reader = vtapp.buffer_reader
+        request_batch = reader.requestBatch
+        monkeypatch.setattr(
+            reader, 'requestBatch',
+            lambda requests: (batches.append(len(requests)),
+                              request_batch(requests)))
+        # A fault of any view loads the same chunk in every model
+        models[0].loadData(60000, models[0].numrows)
+        wait_until(lambda: not any(model.pending for model in models))
+        assert batches == [2]
+        assert models[0].start == models[1].start == 60000
+        for model, scale in zip(models, (1, 2)):
+            row = model.numrows - 1
+            value = float(model.data(model.index(row, 0)))
+            assert value * scale == 60000 + row
+
+        group.ungroupArrays()
+        assert not any(model.navigation for model in models)
+        vtapp.fileCloseAll()
@@ -0,0 +1,95 @@
+"""Test class for copier.py"""
+
+import io
+import logging
+
+import numpy as np
+import pytest
+import tables
+from qtpy import QtWidgets
+
+import vitables.utils
+from vitables.vttables import copier, leaf_model, leaf_view, scantask
+
+
+@pytest.fixture()
+def copy_file(tmp_path):
+    """A file with a table and a matrix."""
+
+    h5file = tables.open_file(str(tmp_path / 'copier.h5'), 'w')
+    rows = np.zeros(30000, dtype=[('a', 'i8'), ('b', 'f8'), ('c', 'S4'),
+                                  ('d', 'i2', (2,))])
+    rows['a'] = np.arange(30000)
+    rows['b'] = np.arange(30000) / 4
+    rows['c'] = b'x\ty'
+    h5file.create_table('/', 'table', rows)
+    h5file.create_array('/', 'matrix', np.arange(12).reshape(3, 4))
+    h5file.flush()
+    yield h5file
+    h5file.close()
+
+
+def copyText(leaf, cell_range, **kwargs):
+    """Copy a range of cells of a leaf and return the text."""
+
+    range_copier = copier.RangeCopier(
+        leaf, cell_range, vitables.utils.formatArrayContent, **kwargs)
+    out_handler = io.StringIO()
+    fractions = list(range_copier.copy(leaf, out_handler))
+    assert fractions[-1] == 1.
+    return out_handler.getvalue()
+
+
+class TestRangeCopier:
+    def test_copy(self, copy_file, monkeypatch):
+        # Several chunks per copy
+        monkeypatch.setattr(copier, 'COPY_MEMORY', 2 ** 12)
+        table = copy_file.root.table
+        lines = copyText(table, (5, 25005, 0, 2)).splitlines()
+        assert len(lines) == 25000
+        assert lines[0] == '5\t1.25'
+        assert lines[-1] == '25004\t6251.'
+        # Tabs and newlines of cells are replaced
+        assert copyText(table, (7, 8, 2, 4)) == 'x y\t[0,0]\n'
+        matrix = copy_file.root.matrix
+        assert copyText(matrix, (1, 3, 1, 3)) == '5\t6\n9\t10\n'
+
+    def test_copyTask(self, launcher, copy_file, tmp_path, run_task):
+        table = copy_file.root.table
+        range_copier = copier.RangeCopier(
+            table, (0, 30000, 0, 1), vitables.utils.formatArrayContent)
+        filepath = str(tmp_path / 'copy.tsv')
+        task = copier.CopyTask(range_copier, table, filepath)
+        assert run_task(task) == 30000
+        assert np.array_equal(np.loadtxt(filepath, dtype='i8'),
+                              np.arange(30000))
+
+    def test_clipboardLimit(self, launcher, copy_file, monkeypatch,
+                            run_task):
+        monkeypatch.setattr(copier, 'COPY_MEMORY', 2 ** 12)
+        monkeypatch.setattr(copier, 'CLIPBOARD_MEMORY', 2 ** 14)
+        table = copy_file.root.table
+        for stop, lines in ((100, 100), (30000, None)):
+            range_copier = copier.RangeCopier(
+                table, (0, stop, 0, 1), vitables.utils.formatArrayContent)
+            # Copies larger than the limit fail
+            text = run_task(copier.CopyTask(range_copier, table))
+            assert (text if lines is None else text.count('\n')) == lines
+
+    def test_exportError(self, launcher, copy_file, tmp_path, monkeypatch,
+                         caplog, wait_until):
+        vtapp = launcher.vtapp_object
+        view = leaf_view.LeafView(leaf_model.LeafModel(copy_file.root.table))
+        monkeypatch.setattr(vtapp, 'activeLeafView', lambda: view)
+        view.selectRange(0, 100)
+        filepath = str(tmp_path / 'missing' / 'copy.tsv')
+        with caplog.at_level(logging.ERROR, logger=copier.__name__):
+            vtapp.copyRange(filepath)
+            wait_until(lambda: not scantask._running_tasks)
+        # The copy fails, it is reported and its dialog is closed
+        assert not scantask._running_tasks
+        assert any(filepath in record.getMessage()
+                   for record in caplog.records)
+        assert not any(dialog.isVisible() for dialog in
+                       launcher.gui.findChildren(QtWidgets.QProgressDialog))
+        view.close()
@@ -0,0 +1,39 @@
+"""Test class for csvutils.py"""
+
+import numpy as np
+import tables
+
+from vitables.vtcsv import csvutils
+
+
+class TestCSVUtils:
+    def test_roundTrip(self, tmp_path):
+        h5file = tables.open_file(str(tmp_path / 'csv.h5'), 'w')
+        try:
+            rows = np.zeros(25000, dtype=[('a', 'i8'), ('b', 'f8')])
+            rows['a'] = np.arange(25000)
+            rows['b'] = np.arange(25000) / 4
+            table = h5file.create_table('/', 'table', rows)
+            csv_filepath = str(tmp_path / 'table.csv')
+            with open(csv_filepath, 'wb') as out_handler:
+                csvutils.writeDataset(table, out_handler)
+            with open(csv_filepath) as input_handler:
+                nrows, descr, has_header = csvutils.tableInfo(input_handler)
+                assert not has_header
+                imported = h5file.create_table('/', 'imported', descr)
+                csvutils.fillDataset(imported, input_handler, has_header,
+                                     chunk_size=1000)
+            assert np.array_equal(imported.col('f0'), rows['a'])
+            assert np.array_equal(imported.col('f1'), rows['b'])
+            # Arrays that cannot be appended to are filled row by row
+            array = h5file.create_array(
+                '/', 'array', np.arange(50000.).reshape(25000, 2))
+            with open(csv_filepath, 'wb') as out_handler:
+                csvutils.writeDataset(array, out_handler)
+            carray = h5file.create_carray('/', 'carray', tables.Float64Atom(),
+                                          (25000, 2))
+            with open(csv_filepath) as input_handler:
+                csvutils.fillDataset(carray, input_handler, chunk_size=1000)
+            assert np.array_equal(carray[:], array[:])
+        finally:
+            h5file.close()
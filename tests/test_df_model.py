@@ -0,0 +1,90 @@
+"""Test class for df_model.py"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import tables
+from qtpy.QtCore import Qt
+
+from vitables.vttables import df_model, leaf_model
+
+
+@pytest.fixture()
+def frame(tmp_path):
+    """A DataFrame with a MultiIndex stored in the table format."""
+
+    nrows = 300
+    index = pd.MultiIndex.from_arrays(
+        [np.repeat(pd.date_range('2020-01-01', periods=3), nrows // 3),
+         np.arange(nrows)], names=['day', 'number'])
+    frame = pd.DataFrame({'a': np.arange(nrows) / 7,
+                          'b': np.arange(nrows),
+                          'c': ['x' * (row % 4) for row in range(nrows)]},
+                         index=index)
+    filepath = str(tmp_path / 'frame.h5')
+    frame.to_hdf(filepath, key='frame', format='table')
+    return filepath, frame
+
+
+def expectedData(frame, row, col):
+    """The text of a cell computed value by value."""
+    return str(frame.iat[row, col])
+
+
+class TestDataFrameModel:
+    def test_data(self, launcher, frame):
+        filepath, expected = frame
+        with tables.open_file(filepath, 'r') as h5file:
+            model = df_model.try_opening_as_dataframe(
+                h5file.root.frame.table)
+            n_columns, n_index = model._nheaders
+            assert (n_columns, n_index) == (1, 2)
+            assert model.numcols == 3
+            for row in (0, 1, 150, 299):
+                for col in range(3):
+                    index = model.index(row + n_columns, col + n_index)
+                    assert model.data(index) == \
+                        expectedData(expected, row, col)
+                for level in range(2):
+                    index = model.index(row + n_columns, level)
+                    assert model.data(index) == \
+                        str(expected.index[row][level])
+            for col in range(3):
+                index = model.index(0, col + n_index)
+                assert model.data(index) == expected.columns[col]
+            assert model.headerData(0, Qt.Horizontal, Qt.DisplayRole) == \
+                'day'
+
+    def test_plainIndex(self, launcher, tmp_path):
+        frame = pd.DataFrame({'a': np.arange(10), 'b': np.arange(10) / 4},
+                             index=pd.date_range('2020-01-01', periods=10))
+        filepath = str(tmp_path / 'plain.h5')
+        frame.to_hdf(filepath, key='frame', format='table')
+        with tables.open_file(filepath, 'r') as h5file:
+            model = df_model.try_opening_as_dataframe(
+                h5file.root.frame.table)
+            assert model._nheaders == (1, 1)
+            assert model.leaf_numcols == 2
+            assert model.data(model.index(4, 0)) == str(frame.index[3])
+            assert model.data(model.index(4, 2)) == str(frame.iat[3, 1])
+
+    def test_columnWindow(self, launcher, frame, monkeypatch):
+        monkeypatch.setattr(leaf_model, 'CHUNK_COLUMNS', 2)
+        filepath, expected = frame
+        with tables.open_file(filepath, 'r') as h5file:
+            model = df_model.try_opening_as_dataframe(
+                h5file.root.frame.table)
+            n_columns, n_index = model._nheaders
+            assert (model.leaf_numcols, model.numcols) == (3, 2)
+            # Columns are read as they are displayed
+            assert not model._values
+            index = model.index(10 + n_columns, 1 + n_index)
+            assert model.data(index) == expectedData(expected, 10, 1)
+            assert sorted(model._values) == ['b']
+            # and only if they are in the window
+            model.loadColumnData(2, 2)
+            assert model.col_start == 1
+            assert not model._values
+            assert model.data(index) == expectedData(expected, 10, 2)
+            assert model.data(model.index(n_columns - 1, n_index)) == 'b'
+            assert sorted(model._values) == ['c']
@@ -20,9 +20,10 @@
 
 """Test class for filenode nodes."""
 
-import os.path
-
 import pytest
+import tables
+from qtpy import QtCore
+from tables.nodes import filenode
 
 import vitables.filenodeutils as fnutils
 import vitables.vttables.filenodebuffer as fnbuffer
@@ -44,17 +45,15 @@ class TestFilenode:
         node = h5file.get_node('/tables/Particles')
         assert not fnutils.isFilenode(node)
 
-    def test_filenodeToFile(self, launcher, fnode):
-        file = fnutils.filenodeToFile(fnode)
-        assert os.path.isfile(file)
-
-        with open(file) as f:
-            lines = f.readlines()
-        assert lines[-1] == 'This is the last line.\n'
+    def test_lineOffsets(self, launcher, fnode):
+        offsets = fnutils.lineOffsets(fnode)
+        with filenode.open_node(fnode, 'r') as f:
+            lengths = [len(line) for line in f]
+        assert list(offsets[1:] - offsets[:-1]) == lengths
 
         # We have to do this by hand because the VTApp.nodeOpen method is
         # not being called
-        launcher.vtapp_object.filenodes_map[fnode] = file, len(lines)
+        launcher.vtapp_object.filenodes_map[fnode] = offsets
 
     def test_filenodeTotalRows(self, fnode):
         assert fnutils.filenodeTotalRows(fnode) == 11
@@ -78,3 +77,45 @@ class TestFilenode:
         fnb.readBuffer(0, 100)
         assert fnb.getCell(2, 5) == ('This is a line inserted '
                                      'programmatically at position 2\n')
+
+    def test_fnbSeek(self, tmp_path):
+        with tables.open_file(str(tmp_path / 'lines.h5'), 'w') as h5file:
+            node = filenode.new_node(h5file, where='/', name='lines')
+            node.write(b'first\r\n' +
+                       b''.join(b'line %d\n' % i for i in range(1, 9999)) +
+                       'last \u00e9'.encode())
+            node.close()
+            leaf = h5file.root.lines
+            fnb = fnbuffer.FilenodeBuffer(leaf, fnutils.lineOffsets(leaf))
+            assert fnb.total_nrows() == 10000
+            fnb.readBuffer(0, 2)
+            assert fnb.chunk == ['first\n', 'line 1\n']
+            # Lines are read by seeking, wherever they are
+            fnb.readBuffer(5000, 5003)
+            assert fnb.chunk == ['line 5000\n', 'line 5001\n', 'line 5002\n']
+            # The last line has no newline
+            fnb.readBuffer(9998, 10100)
+            assert fnb.chunk == ['line 9998\n', 'last \u00e9']
+            del fnb
+
+    def test_pageFilenode(self, launcher, tmp_path, child_index):
+        filepath = str(tmp_path / 'long.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            node = filenode.new_node(h5file, where='/', name='lines')
+            node.write(b''.join(b'line %d\n' % i for i in range(25000)))
+            node.close()
+        vtapp = launcher.vtapp_object
+        tree_model = launcher.gui.dbs_tree_model
+        vtapp.fileOpen(filepath, 'r')
+        root = tree_model.index(0, 0, QtCore.QModelIndex())
+        launcher.gui.dbs_tree_view.expand(root)
+        launcher.gui.dbs_tree_view.activateNode(
+            child_index(tree_model, root, 'lines'))
+        view = launcher.gui.workspace.subWindowList()[-1].leaf_view
+        model = view.tmodel
+        assert model.numrows < view.leaf_numrows == 25000
+        # Jumping beyond the first chunk makes a buffer fault
+        index = view.goToRow(20000)
+        assert model.start > 0
+        assert model.data(index) == 'line 20000\n'
+        vtapp.fileCloseAll()
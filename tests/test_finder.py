@@ -0,0 +1,101 @@
+"""Test class for finder.py"""
+
+import re
+
+import numpy as np
+import pytest
+import tables
+
+from vitables.vttables import finder
+
+
+@pytest.fixture()
+def search_file(tmp_path):
+    """A file with a table, a wide matrix and a 3-D array."""
+
+    h5file = tables.open_file(str(tmp_path / 'finder.h5'), 'w')
+    rows = np.zeros(20000, dtype=[('a', 'i8'), ('b', 'f4'), ('c', 'S6'),
+                                  ('d', 'i2', (2,))])
+    rows['a'] = np.arange(20000) % 1000
+    rows['b'] = np.arange(20000) / 2
+    rows['c'] = np.resize([b'alpha', b'beta', b'gamma', b'delta'], 20000)
+    rows['c'][1999] = b'needle'
+    rows['d'][:, 1] = np.arange(20000) % 7
+    h5file.create_table('/', 'table', rows)
+    h5file.create_array('/', 'matrix', np.arange(6000).reshape(1000, 6))
+    h5file.create_array('/', 'cube', np.arange(24).reshape(2, 3, 4))
+    h5file.flush()
+    yield h5file
+    h5file.close()
+
+
+def search(finder_, leaf, row, col, backward=False):
+    """Run a search to completion and return the found cell."""
+
+    for _ in finder_.search(leaf, row, col, backward):
+        pass
+    return finder_.match
+
+
+class TestFinder:
+    def test_search(self, search_file, monkeypatch):
+        # Several chunks per search
+        monkeypatch.setattr(finder, 'SEARCH_MEMORY', 2 ** 12)
+        table = search_file.root.table
+        table_finder = finder.Finder(table, '999')
+        assert table_finder.chunk_rows < table.nrows
+        assert search(table_finder, table, 0, 0) == (999, 0)
+        assert search(table_finder, table, 999, 0) == (1998, 1)
+        assert search(table_finder, table, 999, 0, True) == (19999, 0)
+        # Searches wrap around the ends of the leaf
+        assert search(table_finder, table, 19999, 0) == (999, 0)
+        assert search(table_finder, table, 0, 0, True) == (19999, 0)
+        # Strings contain the text, cells of multidimensional columns
+        # match if any element matches
+        assert search(finder.Finder(table, 'eed'), table, 0, 0) == \
+            (1999, 2)
+        assert search(finder.Finder(table, '6'), table, 0, 0) == (6, 0)
+        assert search(finder.Finder(table, '6'), table, 6, 0) == (6, 3)
+        assert search(finder.Finder(table, 'xyz'), table, 0, 0) is None
+        matrix = search_file.root.matrix
+        assert search(finder.Finder(matrix, '3001'), matrix, 0, 0) == \
+            (500, 1)
+        cube = search_file.root.cube
+        cube_finder = finder.Finder(cube, '13', slab=(1, 2, (1, 0, 0)))
+        assert (cube_finder.nrows, cube_finder.ncols) == (3, 4)
+        assert search(cube_finder, cube, 0, 0) == (0, 1)
+
+    def test_count(self, search_file):
+        table = search_file.root.table
+        counter = finder.Finder(table, '10')
+        list(counter.count(table))
+        assert counter.nmatches == 20 + 1
+        counter = finder.Finder(table, '^(alpha|beta)$', regex=True)
+        list(counter.count(table))
+        assert counter.nmatches == 10000
+        with pytest.raises(re.error):
+            finder.Finder(table, '(', regex=True)
+        assert finder.parseNumber(' 1e3') == 1000.
+        assert finder.parseNumber('True') is True
+        assert finder.parseNumber('one') is None
+
+    def test_tasks(self, launcher, tmp_path, run_task):
+        filepath = str(tmp_path / 'tasks.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_array('/', 'array', np.arange(1000) % 100)
+        # Writable files are searched in the GUI thread
+        with tables.open_file(filepath, 'a') as h5file:
+            array = h5file.root.array
+            task = finder.SearchTask(finder.Finder(array, '42'), array,
+                                     42, 0)
+            assert not task.background
+            assert run_task(task) == (142, 0)
+        # Read-only files are searched in background
+        with tables.open_file(filepath, 'r') as h5file:
+            array = h5file.root.array
+            task = finder.SearchTask(finder.Finder(array, '420'), array,
+                                     0, 0)
+            assert task.background
+            assert run_task(task) == ()
+            task = finder.CountTask(finder.Finder(array, '42'), array)
+            assert run_task(task) == 10
@@ -0,0 +1,27 @@
+"""Test class for hyperslab_selector.py"""
+
+from qtpy import QtWidgets
+
+from vitables.vttables import hyperslab_selector
+
+
+class TestHyperslabSelector:
+    def test_longAxis(self, launcher):
+        size = 2 ** 31 + 5
+        selector = hyperslab_selector.HyperslabSelector((4, 3, size))
+        hyperslabs = []
+        selector.hyperslabChanged.connect(
+            lambda *args: hyperslabs.append(args))
+        assert isinstance(selector.index_sb[0], QtWidgets.QSpinBox)
+        # Indices beyond the range of spinboxes are typed
+        edit = selector.index_sb[2]
+        assert isinstance(edit, hyperslab_selector.IndexEdit)
+        edit.setText(str(2 ** 31 + 1))
+        edit.editingFinished.emit()
+        assert hyperslabs == [(0, 1, [0, 0, 2 ** 31 + 1])]
+        # and clamped to the axis
+        edit.setText(str(10 ** 12))
+        edit.editingFinished.emit()
+        assert edit.text() == str(size - 1)
+        assert hyperslabs[-1] == (0, 1, [0, 0, size - 1])
+        selector.close()
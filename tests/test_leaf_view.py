@@ -0,0 +1,153 @@
+"""Test class for leaf_view.py"""
+
+import logging
+
+import numpy as np
+import pytest
+import tables
+
+from vitables.vttables import leaf_model, leaf_view
+
+
+@pytest.fixture()
+def view(launcher, tmp_path):
+    """A view of an array with many more rows than its model."""
+
+    h5file = tables.open_file(str(tmp_path / 'leaf_view.h5'), 'w')
+    array = h5file.create_carray('/', 'array', tables.Int64Atom(),
+                                 (100000, 3), chunkshape=(1000, 3))
+    array[:] = np.arange(300000).reshape(100000, 3)
+    view = leaf_view.LeafView(leaf_model.LeafModel(array))
+    yield view
+    view.close()
+    h5file.close()
+
+
+class TestLeafView:
+    def test_goToRow(self, view):
+        model = view.tmodel
+        assert view.leaf_numrows > model.numrows
+        for row in (76543, 10, 99999, 50000):
+            index = view.goToRow(row, 2)
+            assert model.start <= row < model.start + model.numrows
+            assert view.currentRow() == row
+            assert model.data(index) == str(3 * row + 2)
+        assert not view.goToRow(100000).isValid()
+
+    def test_bookmarks(self, view):
+        for row in (99000, 20, 45678):
+            view.goToRow(row)
+            view.toggleBookmark()
+        assert view.tmodel.bookmarks == {20, 45678, 99000}
+        view.goToRow(0)
+        view.nextBookmark()
+        assert view.currentRow() == 20
+        view.nextBookmark()
+        assert view.currentRow() == 45678
+        view.previousBookmark()
+        assert view.currentRow() == 20
+        view.toggleBookmark()
+        view.goToRow(99999)
+        view.previousBookmark()
+        assert view.currentRow() == 99000
+        assert view.tmodel.bookmarks == {45678, 99000}
+
+    def test_sliderMapping(self, view):
+        # Rows are mapped exactly even if they don't fit in the scrollbar
+        view.leaf_numrows = 2 ** 40
+        view.max_value = 2 ** 31 - 1
+        assert view.sliderToRow(0) == 0
+        assert view.sliderToRow(view.max_value) == 2 ** 40 - 1
+        for value in (1, 12345, 2 ** 30, view.max_value - 1):
+            assert view.rowToSlider(view.sliderToRow(value)) == value
+        # And so are the columns of wide arrays
+        view.leaf_numcols = 3 * 10 ** 9
+        view.h_max_value = 2 ** 31 - 1
+        assert view.sliderToColumn(view.h_max_value) == 3 * 10 ** 9 - 1
+        for value in (0, 1, 12345, 2 ** 30, view.h_max_value - 1):
+            assert view.columnToSlider(view.sliderToColumn(value)) == value
+
+    def test_faultStats(self, view, caplog):
+        from vitables.vttables import readstats
+
+        stats = view.tmodel.stats
+        stats.reset()
+        caplog.set_level(logging.INFO, logger=readstats.__name__)
+        view.goToRow(60000)
+        assert stats.faults == 1
+        assert stats.reads >= 1
+        view.tmodel.data(view.tmodel.index(0, 0))
+        assert stats.cells_formatted == view.tmodel.numrows
+        records = [r.perf for r in caplog.records if hasattr(r, 'perf')]
+        assert records[-1]['event'] == 'fault'
+        assert records[-1]['node'] == '/array'
+        assert records[-1]['start'] <= 60000 < records[-1]['stop']
+
+    def test_truncatedRows(self, launcher, tmp_path):
+        h5file = tables.open_file(str(tmp_path / 'vlarray.h5'), 'w')
+        try:
+            vlarray = h5file.create_vlarray('/', 'vlarray', tables.Int32Atom())
+            for row in range(50):
+                vlarray.append(np.arange(5000 if row % 10 == 0 else row))
+            model = leaf_model.LeafModel(vlarray)
+            text = model.data(model.index(10, 0))
+            preview = np.array2string(np.arange(100), separator=',')
+            assert text == f'{preview} \u2026 (5000 items)'
+            assert model.data(model.index(11, 0)) == np.array2string(
+                np.arange(11), separator=',')
+            # Zoomed cells are read whole
+            assert len(model.rbuffer.getCell(10, 0)) == 100
+            assert np.array_equal(model.cell(10, 0), np.arange(5000))
+        finally:
+            h5file.close()
+
+    def test_sortedView(self, launcher, tmp_path):
+        from vitables.vttables import sorting
+
+        h5file = tables.open_file(str(tmp_path / 'sorted.h5'), 'w')
+        tmp_h5file = tables.open_file(str(tmp_path / 'tmp.h5'), 'w')
+        try:
+            rows = np.zeros(30000, dtype=[('a', 'i8'), ('b', 'f8')])
+            rows['a'] = np.arange(30000)[::-1]
+            rows['b'] = np.arange(30000) % 7
+            table = h5file.create_table('/', 'table', rows)
+            view = leaf_view.LeafView(leaf_model.LeafModel(table))
+            model = view.tmodel
+            view.goToRow(100)
+            model.setOrder(sorting.sortOrder(table, ['b', 'a'], tmp_h5file))
+            assert model.start == 0
+            expected = rows[np.lexsort((rows['a'], rows['b']))]
+            for row in (0, 29999, 12345):
+                index = view.goToRow(row, 0)
+                assert model.data(index) == str(expected['a'][row])
+            permutation = model.order.permutation
+            model.setOrder(None)
+            assert not permutation._v_isopen
+            view.goToRow(5, 0)
+            assert model.data(view.currentIndex()) == str(rows['a'][5])
+            view.close()
+        finally:
+            tmp_h5file.close()
+            h5file.close()
+
+    def test_selectRange(self, view):
+        from qtpy import QtCore
+        from qtpy.QtTest import QTest
+
+        model = view.tmodel
+        view.goToRow(9990, 1)
+        # Ranges selected with Shift go beyond the chunk of the model
+        view.setFocus()
+        for _ in range(20):
+            QTest.keyClick(view, QtCore.Qt.Key_Down, QtCore.Qt.ShiftModifier)
+        assert view.selectedRange() == (9990, 10011, 1, 2)
+        assert model.isInSelectedRange(10005 - model.start, 1)
+        QTest.keyClick(view, QtCore.Qt.Key_Down)
+        assert view.selectedRange() == (10011, 10012, 1, 2)
+        # The current cell keeps its row when other chunk is displayed
+        model.loadData(50000, model.numrows)
+        assert view.selectedRange() == (10011, 10012, 1, 2)
+        view.selectRange(50, 90000)
+        assert view.selectedRange() == (50, 90000, 0, 3)
+        view.selectRange(70)
+        assert view.selectedRange() == (70, 71, 0, 3)
@@ -0,0 +1,84 @@
+"""Test class for metacache.py"""
+
+import os
+
+import numpy as np
+import tables
+
+from vitables import metacache
+
+
+class TestMetadataCache:
+    def test_roundTrip(self, tmp_path):
+        filepath = str(tmp_path / 'data.h5')
+        with open(filepath, 'wb') as out_handler:
+            out_handler.write(b'data')
+        cache = metacache.MetadataCache(str(tmp_path / 'cache.sqlite'))
+        offsets = np.arange(10, dtype=np.uint32)
+        cache.put(filepath, '/node', 'offsets', offsets)
+        cache.put(filepath, '/', 'paths', ['/', '/node'])
+        cache.put(filepath, '/node', 'nothing', None)
+        cached = cache.get(filepath, '/node', 'offsets')
+        assert cached.dtype == np.uint32
+        assert np.array_equal(cached, offsets)
+        assert cache.get(filepath, '/', 'paths') == ['/', '/node']
+        assert cache.get(filepath, '/node', 'nothing', 'missing') is None
+        assert cache.get(filepath, '/other', 'paths', 'missing') == 'missing'
+        # Entries persist across sessions
+        cache.close()
+        cache = metacache.MetadataCache(str(tmp_path / 'cache.sqlite'))
+        assert cache.get(filepath, '/', 'paths') == ['/', '/node']
+        # Changing the file invalidates its entries
+        with open(filepath, 'ab') as out_handler:
+            out_handler.write(b'more data')
+        assert cache.get(filepath, '/', 'paths') is None
+        assert cache.size() == 0
+        cache.close()
+
+    def test_eviction(self, tmp_path):
+        filepath = str(tmp_path / 'data.h5')
+        with open(filepath, 'wb') as out_handler:
+            out_handler.write(b'data')
+        cache = metacache.MetadataCache(str(tmp_path / 'cache.sqlite'),
+                                        max_size=2000)
+        for kind in ('first', 'second', 'third'):
+            cache.put(filepath, '/node', kind, np.zeros(100))
+        assert cache.size() <= 2000
+        # The least recently used entry is evicted
+        assert cache.get(filepath, '/node', 'first') is None
+        assert cache.get(filepath, '/node', 'third') is not None
+        # Values larger than the cache are not stored
+        cache.put(filepath, '/node', 'huge', np.zeros(1000))
+        assert cache.get(filepath, '/node', 'huge') is None
+        cache.close()
+
+    def test_disabled(self, tmp_path):
+        # A directory cannot be used as a database
+        os.makedirs(str(tmp_path / 'cache.sqlite'))
+        cache = metacache.MetadataCache(str(tmp_path / 'cache.sqlite'))
+        assert cache.connection is None
+        cache.put(str(tmp_path), '/', 'paths', ['/'])
+        assert cache.get(str(tmp_path), '/', 'paths', 'missing') == 'missing'
+
+    def test_cached(self, tmp_path, monkeypatch):
+        cache = metacache.MetadataCache(str(tmp_path / 'cache.sqlite'))
+        monkeypatch.setattr(metacache, '_cache', cache)
+        filepath = str(tmp_path / 'data.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_array('/', 'array', np.arange(3))
+            # Files being written are never cached
+            assert metacache.cached(h5file.root.array, 'kind',
+                                    lambda: 1) == 1
+            assert cache.size() == 0
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [1, 2]
+
+        for _ in range(2):
+            with tables.open_file(filepath, 'r') as h5file:
+                assert metacache.cached(h5file.root.array, 'kind',
+                                        compute) == [1, 2]
+        assert len(calls) == 1
+        cache.close()
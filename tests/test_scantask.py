@@ -0,0 +1,29 @@
+"""Test class for scantask.py"""
+
+import numpy as np
+import tables
+
+from vitables.vttables import scantask
+
+
+class FailingTask(scantask.ScanTask):
+    """A scan that fails after its first chunk."""
+
+    def steps(self, leaf):
+        yield 0.5
+        raise FileNotFoundError('missing')
+
+
+class TestScanTask:
+    def test_failure(self, launcher, tmp_path, run_task):
+        filepath = str(tmp_path / 'failure.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            h5file.create_array('/', 'array', np.arange(10))
+        # Writable files are scanned in the GUI thread, read-only files in
+        # a worker thread. Errors finish the scan in both cases
+        for mode in ('a', 'r'):
+            with tables.open_file(filepath, mode) as h5file:
+                task = FailingTask(h5file.root.array)
+                assert task.background == (mode == 'r')
+                assert run_task(task) is None
+                assert task not in scantask._running_tasks
@@ -0,0 +1,144 @@
+"""End-to-end GUI scenarios measuring the responsiveness of ViTables.
+
+Scenarios drive the application like a user would (run them with
+``QT_QPA_PLATFORM=offscreen`` where there is no display). Every step
+records its wall time, the peak memory and the stalls of the event loop
+(see `conftest.py`). Stall budgets are generous: they catch actions that
+freeze the GUI for a long time, not small regressions (those are the job
+of the benchmarks suite).
+"""
+
+import numpy as np
+import pytest
+import tables
+from qtpy import QtCore, QtWidgets
+from qtpy.QtTest import QTest
+
+#: The longest stall allowed when browsing a dataset (in seconds).
+BROWSING_BUDGET = 1.0
+
+#: The longest stall allowed when querying a table (in seconds).
+QUERY_BUDGET = 10.0
+
+
+@pytest.fixture(scope='module')
+def scenario_file(tmp_path_factory, scenario_sizes):
+    """A file with a huge table, a crowded group and a table to query."""
+
+    filepath = str(tmp_path_factory.mktemp('scenarios') / 'scenarios.h5')
+    with tables.open_file(filepath, 'w') as h5file:
+        description = {'id': tables.Int64Col(pos=0),
+                       'value': tables.Float64Col(pos=1)}
+        # Chunks of a table that are never written are not stored in the
+        # file, so truncating to a larger size makes huge tables cheaply
+        huge = h5file.create_table('/', 'huge', description,
+                                   expectedrows=scenario_sizes['huge_rows'])
+        first = np.zeros(10, dtype=huge.dtype)
+        first['id'] = np.arange(10)
+        huge.append(first)
+        huge.truncate(scenario_sizes['huge_rows'])
+        group = h5file.create_group('/', 'crowded')
+        data = np.arange(3)
+        for child in range(scenario_sizes['children']):
+            h5file.create_array(group, f'array{child:06d}', data)
+        nrows = scenario_sizes['query_rows']
+        rows = np.empty(nrows, dtype=[('id', 'i8'), ('value', 'f8')])
+        rows['id'] = np.arange(nrows)
+        rows['value'] = np.random.default_rng(0).random(nrows)
+        h5file.create_table('/', 'data', rows)
+    return filepath
+
+
+def maxStall(scenario):
+    """The longest stall of the event loop in every step of a scenario."""
+    return {step['step']: step['max_stall'] for step in scenario.steps}
+
+
+class TestScenarios:
+    def test_browseHugeTable(self, launcher, scenario, scenario_file,
+                            child_index):
+        vtapp = launcher.vtapp_object
+        tree_model = launcher.gui.dbs_tree_model
+        tree_view = launcher.gui.dbs_tree_view
+        sizes = scenario.sizes
+
+        scenario.step('open file',
+                      lambda i: vtapp.fileOpen(scenario_file, 'r'))
+        root = tree_model.index(0, 0, QtCore.QModelIndex())
+        tree_view.expand(root)
+        group = child_index(tree_model, root, 'crowded')
+        scenario.step('expand group', lambda i: tree_view.expand(group))
+        assert tree_model.rowCount(group) == sizes['children']
+
+        huge = child_index(tree_model, root, 'huge')
+        scenario.step('open table', lambda i: tree_view.activateNode(huge))
+        view = vtapp.activeLeafView()
+        model = view.tmodel
+        assert view.leaf_numrows == sizes['huge_rows']
+
+        def settled():
+            return not model.pending
+
+        view.setFocus()
+        view.setCurrentIndex(model.index(0, 0))
+        scenario.step(
+            'page down',
+            lambda i: QTest.keyClick(view, QtCore.Qt.Key_PageDown),
+            repeat=sizes['page_downs'], until=settled)
+        assert view.currentRow() > sizes['page_downs']
+
+        scrollbar = view.tricky_vscrollbar
+        positions = np.random.default_rng(0).integers(
+            0, view.max_value, sizes['slider_drags'], endpoint=True)
+
+        def drag(i):
+            scrollbar.setSliderPosition(int(positions[i]))
+            scrollbar.triggerAction(QtWidgets.QAbstractSlider.SliderMove)
+
+        scenario.step('drag slider', drag, repeat=sizes['slider_drags'],
+                      until=settled)
+        first_row = view.sliderToRow(int(positions[-1]))
+        assert model.start <= first_row < model.start + model.numrows
+
+        scenario.step('close files', lambda i: vtapp.fileCloseAll())
+        assert not launcher.gui.workspace.subWindowList()
+
+        stalls = maxStall(scenario)
+        for step in ('open table', 'page down', 'drag slider'):
+            assert stalls[step] < BROWSING_BUDGET, step
+
+    def test_queryTable(self, launcher, scenario, scenario_file,
+                        monkeypatch, child_index):
+        vtapp = launcher.vtapp_object
+        tree_model = launcher.gui.dbs_tree_model
+        tree_view = launcher.gui.dbs_tree_view
+
+        scenario.step('open file',
+                      lambda i: vtapp.fileOpen(scenario_file, 'r'))
+        root = tree_model.index(0, 0, QtCore.QModelIndex())
+        tree_view.expand(root)
+        tree_view.setCurrentIndex(child_index(tree_model, root, 'data'))
+
+        # Replace the query dialog with the input of the user
+        nrows = scenario.sizes['query_rows']
+        query_description = {
+            'condition': 'value > 0.99',
+            'rows_range': (np.int64(0), np.int64(nrows), np.int64(1)),
+            'ft_name': 'scenario_query',
+            'indices_field_name': '',
+            'condvars': {},
+            'src_filepath': scenario_file,
+            'src_path': '/data',
+            'title': 'value > 0.99',
+        }
+        monkeypatch.setattr(vtapp.queries_mgr, 'getQueryInfo',
+                            lambda info, table: dict(query_description))
+        scenario.step('run query', lambda i: vtapp.newQuery())
+        view = vtapp.activeLeafView()
+        expected = np.count_nonzero(
+            np.random.default_rng(0).random(nrows) > 0.99)
+        assert view.leaf_numrows == expected
+
+        scenario.step('close files', lambda i: vtapp.fileCloseAll())
+
+        assert maxStall(scenario)['run query'] < QUERY_BUDGET
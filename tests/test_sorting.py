@@ -0,0 +1,101 @@
+"""Test class for sorting.py"""
+
+import numpy as np
+import pytest
+import tables
+from vitables.vttables import buffer, sorting
+
+
+@pytest.fixture()
+def h5files(tmp_path):
+    """A file with a table and a temporary database."""
+
+    h5file = tables.open_file(str(tmp_path / 'sorting.h5'), 'w')
+    rows = np.zeros(5000, dtype=[('a', 'i8'), ('b', 'f8'), ('c', 'S4')])
+    rng = np.random.default_rng(0)
+    rows['a'] = rng.integers(0, 10, 5000)
+    rows['b'] = rng.random(5000)
+    rows['b'][::7] = np.nan
+    rows['c'] = rng.integers(0, 100, 5000).astype('S4')
+    h5file.create_table('/', 'table', rows)
+    tmp_h5file = tables.open_file(str(tmp_path / 'tmp.h5'), 'w')
+    yield h5file, tmp_h5file
+    tmp_h5file.close()
+    h5file.close()
+
+
+class TestSorting:
+    def test_sortPermutation(self, h5files, monkeypatch):
+        h5file, tmp_h5file = h5files
+        table = h5file.root.table
+        # Runs of 700 rows merged 3 at a time need several merge passes
+        itemsize = sorting.keysDtype(table, ['a', 'b']).itemsize
+        monkeypatch.setattr(sorting, 'SORT_MEMORY', 2 * 700 * itemsize)
+        monkeypatch.setattr(sorting, 'MAX_FANIN', 3)
+        order = sorting.sortOrder(table, ['a', 'b'], tmp_h5file)
+        assert isinstance(order, sorting.PermutationOrder)
+        rows = table.read()
+        expected = np.lexsort((rows['b'], rows['a']))
+        assert np.array_equal(order.permutation.read(), expected)
+        # Merged runs are removed, only the permutation is kept
+        group = order.permutation._v_parent
+        assert list(group._v_children) == ['permutation']
+        order.close()
+        assert not group._v_isopen
+
+        order = sorting.sortOrder(table, ['c'], tmp_h5file)
+        assert np.array_equal(order.permutation.read(),
+                              np.argsort(rows['c'], kind='stable'))
+        with pytest.raises(ValueError):
+            sorting.sortOrder(table, ['d'], tmp_h5file)
+
+    def test_sortTask(self, launcher, h5files, monkeypatch, run_task):
+        h5file, tmp_h5file = h5files
+        table = h5file.root.table
+        itemsize = sorting.keysDtype(table, ['a', 'b']).itemsize
+        monkeypatch.setattr(sorting, 'SORT_MEMORY', 2 * 700 * itemsize)
+        monkeypatch.setattr(sorting, 'MAX_FANIN', 3)
+        task = sorting.SortTask(table, ['a', 'b'], tmp_h5file)
+        percents = []
+        task.progressChanged.connect(percents.append)
+        order = run_task(task)
+        rows = table.read()
+        assert np.array_equal(order.permutation.read(),
+                              np.lexsort((rows['b'], rows['a'])))
+        assert percents == sorted(percents) and percents[-1] == 100
+        order.close()
+        # Cancelled sorts leave nothing behind
+        task = sorting.SortTask(table, ['a', 'b'], tmp_h5file)
+        task.progressChanged.connect(
+            lambda percent: percent >= 30 and task.cancel())
+        assert run_task(task) is None
+        assert not tmp_h5file.get_node(f'/{sorting.SORT_GROUP}')._v_children
+        with pytest.raises(ValueError):
+            sorting.SortTask(table, [], tmp_h5file)
+
+    def test_csiOrder(self, h5files):
+        h5file, tmp_h5file = h5files
+        table = h5file.root.table
+        table.cols.b.create_csindex()
+        order = sorting.sortOrder(table, ['b'], tmp_h5file)
+        assert isinstance(order, sorting.CSIOrder)
+        assert order.threadsafe
+        assert np.array_equal(order.read(table, 10, 20, 'a'),
+                              table.read_sorted('b', field='a')[10:20])
+
+    def test_sortedBuffer(self, h5files):
+        h5file, tmp_h5file = h5files
+        table = h5file.root.table
+        order = sorting.sortOrder(table, ['c', 'a'], tmp_h5file)
+        rbuffer = buffer.Buffer(table, block_size=700, reader=object(),
+                                order=order)
+        # The permutation is read in the GUI thread only
+        assert rbuffer.reader is None
+        rows = table.read()[order.permutation.read()]
+        for start, stop in [(0, 100), (650, 2100), (4900, 5000)]:
+            rbuffer.readBuffer(start, stop)
+            rbuffer.readColumns([0, 1, 2])
+            for col, field in enumerate(table.colnames):
+                assert np.array_equal(rbuffer.chunk[col],
+                                      rows[field][start:stop],
+                                      equal_nan=(field == 'b'))
@@ -0,0 +1,125 @@
+"""Test class for the time series extension"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import tables
+
+import vitables.utils
+from vitables.extensions.timeseries import time_series, tsformat
+from vitables.vttables import df_model, leaf_model
+
+#: Formats with every directive formatted in bulk, and without them.
+FORMATS = ['%c', '%Y-%m-%d %H:%M:%S', '%a %A %b %B %h %j %e %I %p %u %w %y %%',
+           '%x %X', '%Z %s', 'no directives', '']
+
+
+def gmtimeFormatter(ts_format):
+    """Format seconds like TSLeafModel.formatPyTablesTS does."""
+
+    def formatter(content):
+        try:
+            return time.strftime(ts_format, time.gmtime(content))
+        except (ValueError, OverflowError):
+            return content
+    return formatter
+
+
+class TestTimeSeries:
+    def test_tsPositions(self, launcher, tmp_path, monkeypatch):
+        nrows = 10
+        days = pd.date_range('2020-01-01', periods=nrows)
+        frames = {
+            'plain': pd.DataFrame({'a': np.arange(nrows), 'when': days},
+                                  index=days),
+            'multi': pd.DataFrame(
+                {'a': np.arange(nrows), 'b': np.arange(nrows) / 2,
+                 'when': days.tz_localize('UTC')},
+                index=pd.MultiIndex.from_arrays([np.arange(nrows), days])),
+            'no_time': pd.DataFrame({'a': np.arange(nrows)}),
+        }
+        filepath = str(tmp_path / 'frames.h5')
+        for key, frame in frames.items():
+            frame.to_hdf(filepath, key=key, format='table')
+        expected = {'plain': [0, 2], 'multi': [1, 4], 'no_time': []}
+        with tables.open_file(filepath, 'r') as h5file:
+            for key, frame in frames.items():
+                leaf = h5file.get_node(f'/{key}/table')
+                assert time_series.frameTSPositions(frame) == expected[key]
+                assert time_series.storedTSPositions(leaf) == expected[key]
+                if expected[key]:
+                    assert time_series.findTS(leaf, 'table') == 'pandas_ts'
+                    assert time_series.tsPositions('pandas_ts', leaf) == \
+                        expected[key]
+        # If the metadata are not understood a single row is read
+        def unknownMetadata(leaf):
+            raise KeyError('values_block_0_dtype')
+
+        monkeypatch.setattr(time_series, 'storedTSPositions', unknownMetadata)
+        with tables.open_file(filepath, 'r') as h5file:
+            leaf = h5file.root.multi.table
+            assert time_series.pandasTSPositions(leaf) == expected['multi']
+
+    def test_formatColumn(self):
+        seconds = np.r_[np.random.default_rng(0).random(1000) * 4e9 - 1e9,
+                        [0, -0.5, 1e15, -3e10, np.nan, np.inf]]
+        datetimes = tsformat.secondsToDatetimes(seconds)
+        for ts_format in FORMATS:
+            formatter = gmtimeFormatter(ts_format)
+            expected = [formatter(value) for value in seconds]
+            texts = tsformat.formatColumn(seconds, datetimes, ts_format,
+                                          formatter)
+            assert texts[:-2] == expected[:-2], ts_format
+            assert np.isnan(texts[-2]) and np.isinf(texts[-1])
+
+    def test_renderTimes(self, launcher, tmp_path, monkeypatch):
+        # Models look up the application among the top level widgets,
+        # which depend on the GUI state left by other test modules
+        vtapp = launcher.vtapp_object
+        monkeypatch.setattr(vitables.utils, 'getApp', lambda: vtapp)
+        ts_format = '%Y-%m-%d %H:%M:%S'
+        seconds = np.arange(100) * 86399.5
+        filepath = str(tmp_path / 'times.h5')
+        with tables.open_file(filepath, 'w') as h5file:
+            rows = np.zeros(100, dtype=[('id', 'i8'), ('when', 'f8')])
+            rows['id'] = np.arange(100)
+            rows['when'] = seconds
+            h5file.create_table('/', 'table', {
+                'id': tables.Int64Col(pos=0), 'when': tables.Time64Col(pos=1)
+            }).append(rows)
+        # Files opened in read-write mode are read synchronously
+        with tables.open_file(filepath, 'a') as h5file:
+            table = h5file.root.table
+            model = leaf_model.LeafModel(table)
+            ts_cols = time_series.tsPositions('pytables_ts', table)
+            time_series.TSLeafModel(
+                {'leaf_kind': 'table', 'model': model},
+                {'ts_kind': 'pytables_ts', 'ts_cols': ts_cols,
+                 'ts_freq': None, 'ts_format': ts_format})
+            formatter = gmtimeFormatter(ts_format)
+            for row in (0, 1, 57, 99):
+                assert model.data(model.index(row, 0)) == str(row)
+                assert model.data(model.index(row, 1)) == \
+                    formatter(seconds[row])
+
+        frame = pd.DataFrame({'a': np.arange(100),
+                              'when': pd.to_datetime(seconds, unit='s')},
+                             index=pd.date_range('1960-01-01', periods=100,
+                                                 freq='37h'))
+        frame.to_hdf(filepath, key='frame', format='table', mode='w')
+        with tables.open_file(filepath, 'r') as h5file:
+            table = h5file.root.frame.table
+            model = df_model.try_opening_as_dataframe(table)
+            ts_cols = time_series.tsPositions('pandas_ts', table)
+            assert ts_cols == [0, 2]
+            time_series.TSLeafModel(
+                {'leaf_kind': 'dataframe', 'model': model},
+                {'ts_kind': 'pandas_ts', 'ts_cols': ts_cols,
+                 'ts_freq': None, 'ts_format': ts_format})
+            for row in (0, 1, 57, 99):
+                assert model.data(model.index(row + 1, 0)) == \
+                    frame.index[row].strftime(ts_format)
+                assert model.data(model.index(row + 1, 1)) == str(row)
+                assert model.data(model.index(row + 1, 2)) == \
+                    frame['when'].iloc[row].strftime(ts_format)
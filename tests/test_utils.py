@@ -1,5 +1,6 @@
 """Test class for utils.py"""
 
+import numpy as np
 import pytest
 from qtpy import QtGui, QtWidgets
 
@@ -113,3 +114,18 @@ class TestUtils:
     def test_forwardPath(self):
         filepath = 'C:\\Users\\my_name\\Desktop\\'
         assert utils.forwardPath(filepath) == 'C:/Users/my_name/Desktop/'
+
+    @pytest.mark.parametrize('column', [
+        np.array([0., -0., 1 / 3, 2., 1e20, 1e-7, np.nan, -np.inf]),
+        np.array([0.1, 123.45679, 1e7], dtype=np.float32),
+        np.arange(-3, 3, dtype=np.int16),
+        np.array([True, False]),
+        np.array([b'abc', b'']),
+        np.array([b'abc', b'\xff']),
+        np.ones((3, 2)),
+        np.array([1 + 2j]),
+        [np.arange(3), np.arange(0)],
+    ])
+    def test_formatArrayColumn(self, column):
+        expected = [utils.formatArrayContent(cell) for cell in column]
+        assert utils.formatArrayColumn(column) == expected
@@ -34,6 +34,7 @@ class TestLogger:
         cfg.writeValue('Session/restoreLastSession', False)
         cfg.writeValue('Session/startupWorkingDir', 'home')
         cfg.writeValue('Session/lastWorkingDir', vitables.utils.getHomeDir())
+        cfg.writeValue('Buffers/MemoryBudget', 64)
 
     def test_credentials(self, launcher, config):
         organization = launcher.app.organizationName()
@@ -137,3 +138,9 @@ class TestLogger:
     def test_lastWorkingDir(self, config):
         config.writeValue('Session/lastWorkingDir', 1)
         assert config.lastWorkingDir() == vitables.utils.getHomeDir()
+
+    def test_memoryBudget(self, config):
+        config.writeValue('Buffers/MemoryBudget', 256)
+        assert config.memoryBudget() == 256
+        config.writeValue('Buffers/MemoryBudget', 'lots')
+        assert config.memoryBudget() == 64
@@ -43,7 +43,11 @@ class TestVTGui:
              'windowRestoreAll', 'windowMinimizeAll', 'windowClose',
              'windowCloseAll', 'windowSeparator', 'mdiTabbed',
              'helpUsersGuide', 'helpAbout', 'helpAboutQt', 'helpVersions',
-             'calculate']
+             'calculate', 'datasetGoToRow', 'datasetFind',
+             'datasetSelectRows', 'datasetCopySelection',
+             'datasetExportSelection', 'datasetSortRows',
+             'datasetColumnStats', 'datasetToggleBookmark',
+             'datasetNextBookmark', 'datasetPreviousBookmark']
         assert sorted(gui_actions) == sorted(expected_actions)
 
     def test_fileToolBar(self, launcher):
@@ -134,11 +138,16 @@ class TestVTGui:
 
         actions = [a.objectName() for a in menu_actions
                    if not (a.isSeparator() or a.menu())]
-        expected_actions = ['queryNew', 'calculate', 'export_csv']
+        expected_actions = ['queryNew', 'calculate', 'datasetGoToRow',
+                            'datasetFind', 'datasetSelectRows',
+                            'datasetCopySelection', 'datasetExportSelection',
+                            'datasetSortRows', 'datasetColumnStats',
+                            'datasetToggleBookmark', 'datasetNextBookmark',
+                            'datasetPreviousBookmark', 'export_csv']
         assert sorted(actions) == sorted(expected_actions)
 
         separators = [a for a in menu_actions if a.isSeparator()]
-        assert len(separators) == 1
+        assert len(separators) == 2
 
     def test_settingsMenu(self, menuBar):
         menu = menuBar.findChild(QtWidgets.QMenu, 'settings_menu')
@@ -0,0 +1,33 @@
+"""Test class for zoom_cell.py"""
+
+import numpy as np
+
+from vitables.vtwidgets import zoom_cell
+
+
+class TestZoomModel:
+    def test_lazyFormatting(self, launcher):
+        data = np.arange(3000 * 2000, dtype='f8').reshape(3000, 2000) / 4
+        model = zoom_cell.ZoomModel(data)
+        assert (model.rowCount(), model.columnCount()) == (3000, 2000)
+        assert model.data(model.index(2999, 1999)) == str(data[2999, 1999])
+        # Only the block of the displayed element is formatted
+        assert list(model.blocks) == [(1999, 2)]
+        assert len(model.blocks[(1999, 2)]) == 3000 - 2 * zoom_cell.BLOCK_ROWS
+        assert np.array_equal(model.cell(5, 7), data[5, 7])
+
+    def test_cellKinds(self, launcher):
+        record = np.zeros((), dtype=[('a', 'i4'), ('b', 'S3', (2,))])[()]
+        model = zoom_cell.ZoomModel(record)
+        assert model.headerData(1, zoom_cell.QtCore.Qt.Horizontal) == 'b'
+        assert model.data(model.index(0, 1)) == "[b'',b'']"
+        assert model.cell(0, 1).shape == (2,)
+        model = zoom_cell.ZoomModel([1, 'two', (3,)])
+        assert model.data(model.index(1, 0)) == 'two'
+        assert model.cell(2, 0) == (3,)
+        model = zoom_cell.ZoomModel(np.float32(0.5))
+        assert model.data(model.index(0, 0)) == '0.5'
+        assert model.cell(0, 0) is None
+        cube = np.arange(24).reshape(2, 3, 4)
+        model = zoom_cell.ZoomModel(cube)
+        assert model.data(model.index(1, 2)) == '[20,21,22,23]'
@@ -23,6 +23,11 @@ same number of rows) and then display those arrays using a unique widget, one
 array next to other. One can think that a set of arrays are displayed as a
 table. This seems quite strange to me but is a feature request so I assume
 that the plugin will be useful to some users.
+
+The arrays of a group are navigated as a whole: when any of them needs a
+new chunk of rows, the chunks of every array are read with a single
+request to the background reader and delivered together, so the arrays
+never get out of step.
 """
 
 import os.path
@@ -251,7 +256,7 @@ class MenuUpdater(QtCore.QObject):
                 if isinstance(view, GroupedArrays):
                     numrows.append(view.grouped_arrays_nrows)
                 elif isinstance(view, DataSheet):
-                    numrows.append(view.leaf_model.numrows[()])
+                    numrows.append(view.leaf_model.leaf_numrows)
 
         self.checked_views = checked_views
 
@@ -344,7 +349,7 @@ class GroupedArrays(QtWidgets.QMdiSubWindow):
         """
 
         self.is_checked = QtCore.Qt.Checked
-        nrows = datasheet.leaf_model.numrows[()]
+        nrows = datasheet.leaf_model.leaf_numrows
         self.grouped_arrays_nrows = nrows
 
     def combineArrays(self):
@@ -464,19 +469,21 @@ class GroupedArrays(QtWidgets.QMdiSubWindow):
             datasheets.append(vl.itemAt(1).widget())
 
         nd = len(datasheets)
-        for i in range(nd):
-            datasheets[nd - 1].widget().verticalScrollBar().valueChanged.connect(
-                datasheets[i].widget().verticalScrollBar().setValue)
-            if i < (nd - 1):
-                datasheets[i].widget().verticalScrollBar().hide()
-                datasheets[i].widget().setCornerWidget(None)
-                datasheets[i + 1].widget().verticalHeader().hide()
+        for i in range(nd - 1):
+            datasheets[i].leaf_view.verticalScrollBar().hide()
+            if hasattr(datasheets[i].leaf_view, 'tricky_vscrollbar'):
+                datasheets[i].leaf_view.tricky_vscrollbar.hide()
+            datasheets[i].leaf_view.setCornerWidget(None)
+            datasheets[i + 1].leaf_view.verticalHeader().hide()
+        self.navigation = SharedNavigation(
+            [datasheet.leaf_view for datasheet in datasheets], self)
 
     def closeEvent(self, event):
         """ Propagate the close event.
         In the process, self.widget().closeEvent will be called
         """
 
+        self.navigation.detach()
         sw_layout = self.widget().layout()
         vl_count = sw_layout.count()
         for i in range(vl_count):
@@ -500,6 +507,7 @@ class GroupedArrays(QtWidgets.QMdiSubWindow):
             if isinstance(view, GroupedArrays):
                 self = view
                 break
+        self.navigation.detach()
         sw_layout = self.widget().layout()
         vl_count = sw_layout.count()
         for i in range(vl_count):
@@ -509,8 +517,12 @@ class GroupedArrays(QtWidgets.QMdiSubWindow):
             datasheet.setWindowFlags(QtCore.Qt.SubWindow)
             datasheet.setWindowTitle(title)
             datasheet.setParent(self.vtgui.workspace)
-            datasheet.widget().verticalScrollBar().show()
-            datasheet.widget().verticalHeader().show()
+            # Huge arrays are browsed with the tricky scrollbar
+            if hasattr(datasheet.leaf_view, 'tricky_vscrollbar'):
+                datasheet.leaf_view.tricky_vscrollbar.show()
+            else:
+                datasheet.leaf_view.verticalScrollBar().show()
+            datasheet.leaf_view.verticalHeader().show()
             cb = QtWidgets.QCheckBox(datasheet)
             cb.setToolTip(translate('GroupedArrays',
                                     "Group Arrays into a unique view",
@@ -526,3 +538,102 @@ class GroupedArrays(QtWidgets.QMdiSubWindow):
             layout.deleteLater()
         self.deleteLater()
         self.vtgui.workspace.removeSubWindow(self)
+
+
+class SharedNavigation(QtCore.QObject):
+    """The navigation controller of the views of a group of arrays.
+
+    Every view keeps navigating as usual but the buffer faults of any of
+    them are served by this controller (see
+    :meth:`vitables.vttables.leaf_model.LeafModel.loadData`): the same
+    chunk of rows is requested for every model and the requests are
+    batched so a single read is issued to the background reader. The
+    chunks of all the models are delivered together and the models
+    always start at the same row. Scrolling any view scrolls the others.
+
+    :Parameters:
+
+    - `views`: the grouped `LeafView` instances, the last one is the view
+      whose scrollbar is visible
+    - `parent`: the parent of this object
+    """
+
+    def __init__(self, views, parent=None):
+        """Take charge of the navigation of the grouped views."""
+
+        super(SharedNavigation, self).__init__(parent)
+        self.views = views
+        self.lead = views[-1]
+        self.models = [view.tmodel for view in views]
+
+        # Views can be regrouped: the previous controller lets them go
+        for model in self.models:
+            if model.navigation is not None:
+                model.navigation.detach()
+
+        # Every model must display the same number of rows
+        numrows = min(model.numrows for model in self.models)
+        for model in self.models:
+            model.navigation = self
+            if model.numrows != numrows:
+                model.beginResetModel()
+                model.numrows = numrows
+                model.endResetModel()
+        for view in self.views:
+            view.verticalScrollBar().valueChanged.connect(self.syncScroll)
+        self.loadData(self.lead.tmodel.start, numrows)
+        self.syncScroll(self.lead.verticalScrollBar().value())
+
+    def loadData(self, start, length):
+        """Load the same chunk of rows in every grouped model.
+
+        The views other than the one that faulted are updated here, the
+        faulting view updates itself.
+
+        :Parameters:
+
+        - `start`: the document row that is the first row of the chunk
+        - `length`: the number of rows to be read
+        """
+
+        batch = []
+        for model in self.models:
+            model.requestData(start, length, batch)
+        # Every buffer of a file opened in read-only mode is served by the
+        # same reader, but be ready for buffers with different readers
+        readers = {}
+        for request in batch:
+            readers.setdefault(request[0].reader, []).append(request)
+        for reader, requests in readers.items():
+            reader.requestBatch(requests)
+        for view in self.views:
+            view.updateView()
+
+    def syncScroll(self, value):
+        """Scroll every grouped view to the same position.
+
+        :Parameter value: the value of the scrollbar that has moved
+        """
+
+        for view in self.views:
+            view.verticalScrollBar().setValue(value)
+        # The visible tricky scrollbar must follow the other views when
+        # they are scrolled with the keyboard
+        if hasattr(self.lead, 'tricky_vscrollbar') and \
+                (self.sender() is not self.lead.verticalScrollBar()):
+            self.lead.syncView()
+
+    def detach(self):
+        """Let every view navigate on its own again."""
+
+        for model in self.models:
+            if model.navigation is self:
+                model.navigation = None
+        for view in self.views:
+            try:
+                view.verticalScrollBar().valueChanged.disconnect(
+                    self.syncScroll)
+            except (TypeError, RuntimeError):
+                pass
+        self.views = []
+        self.models = []
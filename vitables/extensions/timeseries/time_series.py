@@ -28,6 +28,7 @@ import configparser
 import os
 import time
 
+import numpy as np
 import tables
 
 try:
@@ -40,15 +41,13 @@ try:
 except ImportError:
     pd = None
 
-from qtpy import QtCore, QtGui, QtWidgets
-from qtpy.QtCore import Qt
+from qtpy import QtWidgets
 
 import vitables.utils
+from vitables import metacache
+from vitables.extensions.timeseries import tsformat
 from vitables.extensions.timeseries.aboutpage import AboutPage
 
-_axis_font = QtGui.QFont()
-_axis_font.setBold(True)
-
 __docformat__ = 'restructuredtext'
 __version__ = '2.1'
 ext_name = 'Time series formatter'
@@ -76,6 +75,23 @@ def findTS(leaf, node_kind):
         - time fields in arrays with more than 2 dimensions
         - time fields in arrays with atom shape other than ()
 
+    :Parameters:
+        - `leaf`: the tables.Leaf instance being inspected.
+        - `node_kind`: a LeafNode attribute that indicates the kind of dataset
+
+    The result is kept in the metadata cache. As it depends on the
+    available modules they are part of the kind of the cached metadata.
+
+    :Return ts_kind: a flag indicating the kind of time series found
+    """
+
+    kind = f'time_series:pandas={pd is not None}:scikits={ts is not None}'
+    return metacache.cached(leaf, kind, lambda: detectTS(leaf, node_kind))
+
+
+def detectTS(leaf, node_kind):
+    """Inspect a leaf looking for a time field (see :func:`findTS`).
+
     :Parameters:
         - `leaf`: the tables.Leaf instance being inspected.
         - `node_kind`: a LeafNode attribute that indicates the kind of dataset
@@ -136,26 +152,7 @@ def tsPositions(ts_kind, leaf):
     if (ts_kind == 'scikits_ts'):
         positions.append(leaf.coldescrs['_dates']._v_pos)
     elif (ts_kind == 'pandas_ts'):
-        hstore = pd.HDFStore(leaf._v_file.filename)
-        pgroup = leaf._g_getparent()
-        df = hstore[pgroup._v_name]
-
-        # Inspect dataframe index
-        df_index = df.index
-        if isinstance(df_index, pd.MultiIndex):
-            nlevels = df_index.nlevels
-            for i, idx in enumerate(df_index.names):
-                dtime = 'datetime'
-                if df_index.get_level_values(i).dtype.name.startswith(dtime):
-                    positions.append(i)
-        elif df_index.dtype.name.startswith('datetime'):
-            nlevels = 1
-            positions.append(0)
-
-        # Inspect dataframe data
-        for i, dt in enumerate(df.dtypes):
-            if dt.name.startswith('datetime'):
-                positions.append(nlevels + i)
+        positions = pandasTSPositions(leaf)
     elif ts_kind == 'pytables_ts':
         if isinstance(leaf, tables.Table):
             for name in leaf.colnames:
@@ -166,6 +163,98 @@ def tsPositions(ts_kind, leaf):
     return positions
 
 
+def pandasDatetimes(values):
+    """Convert a pandas column (or index level) to ``datetime64[s]``.
+
+    Times with a time zone are converted to their wall time, which is
+    what formatting them shows.
+
+    :Parameter values: a `pandas.Series` or a `pandas.Index`
+    :Returns: the converted array (values that are not times are ``NaT``)
+    """
+
+    try:
+        datetimes = pd.DatetimeIndex(values)
+    except (TypeError, ValueError):
+        return np.full(len(values), np.datetime64('NaT'), dtype='M8[s]')
+    if datetimes.tz is not None:
+        datetimes = datetimes.tz_localize(None)
+    return datetimes.to_numpy().astype('M8[s]')
+
+
+def isDatetime(dtype_name):
+    """Find out if the name of a pandas dtype is a datetime dtype."""
+    return str(dtype_name).startswith('datetime')
+
+
+def pandasTSPositions(leaf):
+    """The positions of the time fields of a DataFrame.
+
+    Positions are those of the `DataFrameModel`: the levels of the index
+    go first, followed by the columns of the DataFrame.
+
+    The dtypes are found in the metadata written by ``pandas`` with the
+    table, so no data are read. If the metadata cannot be understood a
+    single row of the DataFrame is read and inspected.
+
+    :Parameter leaf: the `tables.Table` storing the DataFrame
+    """
+
+    try:
+        return storedTSPositions(leaf)
+    except (AttributeError, KeyError, IndexError, TypeError):
+        pgroup = leaf._g_getparent()
+        with pd.HDFStore(leaf._v_file.filename, 'r') as hstore:
+            df = hstore.select(pgroup._v_pathname, start=0, stop=1)
+        return frameTSPositions(df)
+
+
+def storedTSPositions(leaf):
+    """The positions of the time fields of a DataFrame (see
+    :func:`pandasTSPositions`) given by the metadata of its table.
+
+    :Parameter leaf: the `tables.Table` storing the DataFrame
+    """
+
+    asi = leaf._v_attrs
+    group_attrs = leaf._g_getparent()._v_attrs
+    # The dtype of every column, by label
+    dtypes = {}
+    for cname in group_attrs.values_cols:
+        for label in getattr(asi, f'{cname}_kind'):
+            dtypes[label] = getattr(asi, f'{cname}_dtype')
+
+    # The levels of a MultiIndex are stored as columns
+    levels = getattr(group_attrs, 'levels', None)
+    if isinstance(levels, list):
+        positions = [i for i, level in enumerate(levels)
+                     if isDatetime(dtypes[level])]
+    else:
+        levels = []
+        positions = [0] if isDatetime(asi.index_kind) else []
+    labels = [label for label in group_attrs.non_index_axes[0][1]
+              if label not in levels]
+    nlevels = max(len(levels), 1)
+    positions.extend(nlevels + i for i, label in enumerate(labels)
+                     if isDatetime(dtypes[label]))
+    return positions
+
+
+def frameTSPositions(df):
+    """The positions of the time fields of a DataFrame (see
+    :func:`pandasTSPositions`) given by the dtypes of a DataFrame.
+
+    :Parameter df: the DataFrame (or a chunk of it)
+    """
+
+    positions = [i for i in range(df.index.nlevels)
+                 if isDatetime(df.index.get_level_values(i).dtype.name)]
+    nlevels = df.index.nlevels
+    positions.extend(nlevels + i for i, dt in enumerate(df.dtypes)
+                     if isDatetime(dt.name))
+    return positions
+
+
 def tsFrequency(ts_kind, leaf):
     """Return the frequency (if any) of the time series.
 
@@ -244,7 +333,7 @@ class ExtTSFormatter:
             return
 
         # Customise the leaf model
-        model = datasheet.widget().model()
+        model = datasheet.leaf_view.model()
         ts_info = {
             'ts_kind': ts_kind,
             'ts_cols': time_cols,
@@ -261,10 +350,7 @@ class ExtTSFormatter:
         model_info = {
             'leaf_kind': leaf_kind,
             'model': model,
-            'numrows': model.rowCount(),
         }
-        if leaf_kind in ['table', 'array']:
-            model_info['formatContent'] = model.formatContent
 
         # Add required attributes to model
         for k in ts_info:
@@ -273,7 +359,6 @@ class ExtTSFormatter:
         # Add/customise required methods to model
         ts_model = TSLeafModel(model_info, ts_info)
         model.tsFormatter = ts_model.tsFormatter
-        model.data = ts_model.data
 
     def helpAbout(self, parent):
         """Full description of the plugin.
@@ -310,11 +395,17 @@ class ExtTSFormatter:
 
 
 class TSLeafModel:
-    """Provides a `data()` method to leaf models that contains time series.
+    """Formats the time series of a leaf model.
 
     Formatting a table is more difficult than formatting an array because
     tables content is not homogeneous and columns with time series have to
     be formatted in a different way to the rest of columns.
+
+    Time columns are formatted in bulk when the model renders a column (see
+    :mod:`vitables.extensions.timeseries.tsformat`), so repainting the
+    view doesn't format any time. The rendering methods of the model are
+    wrapped: `renderColumn` for every model and also `renderChunk` for
+    DataFrames, whose index labels are rendered with the chunk.
     """
 
     def __init__(self, model_info, ts_info, parent=None):
@@ -327,135 +418,71 @@ class TSLeafModel:
         self.ts_kind = ts_info['ts_kind']
         self.ts_freq = ts_info['ts_freq']
         self.ts_format = ts_info['ts_format']
-        # Attributes required by the data() method
         self.model = model_info['model']
-        self.numrows = model_info['numrows']
         self.ts_cols = ts_info['ts_cols']
-        if 'formatContent' in model_info:
-            self.formatContent = model_info['formatContent']
 
         self.tsFormatter = self.timeFormatter()
 
-        leaf_kind = model_info['leaf_kind']
-        if leaf_kind == 'table':
-            self.data = self.table_data
-        elif leaf_kind == 'dataframe':
-            self.data = self.df_data
-        else:
-            self.data = self.array_data
-
-    def table_data(self, index, role=QtCore.Qt.DisplayRole):
-        """Returns the data stored under the given role for the item
-        referred to by the index.
-
-        This is an overwritten method.
-
-        :Parameters:
-
-        - `index`: the index of a data item
-        - `role`: the role being returned
+        self.leaf_kind = model_info['leaf_kind']
+        model = self.model
+        if self.leaf_kind == 'dataframe':
+            self.renderChunk = model.renderChunk
+            model.renderChunk = self.renderDataFrameChunk
+            model.renderChunk()
+        self.renderColumn = model.renderColumn
+        model.renderColumn = self.renderLeafColumn
+        model.rendered = {}
+
+    def renderLeafColumn(self, col):
+        """Format a column of the chunk of a table, an array or a DataFrame.
+
+        :Parameter col: the column being formatted
+        :Returns: a list with the formatted cells of the column
         """
-        row, col = index.row(), index.column()
-
-        if not index.isValid() or not (0 <= row < self.numrows):
-            return None
-
-        if role == QtCore.Qt.DisplayRole:
-            cell = self.model.cell(row, col)
-            if index.column() in self.ts_cols:
-                return self.tsFormatter(cell)
-            return self.formatContent(cell)
 
-        if role == QtCore.Qt.TextAlignmentRole:
-            return QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop
-
-        return None
-
-    def df_data(self, index, role=QtCore.Qt.DisplayRole):
-        """Returns the data stored under the given role for the item
-        referred to by the index.
-
-        This is an overwritten method.
-
-        :Parameters:
-
-        - `index`: the index of a data item
-        - `role`: the role being returned
+        model = self.model
+        if self.leaf_kind == 'dataframe':
+            # Time series positions count the levels of the index
+            position = model._nheaders[1] + model.col_start + col
+            if position not in self.ts_cols:
+                return self.renderColumn(col)
+            return self.formatTimes(model.columnValues(col))
+        if (self.leaf_kind == 'table') and (col not in self.ts_cols):
+            return self.renderColumn(col)
+        return self.formatTimes(model.rbuffer.getColumn(col))
+
+    def renderDataFrameChunk(self):
+        """Convert the labels of the chunk of a DataFrame to strings.
+
+        The labels are converted as usual and then the time levels of the
+        index are formatted.
         """
-        row, col = index.row(), index.column()
-        n_columns, n_index = self.model._nheaders
-        df = self.model._chunk
-
-        if not index.isValid() or not (0 <= row < (self.numrows + n_columns)):
-            return None
-
-        is_index = col < n_index
-        is_columns = (self.model.start + row) < n_columns
-
-        if is_index and is_columns:
-            return None
-
-        if is_index:
-            if role == Qt.DisplayRole:
-                val = df.index[row - n_columns]
-                if n_index > 1:
-                    val = val[col]
-                if col in self.ts_cols:
-                    return self.tsFormatter(val)
-                return str(val)
-            if role == Qt.FontRole:
-                return _axis_font
-            if role == Qt.TextAlignmentRole:
-                return int(Qt.AlignRight | Qt.AlignVCenter)
-            return
-
-        if is_columns:
-            if role == Qt.DisplayRole:
-                val = df.columns[col - n_index]
-                if n_columns > 1:
-                    val = val[row]
-                return str(val)
-            if role == Qt.FontRole:
-                return _axis_font
-            if role == Qt.TextAlignmentRole:
-                return int(Qt.AlignCenter | Qt.AlignBottom)
-            return
 
-        if role == Qt.DisplayRole:
-            val = self.model._chunk.iat[row - n_columns, col - n_index]
-            if col in self.ts_cols:
-                return self.tsFormatter(val)
-            return str(val)
+        self.renderChunk()
+        model = self.model
+        chunk = model._chunk
+        n_index = model._nheaders[1]
+        for position in self.ts_cols:
+            if position < n_index:
+                model._index_cells[position] = self.formatTimes(
+                    chunk.index.get_level_values(position))
 
-        # if role == Qt.TextAlignmentRole:
-        #     return int(Qt.AlignLeft|Qt.AlignTop)
+    def formatTimes(self, values):
+        """Format a column of times.
 
-        return
-
-    def array_data(self, index, role=QtCore.Qt.DisplayRole):
-        """Returns the data stored under the given role for the item
-        referred to by the index.
-
-        This is an overwritten method.
-
-        :Parameters:
-
-        - `index`: the index of a data item
-        - `role`: the role being returned
+        :Parameter values: the column being formatted
+        :Returns: a list with the formatted cells
         """
-        row, col = index.row(), index.column()
 
-        if not index.isValid() or not (0 <= row < self.numrows):
-            return None
-
-        if role == QtCore.Qt.DisplayRole:
-            cell = self.model.cell(row, col)
-            return self.tsFormatter(cell)
-
-        if role == QtCore.Qt.TextAlignmentRole:
-            return QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop
-
-        return None
+        if self.ts_kind == 'pytables_ts':
+            datetimes = tsformat.secondsToDatetimes(values)
+        elif self.ts_kind == 'pandas_ts':
+            datetimes = pandasDatetimes(values)
+            values = values.array
+        else:
+            return [self.tsFormatter(value) for value in values]
+        return tsformat.formatColumn(values, datetimes, self.ts_format,
+                                     self.tsFormatter)
 
     def timeFormatter(self):
         """Return the function to be used for formatting time series.
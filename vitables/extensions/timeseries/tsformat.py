@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Bulk formatting of time series.
+
+Cells of time series are formatted a whole column of a chunk at once. The
+times are converted to ``datetime64`` values and, if the configured
+``strftime`` format is made of directives whose fields can be computed
+by ``numpy`` (years, months, days, hours...), the column is formatted
+without calling ``strftime`` for every cell. Names of days and
+months are taken from the current locale, and the ``%c``, ``%x`` and
+``%X`` directives are expanded to the formats of the locale when they
+are known.
+
+Times that cannot be formatted in bulk (out of range or missing times,
+formats with unsupported directives...) are formatted one by one by the
+formatter of the time series.
+"""
+
+import locale
+import re
+import time
+
+import numpy as np
+
+__docformat__ = 'restructuredtext'
+
+#: The range of times with a 4-digits year.
+TIME_RANGE = (np.datetime64('1000-01-01T00:00:00', 's'),
+              np.datetime64('9999-12-31T23:59:59', 's'))
+
+#: The character padding names of variable length (from the Unicode
+#: private use area, so it never appears in names).
+PADDING = '\ue000'
+
+#: The ``nl_langinfo`` items giving the formats of the locale directives.
+LOCALE_FORMATS = {'c': 'D_T_FMT', 'x': 'D_FMT', 'X': 'T_FMT'}
+
+_directive = re.compile('%(.)')
+
+# The tables of decimal representations, by width
+_digits = {}
+
+
+def expandLocaleFormats(ts_format):
+    """Replace the locale dependent directives of a format.
+
+    :Parameter ts_format: a ``strftime`` format
+    :Returns: the format with the ``%c``, ``%x`` and ``%X`` directives
+      replaced by the formats of the current locale (if they are known)
+    """
+
+    def expand(match):
+        item = LOCALE_FORMATS.get(match.group(1))
+        if item is None or not hasattr(locale, 'nl_langinfo'):
+            return match.group(0)
+        try:
+            return locale.nl_langinfo(getattr(locale, item))
+        except (AttributeError, ValueError):
+            return match.group(0)
+
+    return _directive.sub(expand, ts_format)
+
+
+def localeNames(directive, count, timetuple):
+    """The names of days, months... in the current locale.
+
+    :Parameters:
+
+    - `directive`: the ``strftime`` directive giving the names
+    - `count`: the number of names
+    - `timetuple`: a callable returning the time tuple of every name
+    """
+
+    return [time.strftime(f'%{directive}', timetuple(i))
+            for i in range(count)]
+
+
+def weekdayTuple(i):
+    """A time tuple for the i-th day of the week (Monday is 0)."""
+    return (2024, 1, 1 + i, 0, 0, 0, i, 1 + i, 0)
+
+
+def monthTuple(i):
+    """A time tuple for the i-th month of the year (January is 0)."""
+    return (2024, 1 + i, 1, 0, 0, 0, 0, 1, 0)
+
+
+def ampmTuple(i):
+    """A time tuple for the i-th half of the day."""
+    return (2024, 1, 1, 12 * i, 0, 0, 0, 1, 0)
+
+
+def digitsTable(width):
+    """The zero padded decimal representations of `[0, 10**width)`."""
+
+    if width not in _digits:
+        _digits[width] = np.array([f'{i:0{width}d}'
+                                   for i in range(10 ** width)])
+    return _digits[width]
+
+
+def digits(values, width):
+    """Zero padded decimal representations of an array of integers.
+
+    :Returns: an array of characters with shape `(len(values), width)`
+    """
+
+    if width > 2:
+        return np.concatenate([digits(values // 100, width - 2),
+                               digits(values % 100, 2)], axis=1)
+    return digitsTable(width)[values].view('U1').reshape(len(values), width)
+
+
+def names(values, table):
+    """Names given by a lookup table, as an array of characters.
+
+    Names are padded with `PADDING` characters that are removed once the
+    format is done.
+
+    :Returns: an array of characters with shape `(len(values), width)`
+    """
+
+    # Names may be empty (e.g. AM/PM in some locales)
+    width = max(max(len(name) for name in table), 1)
+    table = np.array([name.ljust(width, PADDING) for name in table],
+                     dtype=f'U{width}')
+    return table[values].view('U1').reshape(len(values), width)
+
+
+def fieldOf(parts, directive):
+    """The characters of a field of formatted times.
+
+    :Parameters:
+
+    - `parts`: the parts of the times being formatted (see
+      :func:`timeParts`)
+    - `directive`: the ``strftime`` directive of the field
+
+    :Returns: an array of characters with a row per time or None if the
+      directive is not supported
+    """
+
+    days, months, years, seconds = parts
+    if directive == '%':
+        return np.full((len(days), 1), '%')
+    if directive == 'Y':
+        return digits(years.astype(np.int64) + 1970, 4)
+    if directive == 'y':
+        return digits((years.astype(np.int64) + 70) % 100, 2)
+    if directive == 'm':
+        return digits(months.astype(np.int64) % 12 + 1, 2)
+    if directive in 'de':
+        field = digits((days - months).astype(np.int64) + 1, 2)
+        if directive == 'e':
+            field[field[:, 0] == '0', 0] = ' '
+        return field
+    if directive == 'j':
+        return digits((days - years).astype(np.int64) + 1, 3)
+    if directive == 'H':
+        return digits(seconds // 3600, 2)
+    if directive == 'M':
+        return digits(seconds // 60 % 60, 2)
+    if directive == 'S':
+        return digits(seconds % 60, 2)
+    if directive == 'I':
+        return digits((seconds // 3600 + 11) % 12 + 1, 2)
+    if directive == 'p':
+        return names(seconds // 43200, localeNames(directive, 2, ampmTuple))
+    # 1970-01-01 was a Thursday
+    weekdays = (days.astype(np.int64) + 3) % 7
+    if directive in 'aA':
+        return names(weekdays, localeNames(directive, 7, weekdayTuple))
+    if directive == 'u':
+        return digits(weekdays + 1, 1)
+    if directive == 'w':
+        return digits((weekdays + 1) % 7, 1)
+    if directive in 'bBh':
+        return names(months.astype(np.int64) % 12,
+                     localeNames(directive, 12, monthTuple))
+    return None
+
+
+def timeParts(datetimes):
+    """Split times in days, months, years and seconds of the day.
+
+    :Parameter datetimes: a ``datetime64[s]`` array
+    :Returns: a tuple with the ``datetime64`` days, months and years of the
+      times and their seconds since midnight
+    """
+
+    days = datetimes.astype('M8[D]')
+    return (days, days.astype('M8[M]'), days.astype('M8[Y]'),
+            (datetimes - days).astype(np.int64))
+
+
+def literalOf(text, nrows):
+    """The characters of a literal text repeated for every time."""
+    return np.broadcast_to(np.array(list(text)), (nrows, len(text)))
+
+
+def formatDatetimes(datetimes, ts_format):
+    """Format an array of times in bulk.
+
+    :Parameters:
+
+    - `datetimes`: the times being formatted (a ``datetime64[s]`` array
+      whose times have 4-digits years)
+    - `ts_format`: the ``strftime`` format
+
+    :Returns: a list of strings or None if the format has directives that
+      are not supported
+    """
+
+    ts_format = expandLocaleFormats(ts_format)
+    nrows = len(datetimes)
+    parts = timeParts(datetimes)
+    fields = []
+    padded = False
+    position = 0
+    for match in _directive.finditer(ts_format):
+        if match.start() > position:
+            fields.append(literalOf(ts_format[position:match.start()], nrows))
+        field = fieldOf(parts, match.group(1))
+        if field is None:
+            return None
+        fields.append(field)
+        padded = padded or (match.group(1) in 'aAbBhp')
+        position = match.end()
+    literal = ts_format[position:]
+    if '%' in literal:
+        return None
+    if literal:
+        fields.append(literalOf(literal, nrows))
+    if not fields:
+        return [ts_format] * nrows
+    texts = np.ascontiguousarray(np.concatenate(fields, axis=1))
+    texts = texts.view(f'U{texts.shape[1]}').ravel()
+    if padded:
+        texts = np.strings.replace(texts, PADDING, '')
+    return texts.tolist()
+
+
+def formatColumn(values, datetimes, ts_format, formatter):
+    """Format a column of times.
+
+    :Parameters:
+
+    - `values`: the column being formatted
+    - `datetimes`: the column converted to a ``datetime64[s]`` array
+      (missing times are ``NaT``)
+    - `ts_format`: the ``strftime`` format
+    - `formatter`: a callable formatting a value of the column
+
+    :Returns: a list with the formatted cells
+    """
+
+    valid = (datetimes >= TIME_RANGE[0]) & (datetimes <= TIME_RANGE[1])
+    texts = None
+    if valid.any():
+        texts = formatDatetimes(datetimes[valid], ts_format)
+    if texts is None:
+        return [formatter(value) for value in values]
+    if valid.all():
+        return texts
+    formatted = np.empty(len(datetimes), dtype=object)
+    formatted[valid] = texts
+    for row in np.flatnonzero(~valid):
+        formatted[row] = formatter(values[row])
+    return formatted.tolist()
+
+
+def secondsToDatetimes(seconds):
+    """Convert seconds since the epoch to times.
+
+    Seconds are rounded down, like ``time.gmtime`` does.
+
+    :Parameter seconds: an array of seconds
+    :Returns: a ``datetime64[s]`` array (times out of range are ``NaT``)
+    """
+
+    seconds = np.asarray(seconds, dtype=np.float64)
+    datetimes = np.full(seconds.shape, np.datetime64('NaT'), dtype='M8[s]')
+    limit = np.float64(TIME_RANGE[1].astype(np.int64))
+    finite = np.isfinite(seconds) & (np.abs(seconds) <= limit)
+    datetimes[finite] = np.floor(seconds[finite]).astype(np.int64).astype(
+        'M8[s]')
+    return datetimes
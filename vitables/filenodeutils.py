@@ -23,17 +23,22 @@ This module defines some convenience functions for dealing with filenodes.
 
 Efficiently managing filenodes is pretty difficult as they behave as regular
 text files. By design, regular files I/O is not optimized for performing well
-when the files are huge. In fact, even medium size files perform poorly. The
-linecache module helps a little with this problem but at a price: it holds the
-whole file in memory.
-"""
+when the files are huge. In fact, even medium size files perform poorly.
 
-import os
-import tempfile
+Filenodes are displayed line by line without copying them: a single pass
+over the filenode finds the offset of every line (see :func:`lineOffsets`)
+and then any range of lines is read by seeking to its first byte. The
+offsets of filenodes in read-only files are kept in the metadata cache (see
+:mod:`vitables.metacache`) so they are found once, not once per session.
+"""
 
+import numpy as np
 from tables.nodes import filenode
 
-import vitables.utils as vtutils
+from vitables import metacache
+
+#: The number of bytes read at once when indexing the lines of a filenode.
+INDEX_BLOCK_SIZE = 2 ** 22
 
 
 def isFilenode(leaf):
@@ -51,25 +56,48 @@ def isFilenode(leaf):
         return is_filenode
 
 
-def filenodeToFile(leaf):
-    """Write to disk a filenode as a regular text file."""
+def filenodeTotalRows(leaf):
+    """Traverse the whole filenode and count its number of rows."""
+    return len(lineOffsets(leaf)) - 1
 
-    # Warning: this is SLOW for large files
-    fd, temp_filename = tempfile.mkstemp('.txt', 'filenode_')
-    os.close(fd)
-    h5file = leaf._v_file
-    where = leaf._v_parent._v_pathname
-    name = leaf._v_name
-    filenode.read_from_filenode(h5file, temp_filename, where, name, overwrite=True)
-    return vtutils.forwardPath(temp_filename)
 
+def lineOffsets(leaf):
+    """The offsets of the lines of a filenode.
 
-def filenodeTotalRows(leaf):
-    """Traverse the whole filenode and count its number of rows."""
+    Offsets are looked up in the metadata cache and, if missing, they are
+    found by :func:`indexLines`.
+
+    :Parameter leaf: the filenode being indexed
+    """
+    return metacache.cached(leaf, 'line_offsets', lambda: indexLines(leaf))
+
+
+def indexLines(leaf):
+    """Index the lines of a filenode.
+
+    The filenode is read once, in blocks of `INDEX_BLOCK_SIZE` bytes, so
+    the memory used doesn't depend on its size (except for the index).
+
+    :Parameter leaf: the filenode being indexed
+    :Returns: an array with the offset of the first byte of every line
+      followed by the size of the filenode, so line `i` is made of the
+      bytes `[offsets[i], offsets[i + 1])`
+    """
 
-    # Warning: this is SLOW for large files
-    counter = 0
-    with filenode.open_node(leaf, 'r') as f:
-        for line in f:
-            counter += 1
-    return counter
+    starts = [np.zeros(1, dtype=np.int64)]
+    size = 0
+    with filenode.open_node(leaf, 'r') as fnode:
+        while True:
+            block = fnode.read(INDEX_BLOCK_SIZE)
+            if not block:
+                break
+            newlines = np.flatnonzero(
+                np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+            starts.append(newlines + (size + 1))
+            size += len(block)
+    offsets = np.concatenate(starts)
+    # The last line may not end with a newline
+    if offsets[-1] != size:
+        offsets = np.append(offsets, size)
+    # Offsets of filenodes smaller than 4 GiB take half the memory
+    return offsets.astype(np.uint32 if size < 2 ** 32 else np.int64)
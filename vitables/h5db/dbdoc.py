@@ -34,6 +34,7 @@ import tables
 from qtpy import QtCore, QtWidgets
 
 import vitables.utils
+from vitables import metacache
 
 __docformat__ = 'restructuredtext'
 
@@ -164,7 +165,9 @@ class DBDoc(QtCore.QObject):
 
     def list_nodes(self):
         """:Returns: the recursive list of full nodepaths for the file"""
-        return [node._v_pathname for node in self.h5file.walk_nodes('/')]
+        return metacache.cached(
+            self.h5file.root, 'node_paths',
+            lambda: [node._v_pathname for node in self.h5file.walk_nodes('/')])
 
     #
     # Editing databases
@@ -38,6 +38,7 @@ from qtpy import QtCore, QtGui, QtWidgets
 
 import vitables.utils
 from vitables.h5db import dbdoc, groupnode, leafnode, linknode, rootgroupnode, tlink_editor, tnode_editor
+from vitables.vttables import scantask
 
 translate = QtWidgets.QApplication.translate
 
@@ -253,7 +254,10 @@ class DBsTreeModel(QtCore.QAbstractItemModel):
                 except KeyError:
                     pass
 
-                # Close the hdf5 file
+                # Close the hdf5 file (and the handles of the background
+                # reader and of running scans)
+                self.vtapp.buffer_reader.releaseFile(filepath)
+                scantask.releaseFile(filepath)
                 db_doc = self.getDBDoc(filepath)
                 if db_doc.hidden_group is not None:
                     db_doc.h5file.remove_node(db_doc.hidden_group,
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2005-2007 Carabos Coop. V. All rights reserved
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+"""
+A persistent cache of metadata derived from the data of HDF5 files.
+
+Some metadata are expensive to compute (the line offsets of a filenode
+require reading the whole filenode, the tree of a file with many nodes
+takes a long walk...) but depend only on the contents of the file. They
+are stored in a ``SQLite`` database in the cache directory of the user so
+they are computed once, not once per session.
+
+Entries are keyed by the path of the file, the path of the node and the
+kind of metadata. The identity of the file (its size, modification time
+and inode) is stored with every entry: if the file changes its entries
+are dropped the next time they are looked up. When the cache grows over
+its size limit the least recently used entries are evicted.
+
+Only files opened in read-only mode are cached: the identity of a file
+being written cannot be trusted until it is closed.
+
+Failures of the cache (a read-only cache directory, a corrupt database...)
+are not errors, the cache is just disabled and values are computed as
+usual.
+"""
+
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from qtpy import QtCore
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The name of the database file.
+CACHE_FILENAME = 'metadata.sqlite'
+
+#: The maximum size (in bytes) of the values stored in the cache.
+MAX_SIZE = 256 * 2 ** 20
+
+#: The schema of the database.
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        path TEXT NOT NULL,
+        node TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime INTEGER NOT NULL,
+        inode INTEGER NOT NULL,
+        format TEXT NOT NULL,
+        value BLOB NOT NULL,
+        nbytes INTEGER NOT NULL,
+        used REAL NOT NULL,
+        PRIMARY KEY (path, node, kind))
+"""
+
+# The cache shared by the application (None until it is needed)
+_cache = None
+
+
+def defaultPath():
+    """The path of the database in the cache directory of the user."""
+
+    location = QtCore.QStandardPaths.writableLocation(
+        QtCore.QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(location, 'vitables', CACHE_FILENAME)
+
+
+def fileIdentity(filepath):
+    """The identity of a file.
+
+    :Parameter filepath: the path of the file
+    :Returns: a `(size, modification time, inode)` tuple
+    """
+
+    stat = os.stat(filepath)
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def encode(value):
+    """Serialize a value.
+
+    Arrays are stored in the ``npy`` format, anything else as JSON.
+
+    :Parameter value: the value being serialized
+    :Returns: a `(format, bytes)` tuple
+    """
+
+    if isinstance(value, np.ndarray):
+        stream = io.BytesIO()
+        np.save(stream, value, allow_pickle=False)
+        return 'npy', stream.getvalue()
+    return 'json', json.dumps(value).encode('utf-8')
+
+
+def decode(value_format, data):
+    """Deserialize a value.
+
+    :Parameters:
+
+    - `value_format`: the format of the value, as returned by :func:`encode`
+    - `data`: the serialized value
+    """
+
+    if value_format == 'npy':
+        return np.load(io.BytesIO(data), allow_pickle=False)
+    return json.loads(data.decode('utf-8'))
+
+
+class MetadataCache(object):
+    """A cache of metadata stored in a ``SQLite`` database.
+
+    :Parameters:
+
+    - `dbpath`: the path of the database (it is created if needed)
+    - `max_size`: the maximum size (in bytes) of the stored values
+    """
+
+    def __init__(self, dbpath, max_size=MAX_SIZE):
+        """Open the database."""
+
+        self.dbpath = dbpath
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = None
+        try:
+            os.makedirs(os.path.dirname(dbpath), exist_ok=True)
+            self.connection = sqlite3.connect(
+                dbpath, timeout=1, check_same_thread=False,
+                isolation_level=None)
+            self.connection.execute(SCHEMA)
+        except (sqlite3.Error, OSError) as e:
+            self.disable(e)
+
+    def disable(self, error):
+        """Stop using the cache after a failure.
+
+        :Parameter error: the exception raised by the failure
+        """
+
+        log.debug(f'Metadata cache {self.dbpath} disabled: {error}')
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except sqlite3.Error:
+                pass
+        self.connection = None
+
+    def get(self, filepath, node, kind, default=None):
+        """Look up a value.
+
+        Entries of a file whose identity has changed are dropped.
+
+        :Parameters:
+
+        - `filepath`: the path of the HDF5 file
+        - `node`: the path of the node inside the file
+        - `kind`: the kind of metadata
+        - `default`: the value returned if the entry doesn't exist
+        """
+
+        if self.connection is None:
+            return default
+        filepath = os.path.abspath(filepath)
+        try:
+            identity = fileIdentity(filepath)
+            with self.lock:
+                if self.connection is None:
+                    # Closed by another thread
+                    return default
+                row = self.connection.execute(
+                    'SELECT size, mtime, inode, format, value FROM entries '
+                    'WHERE path = ? AND node = ? AND kind = ?',
+                    (filepath, node, kind)).fetchone()
+                if row is None:
+                    return default
+                if tuple(row[:3]) != identity:
+                    self.connection.execute(
+                        'DELETE FROM entries WHERE path = ?', (filepath,))
+                    return default
+                self.connection.execute(
+                    'UPDATE entries SET used = ? '
+                    'WHERE path = ? AND node = ? AND kind = ?',
+                    (time.time(), filepath, node, kind))
+            return decode(row[3], row[4])
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.disable(e)
+            return default
+
+    def put(self, filepath, node, kind, value):
+        """Store a value.
+
+        Values larger than the cache are not stored.
+
+        :Parameters:
+
+        - `filepath`: the path of the HDF5 file
+        - `node`: the path of the node inside the file
+        - `kind`: the kind of metadata
+        - `value`: the value, an array or any JSON serializable object
+        """
+
+        if self.connection is None:
+            return
+        filepath = os.path.abspath(filepath)
+        try:
+            value_format, data = encode(value)
+            if len(data) > self.max_size:
+                return
+            size, mtime, inode = fileIdentity(filepath)
+            with self.lock:
+                if self.connection is None:
+                    return
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO entries '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (filepath, node, kind, size, mtime, inode, value_format,
+                     data, len(data), time.time()))
+                self.evict()
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            self.disable(e)
+
+    def evict(self):
+        """Drop the least recently used entries until the cache fits."""
+
+        total = self.connection.execute(
+            'SELECT TOTAL(nbytes) FROM entries').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self.connection.execute(
+            'SELECT rowid, nbytes FROM entries ORDER BY used').fetchall()
+        evicted = []
+        for rowid, nbytes in rows:
+            if total <= self.max_size:
+                break
+            evicted.append((rowid,))
+            total -= nbytes
+        self.connection.executemany('DELETE FROM entries WHERE rowid = ?',
+                                    evicted)
+
+    def size(self):
+        """The size (in bytes) of the stored values."""
+
+        if self.connection is None:
+            return 0
+        with self.lock:
+            return int(self.connection.execute(
+                'SELECT TOTAL(nbytes) FROM entries').fetchone()[0])
+
+    def clear(self):
+        """Drop every entry."""
+
+        if self.connection is None:
+            return
+        with self.lock:
+            self.connection.execute('DELETE FROM entries')
+
+    def close(self):
+        """Close the database."""
+
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+def getCache():
+    """The cache shared by the application."""
+
+    global _cache
+    if _cache is None:
+        _cache = MetadataCache(defaultPath())
+    return _cache
+
+
+def cached(node, kind, compute):
+    """Get a metadata of a node from the shared cache.
+
+    If the metadata is not cached it is computed and stored. Nodes of files
+    that are not opened in read-only mode are never cached.
+
+    :Parameters:
+
+    - `node`: the `tables.Node` instance whose metadata is requested
+    - `kind`: the kind of metadata
+    - `compute`: a callable returning the metadata of the node
+
+    :Returns: the metadata
+    """
+
+    h5file = node._v_file
+    if h5file.mode != 'r':
+        return compute()
+    cache = getCache()
+    missing = object()
+    value = cache.get(h5file.filename, node._v_pathname, kind, missing)
+    if value is missing:
+        value = compute()
+        cache.put(h5file.filename, node._v_pathname, kind, value)
+    return value
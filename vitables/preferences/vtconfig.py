@@ -95,7 +95,7 @@ from qtpy import QtCore, QtGui, QtWidgets
 import vitables.utils
 from vitables import __version__
 from vitables.preferences import cfgexception
-from vitables.vttables import datasheet
+from vitables.vttables import buffer, datasheet
 
 __docformat__ = 'restructuredtext'
 
@@ -380,6 +380,25 @@ class Config(QtCore.QSettings):
         else:
             return default_value
 
+    def memoryBudget(self):
+        """
+        Returns the memory budget (in MiB) of the buffer of every leaf view.
+
+        The budget bounds the number of rows read from a leaf at once and
+        the size of the cache of read rows.
+        """
+
+        key = 'Buffers/MemoryBudget'
+        default_value = buffer.CACHE_SIZE // 2 ** 20
+        try:
+            setting_value = self.value(key, type=int)
+        except TypeError:
+            setting_value = default_value
+        if setting_value > 0:
+            return setting_value
+        else:
+            return default_value
+
     def helpHistory(self):
         """
         Returns the navigation history of the docs browser.
@@ -491,6 +510,7 @@ class Config(QtCore.QSettings):
         config['Geometry/HSplitter'] = self.hsplitterPosition()
         config['Recent/Files'] = self.recentFiles()
         config['Session/Files'] = self.sessionFiles()
+        config['Buffers/MemoryBudget'] = self.memoryBudget()
         config['HelpBrowser/History'] = self.helpHistory()
         config['HelpBrowser/Bookmarks'] = self.helpBookmarks()
         config['Look/currentStyle'] = self.readStyle()
@@ -550,6 +570,9 @@ class Config(QtCore.QSettings):
 
             key = 'HelpBrowser/Bookmarks'
             self.hb_bookmarks = config[key]
+
+            key = 'Buffers/MemoryBudget'
+            self.memory_budget = config[key]
         except KeyError:
             pass
 
@@ -658,6 +681,8 @@ class Config(QtCore.QSettings):
         self.writeValue('HelpBrowser/History', self.hb_history)
         # The Help Browser bookmarks
         self.writeValue('HelpBrowser/Bookmarks', self.hb_bookmarks)
+        # The memory budget of leaf views buffers
+        self.writeValue('Buffers/MemoryBudget', self.memory_budget)
         # The list of enabled extensions
         self.writeValue('Extensions/columnorg.columnar_org',
                         self.vtapp.all_extensions['columnorg.columnar_org'][0])
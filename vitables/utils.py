@@ -460,6 +460,76 @@ def formatArrayContent(content):
     return ret
 
 
+def formatArrayColumn(column):
+    """
+    Nicely format the contents of a column of view cells in one pass.
+
+    Returns the same texts as calling `formatArrayContent` for every cell
+    of the column, but one-dimensional columns of strings, booleans,
+    integers and floats are formatted by dtype-specialized code instead
+    of calling ``np.array2string`` for every cell.
+
+    :Parameter column: a sequence with the contents of the column cells
+
+    :Returns: a list with the formatted cells
+    """
+
+    if not isinstance(column, np.ndarray) or column.ndim != 1:
+        return [formatArrayContent(content) for content in column]
+
+    kind = column.dtype.kind
+    if kind == 'S':
+        try:
+            return [text.decode(DEFAULT_ENCODING) for text in column.tolist()]
+        except UnicodeDecodeError:
+            pass
+    elif kind == 'b':
+        return np.where(column, 'True', 'False').tolist()
+    elif kind in 'iu':
+        return column.astype(str).tolist()
+    elif (kind == 'f') and _defaultFloatFormatting():
+        return _formatFloats(column)
+    return [formatArrayContent(content) for content in column]
+
+
+def _defaultFloatFormatting():
+    """Check if `numpy` prints floats with the default format options."""
+
+    options = np.get_printoptions()
+    return (options['floatmode'] == 'maxprec') and \
+        (options['legacy'] is False or options['legacy'] == sys.maxsize) \
+        and (options['sign'] == '-') and (options['formatter'] is None) \
+        and (options['nanstr'] == 'nan') and (options['infstr'] == 'inf')
+
+
+def _formatFloats(column):
+    """Format a column of floats like ``np.array2string`` formats scalars.
+
+    :Parameter column: a one-dimensional array of floats
+    """
+
+    options = np.get_printoptions()
+    precision = options['precision']
+    # Choose the exponential format like numpy does for every single value
+    exp_cutoff = 10. ** min(8, np.finfo(column.dtype).precision)
+    with np.errstate(over='ignore', invalid='ignore'):
+        absval = np.abs(column)
+        exp_format = absval >= exp_cutoff
+        if not options['suppress']:
+            exp_format |= (absval < 0.0001) & (absval != 0)
+    # Python floats are formatted faster than numpy scalars
+    values = column.tolist() if column.dtype == np.float64 else column
+    texts = []
+    for value, exp in zip(values, exp_format.tolist()):
+        if exp:
+            texts.append(np.format_float_scientific(
+                value, precision=precision, unique=True, trim='.'))
+        else:
+            texts.append(np.format_float_positional(
+                value, precision=precision, unique=True, trim='.'))
+    return texts
+
+
 def formatObjectContent(content):
     """
     Nicely format the contents of a view (table widget) cell.
@@ -44,8 +44,8 @@ from vitables import vtgui
 from vitables.docbrowser import helpbrowser
 from vitables.preferences import preferences, vtconfig
 from vitables.vtsite import ICONDIR
-from vitables.vttables import datasheet
-from vitables.vtwidgets import nodenamedlg, renamedlg
+from vitables.vttables import copier, datasheet, reader, sorting
+from vitables.vtwidgets import colstats_dlg, nodenamedlg, renamedlg
 
 __docformat__ = 'restructuredtext'
 
@@ -138,6 +138,9 @@ class VTApp(QtCore.QObject):
         # The queries manager
         self.queries_mgr = qmgr.QueriesManager()
 
+        # The background reader of leaf views buffers
+        self.buffer_reader = reader.BufferReader(self)
+
         # Print the welcome message
         self.gui.logger.write(
             translate('VTApp',
@@ -162,7 +165,7 @@ class VTApp(QtCore.QObject):
         # List of HelpBrowser instances in memory
         self.doc_browser = None
 
-        # Filenodes mapping
+        # Filenodes mapping (filenodes to their line offsets)
         self.filenodes_map = {}
 
         # Restore last session
@@ -732,6 +735,8 @@ class VTApp(QtCore.QObject):
         # Close the temporary database
         index = self.gui.dbs_tree_model.index(0, 0, QtCore.QModelIndex())
         self.fileClose(index)
+        # Stop the background reader
+        self.buffer_reader.stop()
 
     def tablesNode(self, index):
         """The tables.Leaf instance tied to the given index.
@@ -783,11 +788,9 @@ class VTApp(QtCore.QObject):
         if not vitables.utils.isDataSourceReadable(leaf):
             return
 
-        # Track filenodes
+        # Track filenodes. Their lines are indexed once
         if fnutils.isFilenode(leaf) and (leaf not in self.filenodes_map):
-            temp_filenode = fnutils.filenodeToFile(leaf)
-            self.filenodes_map[leaf] = (temp_filenode,
-                                        fnutils.filenodeTotalRows(leaf))
+            self.filenodes_map[leaf] = fnutils.lineOffsets(leaf)
 
         # Create a view
         subwindow = datasheet.DataSheet(index)
@@ -1130,6 +1133,298 @@ class VTApp(QtCore.QObject):
         """Slot for emptying the `Query results` node."""
         self.queries_mgr.deleteAllQueries()
 
+    def activeLeafView(self):
+        """The leaf view of the active data sheet.
+
+        :Returns: the view or None if there is no active data sheet or it
+          doesn't display a `PyTables` leaf
+        """
+
+        window = self.gui.workspace.activeSubWindow()
+        view = getattr(window, 'leaf_view', None)
+        if (view is None) or not hasattr(view.tmodel, 'bookmarks'):
+            return None
+        return view
+
+    def goToRow(self):
+        """Slot for jumping to a given row of the active dataset.
+
+        Rows are entered as text because integer input widgets are
+        limited to 32 bits.
+        """
+
+        view = self.activeLeafView()
+        if view is None:
+            return
+        last_row = view.leaf_numrows - 1
+        text, accepted = QtWidgets.QInputDialog.getText(
+            self.gui,
+            translate('VTApp', 'Go to row', 'Caption of the Go to row dialog'),
+            translate('VTApp', 'Row (0 - {0}):',
+                      'Label of the Go to row dialog').format(last_row))
+        if not accepted:
+            return
+        try:
+            row = int(text.strip().replace(',', '').replace('_', ''))
+        except ValueError:
+            log.error(translate('VTApp', 'Invalid row number: {0}',
+                                'A logger error message').format(text))
+            return
+        view.goToRow(min(max(row, 0), last_row))
+
+    def sortRows(self):
+        """Slot for sorting the rows of the active table by some columns.
+
+        Sort keys are entered as a comma separated list of column names.
+        An empty list displays the rows in storage order again. The table
+        is sorted step by step while a modal progress dialog is displayed.
+        """
+
+        view = self.activeLeafView()
+        if (view is None) or not isinstance(view.tmodel.leaf, tables.Table):
+            return
+        model = view.tmodel
+        table = model.leaf
+        if model.order is not None:
+            initial = ', '.join(model.order.columns)
+        else:
+            column = max(view.currentIndex().column(), 0)
+            initial = table.colnames[column]
+        text, accepted = QtWidgets.QInputDialog.getText(
+            self.gui,
+            translate('VTApp', 'Sort rows', 'Caption of the Sort dialog'),
+            translate('VTApp', 'Sort by columns (comma separated, empty '
+                      'for storage order):\n{0}',
+                      'Label of the Sort dialog').format(
+                ', '.join(sorting.sortableColumns(table))),
+            text=initial)
+        if not accepted:
+            return
+        columns = [name.strip() for name in text.split(',') if name.strip()]
+        if not columns:
+            model.setOrder(None)
+            return
+        tmp_h5file = self.gui.dbs_tree_model.tmp_dbdoc.h5file
+        try:
+            task = sorting.SortTask(table, columns, tmp_h5file, self.gui)
+        except ValueError as e:
+            log.error(translate('VTApp', 'Unable to sort the table: {0}',
+                                'A logger error message').format(e))
+            return
+        # The sort runs in the GUI thread, so the dialog is modal: the
+        # view (or the file) cannot be closed while the table is sorted
+        progress = QtWidgets.QProgressDialog(
+            translate('VTApp', 'Sorting {0} rows...',
+                      'Label of the sort progress dialog').format(
+                table.nrows),
+            translate('VTApp', 'Cancel', 'Button of the sort progress dialog'),
+            0, 100, self.gui)
+        progress.setWindowTitle(translate(
+            'VTApp', 'Sort', 'Caption of the sort progress dialog'))
+        progress.setWindowModality(QtCore.Qt.ApplicationModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoReset(False)
+
+        def sortFinished(order):
+            """Display the sorted rows."""
+
+            progress.close()
+            progress.deleteLater()
+            task.deleteLater()
+            if order is not None:
+                model.setOrder(order)
+
+        task.progressChanged.connect(progress.setValue)
+        task.scanFinished.connect(sortFinished)
+        progress.canceled.connect(task.cancel)
+        task.start()
+        progress.show()
+
+    def columnStatistics(self):
+        """Slot for displaying the statistics of the current column.
+
+        Statistics are computed in background, see
+        :mod:`vitables.vttables.colstats`.
+        """
+
+        view = self.activeLeafView()
+        if (view is None) or view.tmodel.is_filenode:
+            return
+        model = view.tmodel
+        leaf = model.leaf
+        column = max(view.currentIndex().column(), 0)
+        if isinstance(leaf, tables.Table):
+            col = column
+            name = leaf.colnames[col]
+        else:
+            col = model.col_start + column
+            name = str(col)
+        title = translate('VTApp', 'Statistics of {0}',
+                          'Caption of the Column statistics dialog').format(
+            f'{leaf._v_name}: {name}')
+        try:
+            dialog = colstats_dlg.ColumnStatsDlg(leaf, col, title, self.gui)
+        except TypeError as e:
+            log.error(translate('VTApp', 'Unable to compute statistics: {0}',
+                                'A logger error message').format(e))
+            return
+        dialog.show()
+
+    def findInDataset(self):
+        """Slot for showing the find bar of the active dataset.
+
+        Searches are done by the bar, see
+        :mod:`vitables.vttables.find_bar`.
+        """
+
+        window = self.gui.workspace.activeSubWindow()
+        bar = getattr(window, 'find_bar', None)
+        if bar is not None:
+            bar.activate()
+
+    def selectRows(self):
+        """Slot for selecting a range of rows of the active dataset.
+
+        Rows are entered as text (see :meth:`goToRow`). The columns of the
+        selected range (if any) are kept, otherwise every column is
+        selected.
+        """
+
+        view = self.activeLeafView()
+        if view is None:
+            return
+        last_row = view.leaf_numrows - 1
+        selected = view.tmodel.selection_range
+        initial = f'{selected[0]}:{selected[1] - 1}' if selected else ''
+        text, accepted = QtWidgets.QInputDialog.getText(
+            self.gui,
+            translate('VTApp', 'Select rows',
+                      'Caption of the Select rows dialog'),
+            translate('VTApp', 'Rows (first:last, 0 - {0}):',
+                      'Label of the Select rows dialog').format(last_row),
+            text=initial)
+        if not accepted:
+            return
+        try:
+            first, last = [int(row.strip().replace(',', '').replace('_', ''))
+                           for row in text.split(':')]
+        except ValueError:
+            log.error(translate('VTApp', 'Invalid range of rows: {0}',
+                                'A logger error message').format(text))
+            return
+        first, last = sorted((first, last))
+        if selected:
+            view.selectRange(first, last + 1, selected[2], selected[3])
+        else:
+            view.selectRange(first, last + 1)
+        view.goToRow(min(max(first, 0), last_row))
+
+    def copySelection(self):
+        """Slot for copying the selected cells to the clipboard.
+
+        Cells are copied as tab separated text, see
+        :mod:`vitables.vttables.copier`.
+        """
+        self.copyRange()
+
+    def exportSelection(self):
+        """Slot for writing the selected cells to a text file."""
+
+        if self.activeLeafView() is None:
+            return
+        fs_args = {'accept_mode': QtWidgets.QFileDialog.AcceptSave,
+                   'file_mode': QtWidgets.QFileDialog.AnyFile,
+                   'history': self.file_selector_history,
+                   'label': translate('VTApp', 'Export',
+                                      'Accept text for QFileDialog')}
+        filepath, working_dir = vitables.utils.getFilepath(
+            self.gui,
+            translate('VTApp', 'Exporting the selected cells',
+                      'Caption of the Export Selection... dialog'),
+            dfilter=translate('VTApp', """Text Files (*.tsv *.txt);;"""
+                              """All Files (*)""",
+                              'Filter for the Export Selection... dialog'),
+            settings=fs_args)
+        if not filepath:
+            # The user has canceled the dialog
+            return
+        self.updateFSHistory(working_dir)
+        self.copyRange(filepath)
+
+    def copyRange(self, filepath=None):
+        """Copy the selected cells of the active dataset.
+
+        The cells are read straight from the leaf in background while a
+        progress dialog is displayed.
+
+        :Parameter filepath: the file where cells are written (None for
+          copying them to the clipboard)
+        """
+
+        view = self.activeLeafView()
+        if (view is None) or view.tmodel.is_filenode:
+            return
+        cell_range = view.selectedRange()
+        if cell_range is None:
+            return
+        model = view.tmodel
+        leaf = model.leaf
+        task = copier.CopyTask(
+            copier.RangeCopier(leaf, cell_range, model.formatContent,
+                               order=model.order, slab=model.rbuffer.slab),
+            leaf, filepath, self.gui)
+        progress = QtWidgets.QProgressDialog(
+            translate('VTApp', 'Copying {0} rows...',
+                      'Label of the copy progress dialog').format(
+                cell_range[1] - cell_range[0]),
+            translate('VTApp', 'Cancel', 'Button of the copy progress dialog'),
+            0, 100, self.gui)
+        progress.setWindowTitle(translate(
+            'VTApp', 'Copy', 'Caption of the copy progress dialog'))
+        progress.setMinimumDuration(500)
+        progress.setAutoReset(False)
+
+        def copyFinished(result):
+            """Deliver the copied cells."""
+
+            progress.close()
+            progress.deleteLater()
+            task.deleteLater()
+            if result is None:
+                return
+            if filepath is None:
+                QtWidgets.QApplication.clipboard().setText(result)
+            else:
+                log.info(translate(
+                    'VTApp', '{0} rows written to {1}',
+                    'A logger info message').format(result, filepath))
+
+        task.progressChanged.connect(progress.setValue)
+        task.scanFinished.connect(copyFinished)
+        progress.canceled.connect(task.cancel)
+        task.start()
+
+    def toggleBookmark(self):
+        """Slot for bookmarking the current row of the active dataset."""
+
+        view = self.activeLeafView()
+        if view is not None:
+            view.toggleBookmark()
+
+    def nextBookmark(self):
+        """Slot for jumping to the next bookmarked row."""
+
+        view = self.activeLeafView()
+        if view is not None:
+            view.nextBookmark()
+
+    def previousBookmark(self):
+        """Slot for jumping to the previous bookmarked row."""
+
+        view = self.activeLeafView()
+        if view is not None:
+            view.previousBookmark()
+
     def settingsPreferences(self):
         """
         Launch the Preferences dialog.
@@ -420,3 +420,73 @@ def checkFilenameExtension(filepath):
         ext = '.csv'
         filepath = filepath + ext
     return filepath
+
+
+def fillDataset(dataset, input_handler, has_header=False, chunk_size=10000):
+    """Fill a dataset with the content of a `CSV` file.
+
+    The file is read in chunks of lines so that big files can be imported
+    in a memory efficient way. Tables and `EArrays` are appended to, other
+    arrays are filled row by row.
+
+    :Parameters:
+
+    - `dataset`: the `tables.Leaf` being filled
+    - `input_handler`: the file handler of the CSV file
+    - `has_header`: True if the first line of the file is a header
+    - `chunk_size`: the (approximate) number of rows read at once
+    """
+
+    input_handler.seek(0)
+    if has_header:
+        # Skip the header line
+        input_handler.readline()
+    buf_size = chunk_size * dataset.rowsize
+    read_fh = input_handler.readlines
+    appendable = isinstance(dataset, (tables.Table, tables.EArray))
+    buf = read_fh(buf_size)
+    start = 0
+    while buf:
+        idata = getArray(buf)
+        if appendable:
+            # Append data to the dataset
+            dataset.append(idata)
+        else:
+            stop = start + idata.shape[0]
+            dataset[start:stop] = idata
+            start = stop
+        dataset.flush()
+        del idata
+        buf = read_fh(buf_size)
+
+
+def writeDataset(leaf, out_handler, add_header=False, chunk_size=10000):
+    """Write the content of a dataset to a `CSV` file.
+
+    The dataset is read in chunks of rows so that big datasets can be
+    exported in a memory efficient way.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` being exported
+    - `out_handler`: the file handler (binary mode) of the CSV file
+    - `add_header`: True if the column names of a table must be written
+    - `chunk_size`: the number of rows read at once
+    """
+
+    if add_header:
+        header = ', '.join(leaf.colnames)
+        # To be consistent with numpy.savetxt use \n line breaks
+        out_handler.write(bytearray(header + '\n', 'UTF-8'))
+    nrows = leaf.nrows
+    chunk_size = min(chunk_size, nrows)
+    nchunks = np.floor_divide(nrows, chunk_size)
+    for i in np.arange(0, nchunks + 1):
+        QtWidgets.QApplication.processEvents()
+        cstart = chunk_size * i
+        if cstart >= nrows:
+            break
+        cstop = cstart + chunk_size
+        cstop = min(cstop, nrows)
+        np.savetxt(out_handler, leaf.read(cstart, cstop, 1),
+                   fmt='%s', delimiter=',')
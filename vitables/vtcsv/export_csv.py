@@ -30,7 +30,6 @@ Neither numpy scalar arrays are exported.
 import logging
 import os
 
-import numpy as np
 import tables
 from qtpy import QtCore, QtGui, QtWidgets
 
@@ -269,25 +268,7 @@ class ExportToCSV(QtCore.QObject):
         try:
             QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
             with open(filepath, 'ab') as out_handler:
-                if add_header:
-                    from functools import reduce
-                    header = reduce(lambda x, y: f'{x}, {y}',
-                                    leaf.colnames)
-                    # To be consistent with numpy.savetxt use \n line breaks
-                    out_handler.write(bytearray(header + '\n', 'UTF-8'))
-                chunk_size = 10000
-                nrows = leaf.nrows
-                chunk_size = min(chunk_size, nrows)
-                nchunks = np.floor_divide(nrows, chunk_size)
-                for i in np.arange(0, nchunks + 1):
-                    QtWidgets.QApplication.processEvents()
-                    cstart = chunk_size * i
-                    if cstart >= nrows:
-                        break
-                    cstop = cstart + chunk_size
-                    cstop = min(cstop, nrows)
-                    np.savetxt(out_handler, leaf.read(cstart, cstop, 1),
-                                  fmt='%s', delimiter=',')
+                csvutils.writeDataset(leaf, out_handler, add_header)
         except OSError:
             vitables.utils.formatExceptionInfo()
         except ValueError:
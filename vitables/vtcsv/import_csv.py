@@ -284,21 +284,7 @@ class ImportCSV(QtCore.QObject):
                 '/', dataset_name, descr, title=atitle, filters=io_filters,
                 expectedrows=nrows)
             # Fill the dataset in a memory efficient way
-            input_handler.seek(0)
-            if has_header:
-                # Skip the header line
-                input_handler.readline()
-            chunk_size = 10000
-            buf_size = chunk_size * dataset.rowsize
-            read_fh = input_handler.readlines
-            buf = read_fh(buf_size)
-            while buf:
-                idata = csvutils.getArray(buf)
-                # Append data to the dataset
-                dataset.append(idata)
-                dataset.flush()
-                del idata
-                buf = read_fh(buf_size)
+            csvutils.fillDataset(dataset, input_handler, has_header)
             dbdoc.h5file.flush()
             self.updateTree(dbdoc.filepath)
         except:
@@ -322,7 +308,6 @@ class ImportCSV(QtCore.QObject):
         try:
             QtWidgets.QApplication.processEvents()
             QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-            chunk_size = 10000
             input_handler = open(filepath, 'r+')
             (nrows, atom, array_shape) = csvutils.earrayInfo(input_handler)
 
@@ -337,19 +322,8 @@ class ImportCSV(QtCore.QObject):
                 '/', dataset_name, atom, array_shape, title=atitle,
                 filters=io_filters, expectedrows=nrows)
 
-            # Fill the dataset in a memory effcient way
-            input_handler.seek(0)
-            chunk_size = 10000
-            buf_size = chunk_size * dataset.rowsize
-            read_fh = input_handler.readlines
-            buf = read_fh(buf_size)
-            while buf:
-                idata = csvutils.getArray(buf)
-                # Append data to the dataset
-                dataset.append(idata)
-                dataset.flush()
-                del idata
-                buf = read_fh(buf_size)
+            # Fill the dataset in a memory efficient way
+            csvutils.fillDataset(dataset, input_handler)
             dbdoc.h5file.flush()
             self.updateTree(dbdoc.filepath)
         except ValueError:
@@ -375,7 +349,6 @@ class ImportCSV(QtCore.QObject):
         try:
             QtWidgets.QApplication.processEvents()
             QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-            chunk_size = 10000
             input_handler = open(filepath, 'r+')
             (atom, array_shape) = csvutils.carrayInfo(input_handler)
 
@@ -390,22 +363,8 @@ class ImportCSV(QtCore.QObject):
                 '/', dataset_name, atom, array_shape, title=atitle,
                 filters=io_filters)
 
-            # Fill the dataset in a memory effcient way
-            input_handler.seek(0)
-            chunk_size = 10000
-            buf_size = chunk_size * dataset.rowsize
-            read_fh = input_handler.readlines
-            buf = read_fh(buf_size)
-            start = 0
-            while buf:
-                idata = csvutils.getArray(buf)
-                stop = start + idata.shape[0]
-                # Append data to the dataset
-                dataset[start:stop] = idata
-                dataset.flush()
-                del idata
-                start = stop
-                buf = read_fh(buf_size)
+            # Fill the dataset in a memory efficient way
+            csvutils.fillDataset(dataset, input_handler)
             dbdoc.h5file.flush()
             self.updateTree(dbdoc.filepath)
         except ValueError:
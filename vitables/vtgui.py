@@ -31,6 +31,7 @@ import vitables.utils
 from vitables import logger
 from vitables.calculator import calculator
 from vitables.h5db import dbstreemodel, dbstreeview
+from vitables.vtwidgets import performance_panel
 
 __docformat__ = 'restructuredtext'
 
@@ -70,6 +71,7 @@ class VTGUI(QtWidgets.QMainWindow):
         self.editing_dlg = None
         self.logger_dock = None
         self.logger = None
+        self.performance_dock = None
         self.setup_logger_window()
         self.setup(vtapp)
 
@@ -84,6 +86,7 @@ class VTGUI(QtWidgets.QMainWindow):
                                                      self.dbs_tree_model,
                                                      self)
         self.addComponents()
+        self.setup_performance_window()
         self.gui_actions = self.setupActions()
         self.setupToolBars()
         self.setupMenus()
@@ -110,6 +113,26 @@ class VTGUI(QtWidgets.QMainWindow):
         stream_handler.setFormatter(logging.Formatter(_GUI_LOG_FORMAT))
         vitables_logger.addHandler(stream_handler)
 
+    def setup_performance_window(self):
+        # Put the profiling counters of the open views in the bottom region
+        # of the window, tabbed with the logging console. The dock is
+        # hidden until the user shows it
+        self.performance_dock = QtWidgets.QDockWidget(
+            translate('VTGUI', 'Performance', 'The Performance dock title'))
+        self.performance_dock.setObjectName('PerformanceDockWidget')
+        self.performance_dock.setFeatures(
+            QtWidgets.QDockWidget.DockWidgetClosable
+            | QtWidgets.QDockWidget.DockWidgetMovable
+            | QtWidgets.QDockWidget.DockWidgetFloatable)
+        self.addDockWidget(QtCore.Qt.BottomDockWidgetArea,
+                           self.performance_dock)
+        self.tabifyDockWidget(self.logger_dock, self.performance_dock)
+        self.performance_panel = performance_panel.PerformancePanel(
+            self.workspace, self)
+        self.performance_panel.setObjectName('PerformancePanel')
+        self.performance_dock.setWidget(self.performance_panel)
+        self.performance_dock.hide()
+
     def addComponents(self):
         """Add widgets to the main window.
 
@@ -452,6 +475,111 @@ class VTGUI(QtWidgets.QMainWindow):
                 'Action tip'))
         actions['calculate'].setObjectName('calculate')
 
+        actions['datasetGoToRow'] = QtWidgets.QAction(
+            translate('VTGUI', '&Go to Row...', 'Dataset -> Go to Row...'),
+            self,
+            shortcut=QtGui.QKeySequence('Ctrl+G'),
+            triggered=self.vtapp.goToRow,
+            statusTip=translate(
+                'VTGUI', 'Jump to a given row of the active dataset',
+                'Status bar text for the Dataset -> Go to Row... action'))
+        actions['datasetGoToRow'].setObjectName('datasetGoToRow')
+
+        actions['datasetFind'] = QtWidgets.QAction(
+            translate('VTGUI', '&Find...', 'Dataset -> Find...'),
+            self,
+            shortcut=QtGui.QKeySequence('Ctrl+F'),
+            triggered=self.vtapp.findInDataset,
+            statusTip=translate(
+                'VTGUI', 'Find values in the active dataset',
+                'Status bar text for the Dataset -> Find... action'))
+        actions['datasetFind'].setObjectName('datasetFind')
+
+        actions['datasetSelectRows'] = QtWidgets.QAction(
+            translate('VTGUI', 'Select &Rows...', 'Dataset -> Select Rows...'),
+            self,
+            triggered=self.vtapp.selectRows,
+            statusTip=translate(
+                'VTGUI', 'Select a range of rows of the active dataset',
+                'Status bar text for the Dataset -> Select Rows... action'))
+        actions['datasetSelectRows'].setObjectName('datasetSelectRows')
+
+        actions['datasetCopySelection'] = QtWidgets.QAction(
+            translate('VTGUI', '&Copy Selection',
+                      'Dataset -> Copy Selection'),
+            self,
+            triggered=self.vtapp.copySelection,
+            statusTip=translate(
+                'VTGUI', 'Copy the selected cells to the clipboard',
+                'Status bar text for the Dataset -> Copy Selection action'))
+        actions['datasetCopySelection'].setObjectName('datasetCopySelection')
+
+        actions['datasetExportSelection'] = QtWidgets.QAction(
+            translate('VTGUI', '&Export Selection...',
+                      'Dataset -> Export Selection...'),
+            self,
+            triggered=self.vtapp.exportSelection,
+            statusTip=translate(
+                'VTGUI', 'Write the selected cells to a text file',
+                'Status bar text for the Dataset -> Export Selection... '
+                'action'))
+        actions['datasetExportSelection'].setObjectName(
+            'datasetExportSelection')
+
+        actions['datasetSortRows'] = QtWidgets.QAction(
+            translate('VTGUI', '&Sort Rows...', 'Dataset -> Sort Rows...'),
+            self,
+            triggered=self.vtapp.sortRows,
+            statusTip=translate(
+                'VTGUI', 'Sort the rows of the active table by some columns',
+                'Status bar text for the Dataset -> Sort Rows... action'))
+        actions['datasetSortRows'].setObjectName('datasetSortRows')
+
+        actions['datasetColumnStats'] = QtWidgets.QAction(
+            translate('VTGUI', 'Column &Statistics...',
+                      'Dataset -> Column Statistics...'),
+            self,
+            triggered=self.vtapp.columnStatistics,
+            statusTip=translate(
+                'VTGUI', 'Summarise the current column of the active dataset',
+                'Status bar text for the Dataset -> Column Statistics... '
+                'action'))
+        actions['datasetColumnStats'].setObjectName('datasetColumnStats')
+
+        actions['datasetToggleBookmark'] = QtWidgets.QAction(
+            translate('VTGUI', 'Toggle &Bookmark',
+                      'Dataset -> Toggle Bookmark'),
+            self,
+            shortcut=QtGui.QKeySequence('Ctrl+B'),
+            triggered=self.vtapp.toggleBookmark,
+            statusTip=translate(
+                'VTGUI', 'Bookmark the current row of the active dataset',
+                'Status bar text for the Dataset -> Toggle Bookmark action'))
+        actions['datasetToggleBookmark'].setObjectName(
+            'datasetToggleBookmark')
+
+        actions['datasetNextBookmark'] = QtWidgets.QAction(
+            translate('VTGUI', '&Next Bookmark', 'Dataset -> Next Bookmark'),
+            self,
+            shortcut=QtGui.QKeySequence('F2'),
+            triggered=self.vtapp.nextBookmark,
+            statusTip=translate(
+                'VTGUI', 'Jump to the next bookmarked row',
+                'Status bar text for the Dataset -> Next Bookmark action'))
+        actions['datasetNextBookmark'].setObjectName('datasetNextBookmark')
+
+        actions['datasetPreviousBookmark'] = QtWidgets.QAction(
+            translate('VTGUI', '&Previous Bookmark',
+                      'Dataset -> Previous Bookmark'),
+            self,
+            shortcut=QtGui.QKeySequence('Shift+F2'),
+            triggered=self.vtapp.previousBookmark,
+            statusTip=translate(
+                'VTGUI', 'Jump to the previous bookmarked row',
+                'Status bar text for the Dataset -> Previous Bookmark action'))
+        actions['datasetPreviousBookmark'].setObjectName(
+            'datasetPreviousBookmark')
+
         return actions
 
     def setupToolBars(self):
@@ -572,7 +700,12 @@ class VTGUI(QtWidgets.QMainWindow):
         self.dataset_menu = self.menuBar().addMenu(
             translate('VTGUI', "&Dataset", 'The Dataset menu entry'))
         self.dataset_menu.setObjectName('dataset_menu')
-        dataset_actions = ['queryNew', 'calculate']
+        dataset_actions = ['queryNew', 'calculate', None, 'datasetGoToRow',
+                           'datasetFind', 'datasetSelectRows',
+                           'datasetCopySelection', 'datasetExportSelection',
+                           'datasetSortRows', 'datasetColumnStats',
+                           'datasetToggleBookmark', 'datasetNextBookmark',
+                           'datasetPreviousBookmark']
         vitables.utils.addActions(self.dataset_menu, dataset_actions,
                                   self.gui_actions)
 
@@ -681,13 +814,17 @@ class VTGUI(QtWidgets.QMainWindow):
         This method disambiguates the ``Ctrl+C`` shortcut. If the console has
         focus then ``Ctrl+C`` will copy the console selected text. If the
         databases tree view has focus then the selected node (if any) will be
-        copied.
+        copied. If the view of a dataset has focus then the selected cells
+        will be copied.
         """
 
+        view = self.vtapp.activeLeafView()
         if self.dbs_tree_view.hasFocus():
             self.vtapp.nodeCopy()
         elif self.logger.hasFocus():
             self.logger.copy()
+        elif (view is not None) and view.hasFocus():
+            self.vtapp.copySelection()
 
     # Updating appearance means:
     #
@@ -17,4 +17,4 @@
 #
 #       Author:  Vicent Mas - vmas@vitables.org
 
-__all__ = ["buffer", "datasheet", "leaf_delegate", "leaf_model", "leaf_view", "scrollbar"]
+__all__ = ["buffer", "colstats", "copier", "datasheet", "find_bar", "finder", "hyperslab_selector", "leaf_delegate", "leaf_model", "leaf_view", "memorymap", "reader", "readstats", "scantask", "scrollbar", "sorting"]
@@ -26,14 +26,17 @@ consequence, views (widgets showing a tabular representation of the dataset)
 are painted much faster too.
 """
 
+import collections
 import logging
+import time
 import warnings
 
 import numpy as np
 import tables
-from qtpy import QtWidgets
+from qtpy import QtCore, QtWidgets
 
 from .. import utils as vtutils
+from . import memorymap, readstats
 
 __docformat__ = 'restructuredtext'
 
@@ -48,6 +51,317 @@ warnings.filterwarnings('ignore', category=tables.NaturalNameWarning)
 
 log = logging.getLogger(__name__)
 
+#: The preferred number of rows of every block kept in the buffer cache.
+BLOCK_SIZE = 1000
+
+#: The memory budget (in bytes) of the buffer cache of every leaf.
+CACHE_SIZE = 64 * 2 ** 20
+
+#: The minimum number of blocks that must fit in the buffer cache.
+MIN_CACHED_BLOCKS = 8
+
+#: The preferred number of columns of every block of wide arrays.
+COLUMN_BLOCK_SIZE = 256
+
+#: The number of elements of the VLArray rows kept in the buffer. Longer
+#: rows are truncated (they are read whole only when a cell is zoomed).
+PREVIEW_LENGTH = 100
+
+#: The memory budget (in bytes) of every read of VLArray rows.
+VLROWS_READ_SIZE = 16 * 2 ** 20
+
+
+def blockNBytes(block, axis):
+    """Estimate the memory used by a block.
+
+    :Parameters:
+
+    - `block`: the block being inspected
+    - `axis`: the axis along which the leaf is read (None for VLArrays)
+    """
+
+    if axis is not None:
+        return block.nbytes
+    # VLArray rows can be arrays, strings or arbitrary objects
+    return sum(getattr(row, 'nbytes', len(row) if
+                       isinstance(row, (str, bytes)) else 64)
+               for row in block)
+
+
+class BlockReader:
+    """Read runs of blocks from a leaf.
+
+    A block reader keeps a copy of the reading parameters of a buffer and
+    never touches the buffer or its leaf, so it can be used by threads
+    with their own handle of the leaf (see
+    :mod:`vitables.vttables.reader`). Block readers are not modified:
+    buffers make a new one when their parameters change. Reading doesn't
+    modify them either. The lengths of the read VLArray rows and the
+    read timings are returned with the blocks, and the buffer applies
+    them in the GUI thread (see :meth:`Buffer.applyRuns`).
+
+    :Parameters:
+
+    - `block_size`: the number of rows of every block
+    - `axis`: the axis along which the leaf is read (None for VLArrays)
+    - `windowed`: True if the columns of the leaf are read in column
+      blocks
+    - `fields`: the names of the fields of a table (None for other
+      leaves)
+    - `order`: the sorting order of the rows of a table (None for storage
+      order)
+    - `preview_length`: the number of elements of the truncated rows of
+      VLArrays (None if rows are not truncated)
+    - `element_size`: the size in bytes of an element of a VLArray row
+    """
+
+    def __init__(self, block_size, axis, windowed, fields=None, order=None,
+                 preview_length=None, element_size=None):
+        """Setup the reader."""
+
+        self.block_size = block_size
+        self.axis = axis
+        self.windowed = windowed
+        self.fields = fields
+        self.order = order
+        self.preview_length = preview_length
+        self.element_size = element_size
+
+    def readRun(self, leaf, first, last, col, nrows, row_lengths=None,
+                max_vlrow_nbytes=0):
+        """Read a run of contiguous blocks from a given leaf.
+
+        :Parameters:
+
+        - `leaf`: the leaf being read
+        - `first`: the number of the first block of the run
+        - `last`: the number of the last block of the run
+        - `col`: the table column or column block being read (None for
+          other leaves)
+        - `nrows`: the number of rows of the leaf
+        - `row_lengths`: the row-length index of a VLArray (see
+          :meth:`Buffer.rowLengths`)
+        - `max_vlrow_nbytes`: the size of the longest VLArray row read so
+          far
+
+        :Returns: a `(blocks, lengths, read)` tuple. `blocks` maps
+          `(block number, col)` keys to blocks, `lengths` maps block
+          numbers to the lengths of the read VLArray rows and `read` is
+          the `(rows, bytes, seconds)` tuple of the read
+        """
+
+        bsize = self.block_size
+        stop = min((last + 1) * bsize, nrows)
+        # Blocks past the end of the leaf are empty
+        start = min(first * bsize, stop)
+        started = time.perf_counter()
+        lengths = {}
+        if self.preview_length:
+            data, run_lengths = self.readPreviews(
+                leaf, start, stop, row_lengths, max_vlrow_nbytes)
+            lengths = self.splitLengths(start, run_lengths)
+            nbytes = int(run_lengths.sum()) * self.element_size
+        else:
+            data = self.readRows(leaf, start, stop, col)
+            nbytes = blockNBytes(data, self.axis)
+        read = (stop - start, nbytes, time.perf_counter() - started)
+        return self.splitBlocks(data, first, last, col), lengths, read
+
+    def readRows(self, leaf, start, stop, col=None):
+        """Read a range of rows from a given leaf, bypassing the cache.
+
+        VLArray rows are read whole.
+
+        :Parameters:
+
+        - `leaf`: the leaf being read
+        - `start`: the first row to read
+        - `stop`: the row after the last row to read
+        - `col`: the table column or column block being read (None for
+          other leaves)
+
+        :Returns: the rows in the range `[start, stop)`
+        """
+
+        if col is None:
+            return leaf.read(start, stop)
+        if self.windowed:
+            # A hyperslab of a column block
+            first_col, last_col, slab = col
+            data = leaf[self.hyperslab(slab, slice(start, stop),
+                                       slice(first_col, last_col))]
+            if (slab is not None) and (slab[0] > slab[1]):
+                data = data.T
+            return data
+        if self.order is not None:
+            return self.order.read(leaf, start, stop, self.fields[col])
+        return leaf.read(start, stop, field=self.fields[col])
+
+    def readPreviews(self, leaf, start, stop, row_lengths=None,
+                     max_vlrow_nbytes=0):
+        """Read the truncated rows of a range of rows of a VLArray.
+
+        The HDF5 library cannot read part of a variable length row, so
+        whole rows are read, truncated and discarded. Rows are read in runs
+        that fit in `VLROWS_READ_SIZE` bytes: the run length is computed
+        from the row-length index if possible, else from the longest row
+        read so far.
+
+        :Parameters:
+
+        - `leaf`: the leaf being read
+        - `start`: the first row to read
+        - `stop`: the row after the last row to read
+        - `row_lengths`: the row-length index of the VLArray
+        - `max_vlrow_nbytes`: the size of the longest row read so far
+
+        :Returns: a tuple with the list of truncated rows and an array with
+          the lengths of the (whole) rows
+        """
+
+        element_size = self.element_size
+        known = None
+        if row_lengths:
+            known = self.rowLengths(row_lengths, start, stop)
+        lengths = np.zeros(stop - start, dtype=np.int64)
+        previews = []
+        row = start
+        while row < stop:
+            if known is not None:
+                nbytes = np.cumsum(known[row - start:]) * element_size
+                run = np.searchsorted(nbytes, VLROWS_READ_SIZE, 'right')
+            elif max_vlrow_nbytes:
+                run = VLROWS_READ_SIZE // max_vlrow_nbytes
+            else:
+                # Nothing is known about the rows yet
+                run = 1
+            run_stop = min(row + max(int(run), 1), stop)
+            for offset, data in enumerate(leaf.read(row, run_stop),
+                                          row - start):
+                lengths[offset] = len(data)
+                if len(data) > self.preview_length:
+                    data = data[:self.preview_length]
+                    if isinstance(data, np.ndarray):
+                        # Don't keep alive the whole row
+                        data = data.copy()
+                previews.append(data)
+            max_vlrow_nbytes = max(
+                max_vlrow_nbytes,
+                int(lengths[row - start:run_stop - start].max()) *
+                element_size)
+            row = run_stop
+        return previews, lengths
+
+    def splitLengths(self, start, lengths):
+        """Split the lengths of some VLArray rows by block.
+
+        :Parameters:
+
+        - `start`: the first row of the range, the first row of a block
+        - `lengths`: the lengths of the rows of some consecutive blocks
+
+        :Returns: a mapping of block numbers to the lengths of their rows
+        """
+
+        bsize = self.block_size
+        first = start // bsize
+        return {first + offset // bsize: lengths[offset:offset + bsize]
+                for offset in range(0, len(lengths), bsize)}
+
+    def rowLengths(self, row_lengths, start, stop):
+        """The lengths of a range of VLArray rows.
+
+        :Parameters:
+
+        - `row_lengths`: the row-length index of the VLArray
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+
+        :Returns: an array with the lengths or None if some row is not in
+          the index
+        """
+
+        bsize = self.block_size
+        first = start // bsize
+        last = max(stop - 1, start) // bsize
+        if any(b not in row_lengths for b in range(first, last + 1)):
+            return None
+        lengths = np.concatenate(
+            [row_lengths[b] for b in range(first, last + 1)])
+        return lengths[start - first * bsize:stop - first * bsize]
+
+    def maxRowNBytes(self, lengths):
+        """The size in bytes of the longest row of some VLArray blocks.
+
+        :Parameter lengths: a mapping of block numbers to the lengths of
+          their rows
+        """
+
+        return max((int(block.max()) for block in lengths.values()
+                    if len(block)), default=0) * self.element_size
+
+    def hyperslab(self, slab, rows, cols):
+        """The key used for reading a hyperslab of the leaf.
+
+        :Parameters:
+
+        - `slab`: the `(row axis, column axis, indices)` tuple of N-D
+          arrays (None for other leaves)
+        - `rows`: the slice of rows being read
+        - `cols`: the slice of columns being read
+
+        :Returns: a tuple that can be used for indexing the leaf
+        """
+
+        if slab is None:
+            return (rows, cols)
+        row_axis, col_axis, indices = slab
+        key = list(indices)
+        key[row_axis] = rows
+        key[col_axis] = cols
+        return tuple(key)
+
+    def splitBlocks(self, data, first, last, col=None):
+        """Split the data read for a run of contiguous blocks.
+
+        :Parameters:
+
+        - `data`: the data read for the run
+        - `first`: the number of the first block of the run
+        - `last`: the number of the last block of the run
+        - `col`: the table column being read (None for other leaves)
+
+        :Returns: a mapping of `(block number, col)` keys to blocks
+        """
+
+        bsize = self.block_size
+        blocks = {}
+        for b in range(first, last + 1):
+            offset = (b - first) * bsize
+            block = self.sliceRows(data, offset, offset + bsize)
+            if self.axis is not None:
+                # Copy the block so that it doesn't keep alive the whole
+                # read array after other blocks of the run are evicted
+                block = block.copy()
+            blocks[(b, col)] = block
+        return blocks
+
+    def sliceRows(self, data, start, stop):
+        """Return the rows `[start, stop)` of some read data.
+
+        :Parameters:
+
+        - `data`: the data being sliced (a list or a ``numpy`` array)
+        - `start`: the first row of the slice
+        - `stop`: the row after the last row of the slice
+        """
+
+        if self.axis is None:
+            return data[start:stop]
+        index = [slice(None)] * data.ndim
+        index[self.axis] = slice(start, stop)
+        return data[tuple(index)]
+
 
 class Buffer:
     """Buffer used to access the real data contained in `PyTables` datasets.
@@ -69,46 +383,362 @@ class Buffer:
     *much* faster than a global reader method that has to decide
     which block of code must be executed at every cell painting time.
 
-    :Parameter leaf:
-        the data source (`tables.Leaf` instance) from which data are
-        going to be read.
+    Data are read from the leaf in blocks of `block_size` rows. Read
+    blocks are kept in a LRU cache so that browsing back and forth
+    across a buffer boundary doesn't read (and decompress) the same
+    rows again and again. After every read the next block in the
+    browsing direction is read ahead of time.
+
+    By default the block size is computed from the leaf row size, the
+    cache memory budget and the HDF5 chunkshape of the leaf: whenever
+    possible blocks are made of whole HDF5 chunks, so every block read
+    starts at a chunk boundary and no chunk is decompressed twice.
+
+    Tables are read column by column: only the fields displayed in the
+    view (see :meth:`requestColumns`) are read, so wide tables don't read
+    and decompress columns that are never displayed. The blocks of
+    tables are cached per field.
+
+    Arrays with more columns than a column block are windowed
+    horizontally too: only the columns in `[col_start, col_stop)` are
+    read (see :meth:`setColumnWindow`) and every read is a hyperslab
+    ``leaf[r0:r1, c0:c1]``. Their blocks are cached per column block.
+
+    Arrays with rank greater than 2 can be displayed as a 2-D hyperslab:
+    two axes are displayed and the index of every other axis is fixed
+    (see :meth:`setHyperslab`). Only that hyperslab is read.
+
+    If a background reader is given then missing blocks can be read
+    without blocking the GUI thread (see :meth:`requestBuffer`).
+
+    Rows of VLArrays (but not of `object` VLArrays) are kept truncated to
+    their first `PREVIEW_LENGTH` elements, so rows with millions of elements
+    don't exhaust the memory. The length of every read row is kept in a
+    row-length index (see :meth:`rowLengths`) and whole rows are read on
+    demand (see :meth:`readRow`).
+
+    Contiguous, uncompressed arrays are read from a memory map of the file
+    (see :mod:`vitables.vttables.memorymap`): chunks are views of the map,
+    so neither the blocks cache nor the background reader are used.
+
+    The rows of tables can be read in a sorting order instead of in
+    storage order (see :mod:`vitables.vttables.sorting`): every block is
+    then read through the order, so the cache keeps sorted rows.
+
+    Cache lookups and reads are recorded in the `stats` attribute, a
+    :class:`vitables.vttables.readstats.ReadStats` instance.
+
+    :Parameters:
+
+    - `leaf`: the data source (`tables.Leaf` instance) from which data are
+      going to be read.
+    - `cache_size`: the memory budget (in bytes) of the blocks cache
+    - `block_size`: the number of rows of every cached block (computed
+      if None)
+    - `reader`: a :meth:`vitables.vttables.reader.BufferReader` instance
+    - `order`: the sorting order of the rows of a table (None for storage
+      order)
     """
 
-    def __init__(self, leaf):
+    def __init__(self, leaf, cache_size=CACHE_SIZE, block_size=None,
+                 reader=None, order=None):
         """
         Initializes the buffer.
         """
 
         self.leaf = leaf
-        # The structure where read data will be stored.
-        self.chunk = np.array([])
+        # The structure where read data will be stored. For tables it maps
+        # the (read) columns of the view to the fields of the chunk
+        self.projected = isinstance(leaf, tables.Table)
+        if self.projected:
+            self.chunk = {}
+            self.fields = leaf.colnames
+        else:
+            self.chunk = np.array([])
+        # The sorting order of the rows of tables
+        self.order = order if self.projected else None
+        # For EArrays, a view of the chunk with the main dimension first so
+        # that every row of the view is a cell (see EArrayCell)
+        self.rows_view = self.chunk
+        # The rows range of the chunk and the browsing direction (1 means
+        # downwards, -1 means upwards)
+        self.start = 0
+        self.stop = 0
+        self.direction = 1
+
+        # The blocks cache maps (block number, column) keys to block data.
+        # Columns are fields for tables, column blocks for wide arrays (see
+        # chunkColumns) and None for other leaves. The most recently used
+        # blocks are kept at the end of the mapping
+        self.blocks = collections.OrderedDict()
+        self.cache_nbytes = 0
+        self.cache_size = cache_size
+        # The axis along which the leaf is read (VLArrays are read as lists)
+        if isinstance(leaf, tables.VLArray):
+            self.axis = None
+        else:
+            self.axis = getattr(leaf, 'maindim', 0)
+        # VLArray rows are truncated to previews. The row-length index maps
+        # block numbers to the lengths of the (whole) rows of the block, and
+        # the size of the longest row read so far bounds the next reads
+        self.preview_length = None
+        if isinstance(leaf, tables.VLArray) and (leaf.atom.type != 'object'):
+            self.preview_length = PREVIEW_LENGTH
+        self.row_lengths = {}
+        self.max_vlrow_nbytes = 0
+        # The displayed axes of the leaf and, for hyperslabs of N-D arrays,
+        # the (row axis, column axis, indices) tuple describing the slab
+        shape = leaf.shape or ()
+        self.row_axis = getattr(leaf, 'maindim', 0)
+        self.col_axis = 1
+        self.slab = None
+        self.sliceable = (len(shape) > 2) and \
+            not isinstance(leaf, (tables.Table, tables.EArray))
+        # The columns window of wide arrays
+        self.ncols = shape[1] if len(shape) > 1 else 1
+        self.column_block_size = self.alignedColumnBlockSize()
+        self.windowed = (len(shape) > 1) and (self.axis == 0) and \
+            not isinstance(leaf, (tables.Table, tables.EArray)) and \
+            (self.ncols > self.column_block_size)
+        self.col_start = 0
+        self.col_stop = self.ncols
+        self.rowsize = self.leafRowSize()
+        self.hdf5_chunk_rows = self.leafChunkRows()
+        self.auto_block_size = block_size is None
+        if block_size is None:
+            block_size = self.alignedBlockSize()
+        self.block_size = block_size
+        self.updateBlockReader()
+
+        # Asynchronous reads. The serial number identifies the last chunk
+        # requested, pending is the range of rows of that chunk (if it has
+        # not been delivered yet) and callback is called on delivery. Some
+        # orders can only be read in the GUI thread
+        if (self.order is not None) and not self.order.threadsafe:
+            reader = None
+        self.reader = reader
+        self.serial = 0
+        self.pending = None
+        self.callback = None
+        # The columns requested to the background reader (if any)
+        self.pending_columns = set()
+        self.columns_callback = None
+
+        # Profiling counters
+        self.stats = readstats.ReadStats(leaf._v_pathname)
+
+        # The memory map of contiguous, uncompressed arrays (if any)
+        self.mapped = memorymap.mapLeaf(leaf)
 
         # The method used for reading data depends on the kind of node.
         # Setting the reader method at initialization time increases the
         # speed of reading several orders of magnitude
+        # The same applies to the method used for reading whole columns
         if isinstance(leaf, tables.Table):
-            # Dataset elements will be read like a[row][column]
-            self.getCell = self.arrayCell
+            # Dataset elements will be read like a[column][row]
+            self.getCell = self.fieldCell
+            self.getColumn = self.fieldColumn
         elif isinstance(leaf, tables.EArray):
             self.getCell = self.EArrayCell
+            self.getColumn = self.EArrayColumn
         elif isinstance(leaf, tables.VLArray):
             # Array elements will be read like a[row]
             self.getCell = self.vectorCell
+            self.getColumn = self.vectorColumn
         elif leaf.shape == ():
             # Array element will be read like a[()]
             self.getCell = self.scalarCell
+            self.getColumn = self.scalarColumn
         elif len(leaf.shape) == 1:
             # Array elements will be read like a[row]
             self.getCell = self.vectorCell
+            self.getColumn = self.vectorColumn
         elif len(leaf.shape) > 1:
             # Dataset elements will be read like a[row][column]
             self.getCell = self.arrayCell
+            self.getColumn = self.arrayColumn
 
     def __del__(self):
         """Release resources before destroying the buffer.
         """
         # FIXME: PY3.5+ leaks resources (use finalizer instead).
         self.chunk = None
+        self.rows_view = None
+        self.blocks = None
+        self.mapped = None
+
+    def leafRowSize(self):
+        """The (estimated) size in bytes of a row of the leaf."""
+
+        rowsize = getattr(self.leaf, 'rowsize', None)
+        if (rowsize is None) and self.preview_length:
+            # The size of truncated VLArray rows is bounded
+            rowsize = self.preview_length * self.elementSize()
+        elif rowsize is None:
+            # VLArrays rows have variable length so the mean size of the
+            # first rows is used
+            try:
+                sample = self.leaf.read(0, min(self.leaf.nrows, 100))
+                rowsize = blockNBytes(sample, self.axis) // \
+                    max(len(sample), 1)
+            except tables.HDF5ExtError:
+                rowsize = self.leaf.atom.itemsize
+        elif self.slab is not None:
+            # Every cell of a hyperslab is an array item
+            rowsize = self.leaf.dtype.itemsize * self.column_block_size
+        elif self.windowed:
+            # Blocks of wide arrays span a column block
+            rowsize = rowsize // self.ncols * self.column_block_size
+        return max(int(rowsize), 1)
+
+    def elementSize(self):
+        """The size in bytes of an element of a VLArray row."""
+
+        atom = self.leaf.atom
+        return getattr(atom, 'size', None) or atom.base.size
+
+    def updateBlockReader(self):
+        """Make the block reader with the current reading parameters.
+
+        The reader (see :class:`BlockReader`) is replaced, not modified,
+        so readers handed to the background reader are never changed.
+        """
+
+        self.block_reader = BlockReader(
+            self.block_size, self.axis, self.windowed,
+            fields=self.fields if self.projected else None,
+            order=self.order, preview_length=self.preview_length,
+            element_size=self.elementSize() if self.preview_length else None)
+
+    def windowRowSize(self):
+        """The size in bytes of a row of the columns window."""
+
+        if not self.windowed:
+            return self.rowsize
+        return max(self.rowsize // self.column_block_size *
+                   (self.col_stop - self.col_start), 1)
+
+    def leafChunkRows(self):
+        """The number of rows of a HDF5 chunk of the leaf.
+
+        :Returns: the number of rows or None if the leaf is not chunked
+        """
+
+        chunkshape = getattr(self.leaf, 'chunkshape', None)
+        if not chunkshape:
+            return None
+        return int(chunkshape[self.row_axis])
+
+    def alignedBlockSize(self):
+        """Compute the number of rows of the cached blocks.
+
+        Blocks are as close to `BLOCK_SIZE` rows as possible but at least
+        `MIN_CACHED_BLOCKS` of them must fit in the cache budget. If the
+        leaf is chunked and a whole HDF5 chunk fits in a block then the
+        block size is a multiple of the HDF5 chunk size.
+        """
+
+        budget_rows = max(
+            self.cache_size // (MIN_CACHED_BLOCKS * self.rowsize), 1)
+        block_size = min(BLOCK_SIZE, budget_rows)
+        chunk_rows = self.hdf5_chunk_rows
+        if chunk_rows and (chunk_rows <= budget_rows):
+            block_size = max(block_size // chunk_rows, 1) * chunk_rows
+        return block_size
+
+    def alignedColumnBlockSize(self):
+        """Compute the number of columns of the cached blocks of wide arrays.
+
+        Column blocks are made of whole HDF5 chunks, unless the chunks
+        are much wider than `COLUMN_BLOCK_SIZE` columns.
+        """
+
+        chunkshape = getattr(self.leaf, 'chunkshape', None)
+        block_size = COLUMN_BLOCK_SIZE
+        if chunkshape and (len(chunkshape) > 1) and \
+                (chunkshape[self.col_axis] <= 4 * COLUMN_BLOCK_SIZE):
+            chunk_cols = int(chunkshape[self.col_axis])
+            block_size = max(block_size // chunk_cols, 1) * chunk_cols
+        return block_size
+
+    def setHyperslab(self, row_axis, col_axis, indices):
+        """Display a 2-D hyperslab of a N-dimensional array.
+
+        The hyperslab is made of the `row_axis` and `col_axis` axes of the
+        array. The index of every other axis is fixed. The buffer is
+        emptied, so a new chunk must be read after calling this method.
+
+        :Parameters:
+
+        - `row_axis`: the axis displayed as rows
+        - `col_axis`: the axis displayed as columns
+        - `indices`: a sequence with the index of every axis of the array
+          (the indices of the displayed axes are ignored)
+        """
+
+        shape = self.leaf.shape
+        self.slab = (row_axis, col_axis, tuple(indices))
+        self.row_axis = row_axis
+        self.col_axis = col_axis
+        self.ncols = shape[col_axis]
+        self.column_block_size = self.alignedColumnBlockSize()
+        self.windowed = True
+        self.col_start = 0
+        self.col_stop = self.ncols
+        self.rowsize = self.leafRowSize()
+        self.hdf5_chunk_rows = self.leafChunkRows()
+        if self.auto_block_size:
+            self.block_size = self.alignedBlockSize()
+        self.updateBlockReader()
+
+        # Cached blocks and pending requests belong to other hyperslab
+        self.serial += 1
+        self.pending = None
+        self.pending_columns.clear()
+        self.clearCache()
+        self.chunk = np.array([])
+        self.start = 0
+        self.stop = 0
+
+    def setColumnWindow(self, start, stop):
+        """Set the range of columns read from wide arrays.
+
+        The new window is used by the next chunk read.
+
+        :Parameters:
+
+        - `start`: the first column of the window
+        - `stop`: the column after the last column of the window
+        """
+
+        if self.windowed:
+            self.col_start = max(start, 0)
+            self.col_stop = min(max(stop, self.col_start + 1), self.ncols)
+
+    def chunkLength(self, min_length, max_length):
+        """The number of rows of the chunks read by the model.
+
+        The length is given by the memory budget and the leaf row size.
+        If possible it is a multiple of the block size, so a chunk spans
+        a whole number of blocks.
+
+        :Parameters:
+
+        - `min_length`: the minimum length (it must fill the viewport)
+        - `max_length`: the maximum length
+
+        :Returns: the number of rows of every chunk
+        """
+
+        # The chunk and its blocks must fit in the cache budget
+        length = self.cache_size // (2 * self.windowRowSize())
+        length = max(min(length, max_length), min_length)
+        if length >= self.block_size:
+            aligned = length // self.block_size * self.block_size
+            if aligned < min_length:
+                aligned += self.block_size
+            length = aligned
+        return min(length, self.total_nrows())
 
     def total_nrows(self):
         """Estimates the number of rows of the dataset being read.
@@ -119,9 +749,11 @@ class Buffer:
         purposes.
 
         The returned number of rows may differ from that returned by the
-        `nrows` attribute in scalar arrays and `EArrays`.
+        `nrows` attribute in scalar arrays and hyperslabs of N-D arrays. For
+        `EArrays` it is the size of the main (extendable) dimension, which
+        is not always the first one.
 
-        :Returns: the size of the first dimension of the dataset
+        :Returns: the size of the dimension displayed as rows
         """
 
         shape = self.leaf.shape
@@ -131,6 +763,8 @@ class Buffer:
         elif shape == ():
             # Node is a rank 0 array (e.g. numpy.array(5))
             nrows = 1
+        elif self.slab is not None:
+            nrows = shape[self.row_axis]
         else:
             nrows = self.leaf.nrows
 
@@ -147,20 +781,32 @@ class Buffer:
         Data read from `VLArrays` are returned as a Python list of objects of
         the current flavor (usually ``numpy`` arrays). Any
         other kind of `tables.Leaf` returns a ``numpy`` array (see comments on
-        restricted_flavors above)
+        restricted_flavors above). For tables only the columns of the
+        current chunk are read.
 
         :Parameters:
         :param start: the document row that is the first row of the chunk.
-        :param stop: the last row to read, inclusive.
+        :param stop: the row after the last row to read.
         """
 
         try:
             # data_source is a tables.Table or a tables.XArray
             # but data is a numpy array
             # Warning: in a EArray with shape (2,3,3) and extdim attribute
-            # being 1, the read method will have 3 rows. However, the numpy
-            # array returned by EArray.read() will have only 2 rows
-            data = self.leaf.read(start, stop)
+            # being 1, the leaf has 3 rows and the numpy array returned by
+            # EArray.read() has shape (2,n,3). Blocks are read, sliced and
+            # joined along the main dimension (see BlockReader.sliceRows)
+            if self.leaf.shape == ():
+                data = self.leaf.read()
+            elif self.mapped is not None:
+                data = self.readMapped(start, stop)
+            elif self.projected:
+                data = {col: self.readBlocks(start, stop, col)
+                        for col in self.chunk}
+            elif self.windowed:
+                data = self.readWindow(start, stop)
+            else:
+                data = self.readBlocks(start, stop)
         except tables.HDF5ExtError as e:
             log.error(
                 translate('Buffer', """\nError: problems reading records. """
@@ -170,7 +816,459 @@ class Buffer:
             vtutils.formatExceptionInfo()
         else:
             # Update the buffer contents and its start position
+            if start != self.start:
+                self.direction = 1 if start > self.start else -1
             self.chunk = data
+            if self.getCell == self.EArrayCell:
+                # A zero-copy view, computed once per chunk
+                self.rows_view = np.moveaxis(data, self.axis, 0)
+            self.start = start
+            self.stop = stop
+            self.pending_columns.clear()
+            self.scheduleReadAhead(start, stop)
+
+    def readMapped(self, start, stop):
+        """Read a range of rows from the memory map of the leaf.
+
+        The returned array is a view of the map, so nothing is copied
+        until cells are actually displayed.
+
+        :Parameters:
+
+        - `start`: the first row to read
+        - `stop`: the row after the last row to read
+
+        :Returns: the rows (and, for wide arrays, the columns window) in
+          the range `[start, stop)`
+        """
+
+        started = time.perf_counter()
+        if self.windowed:
+            data = self.mapped[self.block_reader.hyperslab(
+                self.slab, slice(start, stop),
+                slice(self.col_start, self.col_stop))]
+            if (self.slab is not None) and (self.slab[0] > self.slab[1]):
+                data = data.T
+        else:
+            data = self.mapped[start:stop]
+        data = np.asarray(data)
+        self.stats.addRead(stop - start, data.nbytes,
+                           time.perf_counter() - started)
+        return data
+
+    def readWindow(self, start, stop):
+        """Read the columns window of a range of rows of a wide array.
+
+        :Parameters:
+
+        - `start`: the first row to read
+        - `stop`: the row after the last row to read
+
+        :Returns: the hyperslab `[start:stop, col_start:col_stop]`
+        """
+
+        pages = self.chunkColumns()
+        data = self.joinPages([self.readBlocks(start, stop, page)
+                               for page in pages])
+        offset = pages[0][0]
+        return data[:, self.col_start - offset:self.col_stop - offset]
+
+    def joinPages(self, pages):
+        """Join a sequence of consecutive column blocks.
+
+        :Parameter pages: the sequence of column blocks being joined
+        """
+
+        if len(pages) == 1:
+            return pages[0]
+        return np.concatenate(pages, axis=1)
+
+    def readColumns(self, cols):
+        """Add columns to the current chunk of a table.
+
+        :Parameter cols: the sequence of view columns being read
+        """
+
+        try:
+            for col in cols:
+                if col not in self.chunk:
+                    self.chunk[col] = self.readBlocks(self.start, self.stop,
+                                                      col)
+        except tables.HDF5ExtError as e:
+            log.error(
+                translate('Buffer', """\nError: problems reading records. """
+                          """The dataset maybe corrupted.\n{}""",
+                          'A dataset readability error').format(e.message))
+        except:
+            vtutils.formatExceptionInfo()
+
+    def hasColumn(self, col):
+        """Check if a column of the view has been read in the chunk.
+
+        :Parameter col: the view column being checked
+        """
+        return (not self.projected) or (col in self.chunk)
+
+    def chunkColumns(self):
+        """The columns (cache keys) read in the current chunk."""
+
+        if self.projected:
+            return list(self.chunk)
+        if self.windowed:
+            # Column blocks are (first column, last column + 1, slab)
+            # tuples, so blocks of different hyperslabs never clash
+            cbsize = self.column_block_size
+            return [(page * cbsize, min((page + 1) * cbsize, self.ncols),
+                     self.slab)
+                    for page in range(self.col_start // cbsize,
+                                      (self.col_stop - 1) // cbsize + 1)]
+        return [None]
+
+    def readBlocks(self, start, stop, col=None):
+        """Read a range of rows via the blocks cache.
+
+        Blocks missing in the cache are read from the leaf. Contiguous
+        missing blocks are read with a single read operation.
+
+        :Parameters:
+
+        - `start`: the first row to read
+        - `stop`: the row after the last row to read
+        - `col`: the table column or column block to read (None for
+          other leaves)
+
+        :Returns: the rows in the range `[start, stop)`
+        """
+
+        bsize = self.block_size
+        first = start // bsize
+        last = max(stop - 1, start) // bsize
+        for run_first, run_last, run_col in self.missingRuns(start, stop,
+                                                             [col]):
+            self.fetchBlocks(run_first, run_last, run_col)
+
+        pieces = []
+        for b in range(first, last + 1):
+            self.blocks.move_to_end((b, col))
+            pieces.append(self.blocks[(b, col)])
+        offset = first * bsize
+        data = self.block_reader.sliceRows(self.joinBlocks(pieces),
+                                           start - offset, stop - offset)
+        self.evictBlocks()
+        return data
+
+    def missingRuns(self, start, stop, cols=None):
+        """The runs of contiguous blocks of a range missing in the cache.
+
+        :Parameters:
+
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+        - `cols`: the columns to check (the chunk columns by default)
+
+        :Returns: a list of `(first, last, col)` tuples
+        """
+
+        if cols is None:
+            cols = self.chunkColumns()
+        bsize = self.block_size
+        first = start // bsize
+        last = max(stop - 1, start) // bsize
+        runs = []
+        for col in cols:
+            col_runs = []
+            for b in range(first, last + 1):
+                if (b, col) in self.blocks:
+                    continue
+                if col_runs and col_runs[-1][1] == b - 1:
+                    col_runs[-1][1] = b
+                else:
+                    col_runs.append([b, b, col])
+            runs.extend(tuple(run) for run in col_runs)
+        return runs
+
+    def countLookups(self, start, stop, runs, cols):
+        """Record the cache hits and misses of a requested range.
+
+        :Parameters:
+
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+        - `runs`: the missing runs of the range (see :meth:`missingRuns`)
+        - `cols`: the requested columns
+        """
+
+        bsize = self.block_size
+        nblocks = (max(stop - 1, start) // bsize - start // bsize + 1) * \
+            len(cols)
+        misses = sum(last - first + 1 for first, last, col in runs)
+        self.stats.addLookups(nblocks - misses, misses)
+
+    def fetchBlocks(self, first, last, col=None):
+        """Read a run of contiguous blocks from the leaf and cache them.
+
+        :Parameters:
+
+        - `first`: the number of the first block of the run
+        - `last`: the number of the last block of the run
+        - `col`: the table column being read (None for other leaves)
+        """
+
+        blocks, lengths, read = self.block_reader.readRun(
+            self.leaf, first, last, col, self.total_nrows(),
+            self.row_lengths, self.max_vlrow_nbytes)
+        self.applyRuns(blocks, lengths, [read])
+
+    def applyRuns(self, blocks, lengths, reads):
+        """Cache runs of blocks read by a :class:`BlockReader`.
+
+        The lengths of the read VLArray rows are added to the row-length
+        index and the reads are recorded in the profiling counters.
+
+        :Parameters:
+
+        - `blocks`: a mapping of `(block number, col)` keys to blocks
+        - `lengths`: a mapping of block numbers to the lengths of the
+          rows of the blocks (empty for leaves other than VLArrays)
+        - `reads`: the `(rows, bytes, seconds)` tuples of the reads
+        """
+
+        self.cacheBlocks(blocks)
+        if lengths:
+            self.row_lengths.update(lengths)
+            self.max_vlrow_nbytes = max(
+                self.max_vlrow_nbytes,
+                self.block_reader.maxRowNBytes(lengths))
+        for read in reads:
+            self.stats.addRead(*read)
+
+    def rowLengths(self, start, stop):
+        """The lengths of a range of VLArray rows.
+
+        The row-length index maps block numbers to the lengths of the rows
+        of the block. It is built lazily: it only knows the rows read so
+        far.
+
+        :Parameters:
+
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+
+        :Returns: an array with the lengths or None if some row has not
+          been read yet
+        """
+
+        return self.block_reader.rowLengths(self.row_lengths, start, stop)
+
+    def isTruncated(self, row):
+        """Find out if a row is kept truncated in the buffer.
+
+        :Parameter row: the dataset row being checked
+        """
+
+        if not self.preview_length:
+            return False
+        lengths = self.rowLengths(row, row + 1)
+        return (lengths is not None) and (lengths[0] > self.preview_length)
+
+    def readRow(self, row):
+        """Read a whole row of the dataset.
+
+        :Parameter row: the dataset row being read
+        """
+        return self.leaf.read(row, row + 1)[0]
+
+    def cacheBlocks(self, blocks):
+        """Add blocks to the cache.
+
+        :Parameter blocks: a mapping of `(block number, col)` keys to blocks
+        """
+
+        for key, block in blocks.items():
+            if key in self.blocks:
+                continue
+            self.blocks[key] = block
+            self.cache_nbytes += blockNBytes(block, self.axis)
+
+    def requestBuffer(self, start, stop, callback, batch=None):
+        """Read a chunk from the data source without blocking (if possible).
+
+        If every row of the chunk is cached, or there is no background
+        reader, the chunk is read immediately. Otherwise the missing blocks
+        are requested to the background reader and the chunk will be
+        available when `callback` is called. Requesting a new chunk cancels
+        the previous request.
+
+        :Parameters:
+
+        - `start`: the document row that is the first row of the chunk.
+        - `stop`: the row after the last row to read.
+        - `callback`: the callable to be called when the chunk is read
+        - `batch`: a list where the request to the background reader is
+          appended instead of being made (see
+          :meth:`vitables.vttables.reader.BufferReader.requestBatch`)
+
+        :Returns: True if the chunk has been read immediately
+        """
+
+        self.serial += 1
+        self.pending = None
+        self.pending_columns.clear()
+        runs = []
+        if (self.leaf.shape != ()) and (self.mapped is None):
+            runs = self.missingRuns(start, stop)
+            self.countLookups(start, stop, runs, self.chunkColumns())
+        if (not runs) or (self.reader is None):
+            self.readBuffer(start, stop)
+            return True
+        self.pending = (start, stop)
+        self.callback = callback
+        if batch is None:
+            self.reader.request(self, runs, self.serial)
+        else:
+            batch.append((self, runs, self.serial))
+        return False
+
+    def requestColumns(self, cols, callback):
+        """Add columns to the chunk of a table without blocking (if possible).
+
+        This is the horizontal counterpart of :meth:`requestBuffer`. Column
+        requests are not cancelled by newer column requests, but they are
+        cancelled by chunk requests.
+
+        :Parameters:
+
+        - `cols`: the sequence of view columns being read
+        - `callback`: the callable to be called (with the list of read
+          columns) when the columns are read
+
+        :Returns: True if the columns have been read immediately
+        """
+
+        cols = [col for col in cols if not self.hasColumn(col)]
+        runs = []
+        if cols:
+            runs = self.missingRuns(self.start, self.stop, cols)
+            self.countLookups(self.start, self.stop, runs, cols)
+        if (not runs) or (self.reader is None):
+            self.readColumns(cols)
+            return True
+        self.pending_columns.update(cols)
+        self.columns_callback = callback
+        self.reader.request(self, runs)
+        return False
+
+    def blocksArrived(self, serial, blocks, lengths=None, reads=()):
+        """Receive the blocks read by the background reader.
+
+        :Parameters:
+
+        - `serial`: the serial number of the request (None for read aheads
+          and column requests)
+        - `blocks`: a mapping of `(block number, col)` keys to blocks (None
+          on failure)
+        - `lengths`: a mapping of block numbers to the lengths of the rows
+          of the read VLArray blocks
+        - `reads`: the `(rows, bytes, seconds)` tuples of the reads
+        """
+
+        if self.blocks is None:
+            return
+        if blocks:
+            self.applyRuns(blocks, lengths, reads)
+        if (serial is not None) and (serial == self.serial) and self.pending:
+            # If the background read failed the missing blocks are read
+            # (and the error reported) here
+            start, stop = self.pending
+            self.pending = None
+            self.readBuffer(start, stop)
+            self.callback()
+        elif self.pending_columns and ((blocks is None) or not
+                                       self.missingRuns(self.start, self.stop,
+                                                        self.pending_columns)):
+            cols = sorted(self.pending_columns)
+            self.pending_columns.clear()
+            self.readColumns(cols)
+            self.columns_callback(cols)
+        else:
+            self.evictBlocks()
+
+    def evictBlocks(self):
+        """Remove the least recently used blocks until the budget is met."""
+
+        while (self.cache_nbytes > self.cache_size) and \
+                (len(self.blocks) > 1):
+            key, block = self.blocks.popitem(last=False)
+            self.cache_nbytes -= blockNBytes(block, self.axis)
+
+    def clearCache(self):
+        """Remove every block from the cache."""
+
+        self.blocks.clear()
+        self.cache_nbytes = 0
+
+    def scheduleReadAhead(self, start, stop):
+        """Read the next block in the browsing direction when possible.
+
+        The block is read by the background reader (if any). Otherwise,
+        if the application event loop is running, the read ahead is
+        deferred until pending events have been processed so that the
+        current buffer fault is not delayed.
+
+        :Parameters:
+
+        - `start`: the first row of the current chunk
+        - `stop`: the row after the last row of the current chunk
+        """
+
+        if (self.leaf.shape == ()) or (self.mapped is not None):
+            return
+        if self.direction > 0:
+            block = stop // self.block_size
+        else:
+            block = start // self.block_size - 1
+        if (block < 0) or (block * self.block_size >= self.total_nrows()):
+            return
+        runs = [(block, block, col) for col in self.chunkColumns()
+                if (block, col) not in self.blocks]
+        if not runs:
+            return
+        if self.reader is not None:
+            self.reader.request(self, runs)
+        elif QtCore.QCoreApplication.instance() is None:
+            self.readAhead(runs)
+        else:
+            QtCore.QTimer.singleShot(0, lambda: self.readAhead(runs))
+
+    def readAhead(self, runs):
+        """Read some blocks into the cache (if they are not cached yet).
+
+        :Parameter runs: a sequence of `(first, last, col)` tuples
+        """
+
+        # The leaf may have been closed before a deferred read ahead happens
+        if (self.blocks is None) or not self.leaf._v_isopen:
+            return
+        try:
+            for first, last, col in runs:
+                if (first, col) not in self.blocks:
+                    self.fetchBlocks(first, last, col)
+        except tables.HDF5ExtError:
+            # Errors will be reported when the block is actually needed
+            return
+        self.evictBlocks()
+
+    def joinBlocks(self, blocks):
+        """Join a sequence of consecutive blocks.
+
+        :Parameter blocks: the sequence of blocks being joined
+        """
+
+        if len(blocks) == 1:
+            return blocks[0]
+        if self.axis is None:
+            return [row for block in blocks for row in block]
+        return np.concatenate(blocks, axis=self.axis)
 
     def scalarCell(self, row, col):
         """
@@ -229,17 +1327,13 @@ class Buffer:
 
         # The row-coordinate must be shifted by model.start units in order to
         # get the right chunk element.
-        # chunk = [row0, row1, row2, ..., rowN]
-        # and columns can be read from a given row using indexing notation
-        # Get data for cell
-        cell_data = np.take(self.chunk, [row], axis=self.leaf.maindim)
-        # Remove extra dimension
-        cell_data = np.squeeze(cell_data, axis=self.leaf.maindim)
-        return cell_data
+        # The rows view has the main dimension first:
+        # rows_view = [row0, row1, row2, ..., rowN]
+        return self.rows_view[row]
 
     def arrayCell(self, row, col):
         """
-        Returns a cell of a ND-array view or a table view.
+        Returns a cell of a ND-array view.
 
         The indices values are not checked (and could not be in the
         buffer) so they should be checked by the caller methods.
@@ -256,7 +1350,75 @@ class Buffer:
         # For arrays we have
         # chunk = [row0, row1, row2, ..., rowN]
         # and columns can be read from a given row using indexing notation
-        # For tables we have
-        # chunk = [nestedrecord0, nestedrecord1, ..., nestedrecordN]
-        # and fields can be read from nestedrecordJ using indexing notation
         return self.chunk[row][col]
+
+    def scalarColumn(self, col):
+        """
+        Returns the cells of a column of a scalar array view.
+
+        :Parameter col: the column being read
+        :Returns: a sequence with the cells of the column in the buffer
+        """
+        return [self.chunk[()]]
+
+    def vectorColumn(self, col):
+        """
+        Returns the cells of a column of a 1D-array view.
+
+        :Parameter col: the column being read
+        :Returns: a sequence with the cells of the column in the buffer
+        """
+        return self.chunk
+
+    def EArrayColumn(self, col):
+        """
+        Returns the cells of a column of a EArray view.
+
+        :Parameter col: the column being read
+        :Returns: a sequence with the cells of the column in the buffer
+        """
+
+        # Every cell is a slice of the chunk along the main dimension
+        return self.rows_view
+
+    def arrayColumn(self, col):
+        """
+        Returns the cells of a column of a ND-array view.
+
+        :Parameter col: the column being read
+        :Returns: a sequence with the cells of the column in the buffer
+        """
+        return self.chunk[:, col]
+
+    def fieldColumn(self, col):
+        """
+        Returns the cells of a column of a table view.
+
+        The column is read (if needed) before returning it.
+
+        :Parameter col: the column being read
+        :Returns: a sequence with the cells of the column in the buffer
+        """
+
+        if col not in self.chunk:
+            self.readColumns([col])
+        return self.chunk[col]
+
+    def fieldCell(self, row, col):
+        """
+        Returns a cell of a table view.
+
+        The column is read (if needed) before returning the cell. The
+        indices values are not checked (and could not be in the buffer) so
+        they should be checked by the caller methods.
+
+        :Parameters:
+        - `row`: the row to which the cell belongs.
+        - `col`: the column to wich the cell belongs
+
+        :Returns: the cell at position `(row, col)` of the document
+        """
+
+        if col not in self.chunk:
+            self.readColumns([col])
+        return self.chunk[col][row]
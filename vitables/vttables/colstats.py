@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Statistics of the columns of leaves.
+
+The statistics of a column (count, null count, minimum, maximum, mean,
+standard deviation and histogram) are computed scanning the leaf chunk by
+chunk, so columns of any size can be summarised with bounded memory.
+Every chunk is reduced with vectorized ``numpy`` operations and merged
+into the running statistics (see :class:`ColumnStats`). Chunks are read
+with a :class:`vitables.vttables.buffer.BlockReader`, so scans can run in
+worker threads.
+
+Scans are run by a :class:`StatsScanner` (see
+:mod:`vitables.vttables.scantask`), so they don't block the GUI, report
+their progress and can be cancelled. The statistics of leaves of read-only
+files are kept in the metadata cache (see :mod:`vitables.metacache`), so
+they are computed only once.
+"""
+
+import logging
+
+import numpy as np
+import tables
+
+from vitables import metacache
+from vitables.vttables import buffer, scantask
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The number of bins of the histograms (an even number).
+HISTOGRAM_BINS = 64
+
+#: The memory budget (in bytes) of every chunk read by a scan.
+SCAN_MEMORY = 16 * 2 ** 20
+
+#: The kinds of ``numpy`` dtypes whose statistics can be computed.
+NUMERIC_KINDS = 'biuf'
+
+
+class ColumnStats:
+    """The statistics of a column, accumulated chunk by chunk.
+
+    `NaN` values are counted as nulls. The mean and the variance of every
+    chunk are merged with the running ones using the pairwise update of
+    Chan et al., so they are computed in a single pass.
+
+    The histogram has a fixed number of bins. Its range is given by the
+    first chunk and doubled (merging pairs of bins) every time a value
+    falls out of it, so bins are always aligned and counts are exact.
+
+    :Parameter bins: the number of bins of the histogram
+    """
+
+    def __init__(self, bins=HISTOGRAM_BINS):
+        """Create empty statistics."""
+
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.
+        self.m2 = 0.
+        self.low = None
+        self.width = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values):
+        """Add a chunk of values to the statistics.
+
+        :Parameter values: a ``numpy`` array (of any shape) of values
+        """
+
+        values = np.asarray(values).ravel()
+        if values.dtype.kind == 'b':
+            values = values.view(np.uint8)
+        if values.dtype.kind == 'f':
+            valid = ~np.isnan(values)
+            nulls = values.size - int(np.count_nonzero(valid))
+            if nulls:
+                self.nulls += nulls
+                values = values[valid]
+        size = values.size
+        if not size:
+            return
+        low, high = values.min(), values.max()
+        if self.minimum is None:
+            self.minimum, self.maximum = low, high
+        else:
+            self.minimum = min(self.minimum, low)
+            self.maximum = max(self.maximum, high)
+        values = values.astype(np.float64)
+        mean = values.mean()
+        m2 = np.square(values - mean).sum()
+        total = self.count + size
+        delta = mean - self.mean
+        self.mean += delta * size / total
+        self.m2 += m2 + delta * delta * self.count * size / total
+        self.count = total
+        self.addToHistogram(values)
+
+    def addToHistogram(self, values):
+        """Add some (non null) values to the histogram.
+
+        Infinite values are not binned.
+
+        :Parameter values: an array of ``float64`` values
+        """
+
+        finite = values[np.isfinite(values)]
+        if not finite.size:
+            return
+        low, high = float(finite.min()), float(finite.max())
+        bins = len(self.counts)
+        if self.low is None:
+            self.low = low
+            self.width = ((high - low) / bins) or (max(abs(low), 1.) / bins)
+        while low < self.low:
+            self.expand(left=True)
+        while high > self.low + self.width * bins:
+            self.expand(left=False)
+        positions = ((finite - self.low) / self.width).astype(np.int64)
+        np.clip(positions, 0, bins - 1, out=positions)
+        self.counts += np.bincount(positions, minlength=bins)
+
+    def expand(self, left):
+        """Double the range of the histogram.
+
+        :Parameter left: True if the range grows towards lower values
+        """
+
+        bins = len(self.counts)
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        empty = np.zeros(bins // 2, dtype=np.int64)
+        if left:
+            self.low -= self.width * bins
+            self.counts = np.concatenate((empty, merged))
+        else:
+            self.counts = np.concatenate((merged, empty))
+        self.width *= 2
+
+    def result(self):
+        """The statistics as a mapping of plain Python values.
+
+        Empty bins at both ends of the histogram are dropped.
+
+        :Returns: a dictionary with the `count`, `nulls`, `min`, `max`,
+          `mean` and `std` (population standard deviation) values and the
+          `edges` and `counts` of the histogram
+        """
+
+        stats = {'count': self.count, 'nulls': self.nulls, 'min': None,
+                 'max': None, 'mean': None, 'std': None, 'edges': [],
+                 'counts': []}
+        if self.count:
+            stats.update({
+                'min': self.minimum.item(), 'max': self.maximum.item(),
+                'mean': float(self.mean),
+                'std': float(np.sqrt(self.m2 / self.count))})
+        used = np.flatnonzero(self.counts)
+        if used.size:
+            first, last = int(used[0]), int(used[-1]) + 1
+            edges = self.low + self.width * np.arange(first, last + 1)
+            stats['edges'] = edges.tolist()
+            stats['counts'] = self.counts[first:last].tolist()
+        return stats
+
+
+class ColumnScan:
+    """The plan for reading the values of a column of a leaf in chunks.
+
+    The column is a field of a table (every element of multidimensional
+    fields is used), a column of a bidimensional array or, for other
+    arrays, the whole array.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance being scanned
+    - `col`: the view column being scanned
+
+    :Raises: `TypeError` if the column is not numeric
+    """
+
+    def __init__(self, leaf, col):
+        """Setup the scan."""
+
+        # Only the reading parameters of the buffer are kept, its block
+        # reader and memory map can be used from worker threads
+        rbuffer = buffer.Buffer(leaf)
+        self.block_reader = rbuffer.block_reader
+        self.mapped = rbuffer.mapped
+        self.nrows = rbuffer.total_nrows()
+        self.col = col
+        self.key = None
+        self.matrix = False
+        self.column_name = ''
+        if isinstance(leaf, tables.Table):
+            self.key = col
+            self.column_name = leaf.colnames[col]
+            dtype = leaf.coldtypes[self.column_name]
+        elif isinstance(leaf, tables.VLArray):
+            raise TypeError(f'{leaf._v_pathname} is not a numeric array')
+        else:
+            dtype = leaf.atom.dtype
+            if self.isMatrix(leaf):
+                self.matrix = True
+                self.column_name = str(col)
+                if rbuffer.windowed:
+                    # Read a single column, not whole rows
+                    self.key = (col, col + 1, None)
+        if (dtype.kind not in NUMERIC_KINDS) or (dtype.fields is not None):
+            raise TypeError(f'{self.column_name or leaf._v_pathname} is not '
+                            'a numeric column')
+        # Chunks are made of whole blocks, so HDF5 chunks are read once
+        rowsize = max(rbuffer.rowsize, 1)
+        block_size = rbuffer.block_size
+        self.chunk_rows = max(SCAN_MEMORY // rowsize // block_size, 1) * \
+            block_size
+
+    def isMatrix(self, leaf):
+        """Find out if a leaf is displayed as a matrix of columns.
+
+        :Parameter leaf: the leaf being scanned
+        """
+
+        return (len(leaf.shape) == 2) and \
+            not isinstance(leaf, tables.EArray) and \
+            (getattr(leaf, 'maindim', 0) == 0)
+
+    def kind(self):
+        """The kind of the statistics in the metadata cache."""
+        return f'column_stats:{self.column_name}'
+
+    def chunks(self, leaf):
+        """Read the values of the column chunk by chunk.
+
+        :Parameter leaf: the leaf being scanned (it may be a handle owned
+          by a worker thread)
+        :Returns: an iterator of `(stop, values)` tuples, where `stop` is
+          the row after the last row of the chunk
+        """
+
+        block_reader = self.block_reader
+        for start in range(0, self.nrows, self.chunk_rows):
+            stop = min(start + self.chunk_rows, self.nrows)
+            if leaf.shape == ():
+                data = leaf.read()
+            elif self.mapped is not None:
+                data = self.mapped[start:stop]
+                if self.matrix:
+                    data = data[:, self.col]
+            elif self.matrix and (self.key is None):
+                data = block_reader.readRows(leaf, start, stop)[:, self.col]
+            else:
+                data = block_reader.readRows(leaf, start, stop, self.key)
+            yield stop, data
+
+    def run(self, leaf, stats):
+        """Scan the column, accumulating its statistics.
+
+        :Parameters:
+
+        - `leaf`: the leaf being scanned
+        - `stats`: the :class:`ColumnStats` instance being updated
+
+        :Returns: an iterator of the fraction of rows scanned so far
+        """
+
+        for stop, values in self.chunks(leaf):
+            stats.update(values)
+            yield stop / self.nrows
+
+
+class StatsScanner(scantask.ScanTask):
+    """Compute the statistics of a column without blocking the GUI.
+
+    The statistics of leaves of read-only files are kept in the metadata
+    cache.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance being scanned
+    - `col`: the view column being scanned
+    - `parent`: the parent of this object
+
+    :Raises: `TypeError` if the column is not numeric
+    """
+
+    def __init__(self, leaf, col, parent=None):
+        """Setup the scanner."""
+
+        self.scan = ColumnScan(leaf, col)
+        self.stats = None
+        super(StatsScanner, self).__init__(leaf, parent=parent)
+
+    def cachedResult(self):
+        """The statistics of the column kept in the metadata cache.
+
+        :Returns: the statistics or None if they are not cached
+        """
+
+        if not self.background:
+            return None
+        return metacache.getCache().get(self.filepath, self.nodepath,
+                                        self.scan.kind())
+
+    def steps(self, leaf):
+        """Scan the column of a leaf.
+
+        :Parameter leaf: the leaf being scanned
+        :Returns: an iterator of the fraction of rows scanned so far
+        """
+
+        self.stats = ColumnStats()
+        return self.scan.run(leaf, self.stats)
+
+    def result(self):
+        """The statistics of the column (see :meth:`ColumnStats.result`)."""
+        return self.stats.result()
+
+    def completed(self, result):
+        """Keep the statistics of leaves of read-only files in the cache.
+
+        :Parameter result: the statistics of the column
+        """
+
+        if self.background:
+            metacache.getCache().put(self.filepath, self.nodepath,
+                                     self.scan.kind(), result)
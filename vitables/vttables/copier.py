@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Copy ranges of cells of leaves as tab separated text.
+
+A range of cells is given by absolute row and column coordinates, so it
+is not limited to the chunk of rows loaded by the view. A
+:class:`RangeCopier` reads the range straight from the leaf in large
+chunks (with a :class:`vitables.vttables.buffer.BlockReader`, so copies
+can run in worker threads) and formats every column of a chunk in one
+pass (see :func:`vitables.utils.formatArrayColumn`). Rows are separated
+by newlines and cells by tabs.
+
+The copy is run by a :class:`CopyTask` (see
+:mod:`vitables.vttables.scantask`) that collects the text for the
+clipboard or writes it to a file, chunk by chunk. The text copied to the
+clipboard is kept in memory, so its size is limited (see
+:data:`CLIPBOARD_MEMORY`): larger ranges must be exported to a file.
+"""
+
+import io
+import logging
+
+import numpy as np
+import tables
+
+import vitables.utils
+from vitables.vttables import buffer, scantask
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The memory budget (in bytes) of every chunk read by a copy.
+COPY_MEMORY = 8 * 2 ** 20
+
+#: The largest text (in characters) copied to the clipboard.
+CLIPBOARD_MEMORY = 64 * 2 ** 20
+
+
+class RangeCopier:
+    """Format a range of cells of a leaf as tab separated text.
+
+    Rows are read in the order of the view (see
+    :mod:`vitables.vttables.sorting`).
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance being copied
+    - `cell_range`: the `(start, stop, col_start, col_stop)` tuple of the
+      copied rows and view columns (stops are excluded)
+    - `format_content`: the function used by the model for formatting
+      cells
+    - `order`: the sorting order of the rows of a table (None for storage
+      order)
+    - `slab`: the `(row axis, column axis, indices)` tuple of the 2-D
+      hyperslab displayed for a N-dimensional array (None for the default
+      view)
+    """
+
+    def __init__(self, leaf, cell_range, format_content, order=None,
+                 slab=None):
+        """Setup the copier."""
+
+        # Only the reading parameters of the buffer are kept, its block
+        # reader and memory map can be used from worker threads
+        rbuffer = buffer.Buffer(leaf, order=order)
+        if slab is not None:
+            rbuffer.setHyperslab(*slab)
+        self.block_reader = rbuffer.block_reader
+        self.mapped = rbuffer.mapped
+        self.slab = rbuffer.slab
+        self.start, self.stop, self.col_start, self.col_stop = cell_range
+        self.format_content = format_content
+        # Arrays with more than one dimension are displayed as matrices
+        self.matrix = not isinstance(
+            leaf, (tables.Table, tables.EArray, tables.VLArray)) and \
+            (len(leaf.shape) > 1)
+        self.chunk_rows = max(COPY_MEMORY // max(rbuffer.rowsize, 1), 1)
+        self.nrows = 0
+
+    def readColumns(self, leaf, start, stop):
+        """Read the copied columns of a range of rows.
+
+        :Parameters:
+
+        - `leaf`: the leaf being copied (it may be a handle owned by a
+          worker thread)
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+
+        :Returns: a list with the cells of every copied column
+        """
+
+        block_reader = self.block_reader
+        cols = range(self.col_start, self.col_stop)
+        if block_reader.fields is not None:
+            return [block_reader.readRows(leaf, start, stop, col)
+                    for col in cols]
+        if leaf.shape == ():
+            return [[leaf.read()]]
+        if isinstance(leaf, tables.VLArray):
+            return [block_reader.readRows(leaf, start, stop)]
+        if block_reader.windowed:
+            data = block_reader.readRows(
+                leaf, start, stop,
+                (self.col_start, self.col_stop, self.slab))
+            return [data[:, col] for col in range(data.shape[1])]
+        if self.mapped is not None:
+            data = self.mapped[start:stop]
+        else:
+            data = np.moveaxis(block_reader.readRows(leaf, start, stop),
+                               block_reader.axis, 0)
+        if self.matrix:
+            return [data[:, col] for col in cols]
+        return [data]
+
+    def formatColumn(self, column):
+        """Format the cells of a column in one pass.
+
+        Tabs and newlines (multidimensional cells are formatted in several
+        lines) are replaced by spaces.
+
+        :Parameter column: the cells of the column
+        :Returns: a list of texts
+        """
+
+        if self.format_content is vitables.utils.formatArrayContent:
+            texts = vitables.utils.formatArrayColumn(column)
+            if isinstance(column, np.ndarray) and (column.ndim == 1) and \
+                    (column.dtype.kind in 'biuf'):
+                return texts
+        else:
+            texts = [self.format_content(content) for content in column]
+        return [str(text).replace('\t', ' ').replace('\n', ' ')
+                for text in texts]
+
+    def copy(self, leaf, out_handler):
+        """Write the range of cells as text.
+
+        The number of copied rows is stored in the `nrows` attribute.
+
+        :Parameters:
+
+        - `leaf`: the leaf being copied
+        - `out_handler`: the text stream where the cells are written
+
+        :Returns: an iterator of the fraction of rows copied so far
+        """
+
+        self.nrows = 0
+        total = max(self.stop - self.start, 1)
+        for first in range(self.start, self.stop, self.chunk_rows):
+            last = min(first + self.chunk_rows, self.stop)
+            texts = [self.formatColumn(column)
+                     for column in self.readColumns(leaf, first, last)]
+            out_handler.write(''.join(
+                '\t'.join(cells) + '\n' for cells in zip(*texts)))
+            self.nrows += last - first
+            yield self.nrows / total
+
+
+class CopyTask(scantask.ScanTask):
+    """Copy a range of cells without blocking the GUI.
+
+    The result is the copied text or, if the cells are written to a file,
+    the number of copied rows. Copies to the clipboard fail if the text
+    exceeds :data:`CLIPBOARD_MEMORY` characters.
+
+    :Parameters:
+
+    - `copier`: the :class:`RangeCopier` instance doing the copy
+    - `leaf`: the leaf being copied
+    - `filepath`: the file where the cells are written (None for keeping
+      them in memory)
+    - `parent`: the parent of this object
+    """
+
+    def __init__(self, copier, leaf, filepath=None, parent=None):
+        """Setup the copy."""
+
+        self.copier = copier
+        self.out_filepath = filepath
+        self.text = None
+        # Sorting orders may not be readable from the worker thread
+        order = copier.block_reader.order
+        background = (leaf._v_file.mode == 'r') and \
+            ((order is None) or order.threadsafe)
+        super(CopyTask, self).__init__(leaf, background, parent)
+
+    def steps(self, leaf):
+        """Copy the cells.
+
+        :Parameter leaf: the leaf being copied
+        """
+
+        if self.out_filepath is None:
+            self.text = io.StringIO()
+            for fraction in self.copier.copy(leaf, self.text):
+                if self.text.tell() > CLIPBOARD_MEMORY:
+                    self.text = None
+                    raise ValueError(
+                        f'the selected cells exceed the '
+                        f'{CLIPBOARD_MEMORY // 2 ** 20}M characters that '
+                        f'can be copied to the clipboard, export them to a '
+                        f'file instead')
+                yield fraction
+        else:
+            with open(self.out_filepath, 'w', encoding='utf-8',
+                      newline='') as out_handler:
+                yield from self.copier.copy(leaf, out_handler)
+
+    def finishScan(self, result, error):
+        """Deliver the result of the copy.
+
+        Errors opening or writing the target file are reported as such.
+
+        :Parameters:
+
+        - `result`: the result (None if the copy was cancelled or failed)
+        - `error`: the exception raised by the copy (if any)
+        """
+
+        if (self.out_filepath is not None) and isinstance(error, OSError):
+            log.error(f'Unable to write the selected cells to '
+                      f'{self.out_filepath}: {error}')
+            self.scanFinished.emit(None)
+            return
+        super(CopyTask, self).finishScan(result, error)
+
+    def result(self):
+        """The copied text (or the number of rows written to a file)."""
+
+        if self.out_filepath is None:
+            return self.text.getvalue()
+        return self.copier.nrows
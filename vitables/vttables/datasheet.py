@@ -30,7 +30,8 @@ from qtpy import QtCore, QtWidgets
 from .. import utils as vtutils
 from ..nodeprops import nodeinfo
 from ..vtwidgets import zoom_cell
-from . import df_model, leaf_model, leaf_view
+from . import (df_model, find_bar, hyperslab_selector, leaf_model,
+               leaf_view)
 
 __docformat__ = 'restructuredtext'
 
@@ -71,7 +72,26 @@ class DataSheet(QtWidgets.QMdiSubWindow):
 
         super(DataSheet, self).__init__(self.vtgui.workspace,
                                         QtCore.Qt.SubWindow)
-        self.setWidget(self.leaf_view)
+        container = QtWidgets.QWidget(self)
+        layout = QtWidgets.QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        if getattr(self.leaf_model, 'sliceable', False):
+            # N-dimensional arrays are displayed as 2-D hyperslabs chosen
+            # with a selector placed above the view
+            self.selector = hyperslab_selector.HyperslabSelector(leaf.shape)
+            layout.addWidget(self.selector)
+            self.selector.hyperslabChanged.connect(
+                self.leaf_model.setHyperslab)
+        layout.addWidget(self.leaf_view)
+        # The find bar is placed below the view and shown on demand
+        self.find_bar = None
+        if isinstance(self.leaf_model, leaf_model.LeafModel) and \
+                not self.leaf_model.is_filenode:
+            self.find_bar = find_bar.FindBar(self.leaf_view, container)
+            self.find_bar.hide()
+            layout.addWidget(self.find_bar)
+        self.setWidget(container)
         self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
 
         # Customize the title bar
@@ -101,6 +121,10 @@ class DataSheet(QtWidgets.QMdiSubWindow):
 
         # Ensure that Node menu actions are properly updated
         self.dbt_leaf.has_view = False
+        # Release the sorted view data (if any)
+        order = getattr(self.leaf_model, 'order', None)
+        if order is not None:
+            order.close()
         self.vtgui.updateActions()
 
         # Propagate the event. In the process, self.widget().closeEvent
@@ -159,7 +183,8 @@ class DataSheet(QtWidgets.QMdiSubWindow):
             col = info.columns_names[column]
             title = f'{node.name}: {col}[{tmodel.start + row}]'
         else:
-            title = f'{node.name}: ({tmodel.start + row},{column})'
+            title = (f'{node.name}: ({tmodel.start + row},'
+                     f'{tmodel.col_start + column})')
 
         zoom_cell.ZoomCell(data, title, self.vtgui.workspace,
                            self.dbt_leaf)
@@ -19,12 +19,19 @@
 """
 This module implements a model (in the `MVC` sense) for the real data stored
 in a Pandas HDFStore.
+
+Every column of a chunk is converted to strings in one pass the first time
+one of its cells is painted (labels are converted level by level when the
+chunk is read), so painting a cell is a simple lookup. DataFrames stored in
+the ``table`` format are read by columns too: reading a chunk reads only
+its index, and columns are read in small batches as they are displayed.
 """
 
 __docformat__ = 'restructuredtext'
 
 import logging
 
+import numpy as np
 from qtpy import QtCore, QtGui
 from qtpy.QtCore import Qt
 
@@ -84,6 +91,45 @@ def get_index_name(index, i, fallback_pattern):
     return val
 
 
+def renderValues(values):
+    """Convert a column (or an index level) of a chunk to strings.
+
+    Numeric columns are converted by ``numpy`` at once, which gives the
+    same strings that converting every value does. Other columns are
+    converted value by value, but only once per chunk.
+
+    :Parameter values: the `pandas.Series` or `pandas.Index` being converted
+    :Returns: a list with a string per value
+    """
+
+    array = values.to_numpy()
+    if array.dtype.kind in 'biufc':
+        return array.astype(str).tolist()
+    return [str(value) for value in values]
+
+
+def storedColumns(storer):
+    """The labels of the columns of a DataFrame stored in the table format.
+
+    :Parameter storer: the storer of the DataFrame in the store
+    :Returns: the list of labels or None if the DataFrame is stored in the
+      fixed format (such DataFrames cannot be read by columns)
+    """
+
+    if not getattr(storer, 'is_table', False):
+        return None
+    try:
+        labels = storer.non_index_axes[0][1]
+    except (AttributeError, IndexError, TypeError):
+        return None
+    # The levels of a MultiIndex are stored as columns too (for other
+    # indexes `levels` is the number of levels)
+    levels = getattr(storer, 'levels', None)
+    if not isinstance(levels, list):
+        levels = []
+    return [label for label in labels if label not in levels]
+
+
 class DataFrameModel(QtCore.QAbstractTableModel):
     """
     The model for data contained in pandas DataFrame chunks.
@@ -96,14 +142,21 @@ class DataFrameModel(QtCore.QAbstractTableModel):
         the total number of rows in the underlying data
     :attribute numrows:
         The number of rows visible which equals the chunking-size.
+    :attribute leaf_numcols:
+        the total number of columns in the underlying data
     :attribute numcols:
-        The total number of columns visible, equal to those visible.
+        The number of columns visible. It is smaller than the total number
+        of columns only for very wide DataFrames stored in the table format.
     :attribute start:
         The zero-based starting index of the chunk within the total rows.
+    :attribute col_start:
+        The zero-based starting index of the chunk within the total columns.
     :attribute _nheaders:
         A tuple ``(row_span, col_span)`` for the number of *columns/indices*
         headers respectively, in case they are pandas multi-index, or
         just ``(1, 1)``.
+    :attribute rendered:
+        The converted cells of the chunk, keyed by column.
     """
 
     def __init__(self, leaf, hstore, parent=None):
@@ -114,6 +167,7 @@ class DataFrameModel(QtCore.QAbstractTableModel):
 
         self._hstore = hstore
         self.start = 0
+        self.col_start = 0
 
         # The dataset number of rows is potentially huge but tables are
         #  kept small: just the data returned by a read operation of the
@@ -121,13 +175,23 @@ class DataFrameModel(QtCore.QAbstractTableModel):
         self.leaf_numrows = leaf.shape[0]
         self.numrows = min(self.leaf_numrows, leaf_model.CHUNK_SIZE)
 
+        # DataFrames in the table format are read by columns so, like
+        # arrays with a huge second dimension, very wide DataFrames are
+        # read in chunks of columns
+        self._columns = storedColumns(hstore.get_storer(self._pgroup))
+        if self._columns is not None:
+            self.leaf_numcols = len(self._columns)
+            self.numcols = min(self.leaf_numcols, leaf_model.CHUNK_COLUMNS)
+
         # Track selected cell.
         self.selected_cell = {'index': QtCore.QModelIndex(), 'buffer_start': 0}
 
         # Populate the model with the first chunk of data.
         self.loadData(0, self.numrows)
         chunk = self._chunk
-        self.numcols = len(chunk.columns)
+        if self._columns is None:
+            self.numcols = len(chunk.columns)
+            self.leaf_numcols = self.numcols
 
         def count_multiindex(index):
             try:
@@ -192,9 +256,104 @@ class DataFrameModel(QtCore.QAbstractTableModel):
         actual_start = stop - self.numrows
         start = max(min(actual_start, start), 0)
 
-        self._chunk = self._hstore.select(self._pgroup,
-                                          start=start, stop=stop)
+        # The columns of DataFrames in the table format are read later, as
+        # they are displayed (see readColumns)
+        columns = None if self._columns is None else []
+        self._chunk = self._hstore.select(self._pgroup, start=start,
+                                          stop=stop, columns=columns)
         self.start = start
+        self._stop = stop
+        # The columns read so far, keyed by label
+        self._values = {}
+        self.rendered = {}
+        self.renderChunk()
+
+    def loadColumnData(self, start, width):
+        """Load the model with a fresh range of columns.
+
+        This is the horizontal counterpart of :meth:`loadData`. It is used
+        only with DataFrames too wide to be read at once.
+
+        :param start:
+            the document column that is the first column of the chunk.
+        :param width:
+            the number of columns to be read.
+        """
+
+        start = max(min(start, self.leaf_numcols - width), 0)
+        if start == self.col_start:
+            return
+        self.col_start = start
+        self.loadData(self.start, self.numrows)
+
+    def renderChunk(self):
+        """Convert the labels of the chunk to strings.
+
+        The index labels and the columns labels are converted level by
+        level. Cells are converted later, by :meth:`renderColumn`.
+        """
+
+        chunk = self._chunk
+        self._index_cells = [renderValues(chunk.index.get_level_values(level))
+                             for level in range(chunk.index.nlevels)]
+        if self._columns is None:
+            self._columns_cells = [
+                renderValues(chunk.columns.get_level_values(level))
+                for level in range(chunk.columns.nlevels)]
+        else:
+            labels = self._columns[self.col_start:
+                                   self.col_start + self.numcols]
+            self._columns_cells = [[str(label) for label in labels]]
+
+    def columnValues(self, col):
+        """The values of a column of the chunk.
+
+        Columns of DataFrames in the table format are read, together with
+        the next ones, if they have not been read yet.
+
+        :Parameter col: the column of the chunk
+        :Returns: the column as a `pandas.Series`
+        """
+
+        if self._columns is None:
+            return self._chunk.iloc[:, col]
+        label = self._columns[self.col_start + col]
+        if label not in self._values:
+            self.readColumns(col)
+        return self._values[label]
+
+    def readColumns(self, col):
+        """Read a batch of columns of the chunk, starting at a given column.
+
+        Like the columns of tables (see
+        :meth:`vitables.vttables.leaf_model.LeafModel.loadColumns`), the
+        columns next to the displayed one are read too, so scrolling
+        horizontally doesn't read the columns one by one.
+
+        :Parameter col: the first column of the batch
+        """
+
+        stop = min(col + leaf_model.COLUMNS_BATCH, self.numcols)
+        labels = [label for label in
+                  self._columns[self.col_start + col:self.col_start + stop]
+                  if label not in self._values]
+        columns = self._hstore.select(self._pgroup, start=self.start,
+                                      stop=self._stop, columns=labels)
+        for label in labels:
+            self._values[label] = columns[label]
+
+    def renderColumn(self, col):
+        """Convert a column of the chunk to strings in one pass.
+
+        Every column is converted the first time one of its cells is
+        displayed, so columns out of the viewport are neither read nor
+        converted.
+
+        :Parameter col: the column of the chunk
+        :Returns: a list with the converted cells of the column
+        """
+
+        return renderValues(self.columnValues(col))
 
     def get_corner_span(self):
         """Must return ``(row_span, col_span)`` tuple for the top-left cell."""
@@ -226,7 +385,7 @@ class DataFrameModel(QtCore.QAbstractTableModel):
             if orientation == Qt.Horizontal:
                 if is_header:
                     return get_index_name(self._chunk.index, section, 'I%s')
-                return str(section)
+                return str(self.col_start + section)
 
             if orientation == Qt.Vertical:
                 if is_header:
@@ -249,7 +408,6 @@ class DataFrameModel(QtCore.QAbstractTableModel):
         """
         row, col = index.row(), index.column()
         n_columns, n_index = self._nheaders
-        df = self._chunk
 
         if not index.isValid() or not (0 <= row < (self.numrows + n_columns)):
             return None
@@ -262,10 +420,7 @@ class DataFrameModel(QtCore.QAbstractTableModel):
 
         if is_index:
             if role == Qt.DisplayRole:
-                val = df.index[row - n_columns]
-                if n_index > 1:
-                    val = val[col]
-                return str(val)
+                return self._index_cells[col][row - n_columns]
             if role == Qt.FontRole:
                 return _axis_font
             if role == Qt.TextAlignmentRole:
@@ -274,10 +429,7 @@ class DataFrameModel(QtCore.QAbstractTableModel):
 
         if is_columns:
             if role == Qt.DisplayRole:
-                val = df.columns[col - n_index]
-                if n_columns > 1:
-                    val = val[row]
-                return str(val)
+                return self._columns_cells[row][col - n_index]
             if role == Qt.FontRole:
                 return _axis_font
             if role == Qt.TextAlignmentRole:
@@ -285,7 +437,11 @@ class DataFrameModel(QtCore.QAbstractTableModel):
             return
 
         if role == Qt.DisplayRole:
-            return str(self._chunk.iat[row - n_columns, col - n_index])
+            col -= n_index
+            texts = self.rendered.get(col)
+            if texts is None:
+                texts = self.rendered[col] = self.renderColumn(col)
+            return texts[row - n_columns]
 
         # if role == Qt.TextAlignmentRole:
         #     return int(Qt.AlignLeft|Qt.AlignTop)
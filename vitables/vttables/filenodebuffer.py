@@ -27,14 +27,16 @@ consequence, views (widgets showing a tabular representation of the dataset)
 are painted much faster too.
 """
 
-import linecache
 import logging
+import time
 import warnings
 
 import numpy as np
 import tables
+from tables.nodes import filenode
 
 from .. import utils as vtutils
+from . import readstats
 
 __docformat__ = 'restructuredtext'
 
@@ -58,14 +60,21 @@ class FilenodeBuffer:
     in buffer are numbered from 0 to N (as it happens with the data
     source).
 
-    Filenodes are displayed in Mx1 table widgets.
+    Filenodes are displayed in Mx1 table widgets, one line per row. Lines
+    are read from the filenode itself: the index of line offsets built
+    when the filenode is opened (see
+    :func:`vitables.filenodeutils.lineOffsets`) gives the range of bytes
+    of every chunk.
 
-    :Parameter leaf:
-        the data source (`tables.EArray` instance) from which data are
-        going to be read.
+    :Parameters:
+
+    - `leaf`: the data source (`tables.EArray` instance) from which data
+      are going to be read.
+    - `offsets`: the line offsets of the filenode (by default they are
+      taken from the filenodes tracked by the application)
     """
 
-    def __init__(self, leaf):
+    def __init__(self, leaf, offsets=None):
         """
         Initializes the buffer.
         """
@@ -74,39 +83,84 @@ class FilenodeBuffer:
         # The structure where read data will be stored.
         self.chunk = np.array([])
 
-        vtapp = vtutils.getApp()
-        self.temp_filenode, self.total_rows = vtapp.filenodes_map[leaf]
+        if offsets is None:
+            offsets = vtutils.getApp().filenodes_map[leaf]
+        self.offsets = offsets
+        self.total_rows = len(self.offsets) - 1
+        self.fnode = filenode.open_node(leaf, 'r')
+        # Profiling counters
+        self.stats = readstats.ReadStats(leaf._v_pathname)
 
     def __del__(self):
         """Release resources before destroying the buffer.
         """
         # FIXME: PY3.5+ leaks resources (use finalizer instead).
         self.chunk = None
+        fnode = getattr(self, 'fnode', None)
+        if (fnode is not None) and self.leaf._v_isopen:
+            fnode.close()
 
     def total_nrows(self):
         return self.total_rows
 
     def readBuffer(self, start, stop):
         """
-        Read the whole filenode in memory using the linecache module.
-        Data is returned as a Python list of byte strings.
+        Read a range of lines of the filenode.
+
+        The bytes of the whole range are read at once and split in lines.
+        Data is stored as a Python list of strings (with universal
+        newlines, like files open in text mode).
 
         :Parameters:
         :param start: the document row that is the first row of the chunk.
-        :param stop: the last row to read, inclusive.
+        :param stop: the row after the last row to read.
         """
 
-        # The line numbers of files read by linecache start with 1
-        if start == 0:
-            start += 1
+        start = max(start, 0)
         stop = min(stop, self.total_rows)
+        if start >= stop:
+            self.chunk = []
+            return
+
+        started = time.perf_counter()
+        offsets = self.offsets[start:stop + 1].astype(np.int64)
+        first = int(offsets[0])
+        self.fnode.seek(first)
+        data = self.fnode.read(int(offsets[-1]) - first)
+        offsets -= first
+        self.chunk = [
+            data[line_start:line_stop].decode('utf-8', errors='replace'
+                                              ).replace('\r\n', '\n')
+            for line_start, line_stop in zip(offsets[:-1].tolist(),
+                                             offsets[1:].tolist())]
+        self.stats.addRead(stop - start, len(data),
+                           time.perf_counter() - started)
+
+    def requestBuffer(self, start, stop, callback, batch=None):
+        """Read a chunk from the data source.
+
+        Filenodes are always read in the GUI thread (see
+        :meth:`vitables.vttables.buffer.Buffer.requestBuffer`), so nothing
+        is ever added to `batch`.
+
+        :Returns: True, the chunk is always read immediately
+        """
+
+        self.readBuffer(start, stop)
+        return True
 
-        data = []
-        counter = start
-        while counter <= stop:
-            data.append(linecache.getline(self.temp_filenode, counter))
-            counter += 1
-        self.chunk = data
+    def hasColumn(self, col):
+        """Filenodes have a single column, always read with the chunk."""
+        return True
+
+    def getColumn(self, col):
+        """
+        Returns the cells of the (only) column of the filenode view.
+
+        :Parameter col: the column being read
+        :Returns: the list of lines in the buffer
+        """
+        return self.chunk
 
     def getCell(self, row, col):
         """
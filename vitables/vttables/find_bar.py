@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+This module defines a bar for finding values in a data sheet.
+
+The bar is placed below the view of a leaf. Searches start at the current
+cell of the view and go forward or backward, wrapping around the ends of
+the leaf. The leaf is searched by a
+:class:`vitables.vttables.finder.SearchTask` and the view jumps to the
+found cell with a single read of the buffer. The number of matching cells
+of the whole leaf is counted in background on demand.
+"""
+
+import functools
+import re
+
+from qtpy import QtCore, QtWidgets
+
+from vitables.vttables import finder
+
+__docformat__ = 'restructuredtext'
+
+translate = QtWidgets.QApplication.translate
+
+
+class FindBar(QtWidgets.QWidget):
+    """
+    A bar for finding values in the view of a leaf.
+
+    :Parameters:
+
+    - `view`: the :class:`vitables.vttables.leaf_view.LeafView` being
+      searched
+    - `parent`: the parent of this widget
+    """
+
+    def __init__(self, view, parent=None):
+        """Create the bar."""
+
+        super(FindBar, self).__init__(parent)
+        self.view = view
+        self.model = view.tmodel
+        # The finder of the last search and the running tasks
+        self.finder = None
+        self.search_task = None
+        self.count_task = None
+
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.addWidget(QtWidgets.QLabel(
+            translate('FindBar', 'Find:', 'Label of the find bar'), self))
+        self.text_le = QtWidgets.QLineEdit(self)
+        self.text_le.setClearButtonEnabled(True)
+        layout.addWidget(self.text_le, 1)
+        self.regex_cb = QtWidgets.QCheckBox(
+            translate('FindBar', 'Regex', 'Checkbox of the find bar'), self)
+        self.regex_cb.setToolTip(translate(
+            'FindBar', 'Match string cells with a regular expression',
+            'Tooltip of the regex checkbox'))
+        layout.addWidget(self.regex_cb)
+        self.previous_pb = QtWidgets.QPushButton(
+            translate('FindBar', 'Previous', 'Button of the find bar'), self)
+        layout.addWidget(self.previous_pb)
+        self.next_pb = QtWidgets.QPushButton(
+            translate('FindBar', 'Next', 'Button of the find bar'), self)
+        layout.addWidget(self.next_pb)
+        self.count_pb = QtWidgets.QPushButton(
+            translate('FindBar', 'Count', 'Button of the find bar'), self)
+        self.count_pb.setToolTip(translate(
+            'FindBar', 'Count the matching cells of the whole dataset',
+            'Tooltip of the count button'))
+        layout.addWidget(self.count_pb)
+        self.status_label = QtWidgets.QLabel(self)
+        layout.addWidget(self.status_label)
+        self.close_pb = QtWidgets.QToolButton(self)
+        self.close_pb.setText('x')
+        self.close_pb.setAutoRaise(True)
+        layout.addWidget(self.close_pb)
+
+        # Connect signals to slots
+        self.text_le.returnPressed.connect(self.findNext)
+        self.text_le.textChanged.connect(self.resetFinder)
+        self.regex_cb.toggled.connect(self.resetFinder)
+        self.next_pb.clicked.connect(self.findNext)
+        self.previous_pb.clicked.connect(self.findPrevious)
+        self.count_pb.clicked.connect(self.countMatches)
+        self.close_pb.clicked.connect(self.hide)
+        self.model.modelReset.connect(self.resetFinder)
+
+    def activate(self):
+        """Show the bar and give focus to its text field."""
+
+        self.show()
+        self.text_le.setFocus()
+        self.text_le.selectAll()
+
+    def keyPressEvent(self, event):
+        """Hide the bar when the Escape key is pressed.
+
+        :Parameter event: the event being processed
+        """
+
+        if event.key() == QtCore.Qt.Key_Escape:
+            self.hide()
+            self.view.setFocus()
+        else:
+            super(FindBar, self).keyPressEvent(event)
+
+    def hideEvent(self, event):
+        """Cancel the running tasks when the bar is hidden.
+
+        :Parameter event: the event being processed
+        """
+
+        self.cancelTasks()
+        super(FindBar, self).hideEvent(event)
+
+    def cancelTasks(self):
+        """Cancel the running search and count (if any)."""
+
+        for task in (self.search_task, self.count_task):
+            if task is not None:
+                task.cancel()
+        self.search_task = self.count_task = None
+        self.setSearching(False)
+        self.count_pb.setEnabled(True)
+
+    def resetFinder(self):
+        """Forget the last finder when the text or the view change."""
+
+        self.cancelTasks()
+        self.finder = None
+        self.status_label.clear()
+
+    def currentFinder(self):
+        """The finder of the current text.
+
+        :Returns: a :class:`vitables.vttables.finder.Finder` instance or
+          None if the text is empty or not valid
+        """
+
+        text = self.text_le.text()
+        if not text:
+            return None
+        if self.finder is None:
+            try:
+                self.finder = finder.Finder(
+                    self.model.leaf, text, self.regex_cb.isChecked(),
+                    order=getattr(self.model, 'order', None),
+                    slab=self.model.rbuffer.slab)
+            except re.error as e:
+                self.status_label.setText(translate(
+                    'FindBar', 'Invalid regular expression: {0}',
+                    'Status of the find bar').format(e))
+            except TypeError:
+                self.status_label.setText(translate(
+                    'FindBar', 'This dataset cannot be searched',
+                    'Status of the find bar'))
+        return self.finder
+
+    def setSearching(self, searching):
+        """Enable or disable the search buttons.
+
+        :Parameter searching: True if a search is running
+        """
+
+        self.next_pb.setEnabled(not searching)
+        self.previous_pb.setEnabled(not searching)
+
+    def findNext(self):
+        """Find the next matching cell."""
+        self.find(backward=False)
+
+    def findPrevious(self):
+        """Find the previous matching cell."""
+        self.find(backward=True)
+
+    def find(self, backward):
+        """Find the next (or previous) matching cell of the current one.
+
+        :Parameter backward: True if the search goes towards the first row
+        """
+
+        if self.search_task is not None:
+            return
+        if self.currentFinder() is None:
+            return
+        model = self.model
+        index = self.view.currentIndex()
+        if index.isValid():
+            row = model.start + index.row()
+            col = model.col_start + index.column()
+        elif backward:
+            row, col = model.leaf_numrows - 1, self.finder.ncols
+        else:
+            row, col = 0, -1
+        self.search_task = finder.SearchTask(self.finder, model.leaf, row,
+                                             col, backward, self)
+        self.search_task.scanFinished.connect(
+            functools.partial(self.searchFinished, self.search_task))
+        self.setSearching(True)
+        self.status_label.setText(translate(
+            'FindBar', 'Searching...', 'Status of the find bar'))
+        self.search_task.start()
+
+    def searchFinished(self, task, match):
+        """Jump to the found cell.
+
+        :Parameters:
+
+        - `task`: the task that did the search
+        - `match`: the `(row, col)` tuple of the found cell (an empty
+          tuple if no cell matches, None if the search was cancelled)
+        """
+
+        if task is not self.search_task:
+            return
+        self.search_task = None
+        self.setSearching(False)
+        if match is None:
+            self.status_label.clear()
+        elif not match:
+            self.status_label.setText(translate(
+                'FindBar', 'Not found', 'Status of the find bar'))
+        else:
+            self.status_label.clear()
+            self.jump(*match)
+
+    def jump(self, row, col):
+        """Make a given cell the current one.
+
+        :Parameters:
+
+        - `row`: the row of the cell
+        - `col`: the column of the cell
+        """
+
+        model = self.model
+        view = self.view
+        if not (model.col_start <= col < model.col_start + model.numcols):
+            # Cells of wide arrays may be out of the columns window
+            model.loadColumnData(col - model.numcols // 2, model.numcols)
+            view.syncHView()
+        view.goToRow(row, col - model.col_start)
+        view.setFocus()
+
+    def countMatches(self):
+        """Count the matching cells of the whole dataset in background."""
+
+        if self.count_task is not None:
+            return
+        text = self.text_le.text()
+        if not text:
+            return
+        try:
+            counter = finder.Finder(self.model.leaf, text,
+                                    self.regex_cb.isChecked(),
+                                    slab=self.model.rbuffer.slab)
+        except (re.error, TypeError):
+            # Reported by the finder of searches
+            self.currentFinder()
+            return
+        self.count_task = finder.CountTask(counter, self.model.leaf, self)
+        self.count_task.progressChanged.connect(self.showCountProgress)
+        self.count_task.scanFinished.connect(
+            functools.partial(self.countFinished, self.count_task))
+        self.count_pb.setEnabled(False)
+        self.count_task.start()
+
+    def showCountProgress(self, percent):
+        """Display the progress of the count.
+
+        :Parameter percent: the percentage of the dataset scanned so far
+        """
+
+        self.status_label.setText(translate(
+            'FindBar', 'Counting... {0}%',
+            'Status of the find bar').format(percent))
+
+    def countFinished(self, task, nmatches):
+        """Display the number of matching cells.
+
+        :Parameters:
+
+        - `task`: the task that did the count
+        - `nmatches`: the number of matching cells (None if the count was
+          cancelled)
+        """
+
+        if task is not self.count_task:
+            return
+        self.count_task = None
+        self.count_pb.setEnabled(True)
+        if nmatches is None:
+            self.status_label.clear()
+        else:
+            self.status_label.setText(translate(
+                'FindBar', 'Matches: {0}',
+                'Status of the find bar').format(nmatches))
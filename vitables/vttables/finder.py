@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Find values in the cells of leaves.
+
+A :class:`Finder` looks for a text in every searchable column of a leaf:
+
+- numeric columns are searched for the number given by the text (``true``
+  and ``false`` are the numbers of boolean columns)
+- string columns are searched for cells containing the text or, if a
+  regular expression is given, for cells matching it
+
+The leaf is read in large chunks (with the reading logic of
+:class:`vitables.vttables.buffer.Buffer`) and every chunk is compared at
+once, with ``numexpr`` where possible. Only regular expressions are
+applied cell by cell. Cells of multidimensional columns match if any of
+their elements match.
+
+Searches and match counts are run by a :class:`SearchTask` and a
+:class:`CountTask` (see :mod:`vitables.vttables.scantask`), so they don't
+block the GUI.
+"""
+
+import logging
+import re
+
+import numexpr
+import numpy as np
+import tables
+
+from vitables.vttables import buffer, scantask
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The memory budget (in bytes) of every chunk read by a search.
+SEARCH_MEMORY = 16 * 2 ** 20
+
+#: The kinds of ``numpy`` dtypes that can be searched.
+SEARCHABLE_KINDS = 'biufS'
+
+#: The kinds of ``numpy`` dtypes compared with ``numexpr``.
+NUMEXPR_KINDS = 'iuf'
+
+
+def parseNumber(text):
+    """The number given by a text.
+
+    :Parameter text: the text being parsed
+    :Returns: an integer, a float, a boolean or None if the text is not a
+      number
+    """
+
+    text = text.strip()
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return None
+
+
+class Finder:
+    """Find a text in the cells of a leaf.
+
+    Rows are read in the order of the view (see
+    :mod:`vitables.vttables.sorting`). Cells are numbered in row-major
+    order, so searches go along rows first.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance being searched
+    - `text`: the text being searched
+    - `regex`: True if the text is a regular expression
+    - `order`: the sorting order of the rows of a table (None for storage
+      order)
+    - `slab`: the `(row axis, column axis, indices)` tuple of the 2-D
+      hyperslab displayed for a N-dimensional array (None for the default
+      view)
+
+    :Raises: `TypeError` if the leaf cannot be searched and `re.error` if
+      the regular expression is not valid
+    """
+
+    def __init__(self, leaf, text, regex=False, order=None, slab=None):
+        """Setup the finder."""
+
+        if isinstance(leaf, tables.VLArray):
+            raise TypeError(f'{leaf._v_pathname} cannot be searched')
+        # Only the reading parameters of the buffer are kept, its block
+        # reader and memory map can be used from worker threads
+        rbuffer = buffer.Buffer(leaf, order=order)
+        if slab is not None:
+            rbuffer.setHyperslab(*slab)
+        self.block_reader = rbuffer.block_reader
+        self.mapped = rbuffer.mapped
+        self.slab = rbuffer.slab
+        self.nrows = rbuffer.total_nrows()
+        self.text = text
+        self.number = parseNumber(text)
+        # Strings are stored as bytes
+        self.pattern = None
+        if regex:
+            self.pattern = re.compile(text.encode('utf-8'))
+        self.matrix = False
+        if isinstance(leaf, tables.Table):
+            self.ncols = len(leaf.colnames)
+            self.columns = [
+                col for col, name in enumerate(leaf.colnames)
+                if leaf.dtype[name].base.kind in SEARCHABLE_KINDS]
+        else:
+            self.matrix = (len(leaf.shape) > 1) and \
+                not isinstance(leaf, tables.EArray)
+            self.ncols = rbuffer.ncols if self.matrix else 1
+            self.columns = None
+            if leaf.atom.dtype.kind not in SEARCHABLE_KINDS:
+                raise TypeError(f'{leaf._v_pathname} cannot be searched')
+        self.chunk_rows = max(SEARCH_MEMORY // max(rbuffer.rowsize, 1), 1)
+        self.match = None
+        self.nmatches = 0
+
+    def matchValues(self, values):
+        """Compare some values with the searched text.
+
+        :Parameter values: a ``numpy`` array of values
+        :Returns: a boolean array with the shape of the values
+        """
+
+        kind = values.dtype.kind
+        if kind == 'S':
+            if self.pattern is not None:
+                flat = values.ravel().tolist()
+                return np.fromiter(
+                    (self.pattern.search(value) is not None
+                     for value in flat),
+                    dtype=bool, count=len(flat)).reshape(values.shape)
+            return numexpr.evaluate(
+                'contains(values, text)',
+                local_dict={'values': values,
+                            'text': np.bytes_(self.text.encode('utf-8'))})
+        number = self.number
+        if (number is None) or ((kind != 'f') and isinstance(number, float)
+                                and not number.is_integer()):
+            return np.zeros(values.shape, dtype=bool)
+        if isinstance(number, float) and np.isnan(number):
+            return np.isnan(values)
+        if kind in NUMEXPR_KINDS:
+            try:
+                return numexpr.evaluate(
+                    'values == number',
+                    local_dict={'values': values, 'number': number})
+            except (OverflowError, ValueError):
+                # Numbers out of the range of numexpr types
+                pass
+        return values == number
+
+    def chunkMatches(self, leaf, start, stop):
+        """Find the matching cells of a range of rows.
+
+        :Parameters:
+
+        - `leaf`: the leaf being searched (it may be a handle owned by a
+          worker thread)
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+
+        :Returns: a boolean array with a row per row of the range and a
+          column per column of the view
+        """
+
+        nrows = stop - start
+        block_reader = self.block_reader
+        if self.columns is not None:
+            matches = np.zeros((nrows, self.ncols), dtype=bool)
+            for col in self.columns:
+                cells = self.matchValues(
+                    block_reader.readRows(leaf, start, stop, col))
+                matches[:, col] = cells.reshape(nrows, -1).any(axis=1)
+            return matches
+        if leaf.shape == ():
+            data = np.asarray(leaf.read()).reshape(1)
+        elif block_reader.windowed:
+            data = block_reader.readRows(leaf, start, stop,
+                                         (0, self.ncols, self.slab))
+        elif self.mapped is not None:
+            data = self.mapped[start:stop]
+        else:
+            data = np.moveaxis(block_reader.readRows(leaf, start, stop),
+                               block_reader.axis, 0)
+        return self.matchValues(data).reshape(nrows, self.ncols, -1).any(
+            axis=2)
+
+    def chunks(self, start, stop, backward=False):
+        """Split a range of rows in chunks.
+
+        :Parameters:
+
+        - `start`: the first row of the range
+        - `stop`: the row after the last row of the range
+        - `backward`: True if chunks are given from the end of the range
+
+        :Returns: a list of `(start, stop)` tuples
+        """
+
+        chunks = [(first, min(first + self.chunk_rows, stop))
+                  for first in range(start, stop, self.chunk_rows)]
+        return chunks[::-1] if backward else chunks
+
+    def search(self, leaf, row, col, backward=False):
+        """Find the next (or previous) matching cell.
+
+        The search starts after (or before) a given cell and wraps around
+        the end (or the beginning) of the leaf. The found cell (if any)
+        is stored in the `match` attribute as a `(row, col)` tuple.
+
+        :Parameters:
+
+        - `leaf`: the leaf being searched
+        - `row`: the row of the cell where the search starts
+        - `col`: the view column of the cell where the search starts
+          (it may be -1 or the number of columns)
+        - `backward`: True if the search goes towards the first row
+
+        :Returns: an iterator of the fraction of rows searched so far
+        """
+
+        self.match = None
+        ncols = self.ncols
+        origin = row * ncols + col
+        row = min(max(row, 0), self.nrows - 1)
+        if backward:
+            ranges = [(0, row + 1, False), (row, self.nrows, True)]
+        else:
+            ranges = [(row, self.nrows, False), (0, row + 1, True)]
+        total = self.nrows + 1
+        searched = 0
+        for start, stop, wrapped in ranges:
+            for first, last in self.chunks(start, stop, backward):
+                positions = np.flatnonzero(
+                    self.chunkMatches(leaf, first, last)) + first * ncols
+                if backward:
+                    after = positions >= origin if wrapped else \
+                        positions < origin
+                    candidates = positions[after]
+                    found = candidates[-1:]
+                else:
+                    after = positions <= origin if wrapped else \
+                        positions > origin
+                    candidates = positions[after]
+                    found = candidates[:1]
+                if found.size:
+                    self.match = divmod(int(found[0]), ncols)
+                    return
+                searched += last - first
+                yield searched / total
+
+    def count(self, leaf):
+        """Count the matching cells of the leaf.
+
+        The count is stored in the `nmatches` attribute.
+
+        :Parameter leaf: the leaf being searched
+        :Returns: an iterator of the fraction of rows searched so far
+        """
+
+        self.nmatches = 0
+        for start, stop in self.chunks(0, self.nrows):
+            self.nmatches += int(np.count_nonzero(
+                self.chunkMatches(leaf, start, stop)))
+            yield stop / self.nrows
+
+
+class SearchTask(scantask.ScanTask):
+    """Find the next (or previous) matching cell without blocking the GUI.
+
+    The result is the `(row, col)` tuple of the found cell or an empty
+    tuple if no cell matches.
+
+    :Parameters:
+
+    - `finder`: the :class:`Finder` instance doing the search
+    - `leaf`: the leaf being searched
+    - `row`: the row of the cell where the search starts
+    - `col`: the view column of the cell where the search starts
+    - `backward`: True if the search goes towards the first row
+    - `parent`: the parent of this object
+    """
+
+    def __init__(self, finder, leaf, row, col, backward=False, parent=None):
+        """Setup the search."""
+
+        self.finder = finder
+        self.origin = (row, col, backward)
+        # Sorting orders may not be readable from the worker thread
+        order = finder.block_reader.order
+        background = (leaf._v_file.mode == 'r') and \
+            ((order is None) or order.threadsafe)
+        super(SearchTask, self).__init__(leaf, background, parent)
+
+    def steps(self, leaf):
+        """Search the leaf.
+
+        :Parameter leaf: the leaf being searched
+        """
+        return self.finder.search(leaf, *self.origin)
+
+    def result(self):
+        """The found cell (an empty tuple if no cell matches)."""
+        return self.finder.match or ()
+
+
+class CountTask(scantask.ScanTask):
+    """Count the matching cells of a leaf without blocking the GUI.
+
+    The result is the number of matching cells.
+
+    :Parameters:
+
+    - `finder`: the :class:`Finder` instance doing the count
+    - `leaf`: the leaf being searched
+    - `parent`: the parent of this object
+    """
+
+    def __init__(self, finder, leaf, parent=None):
+        """Setup the count."""
+
+        self.finder = finder
+        super(CountTask, self).__init__(leaf, parent=parent)
+
+    def steps(self, leaf):
+        """Count the matching cells of the leaf.
+
+        :Parameter leaf: the leaf being searched
+        """
+        return self.finder.count(leaf)
+
+    def result(self):
+        """The number of matching cells."""
+        return self.finder.nmatches
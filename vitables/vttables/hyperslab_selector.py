@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+This module defines a widget for choosing the hyperslab of a N-dimensional
+array displayed in a data sheet.
+
+Arrays with rank greater than 2 are displayed as 2-D hyperslabs: two axes
+of the array are displayed as rows and columns and the index of every other
+axis is fixed. The widget has a combobox for choosing the rows axis, a
+combobox for choosing the columns axis and a spinbox for choosing the index
+of every axis. Spinboxes are limited to 32-bit integers, so the indices of
+longer axes are entered in validated line edits instead.
+"""
+
+from qtpy import QtCore, QtGui, QtWidgets
+
+__docformat__ = 'restructuredtext'
+
+translate = QtWidgets.QApplication.translate
+
+#: The largest value of a `QSpinBox`.
+MAX_SPINBOX_VALUE = 2 ** 31 - 1
+
+
+class IndexEdit(QtWidgets.QLineEdit):
+    """
+    A line edit for the index of an axis too long for a spinbox.
+
+    Only digits can be typed. The index is clamped to the axis when the
+    edition is finished.
+
+    :Parameters:
+
+    - `size`: the size of the axis
+    - `parent`: the parent of this widget
+    """
+
+    #: Emitted with the new index when the user changes it
+    valueChanged = QtCore.Signal(object)
+
+    def __init__(self, size, parent=None):
+        """Create the line edit."""
+
+        super(IndexEdit, self).__init__('0', parent)
+        self.last_index = max(size - 1, 0)
+        self.index = 0
+        self.setValidator(QtGui.QRegularExpressionValidator(
+            QtCore.QRegularExpression(r'\d+'), self))
+        self.editingFinished.connect(self.updateValue)
+
+    def value(self):
+        """The index of the axis."""
+        return self.index
+
+    def updateValue(self):
+        """Clamp the entered index and notify it if it has changed."""
+
+        index = min(int(self.text() or 0), self.last_index)
+        self.setText(str(index))
+        if index != self.index:
+            self.index = index
+            self.valueChanged.emit(index)
+
+
+class HyperslabSelector(QtWidgets.QWidget):
+    """
+    A bar for choosing the displayed hyperslab of a N-dimensional array.
+
+    :Parameters:
+
+    - `shape`: the shape of the array
+    - `parent`: the parent of this widget
+    """
+
+    #: Emitted with the rows axis, the columns axis and the list of indices
+    #: when the user chooses other hyperslab
+    hyperslabChanged = QtCore.Signal(int, int, object)
+
+    def __init__(self, shape, parent=None):
+        """Create the selector.
+
+        Initially the first two axes are displayed and every other index
+        is 0.
+        """
+
+        super(HyperslabSelector, self).__init__(parent)
+        self.shape = tuple(shape)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        axes = [str(axis) for axis in range(len(self.shape))]
+        self.rows_cb = QtWidgets.QComboBox(self)
+        self.rows_cb.addItems(axes)
+        self.cols_cb = QtWidgets.QComboBox(self)
+        self.cols_cb.addItems(axes)
+        self.cols_cb.setCurrentIndex(1)
+        layout.addWidget(QtWidgets.QLabel(
+            translate('HyperslabSelector', 'Rows axis:',
+                      'Label of the rows axis combobox'), self))
+        layout.addWidget(self.rows_cb)
+        layout.addWidget(QtWidgets.QLabel(
+            translate('HyperslabSelector', 'Columns axis:',
+                      'Label of the columns axis combobox'), self))
+        layout.addWidget(self.cols_cb)
+
+        # A spinbox per axis for fixing its index
+        self.index_sb = []
+        for axis, size in enumerate(self.shape):
+            if size - 1 > MAX_SPINBOX_VALUE:
+                spinbox = IndexEdit(size, self)
+                layout.addWidget(QtWidgets.QLabel(f'[{axis}]', self))
+            else:
+                spinbox = QtWidgets.QSpinBox(self)
+                spinbox.setRange(0, max(size - 1, 0))
+                spinbox.setPrefix(f'[{axis}] ')
+            spinbox.setToolTip(translate(
+                'HyperslabSelector', 'The index of the axis {0} (size {1})',
+                'Tooltip of the axis index spinbox').format(axis, size))
+            layout.addWidget(spinbox)
+            self.index_sb.append(spinbox)
+        layout.addStretch(1)
+        # The displayed (rows, columns) axes
+        self.axes = (0, 1)
+        self.updateSpinBoxes()
+
+        # Connect signals to slots
+        self.rows_cb.currentIndexChanged.connect(self.rowsAxisChanged)
+        self.cols_cb.currentIndexChanged.connect(self.colsAxisChanged)
+        for spinbox in self.index_sb:
+            spinbox.valueChanged.connect(self.emitHyperslab)
+
+    def hyperslab(self):
+        """The currently selected hyperslab.
+
+        :Returns: a tuple `(rows axis, columns axis, indices)`
+        """
+
+        return (self.rows_cb.currentIndex(), self.cols_cb.currentIndex(),
+                [spinbox.value() for spinbox in self.index_sb])
+
+    def updateSpinBoxes(self):
+        """Disable the spinboxes of the displayed axes."""
+
+        displayed = (self.rows_cb.currentIndex(), self.cols_cb.currentIndex())
+        for axis, spinbox in enumerate(self.index_sb):
+            spinbox.setEnabled(axis not in displayed)
+
+    def rowsAxisChanged(self, axis):
+        """Choose other rows axis.
+
+        If the new axis is the columns axis then the axes are swapped.
+
+        :Parameter axis: the new rows axis
+        """
+
+        rows, cols = self.axes
+        if axis == cols:
+            self.setAxis(self.cols_cb, rows)
+        self.emitHyperslab()
+
+    def colsAxisChanged(self, axis):
+        """Choose other columns axis.
+
+        If the new axis is the rows axis then the axes are swapped.
+
+        :Parameter axis: the new columns axis
+        """
+
+        rows, cols = self.axes
+        if axis == rows:
+            self.setAxis(self.rows_cb, cols)
+        self.emitHyperslab()
+
+    def setAxis(self, combobox, axis):
+        """Set the axis of a combobox without notifying it.
+
+        :Parameters:
+
+        - `combobox`: the combobox being changed
+        - `axis`: the new axis
+        """
+
+        combobox.blockSignals(True)
+        combobox.setCurrentIndex(axis)
+        combobox.blockSignals(False)
+
+    def emitHyperslab(self):
+        """Notify the selected hyperslab."""
+
+        self.axes = (self.rows_cb.currentIndex(), self.cols_cb.currentIndex())
+        self.updateSpinBoxes()
+        self.hyperslabChanged.emit(*self.hyperslab())
@@ -24,9 +24,11 @@ in a `tables.Leaf`.
 """
 
 import logging
+import time
 
+import numpy as np
 import tables
-from qtpy import QtCore
+from qtpy import QtCore, QtGui
 
 import vitables.utils
 from vitables.vttables import buffer, filenodebuffer
@@ -36,6 +38,26 @@ __docformat__ = 'restructuredtext'
 #: The maximum number of rows to be read from the data source.
 CHUNK_SIZE = 10000
 
+#: The maximum number of columns of arrays to be read from the data source.
+CHUNK_COLUMNS = 1024
+
+#: The minimum number of rows to be read from the data source. Chunks must
+#: be larger than the viewport of the view, whatever the row size is.
+MIN_CHUNK_SIZE = 200
+
+#: The text displayed in cells whose data is being read in background.
+PLACEHOLDER = '...'
+
+#: The number of table columns read at once when a column is displayed.
+COLUMNS_BATCH = 8
+
+#: The marker prepended to the labels of bookmarked rows.
+BOOKMARK_MARKER = '\u25b6 '
+
+#: The text of truncated VLArray rows: the formatted preview and the length
+#: of the whole row.
+TRUNCATED_FORMAT = '{0} \u2026 ({1} items)'
+
 log = logging.getLogger(__name__)
 
 
@@ -58,11 +80,27 @@ class LeafModel(QtCore.QAbstractTableModel):
     :attribute leaf_numrows:
         the total number of rows in the underlying data
     :attribute numrows:
-        The number of rows visible which equals the chunking-size.
+        The number of rows visible which equals the chunking-size. It
+        depends on the leaf row size and the configured memory budget.
+    :attribute leaf_numcols:
+        the total number of columns in the underlying data
     :attribute numcols:
-        The total number of columnss visible, equal to those visible.
+        The number of columns visible. It is smaller than the total number
+        of columns only for arrays with a huge second dimension.
     :attribute start:
         The zero-based starting index of the chunk within the total rows.
+    :attribute col_start:
+        The zero-based starting index of the chunk within the total columns.
+    :attribute pending:
+        True while the chunk is being read by the background reader.
+    :attribute requested_columns:
+        The table columns being read by the background reader.
+    :attribute rendered:
+        The formatted cells of the chunk, keyed by column.
+    :attribute bookmarks:
+        The set of bookmarked dataset rows.
+    :attribute order:
+        The sorting order of the rows of tables (None for storage order).
 
     """
 
@@ -72,35 +110,20 @@ class LeafModel(QtCore.QAbstractTableModel):
 
         # The model data source (a PyTables/HDF5 leaf) and its access buffer
         self.leaf = leaf
-        self.is_filenode = False
-        vtapp = vitables.utils.getApp()
-        if leaf in vtapp.filenodes_map:
-            self.is_filenode = True
-            self.rbuffer = filenodebuffer.FilenodeBuffer(leaf)
-        else:
-            self.rbuffer = buffer.Buffer(leaf)
-
-        self.leaf_numrows = self.rbuffer.total_nrows()
-        self.numrows = min(self.leaf_numrows, CHUNK_SIZE)
-        self.start = 0
-
-        # The dataset number of columns doesn't use to be large so, we don't
-        # need set a maximum as we did with rows. The whole set of columns
-        # are displayed
-        if isinstance(leaf, tables.Table):
-            # Leaf is a PyTables table
-            self.numcols = len(leaf.colnames)
-        elif isinstance(leaf, tables.EArray):
-            self.numcols = 1
-        else:
-            # Leaf is some kind of PyTables array
-            shape = leaf.shape
-            if len(shape) > 1:
-                # The leaf will be displayed as a bidimensional matrix
-                self.numcols = shape[1]
-            else:
-                # The leaf will be displayed as a column vector
-                self.numcols = 1
+        self.is_filenode = leaf in vitables.utils.getApp().filenodes_map
+        self.order = None
+        self.rbuffer = self.newBuffer()
+        # Buffer faults and formatting times are recorded with the buffer
+        # counters (see vitables.vttables.readstats)
+        self.stats = self.rbuffer.stats
+        self.fault_started = 0
+
+        # Arrays with rank greater than 2 are displayed as 2-D hyperslabs.
+        # Initially the first two axes are displayed
+        self.sliceable = getattr(self.rbuffer, 'sliceable', False)
+        if self.sliceable:
+            self.rbuffer.setHyperslab(0, 1, [0] * len(leaf.shape))
+        self.setupDimensions()
 
         #
         # Choose a format for cells
@@ -127,12 +150,124 @@ class LeafModel(QtCore.QAbstractTableModel):
 
         # Track selected cell
         self.selected_cell = {'index': QtCore.QModelIndex(), 'buffer_start': 0}
-
-        # Populate the model with the first chunk of data
-        self.loadData(0, self.numrows)
+        self.bookmarks = set()
+        # The selected range of cells in dataset coordinates, a
+        # (start, stop, col_start, col_stop) tuple (see LeafView.selectRange)
+        self.selection_range = None
+        self.selection_brush = None
+        # The controller that navigates this model together with others
+        # (see the columnorg extension)
+        self.navigation = None
+
+        # Populate the model with the first chunk of data. It is read
+        # synchronously because signals cannot be emitted yet
+        self.rbuffer.readBuffer(0, self.numrows)
 
         super(LeafModel, self).__init__(parent)
 
+    def newBuffer(self, order=None):
+        """Create the buffer used for reading the leaf.
+
+        :Parameter order: the sorting order of the rows of a table (None
+          for storage order)
+        """
+
+        leaf = self.leaf
+        vtapp = vitables.utils.getApp()
+        cache_size = vtapp.config.memory_budget * 2 ** 20
+        if self.is_filenode:
+            return filenodebuffer.FilenodeBuffer(leaf)
+        if leaf._v_file.mode == 'r':
+            # Files opened in read-only mode can be read in background
+            return buffer.Buffer(leaf, cache_size=cache_size,
+                                 reader=vtapp.buffer_reader, order=order)
+        return buffer.Buffer(leaf, cache_size=cache_size, order=order)
+
+    def setOrder(self, order):
+        """Display the rows of a table in a given order.
+
+        The model is reset, so attached views are reset too. The previous
+        order (if any) is released.
+
+        :Parameter order: the sorting order (see
+          :mod:`vitables.vttables.sorting`) or None for storage order
+        """
+
+        if not isinstance(self.leaf, tables.Table):
+            return
+        self.beginResetModel()
+        previous = self.order
+        self.order = order
+        self.rbuffer = self.newBuffer(order)
+        self.stats = self.rbuffer.stats
+        self.setupDimensions()
+        self.selected_cell = {'index': QtCore.QModelIndex(), 'buffer_start': 0}
+        self.selection_range = None
+        self.bookmarks.clear()
+        self.rbuffer.readBuffer(0, self.numrows)
+        self.endResetModel()
+        if (previous is not None) and (previous is not order):
+            previous.close()
+
+    def setupDimensions(self):
+        """Setup the dimensions of the model and its first chunk."""
+
+        leaf = self.leaf
+        # The dataset number of columns doesn't use to be large so, usually
+        # the whole set of columns is displayed. Arrays with a huge second
+        # dimension are read in chunks of columns too
+        if isinstance(leaf, tables.Table):
+            # Leaf is a PyTables table
+            self.leaf_numcols = len(leaf.colnames)
+        elif isinstance(leaf, tables.EArray):
+            self.leaf_numcols = 1
+        elif self.is_filenode or (len(leaf.shape) < 2):
+            # The leaf will be displayed as a column vector
+            self.leaf_numcols = 1
+        else:
+            # The leaf will be displayed as a bidimensional matrix
+            self.leaf_numcols = self.rbuffer.ncols
+        self.numcols = self.leaf_numcols
+        self.col_start = 0
+        if getattr(self.rbuffer, 'windowed', False):
+            self.numcols = min(self.leaf_numcols, CHUNK_COLUMNS)
+            self.rbuffer.setColumnWindow(0, self.numcols)
+
+        self.leaf_numrows = self.rbuffer.total_nrows()
+        if self.is_filenode:
+            self.numrows = min(self.leaf_numrows, CHUNK_SIZE)
+        else:
+            self.numrows = self.rbuffer.chunkLength(MIN_CHUNK_SIZE,
+                                                    CHUNK_SIZE)
+        self.start = 0
+        self.pending = False
+        self.rendered = {}
+        self.requested_columns = set()
+
+    def setHyperslab(self, row_axis, col_axis, indices):
+        """Display other 2-D hyperslab of a N-dimensional array.
+
+        The model is reset, so attached views are reset too.
+
+        :Parameters:
+
+        - `row_axis`: the axis displayed as rows
+        - `col_axis`: the axis displayed as columns
+        - `indices`: a sequence with the index of every axis of the array
+          (the indices of the displayed axes are ignored)
+        """
+
+        if not self.sliceable:
+            return
+        self.beginResetModel()
+        self.rbuffer.setHyperslab(row_axis, col_axis, indices)
+        self.setupDimensions()
+        self.selected_cell = {'index': QtCore.QModelIndex(), 'buffer_start': 0}
+        self.selection_range = None
+        self.bookmarks.clear()
+        self.rbuffer.readBuffer(0, self.numrows)
+        self.endResetModel()
+
     def columnCount(self, parent=None):
         """The number of columns of the given model index.
 
@@ -163,13 +298,30 @@ class LeafModel(QtCore.QAbstractTableModel):
     def loadData(self, start, length):
         """Load the model with fresh data from the buffer.
 
+        If the model is navigated together with other models the chunk
+        is loaded by its navigation controller, in every model at once.
+
         :param start:
             the document row that is the first row of the chunk.
         :param length:
             the buffer size, i.e. the number of rows to be read.
+        """
+
+        if self.navigation is not None:
+            self.navigation.loadData(start, length)
+        else:
+            self.requestData(start, length)
+
+    def requestData(self, start, length, batch=None):
+        """Request a fresh chunk of data to the buffer.
 
-        :return:
-            a tuple with tested values for the parameters of the read method
+        :param start:
+            the document row that is the first row of the chunk.
+        :param length:
+            the buffer size, i.e. the number of rows to be read.
+        :param batch:
+            a list where the request to the background reader is appended
+            instead of being made (see :meth:`Buffer.requestBuffer`)
         """
 
         # Enforce scrolling limits.
@@ -182,8 +334,122 @@ class LeafModel(QtCore.QAbstractTableModel):
         actual_start = stop - self.numrows
         start = max(min(actual_start, start), 0)
 
-        self.rbuffer.readBuffer(start, stop)
         self.start = start
+        self.rendered = {}
+        self.requested_columns.clear()
+        self.fault_started = time.perf_counter()
+        self.pending = not self.rbuffer.requestBuffer(start, stop,
+                                                      self.chunkLoaded, batch)
+        self.recordFault(start, stop, self.col_start,
+                         self.col_start + self.numcols)
+
+    def loadColumnData(self, start, width):
+        """Load the model with a fresh range of columns from the buffer.
+
+        This is the horizontal counterpart of :meth:`loadData`. It is used
+        only with arrays whose second dimension is too large to be read
+        at once.
+
+        :param start:
+            the document column that is the first column of the chunk.
+        :param width:
+            the number of columns to be read.
+        """
+
+        # Enforce scrolling limits. The chunk must be filled when scrolled
+        # beyond the right edge
+        start = max(min(start, self.leaf_numcols - width), 0)
+        if start == self.col_start:
+            return
+        self.col_start = start
+        self.rbuffer.setColumnWindow(start, start + width)
+        self.rendered = {}
+        self.fault_started = time.perf_counter()
+        self.pending = not self.rbuffer.requestBuffer(
+            self.start, self.start + self.numrows, self.chunkLoaded)
+        self.recordFault(self.start, self.start + self.numrows, start,
+                         start + width)
+
+    def recordFault(self, start, stop, col_start, col_stop):
+        """Record a buffer fault in the profiling counters.
+
+        :Parameters:
+
+        - `start`: the first row of the new chunk
+        - `stop`: the row after the last row of the new chunk
+        - `col_start`: the first column of the new chunk
+        - `col_stop`: the column after the last column of the new chunk
+        """
+
+        self.stats.addFault()
+        latency = None
+        if not self.pending:
+            latency = time.perf_counter() - self.fault_started
+        self.stats.logEvent('fault', start=int(start), stop=int(stop),
+                            col_start=int(col_start), col_stop=int(col_stop),
+                            background=self.pending, latency=latency)
+
+    def chunkStart(self, row):
+        """The first row of the chunk used for displaying a given row.
+
+        The row is placed near the middle of the chunk, so browsing
+        around it doesn't cause buffer faults. If possible the chunk
+        starts at a buffer block boundary, so it is read with a single
+        aligned read of whole blocks.
+
+        :Parameter row: the dataset row being displayed
+        :Returns: the first row of the chunk
+        """
+
+        start = row - self.numrows // 2
+        block_size = getattr(self.rbuffer, 'block_size', 1)
+        aligned = max(start, 0) // block_size * block_size
+        if row < aligned + self.numrows:
+            start = aligned
+        return max(min(start, self.leaf_numrows - self.numrows), 0)
+
+    def chunkLoaded(self):
+        """Refresh the view when the background reader delivers a chunk."""
+
+        self.pending = False
+        self.rendered = {}
+        self.stats.logEvent('delivered', start=int(self.start),
+                            latency=time.perf_counter() - self.fault_started)
+        if self.numrows and self.numcols:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.numrows - 1, self.numcols - 1))
+
+    def loadColumns(self, col):
+        """Read a batch of table columns, starting at a given column.
+
+        Tables are read column by column as they are displayed (see
+        :meth:`vitables.vttables.buffer.Buffer.requestColumns`). The
+        columns next to the displayed one are read too, so scrolling
+        horizontally doesn't read the columns one by one.
+
+        :Parameter col: the first column of the batch
+        """
+
+        if col in self.requested_columns:
+            return
+        cols = [c for c in range(col, min(col + COLUMNS_BATCH, self.numcols))
+                if not (self.rbuffer.hasColumn(c) or
+                        c in self.requested_columns)]
+        if not self.rbuffer.requestColumns(cols, self.columnsLoaded):
+            self.requested_columns.update(cols)
+
+    def columnsLoaded(self, cols):
+        """Refresh the view when the background reader delivers columns.
+
+        :Parameter cols: the list of delivered columns
+        """
+
+        self.requested_columns.difference_update(cols)
+        if self.numrows and cols:
+            self.dataChanged.emit(
+                self.index(0, min(cols)),
+                self.index(self.numrows - 1, max(cols)))
 
     def get_corner_span(self):
         """Must return ``(row_span, col_span)`` tuple for the top-left cell."""
@@ -217,10 +483,13 @@ class LeafModel(QtCore.QAbstractTableModel):
             # the section numbers are used as horizontal labels
             if hasattr(self.leaf, 'description'):
                 return str(self.leaf.colnames[section])
-            return str(section)
+            return str(self.col_start + section)
 
         # Rows-labels
-        return str(self.start + section)
+        row = self.start + section
+        if row in self.bookmarks:
+            return f'{BOOKMARK_MARKER}{row}'
+        return str(row)
 
     def data(self, index, role=QtCore.Qt.DisplayRole):
         """Returns the data stored under the given role for the item
@@ -239,22 +508,100 @@ class LeafModel(QtCore.QAbstractTableModel):
             return None
 
         if role == QtCore.Qt.DisplayRole:
-            cell = self.cell(row, col)
-            return self.formatContent(cell)
+            if self.pending:
+                return PLACEHOLDER
+            texts = self.rendered.get(col)
+            if texts is None:
+                if not self.rbuffer.hasColumn(col):
+                    self.loadColumns(col)
+                    if col in self.requested_columns:
+                        return PLACEHOLDER
+                    if not self.rbuffer.hasColumn(col):
+                        return None
+                started = time.perf_counter()
+                texts = self.rendered[col] = self.renderColumn(col)
+                self.stats.addFormat(len(texts),
+                                     time.perf_counter() - started)
+            return texts[row]
 
         if role == QtCore.Qt.TextAlignmentRole:
             return QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop
 
+        if (role == QtCore.Qt.BackgroundRole) and \
+                self.isInSelectedRange(row, col):
+            if self.selection_brush is None:
+                color = QtGui.QGuiApplication.palette().color(
+                    QtGui.QPalette.Highlight)
+                color.setAlpha(96)
+                self.selection_brush = QtGui.QBrush(color)
+            return self.selection_brush
+
         return None
 
+    def isInSelectedRange(self, row, col):
+        """Find out if a cell of the chunk is in the selected range.
+
+        :Parameters:
+
+        - `row`: the row of the cell in the chunk
+        - `col`: the column of the cell in the chunk
+        """
+
+        if self.selection_range is None:
+            return False
+        start, stop, col_start, col_stop = self.selection_range
+        return (start <= self.start + row < stop) and \
+            (col_start <= self.col_start + col < col_stop)
+
+    def renderColumn(self, col):
+        """Format the cells of a column of the chunk in one pass.
+
+        Painting a cell is then a simple lookup. Every column is formatted
+        the first time one of its cells is displayed, so columns out of
+        the viewport of wide leaves are not formatted.
+
+        :Parameter col: the column being formatted
+        :Returns: a list with the formatted cells of the column
+        """
+
+        column = self.rbuffer.getColumn(col)
+        if self.formatContent is vitables.utils.formatArrayContent:
+            texts = vitables.utils.formatArrayColumn(column)
+        else:
+            texts = [self.formatContent(content) for content in column]
+        if getattr(self.rbuffer, 'preview_length', None):
+            self.markTruncated(texts)
+        return texts
+
+    def markTruncated(self, texts):
+        """Add the length of the whole row to truncated VLArray rows.
+
+        :Parameter texts: the formatted cells of the chunk (updated in
+          place)
+        """
+
+        lengths = self.rbuffer.rowLengths(self.rbuffer.start,
+                                          self.rbuffer.stop)
+        if lengths is None:
+            return
+        for row in np.flatnonzero(lengths > self.rbuffer.preview_length):
+            texts[row] = TRUNCATED_FORMAT.format(texts[row], lengths[row])
+
     def cell(self, row, col):
         """
         Returns the contents of a cell.
 
+        Truncated VLArray rows are read whole.
+
         :return: none to disable zooming.
         """
+        if self.pending:
+            return None
+        if getattr(self.rbuffer, 'preview_length', None) and \
+                self.rbuffer.isTruncated(self.start + row):
+            return self.rbuffer.readRow(self.start + row)
         try:
             return self.rbuffer.getCell(row, col)
-        except IndexError:
+        except (IndexError, KeyError):
             log.error(f'IndexError! buffer start: {self.start} row, column: '
                       f'{row}, {col}')
@@ -59,36 +59,32 @@ class LeafView(QtWidgets.QTableView):
         super(LeafView, self).__init__(parent)
         self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
         self.tmodel = tmodel  # This is a MUST
-        self.leaf_numrows = leaf_numrows = self.tmodel.leaf_numrows
+        self.leaf_numrows = self.tmodel.leaf_numrows
         self.selection_model = self.selectionModel()
         self.setSelectionMode(_aiv.SingleSelection)
         self.setSelectionBehavior(_aiv.SelectItems)
+        # The dataset cell where ranges selected with Shift start and
+        # whether the current cell is being moved with Shift pressed
+        self.anchor = None
+        self.extending = False
 
         # Setup the actual vertical scrollbar
         self.setVerticalScrollMode(_aiv.ScrollPerItem)
         self.vscrollbar = self.verticalScrollBar()
 
+        # Setup the actual horizontal scrollbar
+        self.leaf_numcols = self.tmodel.leaf_numcols
+        self.hscrollbar = self.horizontalScrollBar()
+
         self.setModel(tmodel)
 
-        # For potentially huge datasets use a customised scrollbar
-        if leaf_numrows > tmodel.numrows:
-            self.setItemDelegate(leaf_delegate.LeafDelegate())
-            self.rbuffer_fault = False
-            self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            self.tricky_vscrollbar = scrollbar.ScrollBar(self)
-            self.max_value = self.tricky_vscrollbar.setMaxValue(
-                self.leaf_numrows)
-            self.tricky_vscrollbar.setMinimum(0)
-            self.interval_size = self.mapSlider2Leaf()
+        # For potentially huge datasets use customised scrollbars
+        self.setupScrollBars()
 
         # Setup the vertical header width
         self.vheader = QtWidgets.QHeaderView(QtCore.Qt.Vertical)
         self.setVerticalHeader(self.vheader)
-        font = self.vheader.font()
-        font.setBold(True)
-        fmetrics = QtGui.QFontMetrics(font)
-        max_width = fmetrics.width(f" {leaf_numrows!s} ")
-        self.vheader.setMinimumWidth(max_width)
+        self.setupHeaderWidth()
         self.vheader.setSectionsClickable(True)
 
         # Setup the headers' resize mode
@@ -102,9 +98,7 @@ class LeafView(QtWidgets.QTableView):
         self.setTextElideMode(QtCore.Qt.ElideRight)
 
         # Connect signals to slots
-        if leaf_numrows > tmodel.numrows:
-            self.tricky_vscrollbar.actionTriggered.connect(
-                self.navigateWithMouse)
+        tmodel.modelReset.connect(self.resetNavigation)
 
         (row_span, col_span) = tmodel.get_corner_span()
         # Check the left corner span to avoid the annoying console message
@@ -112,29 +106,138 @@ class LeafView(QtWidgets.QTableView):
         if (row_span > 1) | (col_span > 1):
             self.setSpan(0, 0, row_span, col_span)
 
-    def mapSlider2Leaf(self):
-        """Setup the interval size.
+    def setupScrollBars(self):
+        """Setup the customised scrollbars used for browsing huge datasets.
+
+        The actual scrollbars are tied to the dimensions of the model, which
+        are usually much smaller than the dataset dimensions. If needed they
+        are replaced by tricky scrollbars tied to the dataset dimensions.
+        """
+
+        tmodel = self.tmodel
+        self.leaf_numrows = tmodel.leaf_numrows
+        self.leaf_numcols = tmodel.leaf_numcols
+
+        if self.leaf_numrows > tmodel.numrows:
+            self.setItemDelegate(leaf_delegate.LeafDelegate())
+            self.rbuffer_fault = False
+            self.valid_current_buffer = tmodel.start
+            self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+            self.tricky_vscrollbar = scrollbar.ScrollBar(self)
+            self.max_value = self.tricky_vscrollbar.setMaxValue(
+                self.leaf_numrows - 1)
+            self.tricky_vscrollbar.setMinimum(0)
+            self.tricky_vscrollbar.actionTriggered.connect(
+                self.navigateWithMouse)
+
+        # Arrays with a huge number of columns are browsed horizontally
+        # with a customised scrollbar too
+        if self.leaf_numcols > tmodel.numcols:
+            self.setHorizontalScrollMode(_aiv.ScrollPerItem)
+            self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+            self.tricky_hscrollbar = scrollbar.ScrollBar(
+                self, QtCore.Qt.Horizontal)
+            self.h_max_value = self.tricky_hscrollbar.setMaxValue(
+                self.leaf_numcols - 1)
+            self.tricky_hscrollbar.setMinimum(0)
+            self.tricky_hscrollbar.actionTriggered.connect(
+                self.navigateHorizontally)
+            self.hscrollbar.valueChanged.connect(self.syncHView)
+
+    def setupHeaderWidth(self):
+        """Make the vertical header wide enough for every row label."""
 
-        Get the number of rows we move up/down on the dataset every time the
-        slider's value moves up/down by 1 unit. The interval size is given by
-        the formula::
+        font = self.vheader.font()
+        font.setBold(True)
+        fmetrics = QtGui.QFontMetrics(font)
+        max_width = fmetrics.width(f" {self.leaf_numrows!s} ")
+        self.vheader.setMinimumWidth(max_width)
 
-            int(self.leaf_numrows/self.max_value)
+    def resetNavigation(self):
+        """Setup the navigation again after the model has been reset.
 
-        Note that the larger is the number of rows the worse is this
-        approach. In the worst case we would have an interval size of
-        (2**64 - 1)/(2**31 - 1) = 2**33. Nevertheless the approach is
-        quite good for number of rows about 2**33 (eight thousand million
-        rows). In this case the interval size is about 4.
+        The dimensions of the model change when other hyperslab of a
+        N-dimensional array is displayed (see
+        :meth:`vitables.vttables.leaf_model.LeafModel.setHyperslab`), so
+        the customised scrollbars are removed and created again.
         """
 
-        # If the slider range equals to the number of rows of the dataset
-        # then there is a 1:1 mapping between range values and dataset
-        # rows and row equals to value
-        interval_size = 1
-        if self.max_value < self.leaf_numrows:
-            interval_size = round(self.leaf_numrows / self.max_value)
-        return interval_size
+        if hasattr(self, 'tricky_vscrollbar'):
+            self.tricky_vscrollbar.hide()
+            self.tricky_vscrollbar.deleteLater()
+            del self.tricky_vscrollbar
+            self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+            self.vscrollbar.setVisible(True)
+        if hasattr(self, 'tricky_hscrollbar'):
+            self.hscrollbar.valueChanged.disconnect(self.syncHView)
+            self.tricky_hscrollbar.hide()
+            self.tricky_hscrollbar.deleteLater()
+            del self.tricky_hscrollbar
+            self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+            self.hscrollbar.setVisible(True)
+        self.setupScrollBars()
+        self.setupHeaderWidth()
+        self.scrollToTop()
+        self.anchor = None
+
+    def sliderToRow(self, value):
+        """Map a value of the tricky scrollbar to a dataset row.
+
+        The range of the scrollbar is a signed 32-bit integer but datasets
+        can have up to 2**63 rows. Values are mapped linearly onto rows
+        using exact integer arithmetic: 0 is mapped to the first row and
+        `max_value` to the last one, so the mapping doesn't drift however
+        large the dataset is. If the dataset has less than 2**31 rows the
+        mapping is the identity.
+
+        :Parameter value: the scrollbar value
+        :Returns: the dataset row mapped to the value
+        """
+
+        value = min(max(value, 0), self.max_value)
+        return value * (self.leaf_numrows - 1) // self.max_value
+
+    def rowToSlider(self, row):
+        """Map a dataset row to the nearest value of the tricky scrollbar.
+
+        This is the inverse of :meth:`sliderToRow`.
+
+        :Parameter row: the dataset row
+        :Returns: the scrollbar value mapped to the row
+        """
+
+        last_row = self.leaf_numrows - 1
+        row = min(max(row, 0), last_row)
+        return (row * self.max_value + last_row // 2) // last_row
+
+    def sliderToColumn(self, value):
+        """Map a value of the tricky horizontal scrollbar to a column.
+
+        This is the horizontal counterpart of :meth:`sliderToRow`.
+
+        :Parameter value: the scrollbar value
+        :Returns: the dataset column mapped to the value
+        """
+
+        value = min(max(value, 0), self.h_max_value)
+        return value * (self.leaf_numcols - 1) // self.h_max_value
+
+    def columnToSlider(self, column):
+        """Map a dataset column to a value of the tricky scrollbar.
+
+        This is the inverse of :meth:`sliderToColumn`: the first value
+        mapped to (or beyond) the column is returned. There are usually
+        less columns than rows per scrollbar value, so rounding to the
+        nearest value (as :meth:`rowToSlider` does) could pick a value
+        mapped to a previous column.
+
+        :Parameter column: the dataset column
+        :Returns: the scrollbar value mapped to the column
+        """
+
+        last_column = self.leaf_numcols - 1
+        column = min(max(column, 0), last_column)
+        return -(-column * self.h_max_value // last_column)
 
     def syncView(self):
         """Update the tricky scrollbar value after a data navigation.
@@ -153,7 +256,7 @@ class LeafView(QtWidgets.QTableView):
         elif fv_label == 1:
             self.tricky_vscrollbar.setValue(0)
         else:
-            value = round(fv_label / self.interval_size)
+            value = self.rowToSlider(fv_label - 1)
             self.tricky_vscrollbar.setValue(value)
 
     def updateView(self):
@@ -163,6 +266,9 @@ class LeafView(QtWidgets.QTableView):
 
         self.vheader.headerDataChanged(
             QtCore.Qt.Vertical, 0, tmodel.numrows - 1)
+        if self.leaf_numcols > tmodel.numcols:
+            self.horizontalHeader().headerDataChanged(
+                QtCore.Qt.Horizontal, 0, tmodel.numcols - 1)
         top_left = tmodel.index(0, 0)
         bottom_right = tmodel.index(tmodel.numrows - 1,
                                     tmodel.numcols - 1)
@@ -355,7 +461,7 @@ class LeafView(QtWidgets.QTableView):
             value = self.max_value
             row = self.leaf_numrows - 1
         else:
-            row = self.interval_size * value
+            row = self.sliderToRow(value)
 
         # top buffer fault condition
         if row < model.start:
@@ -432,13 +538,96 @@ class LeafView(QtWidgets.QTableView):
         self.updateView()
         self.scrollTo(self.tmodel.index(position, 0), hint)
 
+    def navigateHorizontally(self, slider_action):
+        """Navigate the columns of the view with the mouse.
+
+        This is the horizontal counterpart of :meth:`navigateWithMouse`. The
+        slot is connected to the tricky horizontal scrollbar. When it is
+        called the slider position has been already set by the triggered
+        action, so every action is handled like a slider move: the column
+        mapped to the slider position is made the first visible column,
+        reading a new range of columns if it is out of the buffer.
+
+        :Parameter slider_action: the triggered slider action i.e., a member of
+            the QAbstractSlider.SliderAction enum
+        """
+
+        if slider_action not in (1, 2, 3, 4, 7):
+            return
+        model = self.tmodel
+        column = self.sliderToColumn(self.tricky_hscrollbar.sliderPosition())
+        visible = max(self.hscrollbar.pageStep(), 1)
+
+        # left buffer fault condition
+        if column < model.col_start:
+            self.leftBF(column, visible)
+        # right buffer fault condition
+        elif column + visible > model.col_start + model.numcols:
+            self.rightBF(column, visible)
+        self.hscrollbar.setValue(column - model.col_start)
+
+        # Eventually synchronize the position of the visible scrollbar
+        # with the displayed data
+        self.syncHView()
+
+    def leftBF(self, column, visible):
+        """Going out of buffer when browsing leftwards.
+
+        Buffer fault condition: column < model.col_start
+
+        :Parameters:
+
+            - `column`: the dataset column that must be displayed
+            - `visible`: the number of columns that fit in the viewport
+        """
+
+        model = self.tmodel
+        # The new buffer ends at the last visible column
+        model.loadColumnData(column + visible - model.numcols, model.numcols)
+        self.updateView()
+
+    def rightBF(self, column, visible):
+        """Going out of buffer when browsing rightwards.
+
+        Buffer fault condition: column + visible > model.col_start + numcols
+
+        :Parameters:
+
+            - `column`: the dataset column that must be displayed
+            - `visible`: the number of columns that fit in the viewport
+        """
+
+        model = self.tmodel
+        # The new buffer starts at the first visible column
+        model.loadColumnData(column, model.numcols)
+        self.updateView()
+
+    def syncHView(self, value=None):
+        """Update the tricky horizontal scrollbar after a data navigation.
+
+        :Parameter value: the value of the hidden horizontal scrollbar
+        """
+
+        if value is None:
+            value = self.hscrollbar.value()
+        column = self.tmodel.col_start + value
+        page_step = self.hscrollbar.pageStep() * self.h_max_value // \
+            (self.leaf_numcols - 1)
+        self.tricky_hscrollbar.setPageStep(max(page_step, 1))
+        self.tricky_hscrollbar.setValue(self.columnToSlider(column))
+
     def wheelEvent(self, event):
         """Specialized handler for the wheel events received by the *viewport*.
 
         :Parameter event: the QWheelEvent being processed
         """
 
-        if self.leaf_numrows > self.tmodel.numrows:
+        if (self.leaf_numcols > self.tmodel.numcols) and \
+                not event.angleDelta().y():
+            # Horizontal wheeling is handled by the tricky scrollbar
+            QtCore.QCoreApplication.sendEvent(self.tricky_hscrollbar, event)
+            event.accept()
+        elif self.leaf_numrows > self.tmodel.numrows:
             height = self.vheader.sectionSize(0)
             # The distance the wheel is rotated in eights of a degree.
             # For example: 120/8 = 15 so if delta is 120 then the wheel
@@ -456,6 +645,149 @@ class LeafView(QtWidgets.QTableView):
         else:
             QtWidgets.QTableView.wheelEvent(self, event)
 
+    def currentRow(self):
+        """The dataset row of the current cell.
+
+        :Returns: the row or None if there is no current cell
+        """
+
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+        if self.tmodel.numrows < self.leaf_numrows:
+            return self.valid_current_buffer + index.row()
+        return self.tmodel.start + index.row()
+
+    def goToRow(self, row, column=None):
+        """Make a given dataset row the current one.
+
+        This is the entry point for jumping to any row of the dataset, both
+        from the GUI and programmatically (e.g. by plugins). If the row is
+        not in the buffer, the chunk centred on it is read with a single
+        read aligned to the buffer blocks (see
+        :meth:`vitables.vttables.leaf_model.LeafModel.chunkStart`).
+
+        :Parameters:
+
+        - `row`: the dataset row
+        - `column`: the column of the new current cell (by default the
+          column of the current cell)
+
+        :Returns: the model index of the new current cell (invalid if the
+          row doesn't exist)
+        """
+
+        model = self.tmodel
+        if not (0 <= row < self.leaf_numrows):
+            return QtCore.QModelIndex()
+        if column is None:
+            column = max(self.currentIndex().column(), 0)
+        if not (model.start <= row < model.start + model.numrows):
+            model.loadData(model.chunkStart(row), model.numrows)
+            self.updateView()
+        index = model.index(row - model.start, column)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, _aiv.PositionAtCenter)
+
+        # Eventually synchronize the position of the visible scrollbar
+        # with the displayed data
+        if self.leaf_numrows > model.numrows:
+            self.syncView()
+        return index
+
+    def selectRange(self, start, stop=None, col_start=None, col_stop=None):
+        """Select a range of dataset cells.
+
+        The range is given in dataset coordinates, so it may span rows
+        (and columns) that are not loaded in the model.
+
+        :Parameters:
+
+        - `start`: the first selected row (None clears the selection)
+        - `stop`: the row after the last selected row (by default only
+          the `start` row is selected)
+        - `col_start`: the first selected column (by default the first
+          column of the dataset)
+        - `col_stop`: the column after the last selected column (by
+          default the last column of the dataset)
+        """
+
+        model = self.tmodel
+        if start is None:
+            model.selection_range = None
+        else:
+            if stop is None:
+                stop = start + 1
+            if col_start is None:
+                col_start = 0
+            if col_stop is None:
+                col_stop = self.leaf_numcols
+            start = min(max(start, 0), self.leaf_numrows)
+            col_start = min(max(col_start, 0), self.leaf_numcols)
+            model.selection_range = (
+                start, min(max(stop, start), self.leaf_numrows),
+                col_start, min(max(col_stop, col_start), self.leaf_numcols))
+        self.viewport().update()
+
+    def selectedRange(self):
+        """The selected range of dataset cells.
+
+        :Returns: the `(start, stop, col_start, col_stop)` tuple of the
+          selected range, the current cell if no range is selected or None
+          if there is no current cell
+        """
+
+        model = self.tmodel
+        if model.selection_range is not None:
+            return model.selection_range
+        row = self.currentRow()
+        if row is None:
+            return None
+        col = model.col_start + self.currentIndex().column()
+        return (row, row + 1, col, col + 1)
+
+    def toggleBookmark(self, row=None):
+        """Add (or remove) a bookmark for a dataset row.
+
+        :Parameter row: the bookmarked row (by default the current row)
+        """
+
+        model = self.tmodel
+        if row is None:
+            row = self.currentRow()
+            if row is None:
+                return
+        if row in model.bookmarks:
+            model.bookmarks.remove(row)
+        else:
+            model.bookmarks.add(row)
+        section = row - model.start
+        if 0 <= section < model.numrows:
+            self.vheader.headerDataChanged(QtCore.Qt.Vertical, section,
+                                           section)
+
+    def nextBookmark(self):
+        """Go to the first bookmark after the current row."""
+
+        row = self.currentRow()
+        if row is None:
+            row = -1
+        later = [bookmark for bookmark in self.tmodel.bookmarks
+                 if bookmark > row]
+        if later:
+            self.goToRow(min(later))
+
+    def previousBookmark(self):
+        """Go to the last bookmark before the current row."""
+
+        row = self.currentRow()
+        if row is None:
+            row = self.leaf_numrows
+        earlier = [bookmark for bookmark in self.tmodel.bookmarks
+                   if bookmark < row]
+        if earlier:
+            self.goToRow(max(earlier))
+
     def wheelDown(self, event):
         """Setup data for wheeling with the mouse towards the last section.
         """
@@ -503,13 +835,44 @@ class LeafView(QtWidgets.QTableView):
         else:
             QtCore.QCoreApplication.sendEvent(self.vscrollbar, event)
 
+    def mousePressEvent(self, event):
+        """Extend the selected range when a cell is clicked with Shift.
+
+        :Parameter event: the mouse event being processed
+        """
+
+        self.extending = bool(event.modifiers() & QtCore.Qt.ShiftModifier)
+        try:
+            QtWidgets.QTableView.mousePressEvent(self, event)
+        finally:
+            self.extending = False
+
     def keyPressEvent(self, event):
         """Handle basic cursor movement for key events.
 
+        Moving the current cell with Shift pressed extends the selected
+        range.
+
         :Parameter event: the key event being processed
         """
 
-        if self.tmodel.numrows < self.leaf_numrows:
+        self.extending = bool(event.modifiers() & QtCore.Qt.ShiftModifier)
+        try:
+            self.navigateWithKeys(event)
+        finally:
+            self.extending = False
+
+    def navigateWithKeys(self, event):
+        """Move the current cell as requested by a key event.
+
+        :Parameter event: the key event being processed
+        """
+
+        if (self.leaf_numcols > self.tmodel.numcols) and \
+                (event.key() in (QtCore.Qt.Key_Left, QtCore.Qt.Key_Right)):
+            event.accept()
+            self.sideKeyPressEvent(event)
+        elif self.tmodel.numrows < self.leaf_numrows:
             key = event.key()
             if key == QtCore.Qt.Key_Home:
                 event.accept()
@@ -576,6 +939,38 @@ class LeafView(QtWidgets.QTableView):
         # the displayed data
         self.tricky_vscrollbar.setValue(self.max_value)
 
+    def sideKeyPressEvent(self, event):
+        """Specialised handler for the cursor left/right key press events.
+
+        It is used only with arrays whose columns are read in chunks.
+
+        :Parameter event: the key event being processed
+        """
+
+        model = self.tmodel
+        current_index = self.currentIndex()
+        if not current_index.isValid():
+            QtWidgets.QTableView.keyPressEvent(self, event)
+            return
+        step = 1 if event.key() == QtCore.Qt.Key_Right else -1
+        column = model.col_start + current_index.column() + step
+        visible = max(self.hscrollbar.pageStep(), 1)
+        # If we are at the first/last column of the buffer but not at the
+        # first/last column of the dataset we have to read the contiguous
+        # buffer
+        if (column < model.col_start) and (column >= 0):
+            self.leftBF(column, visible)
+        elif (column >= model.col_start + model.numcols) and \
+                (column < self.leaf_numcols):
+            self.rightBF(column - visible + 1, visible)
+        else:
+            QtWidgets.QTableView.keyPressEvent(self, event)
+            return
+        index = model.index(current_index.row(), column - model.col_start)
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+        self.syncHView()
+
     def keyboardNavInfo(self):
         """Gives information about model, and current cell.
 
@@ -753,6 +1148,20 @@ class LeafView(QtWidgets.QTableView):
         QtWidgets.QTableView.currentChanged(self, current, previous)
         if self.tmodel.numrows < self.leaf_numrows:
             self.valid_current_buffer = self.tmodel.start
+        if not (current.isValid() and hasattr(self.tmodel, 'bookmarks')):
+            return
+        # Ranges are tracked in dataset coordinates so they can be larger
+        # than the chunk of rows being displayed
+        cell = (self.tmodel.start + current.row(),
+                self.tmodel.col_start + current.column())
+        if self.extending and (self.anchor is not None):
+            rows = sorted((self.anchor[0], cell[0]))
+            cols = sorted((self.anchor[1], cell[1]))
+            self.selectRange(rows[0], rows[1] + 1, cols[0], cols[1] + 1)
+        else:
+            self.anchor = cell
+            if self.tmodel.selection_range is not None:
+                self.selectRange(None)
 
     # This method has been renamed from loadDatasetCurrentCell to
     # validCurrentCellBuffer. The method has been debugged too
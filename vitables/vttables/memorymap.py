@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Memory maps of contiguous, uncompressed arrays.
+
+The data of a `tables.Array` (but not of its chunked subclasses) are
+stored as a single contiguous block of the HDF5 file, in the layout of
+the equivalent ``numpy`` array. Those data can be read from a
+``numpy.memmap`` of the file instead of through the HDF5 library: reads
+don't copy anything, they just touch pages of the operating system cache.
+
+The offset of the data in the file is given by the ``H5Dget_offset``
+function of the HDF5 library that `PyTables` has already loaded. If the
+function cannot be found, or the dataset is chunked, filtered, compact,
+external, not allocated yet or lives in a file opened with a driver other
+than the default one, no map is made and the leaf must be read as usual.
+"""
+
+import ctypes
+import logging
+import os
+
+import numpy as np
+import tables
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The value returned by ``H5Dget_offset`` when the offset is undefined.
+HADDR_UNDEF = 2 ** 64 - 1
+
+#: The kinds of ``numpy`` dtypes whose HDF5 layout matches the numpy one.
+MAPPABLE_KINDS = 'biufcS'
+
+#: The HDF5 file drivers whose files are laid out in a single disk file.
+MAPPABLE_DRIVERS = (None, 'H5FD_SEC2', 'H5FD_STDIO')
+
+# The H5Dget_offset function (False until it is looked up)
+_get_offset = False
+
+
+def getOffsetFunction():
+    """The ``H5Dget_offset`` function of the loaded HDF5 library.
+
+    The function is looked up through the handle of the `PyTables`
+    extension module, so the same library (and the same identifiers of
+    open objects) used by `PyTables` is used.
+
+    :Returns: the ``ctypes`` function or None if it is not available
+    """
+
+    global _get_offset
+    if _get_offset is False:
+        try:
+            library = ctypes.CDLL(tables.hdf5extension.__file__)
+            _get_offset = library.H5Dget_offset
+            _get_offset.argtypes = [ctypes.c_int64]
+            _get_offset.restype = ctypes.c_uint64
+        except (OSError, AttributeError):
+            _get_offset = None
+    return _get_offset
+
+
+def isMappable(leaf):
+    """Find out if the data of a leaf are laid out contiguously on disk.
+
+    :Parameter leaf: the `tables.Leaf` instance being checked
+    """
+
+    if (type(leaf) is not tables.Array) or (leaf.chunkshape is not None):
+        return False
+    if not leaf.shape or not leaf.nrows:
+        return False
+    filters = leaf.filters
+    if filters.complevel or filters.fletcher32:
+        return False
+    dtype = leaf.atom.dtype
+    if (dtype.kind not in MAPPABLE_KINDS) or (dtype.fields is not None):
+        return False
+    return leaf._v_file.params.get('DRIVER') in MAPPABLE_DRIVERS
+
+
+def mapLeaf(leaf):
+    """Map the data of a contiguous, uncompressed array.
+
+    The map is checked against the first and last elements of the array
+    read by the HDF5 library. If any step fails no map is made.
+
+    :Parameter leaf: the `tables.Leaf` instance being mapped
+    :Returns: a read-only ``numpy.memmap`` with the shape of the leaf or
+      None if the leaf cannot be mapped
+    """
+
+    if not isMappable(leaf):
+        return None
+    get_offset = getOffsetFunction()
+    if get_offset is None:
+        return None
+    try:
+        offset = get_offset(leaf._v_objectid)
+        if offset == HADDR_UNDEF:
+            return None
+        byteorder = {'little': '<', 'big': '>'}.get(leaf.byteorder, '|')
+        dtype = leaf.atom.dtype.newbyteorder(byteorder)
+        filename = leaf._v_file.filename
+        nbytes = dtype.itemsize * int(np.prod(leaf.shape))
+        if offset + nbytes > os.path.getsize(filename):
+            return None
+        mapped = np.memmap(filename, dtype=dtype, mode='r', offset=offset,
+                           shape=tuple(int(dim) for dim in leaf.shape))
+        # Compare 1-element slices, scalars would lose their byte order
+        first = tuple(slice(0, 1) for dim in leaf.shape)
+        last = tuple(slice(int(dim) - 1, int(dim)) for dim in leaf.shape)
+        for index in (first, last):
+            expected = np.asarray(leaf[index], dtype=dtype)
+            if mapped[index].tobytes() != expected.tobytes():
+                break
+        else:
+            return mapped
+        log.debug(f'Unexpected layout of {leaf._v_pathname}, '
+                  'it will not be memory mapped')
+    except (OSError, ValueError, tables.HDF5ExtError):
+        pass
+    return None
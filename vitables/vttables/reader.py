@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+This module implements a background reader for the buffers of leaf views.
+
+Reading (and decompressing) data from slow storage can take seconds. If it
+is done in the GUI thread the whole application freezes. The background
+reader serves the block requests of buffers (see
+:meth:`vitables.vttables.buffer.Buffer.requestBuffer`) in a worker thread
+and delivers the read blocks to the GUI thread via a Qt signal.
+
+`PyTables` objects are not thread safe so the worker never touches the
+leaves used by the GUI thread. Instead it opens its own read-only handle
+of every file it reads from. The worker doesn't touch the buffers either:
+every request carries a copy of the reading parameters of its buffer (a
+:class:`vitables.vttables.buffer.BlockReader`), and the lengths of the
+read VLArray rows and the read timings are delivered with the blocks, so
+buffers are only updated in the GUI thread. Only files opened in read-only
+mode by the user are served by the worker (a file cannot be opened twice
+if one of the handles is writable).
+
+Requests are cancellable: if a buffer issues a new request before the
+previous one has been served then the previous request is skipped.
+
+The requests of several buffers that must be refreshed together (for
+instance, the views of grouped arrays) can be batched: the worker serves
+them in a row and delivers every read block with a single signal, so all
+the buffers are updated in the same iteration of the event loop.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import weakref
+
+import tables
+from qtpy import QtCore
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+
+class BufferReader(QtCore.QObject):
+    """Read blocks of leaves in a worker thread.
+
+    The worker thread is started the first time a request is made.
+
+    :Parameter parent: the parent of this object
+    """
+
+    # Emitted from the worker thread, so slots connected to it run in
+    # the GUI thread
+    blocksRead = QtCore.Signal(int, object, object, object)
+    batchRead = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        """Create the reader."""
+
+        super(BufferReader, self).__init__(parent)
+        self.requests = queue.Queue()
+        self.thread = None
+        # The buffers being served and the serial number of the last
+        # cancellable request made by every buffer
+        self.buffers = weakref.WeakValueDictionary()
+        self.latest = {}
+        self.keys = itertools.count()
+        # Read-only handles owned by the worker thread
+        self.h5files = {}
+
+        self.blocksRead.connect(self.deliverBlocks)
+        self.batchRead.connect(self.deliverBatch)
+
+    def request(self, rbuffer, runs, serial=None):
+        """Request the reading of some blocks of a buffer.
+
+        :Parameters:
+
+        - `rbuffer`: the :meth:`vitables.vttables.buffer.Buffer` instance
+          that will receive the read blocks
+        - `runs`: a sequence of `(first, last, col)` runs of contiguous
+          blocks of a given column (None for leaves other than tables)
+        - `serial`: the serial number of a cancellable request. Read ahead
+          and column requests are not cancellable and have no serial
+          number
+        """
+
+        self.requests.put(('read',) + self.describeRequest(rbuffer, runs,
+                                                           serial))
+
+    def requestBatch(self, requests):
+        """Request the reading of blocks of several buffers at once.
+
+        The blocks of every buffer are delivered together, when all of
+        them have been read.
+
+        :Parameter requests: a sequence of `(rbuffer, runs, serial)` tuples
+          (see :meth:`request`)
+        """
+
+        items = [self.describeRequest(rbuffer, runs, serial)
+                 for rbuffer, runs, serial in requests]
+        if items:
+            self.requests.put(('batch', items))
+
+    def describeRequest(self, rbuffer, runs, serial):
+        """Make the description of a request handed to the worker.
+
+        The worker thread is started if needed.
+
+        :Parameters:
+
+        - `rbuffer`: the buffer that will receive the read blocks
+        - `runs`: the runs of blocks being read
+        - `serial`: the serial number of a cancellable request
+
+        :Returns: the arguments of :meth:`readRuns`
+        """
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.serveRequests,
+                                           name='vitables-reader',
+                                           daemon=True)
+            self.thread.start()
+        key = getattr(rbuffer, 'reader_key', None)
+        if key is None:
+            key = rbuffer.reader_key = next(self.keys)
+            self.buffers[key] = rbuffer
+        if serial is not None:
+            self.latest[key] = serial
+        # The worker must not touch the buffer or its leaf so everything
+        # it needs to know about them is copied here
+        leaf = rbuffer.leaf
+        row_lengths = None
+        if rbuffer.preview_length:
+            row_lengths = dict(rbuffer.row_lengths)
+        return (key, serial, leaf._v_file.filename, leaf._v_pathname, runs,
+                rbuffer.total_nrows(), rbuffer.block_reader, row_lengths,
+                rbuffer.max_vlrow_nbytes)
+
+    def releaseFile(self, filepath):
+        """Close the worker handle of a given file.
+
+        The method returns once the handle has been closed.
+
+        :Parameter filepath: the full path of the file being released
+        """
+
+        if self.thread is None:
+            return
+        done = threading.Event()
+        self.requests.put(('close', filepath, done))
+        done.wait()
+
+    def stop(self):
+        """Close every worker handle and stop the worker thread."""
+
+        if self.thread is None:
+            return
+        self.requests.put(('stop',))
+        self.thread.join()
+        self.thread = None
+
+    def serveRequests(self):
+        """The worker thread main loop."""
+
+        while True:
+            request = self.requests.get()
+            if request[0] == 'stop':
+                self.closeFiles()
+                break
+            elif request[0] == 'close':
+                filepath, done = request[1:]
+                self.closeFiles(filepath)
+                done.set()
+            elif request[0] == 'batch':
+                self.readBatch(request[1])
+            else:
+                self.readBlocks(*request[1:])
+
+    def readBlocks(self, key, serial, *description):
+        """Read blocks in the worker thread and deliver them.
+
+        :Parameters:
+
+        - `key`: the key of the requester buffer
+        - `serial`: the serial number of the request (if cancellable)
+        - `description`: the arguments of :meth:`readRuns`
+        """
+
+        # Skip stale requests
+        if (serial is not None) and (self.latest.get(key) != serial):
+            return
+        result, error = self.readRuns(*description)
+        self.blocksRead.emit(key, serial, result, error)
+
+    def readBatch(self, items):
+        """Read the blocks of several buffers and deliver them together.
+
+        :Parameter items: a sequence of request descriptions (see
+          :meth:`readBlocks`)
+        """
+
+        results = []
+        for key, serial, *description in items:
+            if (serial is not None) and (self.latest.get(key) != serial):
+                continue
+            result, error = self.readRuns(*description)
+            results.append((key, serial, result, error))
+        if results:
+            self.batchRead.emit(results)
+
+    def readRuns(self, filepath, nodepath, runs, nrows, block_reader,
+                 row_lengths, max_vlrow_nbytes):
+        """Read runs of blocks in the worker thread.
+
+        :Parameters:
+
+        - `filepath`: the full path of the file where the leaf lives
+        - `nodepath`: the full path of the leaf
+        - `runs`: a sequence of `(first, last, col)` runs of contiguous
+          blocks
+        - `nrows`: the number of rows of the leaf
+        - `block_reader`: the
+          :class:`vitables.vttables.buffer.BlockReader` of the requester
+          buffer
+        - `row_lengths`: a copy of the row-length index of a VLArray
+          buffer (None for other leaves)
+        - `max_vlrow_nbytes`: the size of the longest VLArray row read so
+          far
+
+        :Returns: a `(result, error)` tuple, `result` is None if the
+          reading failed with `error`. Else it is a `(blocks, lengths,
+          reads)` tuple (see :meth:`deliverBlocks`)
+        """
+
+        try:
+            h5file = self.h5files.get(filepath)
+            if h5file is None:
+                h5file = tables.open_file(filepath, 'r')
+                self.h5files[filepath] = h5file
+            leaf = h5file.get_node(nodepath)
+            blocks = {}
+            lengths = {}
+            reads = []
+            for first, last, col in runs:
+                run_blocks, run_lengths, read = block_reader.readRun(
+                    leaf, first, last, col, nrows, row_lengths,
+                    max_vlrow_nbytes)
+                blocks.update(run_blocks)
+                reads.append(read)
+                if run_lengths:
+                    # Later runs are read with the updated (local) index
+                    lengths.update(run_lengths)
+                    row_lengths.update(run_lengths)
+                    max_vlrow_nbytes = max(
+                        max_vlrow_nbytes,
+                        block_reader.maxRowNBytes(run_lengths))
+        except Exception as e:
+            return None, e
+        return (blocks, lengths, reads), None
+
+    def closeFiles(self, filepath=None):
+        """Close worker handles (all of them if no filepath is given).
+
+        :Parameter filepath: the full path of the file being closed
+        """
+
+        for path in list(self.h5files):
+            if (filepath is None) or (path == filepath):
+                try:
+                    self.h5files.pop(path).close()
+                except (tables.NodeError, OSError) as e:
+                    log.error(f'{e}')
+
+    def deliverBlocks(self, key, serial, result, error):
+        """Hand the read blocks to the requester buffer.
+
+        This slot runs in the GUI thread.
+
+        :Parameters:
+
+        - `key`: the key of the requester buffer
+        - `serial`: the serial number of the request (if cancellable)
+        - `result`: a `(blocks, lengths, reads)` tuple (None on failure).
+          `blocks` maps `(block number, col)` keys to blocks, `lengths`
+          maps block numbers to the lengths of the read VLArray rows and
+          `reads` are the `(rows, bytes, seconds)` tuples of the reads
+        - `error`: the exception raised by the worker (if any)
+        """
+
+        rbuffer = self.buffers.get(key)
+        if rbuffer is None:
+            return
+        if error is not None:
+            log.debug(f'Background read failed: {error!r}')
+        if result is None:
+            rbuffer.blocksArrived(serial, None)
+        else:
+            rbuffer.blocksArrived(serial, *result)
+
+    def deliverBatch(self, results):
+        """Hand the blocks read for a batch to the requester buffers.
+
+        This slot runs in the GUI thread.
+
+        :Parameter results: a sequence of `(key, serial, result, error)`
+          tuples (see :meth:`deliverBlocks`)
+        """
+
+        for key, serial, blocks, error in results:
+            self.deliverBlocks(key, serial, blocks, error)
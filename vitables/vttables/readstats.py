@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+This module implements the counters used for profiling the views of leaves.
+
+Every buffer owns a :class:`ReadStats` instance where it records the
+blocks looked up in its cache, the reads made from the leaf and the time
+spent reading (i.e. doing I/O and decompressing). The model of the view
+records in the same instance its buffer faults and the time spent
+formatting cells. The counters are displayed in the Performance dock
+(see :mod:`vitables.vtwidgets.performance_panel`).
+
+Buffer faults are also logged as structured records: the message is a JSON
+object and the same mapping is attached to the log record as its `perf`
+attribute. Records are logged with the ``INFO`` level, so they are only
+emitted if the logger of this module is enabled for that level (e.g. from
+the Performance dock). Sending them to a log file (see the ``--log-file``
+command line option) allows the profiling of real sessions.
+"""
+
+import json
+import logging
+import time
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The counters of a :class:`ReadStats` instance. Times are in seconds.
+FIELDS = ('faults', 'block_hits', 'block_misses', 'reads', 'rows_read',
+          'bytes_read', 'read_time', 'cells_formatted', 'format_time')
+
+
+class ReadStats:
+    """Counters and timings of the reads made for displaying a leaf.
+
+    Counters are only updated in the GUI thread: the reads made by the
+    background reader are recorded when their blocks are delivered (see
+    :meth:`vitables.vttables.buffer.Buffer.blocksArrived`).
+
+    :Parameter name: the full path of the leaf (used in log records)
+    """
+
+    def __init__(self, name=''):
+        """Create the counters."""
+
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        """Set every counter to zero."""
+
+        for field in FIELDS:
+            setattr(self, field, 0)
+
+    def addLookups(self, hits, misses):
+        """Record the outcome of looking up blocks in the cache.
+
+        :Parameters:
+
+        - `hits`: the number of blocks found in the cache
+        - `misses`: the number of blocks that must be read
+        """
+
+        self.block_hits += hits
+        self.block_misses += misses
+
+    def addRead(self, rows, nbytes, seconds):
+        """Record a read from the leaf.
+
+        :Parameters:
+
+        - `rows`: the number of rows read
+        - `nbytes`: the number of bytes read
+        - `seconds`: the time spent reading and decompressing
+        """
+
+        self.reads += 1
+        self.rows_read += rows
+        self.bytes_read += nbytes
+        self.read_time += seconds
+
+    def addFault(self):
+        """Record a buffer fault."""
+
+        self.faults += 1
+
+    def addFormat(self, cells, seconds):
+        """Record the formatting of some cells.
+
+        :Parameters:
+
+        - `cells`: the number of formatted cells
+        - `seconds`: the time spent formatting them
+        """
+
+        self.cells_formatted += cells
+        self.format_time += seconds
+
+    def snapshot(self):
+        """The current value of every counter.
+
+        :Returns: a mapping of counter names to values
+        """
+
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def hitRatio(self):
+        """The fraction of blocks found in the cache (None if unknown)."""
+
+        lookups = self.block_hits + self.block_misses
+        if not lookups:
+            return None
+        return self.block_hits / lookups
+
+    def logEvent(self, event, **fields):
+        """Log a structured record of an event.
+
+        The record contains the given fields and the current value of
+        every counter.
+
+        :Parameters:
+
+        - `event`: the name of the event
+        - `fields`: the fields describing the event
+        """
+
+        if not log.isEnabledFor(logging.INFO):
+            return
+        record = {'event': event, 'node': self.name, 'time': time.time()}
+        record.update(fields)
+        record.update(self.snapshot())
+        log.info(f'{json.dumps(record)}', extra={'perf': record})
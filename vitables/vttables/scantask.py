@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Scans of whole leaves that don't block the GUI.
+
+Some actions (column statistics, match counts, searches) read a whole
+leaf chunk by chunk. A :class:`ScanTask` runs such a scan: subclasses
+provide the scan as a generator that processes a chunk per iteration and
+yields the fraction of the leaf scanned so far.
+
+Leaves of files opened in read-only mode can be scanned in a worker
+thread with its own handle of the file (as the background reader of
+buffers does, see :mod:`vitables.vttables.reader`). Other leaves are
+scanned in the GUI thread, one chunk per event loop iteration. Scans
+report their progress and can be cancelled.
+
+Running scans are registered by file: before a file is closed its scans
+are cancelled and their worker threads joined (see :func:`releaseFile`),
+so no handle of the file is left open.
+"""
+
+import logging
+import threading
+
+import tables
+from qtpy import QtCore
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+# The scans started and not finished yet (used by the GUI thread only)
+_running_tasks = set()
+
+
+def releaseFile(filepath):
+    """Cancel the scans of a given file and wait for their worker threads.
+
+    The function returns once every worker handle of the file has been
+    closed, like :meth:`vitables.vttables.reader.BufferReader.releaseFile`
+    does.
+
+    :Parameter filepath: the full path of the file being closed
+    """
+
+    for task in list(_running_tasks):
+        if task.filepath == filepath:
+            task.cancel()
+            if task.thread is not None:
+                task.thread.join()
+
+
+class ScanTask(QtCore.QObject):
+    """A chunked scan of a leaf.
+
+    Subclasses implement :meth:`steps` and :meth:`result`.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance being scanned
+    - `background`: True if the leaf can be scanned in a worker thread
+      (by default, if its file is opened in read-only mode)
+    - `parent`: the parent of this object
+    """
+
+    #: The percentage of the leaf scanned so far.
+    progressChanged = QtCore.Signal(int)
+
+    #: The result of the scan, None if the scan was cancelled or failed.
+    scanFinished = QtCore.Signal(object)
+
+    # Emitted from the worker thread, so slots connected to it run in
+    # the GUI thread
+    scanDone = QtCore.Signal(object, object)
+
+    def __init__(self, leaf, background=None, parent=None):
+        """Setup the scan."""
+
+        super(ScanTask, self).__init__(parent)
+        self.leaf = leaf
+        self.filepath = leaf._v_file.filename
+        self.nodepath = leaf._v_pathname
+        # As for the background reader, only files opened in read-only
+        # mode can be opened again in a worker thread
+        if background is None:
+            background = leaf._v_file.mode == 'r'
+        self.background = background
+        self.cancelled = threading.Event()
+        self.thread = None
+        self.running = None
+        self.percent = -1
+
+        self.scanDone.connect(self.finishScan)
+        self.scanFinished.connect(self.unregister)
+
+    def steps(self, leaf):
+        """Scan a leaf.
+
+        :Parameter leaf: the leaf being scanned (it may be a handle owned
+          by the worker thread)
+        :Returns: an iterator of the fraction of the leaf scanned so far
+        """
+        raise NotImplementedError
+
+    def result(self):
+        """The result of a completed scan."""
+        raise NotImplementedError
+
+    def completed(self, result):
+        """Process the result of a completed scan.
+
+        It is called in the thread that runs the scan. By default nothing
+        is done.
+
+        :Parameter result: the result of the scan
+        """
+
+    def start(self):
+        """Start the scan."""
+
+        self.percent = -1
+        _running_tasks.add(self)
+        if self.background:
+            self.thread = threading.Thread(target=self.scanInThread,
+                                           name='vitables-scan', daemon=True)
+            self.thread.start()
+        else:
+            self.running = None
+            QtCore.QTimer.singleShot(0, self.step)
+
+    def cancel(self):
+        """Cancel the scan (the result will be None)."""
+        self.cancelled.set()
+
+    def unregister(self, result=None):
+        """Forget a finished scan.
+
+        :Parameter result: the result of the scan (unused)
+        """
+        _running_tasks.discard(self)
+
+    def reportProgress(self, fraction):
+        """Emit the progress of the scan if it has changed.
+
+        :Parameter fraction: the fraction of the leaf scanned so far
+        """
+
+        percent = int(fraction * 100)
+        if percent != self.percent:
+            self.percent = percent
+            self.progressChanged.emit(percent)
+
+    def closeSteps(self, running):
+        """Stop a cancelled scan, so it can release its resources.
+
+        :Parameter running: the iterator returned by :meth:`steps`
+        """
+
+        close = getattr(running, 'close', None)
+        if close is not None:
+            close()
+
+    def step(self):
+        """Scan the next chunk in the GUI thread."""
+
+        if self.cancelled.is_set() or not self.leaf._v_isopen:
+            self.closeSteps(self.running)
+            self.scanFinished.emit(None)
+            return
+        try:
+            if self.running is None:
+                self.running = self.steps(self.leaf)
+            fraction = next(self.running)
+        except StopIteration:
+            result = self.result()
+            self.completed(result)
+            self.scanFinished.emit(result)
+            return
+        except Exception as e:
+            # Errors must not escape the timer slot, the scan would never
+            # finish
+            self.finishScan(None, e)
+            return
+        self.reportProgress(fraction)
+        QtCore.QTimer.singleShot(0, self.step)
+
+    def scanInThread(self):
+        """Scan the leaf in the worker thread."""
+
+        result = error = None
+        try:
+            with tables.open_file(self.filepath, 'r') as h5file:
+                leaf = h5file.get_node(self.nodepath)
+                running = self.steps(leaf)
+                for fraction in running:
+                    if self.cancelled.is_set():
+                        self.closeSteps(running)
+                        break
+                    self.reportProgress(fraction)
+                else:
+                    result = self.result()
+                    self.completed(result)
+        except Exception as e:
+            error = e
+        self.scanDone.emit(result, error)
+
+    def finishScan(self, result, error):
+        """Deliver the result of the scan.
+
+        This slot runs in the GUI thread.
+
+        :Parameters:
+
+        - `result`: the result (None if the scan was cancelled or failed)
+        - `error`: the exception raised by the scan (if any)
+        """
+
+        if error is not None:
+            log.error(f'Unable to scan {self.nodepath}: {error}')
+        self.scanFinished.emit(result)
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Sorted views of tables.
+
+Tables are browsed in storage order. A sorted view displays the rows of a
+table ordered by one or more of its columns without reading the whole
+table in memory: the buffer of the view (see
+:class:`vitables.vttables.buffer.Buffer`) reads the rows of every block
+through a sorting order.
+
+If the table is sorted by a single column with a completely sorted index
+(CSI) the index is already a sorting order, so rows are read with
+`Table.read_sorted`. Otherwise a permutation of the table rows is built
+with an external merge sort:
+
+- the keys of the table are read in runs that fit in the `SORT_MEMORY`
+  budget. Every run is sorted in memory, together with the coordinates of
+  its rows (which break ties, so the sort is stable), and written to the
+  temporary database
+- runs are merged in passes of at most `MAX_FANIN` runs. Every run is
+  read in blocks, and at every step the rows not greater than the
+  smallest of the last read keys are merged at once. The last pass
+  writes only the coordinates of the rows: they are the permutation
+
+Rows are then read with `Table.read_coordinates`. Runs and permutations
+live under the hidden `SORT_GROUP` group of the temporary database, so
+neither the keys nor the permutation are kept in memory.
+
+Sorting a huge table can take a long time, so the GUI sorts tables with a
+:class:`SortTask`, which reports its progress and can be cancelled.
+"""
+
+import logging
+import math
+import time
+import uuid
+
+import numpy as np
+import tables
+
+from vitables.vttables import scantask
+
+__docformat__ = 'restructuredtext'
+
+log = logging.getLogger(__name__)
+
+#: The memory budget (in bytes) of the external sort.
+SORT_MEMORY = 64 * 2 ** 20
+
+#: The maximum number of runs merged in a single pass.
+MAX_FANIN = 64
+
+#: The hidden group of the temporary database where sort data are stored.
+SORT_GROUP = '_p_sorted_views'
+
+#: The field of the sorted runs keeping the coordinates of the rows.
+COORD_FIELD = 'coord'
+
+
+def sortableColumns(table):
+    """The columns of a table that can be used as sort keys.
+
+    Every column with scalar cells (nested columns included) is sortable.
+
+    :Parameter table: the `tables.Table` instance being sorted
+    :Returns: a list with the paths of the sortable columns
+    """
+
+    return [name for name in table.colpathnames
+            if table.coldescrs[name].shape == ()]
+
+
+def csiColumn(table, columns):
+    """Find out if a table has a completely sorted index for some keys.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys
+
+    :Returns: True if the table can be read with `Table.read_sorted`
+    """
+
+    if len(columns) != 1:
+        return False
+    index = table.colinstances[columns[0]].index
+    return (index is not None) and index.is_csi and not index.dirty
+
+
+def checkSortKeys(table, columns):
+    """Check the sort keys of a table.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys (column paths)
+
+    :Raises: `ValueError` if there are no keys or some of them cannot be
+      sorted
+    """
+
+    if not columns:
+        raise ValueError('No sort keys given')
+    sortable = sortableColumns(table)
+    for name in columns:
+        if name not in sortable:
+            raise ValueError(f'Column {name} cannot be sorted')
+
+
+def sortOrder(table, columns, h5file):
+    """The order of the rows of a table sorted by some columns.
+
+    The table is sorted at once, see :class:`SortTask` for sorting it
+    without blocking the GUI.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys (column paths)
+    - `h5file`: the temporary database, where permutations are stored
+
+    :Returns: a :class:`CSIOrder` or a :class:`PermutationOrder` instance
+    """
+
+    checkSortKeys(table, columns)
+    steps = orderSteps(table, columns, h5file)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def orderSteps(table, columns, h5file):
+    """Find the order of the rows of a table step by step.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of (checked) sort keys
+    - `h5file`: the temporary database, where permutations are stored
+
+    :Returns: a generator of the fraction of the sort done so far. Its
+      return value is a :class:`CSIOrder` or a :class:`PermutationOrder`
+      instance
+    """
+
+    if csiColumn(table, columns):
+        return CSIOrder(table, columns[0])
+    started = time.perf_counter()
+    permutation = yield from sortPermutation(table, columns, h5file)
+    log.debug(f'{table._v_pathname} sorted by {", ".join(columns)} in '
+              f'{time.perf_counter() - started:.2f} s')
+    return PermutationOrder(columns, permutation)
+
+
+def keysDtype(table, columns):
+    """The dtype of the sorted runs of some sort keys.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys
+
+    :Returns: a structured dtype with a field per key (named `key0`,
+      `key1`...) plus the `COORD_FIELD` field
+    """
+
+    fields = [(f'key{position}', table.coldtypes[name])
+              for position, name in enumerate(columns)]
+    return np.dtype(fields + [(COORD_FIELD, np.int64)])
+
+
+def sortKeys(keys):
+    """Sort an array of keys.
+
+    Keys are compared field by field (`NaN` values are sorted last), in
+    the same order used by ``numpy.searchsorted`` with structured arrays.
+
+    :Parameter keys: the structured array of keys being sorted
+    :Returns: the sorted array
+    """
+
+    names = keys.dtype.names
+    return keys[np.lexsort([keys[name] for name in reversed(names)])]
+
+
+def sortGroup(h5file):
+    """Create a new group for the sort data of a sorted view.
+
+    :Parameter h5file: the temporary database
+    :Returns: the new group
+    """
+
+    if f'/{SORT_GROUP}' not in h5file:
+        h5file.create_group('/', SORT_GROUP, 'Hide the sorted views data')
+    return h5file.create_group(f'/{SORT_GROUP}', f'_p_{uuid.uuid4().hex}')
+
+
+def mergePasses(nruns):
+    """The number of merge passes of an external sort.
+
+    :Parameter nruns: the number of sorted runs
+    """
+
+    npasses = 0
+    while nruns > MAX_FANIN:
+        nruns = math.ceil(nruns / MAX_FANIN)
+        npasses += 1
+    return npasses + 1 if nruns > 1 else npasses
+
+
+def sortPermutation(table, columns, h5file):
+    """Build the permutation that sorts a table (external merge sort).
+
+    The sort is done step by step: a run is sorted, or a block of runs is
+    merged, per step. If the generator is closed before the sort is done
+    the sort data are removed from the temporary database.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys
+    - `h5file`: the temporary database
+
+    :Returns: a generator of the fraction of the sort done so far. Its
+      return value is an `EArray` with the coordinates of the table rows
+      in sorted order
+    """
+
+    group = sortGroup(h5file)
+    dtype = keysDtype(table, columns)
+    nrows = table.nrows
+    permutation = h5file.create_earray(group, 'permutation',
+                                       tables.Int64Atom(), (0,),
+                                       expectedrows=max(nrows, 1))
+    try:
+        # The sorted keys and a copy of them must fit in memory
+        run_length = max(SORT_MEMORY // (2 * dtype.itemsize), 1)
+        # Every row is sorted once and then merged once per pass
+        nphases = 1 + mergePasses(math.ceil(nrows / run_length))
+        runs = []
+        for start in range(0, nrows, run_length):
+            stop = min(start + run_length, nrows)
+            keys = np.empty(stop - start, dtype=dtype)
+            for position, name in enumerate(columns):
+                keys[f'key{position}'] = table.read(start, stop, field=name)
+            keys[COORD_FIELD] = np.arange(start, stop)
+            keys = sortKeys(keys)
+            if stop - start == nrows:
+                # A single run is the permutation
+                permutation.append(keys[COORD_FIELD])
+            else:
+                run = h5file.create_table(group, f'run{len(runs)}', dtype,
+                                          expectedrows=stop - start)
+                run.append(keys)
+                runs.append(run)
+            yield stop / nrows / nphases
+
+        # Merge passes
+        npass = 0
+        while len(runs) > MAX_FANIN:
+            npass += 1
+            merged = []
+            done = 0
+            for first in range(0, len(runs), MAX_FANIN):
+                batch = runs[first:first + MAX_FANIN]
+                output = h5file.create_table(
+                    group, f'pass{npass}_run{len(merged)}', dtype,
+                    expectedrows=sum(run.nrows for run in batch))
+                for nmerged in mergeRuns(batch, output):
+                    yield (npass + (done + nmerged) / nrows) / nphases
+                done += output.nrows
+                merged.append(output)
+            runs = merged
+        if runs:
+            for nmerged in mergeRuns(runs, permutation):
+                yield (npass + 1 + nmerged / nrows) / nphases
+    except BaseException:
+        group._f_remove(recursive=True)
+        raise
+    h5file.flush()
+    return permutation
+
+
+def mergeRuns(runs, output):
+    """Merge some sorted runs.
+
+    Every run is read in blocks. At every step the rows not greater than
+    the smallest of the last read keys (from the runs with rows still
+    unread) are sorted and written at once: no later row can precede
+    them. Merged runs are removed from the file.
+
+    :Parameters:
+
+    - `runs`: the sequence of sorted runs (tables)
+    - `output`: the merged run (a table) or the permutation (an `EArray`,
+      only coordinates are written)
+
+    :Returns: a generator of the number of rows merged so far
+    """
+
+    dtype = runs[0].dtype
+    block = max(SORT_MEMORY // (2 * len(runs) * dtype.itemsize), 1)
+    positions = [0] * len(runs)
+    buffers = [np.empty(0, dtype=dtype) for run in runs]
+    coords_only = not isinstance(output, tables.Table)
+    nmerged = 0
+    while True:
+        for number, run in enumerate(runs):
+            if (not len(buffers[number])) and (positions[number] < run.nrows):
+                stop = min(positions[number] + block, run.nrows)
+                buffers[number] = run.read(positions[number], stop)
+                positions[number] = stop
+        unread = [number for number, run in enumerate(runs)
+                  if positions[number] < run.nrows]
+        if unread:
+            bound = sortKeys(np.concatenate(
+                [buffers[number][-1:] for number in unread]))[0]
+            cuts = [int(np.searchsorted(keys, bound, side='right'))
+                    for keys in buffers]
+        else:
+            cuts = [len(keys) for keys in buffers]
+        merged = sortKeys(np.concatenate(
+            [keys[:cut] for keys, cut in zip(buffers, cuts)]))
+        output.append(merged[COORD_FIELD] if coords_only else merged)
+        buffers = [keys[cut:] for keys, cut in zip(buffers, cuts)]
+        nmerged += len(merged)
+        if not (unread or any(len(keys) for keys in buffers)):
+            break
+        yield nmerged
+    for run in runs:
+        run.remove()
+    yield nmerged
+
+
+class SortTask(scantask.ScanTask):
+    """Sort a table without blocking the GUI.
+
+    Permutations are written to the temporary database, which is used by
+    the GUI thread only, so tables are always sorted in the GUI thread, a
+    step per iteration of the event loop.
+
+    :Parameters:
+
+    - `table`: the `tables.Table` instance being sorted
+    - `columns`: the sequence of sort keys (column paths)
+    - `h5file`: the temporary database, where permutations are stored
+    - `parent`: the parent of this object
+
+    :Raises: `ValueError` if some sort key cannot be sorted
+    """
+
+    def __init__(self, table, columns, h5file, parent=None):
+        """Setup the sort."""
+
+        checkSortKeys(table, columns)
+        self.columns = list(columns)
+        self.h5file = h5file
+        self.order = None
+        super(SortTask, self).__init__(table, background=False,
+                                       parent=parent)
+
+    def steps(self, table):
+        """Sort a table.
+
+        :Parameter table: the table being sorted
+        :Returns: an iterator of the fraction of the sort done so far
+        """
+
+        self.order = yield from orderSteps(table, self.columns, self.h5file)
+
+    def result(self):
+        """The order of the sorted rows."""
+        return self.order
+
+
+class CSIOrder:
+    """The order given by a completely sorted index of a table column.
+
+    The index lives in the file of the table, so the order can be used
+    by the background reader too.
+
+    :Parameters:
+
+    - `table`: the sorted `tables.Table` instance
+    - `column`: the path of the indexed column
+    """
+
+    #: Rows can be read by the background reader.
+    threadsafe = True
+
+    def __init__(self, table, column):
+        """Setup the order."""
+
+        self.columns = [column]
+        self.nrows = table.nrows
+
+    def read(self, table, start, stop, field):
+        """Read a field of a range of sorted rows.
+
+        :Parameters:
+
+        - `table`: the sorted table (may be a handle owned by the
+          background reader)
+        - `start`: the first sorted row to read
+        - `stop`: the sorted row after the last row to read
+        - `field`: the name of the field being read
+
+        :Returns: an array with the field of the rows
+        """
+
+        return table.read_sorted(self.columns[0], field=field, start=start,
+                                 stop=stop)
+
+    def coordinates(self, table, start, stop):
+        """The coordinates of a range of sorted rows.
+
+        :Parameters:
+
+        - `table`: the sorted table
+        - `start`: the first sorted row
+        - `stop`: the sorted row after the last row
+
+        :Returns: an array with the coordinates of the rows
+        """
+
+        return table.colinstances[self.columns[0]].index.read_indices(
+            start, stop)
+
+    def close(self):
+        """Release the order (nothing to do)."""
+
+
+class PermutationOrder:
+    """The order given by a permutation of the rows of a table.
+
+    The permutation lives in the temporary database, which is used by the
+    GUI thread only, so rows cannot be read by the background reader.
+
+    :Parameters:
+
+    - `columns`: the sequence of sort keys
+    - `permutation`: the `EArray` with the coordinates of the rows in
+      sorted order
+    """
+
+    #: Rows can be read by the background reader.
+    threadsafe = False
+
+    def __init__(self, columns, permutation):
+        """Setup the order."""
+
+        self.columns = list(columns)
+        self.permutation = permutation
+        self.nrows = permutation.nrows
+
+    def read(self, table, start, stop, field):
+        """Read a field of a range of sorted rows.
+
+        Coordinates are read in increasing order, so the HDF5 chunks of
+        the table are visited sequentially, and the rows are put back in
+        sorted order.
+
+        :Parameters:
+
+        - `table`: the sorted table
+        - `start`: the first sorted row to read
+        - `stop`: the sorted row after the last row to read
+        - `field`: the name of the field being read
+
+        :Returns: an array with the field of the rows
+        """
+
+        coords = self.coordinates(table, start, stop)
+        increasing = np.argsort(coords, kind='stable')
+        data = table.read_coordinates(coords[increasing], field=field)
+        rows = np.empty_like(data)
+        rows[increasing] = data
+        return rows
+
+    def coordinates(self, table, start, stop):
+        """The coordinates of a range of sorted rows.
+
+        :Parameters:
+
+        - `table`: the sorted table
+        - `start`: the first sorted row
+        - `stop`: the sorted row after the last row
+
+        :Returns: an array with the coordinates of the rows
+        """
+
+        return self.permutation.read(start, stop)
+
+    def close(self):
+        """Remove the permutation from the temporary database."""
+
+        try:
+            if self.permutation._v_isopen:
+                self.permutation._v_parent._f_remove(recursive=True)
+        except tables.NodeError as e:
+            log.error(f'{e}')
+        self.permutation = None
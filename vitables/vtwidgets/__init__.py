@@ -17,4 +17,4 @@
 #
 #       Author:  Vicent Mas - vmas@vitables.org
 
-__all__ = ["nodenamedlg", "renamedlg", "zoom_cell"]
+__all__ = ["colstats_dlg", "nodenamedlg", "performance_panel", "renamedlg", "zoom_cell"]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+
+"""
+Display the statistics of a column of a leaf.
+
+The statistics are computed in background by a
+:class:`vitables.vttables.colstats.StatsScanner`. While the scan is
+running the dialog shows its progress and the scan can be cancelled.
+Statistics found in the metadata cache are displayed at once.
+"""
+
+from qtpy import QtCore, QtGui, QtWidgets
+
+from vitables.vttables import colstats
+
+__docformat__ = 'restructuredtext'
+
+translate = QtWidgets.QApplication.translate
+
+
+class HistogramView(QtWidgets.QWidget):
+    """A bar chart of the histogram of a column.
+
+    :Parameter parent: the parent of this widget
+    """
+
+    def __init__(self, parent=None):
+        """Create an empty chart."""
+
+        super(HistogramView, self).__init__(parent)
+        self.edges = []
+        self.counts = []
+        self.setMinimumSize(320, 120)
+
+    def setHistogram(self, edges, counts):
+        """Display a histogram.
+
+        :Parameters:
+
+        - `edges`: the edges of the bins
+        - `counts`: the number of values of every bin
+        """
+
+        self.edges = edges
+        self.counts = counts
+        if counts:
+            self.setToolTip(f'[{edges[0]:.6g}, {edges[-1]:.6g}]')
+        self.update()
+
+    def paintEvent(self, event):
+        """Paint the bars of the histogram.
+
+        :Parameter event: the paint event being processed
+        """
+
+        if not self.counts:
+            return
+        painter = QtGui.QPainter(self)
+        color = self.palette().color(QtGui.QPalette.Highlight)
+        rect = self.rect().adjusted(2, 2, -2, -2)
+        width = rect.width() / len(self.counts)
+        highest = max(self.counts)
+        for position, count in enumerate(self.counts):
+            height = rect.height() * count / highest
+            painter.fillRect(
+                QtCore.QRectF(rect.left() + position * width,
+                              rect.bottom() - height, max(width - 1, 1),
+                              height), color)
+        painter.end()
+
+
+class ColumnStatsDlg(QtWidgets.QDialog):
+    """A non modal dialog with the statistics of a column.
+
+    :Parameters:
+
+    - `leaf`: the `tables.Leaf` instance whose column is described
+    - `col`: the view column being described
+    - `title`: the title of the dialog
+    - `parent`: the parent of this dialog
+
+    :Raises: `TypeError` if the column is not numeric
+    """
+
+    def __init__(self, leaf, col, title, parent=None):
+        """Create the dialog and start the scan."""
+
+        self.scanner = colstats.StatsScanner(leaf, col)
+        super(ColumnStatsDlg, self).__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        self.setWindowTitle(title)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        form = QtWidgets.QFormLayout()
+        self.labels = {}
+        names = [
+            ('count', translate('ColumnStatsDlg', 'Count:', 'Label text')),
+            ('nulls', translate('ColumnStatsDlg', 'Nulls:', 'Label text')),
+            ('min', translate('ColumnStatsDlg', 'Minimum:', 'Label text')),
+            ('max', translate('ColumnStatsDlg', 'Maximum:', 'Label text')),
+            ('mean', translate('ColumnStatsDlg', 'Mean:', 'Label text')),
+            ('std', translate('ColumnStatsDlg', 'Standard deviation:',
+                              'Label text')),
+        ]
+        for key, text in names:
+            label = QtWidgets.QLabel(self)
+            label.setTextInteractionFlags(
+                QtCore.Qt.TextSelectableByMouse)
+            form.addRow(text, label)
+            self.labels[key] = label
+        layout.addLayout(form)
+        self.histogram = HistogramView(self)
+        layout.addWidget(self.histogram)
+        self.progress = QtWidgets.QProgressBar(self)
+        self.progress.setRange(0, 100)
+        layout.addWidget(self.progress)
+        self.buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Cancel, self)
+        layout.addWidget(self.buttons)
+
+        # Connect signals to slots
+        self.buttons.rejected.connect(self.close)
+        self.scanner.progressChanged.connect(self.progress.setValue)
+        self.scanner.scanFinished.connect(self.showStats)
+
+        result = self.scanner.cachedResult()
+        if result is not None:
+            self.showStats(result)
+        else:
+            self.scanner.start()
+
+    def showStats(self, result):
+        """Display the statistics of the column.
+
+        :Parameter result: the statistics (None if the scan was cancelled
+          or failed)
+        """
+
+        self.progress.hide()
+        self.buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        if result is None:
+            return
+        for key, label in self.labels.items():
+            value = result[key]
+            if value is None:
+                text = ''
+            elif isinstance(value, float):
+                text = f'{value:.6g}'
+            else:
+                text = str(value)
+            label.setText(text)
+        self.histogram.setHistogram(result['edges'], result['counts'])
+
+    def closeEvent(self, event):
+        """Cancel the scan (if it is running) when the dialog is closed.
+
+        :Parameter event: the event being processed
+        """
+
+        self.scanner.cancel()
+        super(ColumnStatsDlg, self).closeEvent(event)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+#       Copyright (C) 2008-2024 Vicent Mas. All rights reserved
+#
+#       This program is free software: you can redistribute it and/or modify
+#       it under the terms of the GNU General Public License as published by
+#       the Free Software Foundation, either version 3 of the License, or
+#       (at your option) any later version.
+#
+#       This program is distributed in the hope that it will be useful,
+#       but WITHOUT ANY WARRANTY; without even the implied warranty of
+#       MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#       GNU General Public License for more details.
+#
+#       You should have received a copy of the GNU General Public License
+#       along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#       Author:  Vicent Mas - vmas@vitables.org
+
+"""
+Display the profiling counters of the views open in the workspace.
+
+Every view of a leaf records its buffer faults, cache lookups, reads and
+formatting times (see :mod:`vitables.vttables.readstats`). This panel
+shows them in a table with one row per view. The table is refreshed
+periodically while the panel is visible.
+"""
+
+import logging
+
+from qtpy import QtCore, QtWidgets
+
+from vitables.vttables import readstats
+
+__docformat__ = 'restructuredtext'
+
+translate = QtWidgets.QApplication.translate
+
+#: The refresh interval of the panel (in milliseconds).
+REFRESH_INTERVAL = 1000
+
+
+class PerformancePanel(QtWidgets.QWidget):
+    """
+    A table with the profiling counters of every open view.
+
+    :Parameters:
+
+    - `workspace`: the workspace where views are displayed
+    - `parent`: the parent of this widget
+    """
+
+    def __init__(self, workspace, parent=None):
+        """Create the panel."""
+
+        super(PerformancePanel, self).__init__(parent)
+        self.workspace = workspace
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        self.headers = [
+            translate('PerformancePanel', 'View', 'Column header'),
+            translate('PerformancePanel', 'Faults', 'Column header'),
+            translate('PerformancePanel', 'Cache hits', 'Column header'),
+            translate('PerformancePanel', 'Reads', 'Column header'),
+            translate('PerformancePanel', 'Rows read', 'Column header'),
+            translate('PerformancePanel', 'MiB read', 'Column header'),
+            translate('PerformancePanel', 'Read ms', 'Column header'),
+            translate('PerformancePanel', 'Cells formatted',
+                      'Column header'),
+            translate('PerformancePanel', 'Format ms', 'Column header'),
+        ]
+        self.table = QtWidgets.QTableWidget(0, len(self.headers), self)
+        self.table.setHorizontalHeaderLabels(self.headers)
+        self.table.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.setWhatsThis(translate(
+            'PerformancePanel',
+            """<qt>
+            <h3>The Performance panel</h3>
+            Counters of the views open in the workspace: buffer faults,
+            blocks found in the read cache, reads made from the
+            dataset, and the time spent reading (I/O and decompression)
+            and formatting cells.
+            </qt>""",
+            'WhatsThis help for the Performance panel'))
+        layout.addWidget(self.table)
+
+        buttons = QtWidgets.QHBoxLayout()
+        self.log_cb = QtWidgets.QCheckBox(
+            translate('PerformancePanel', 'Log buffer faults',
+                      'Checkbox text'), self)
+        self.log_cb.setToolTip(translate(
+            'PerformancePanel',
+            'Log a structured record for every buffer fault',
+            'Checkbox tooltip'))
+        self.reset_button = QtWidgets.QPushButton(
+            translate('PerformancePanel', 'Reset', 'Button text'), self)
+        buttons.addWidget(self.log_cb)
+        buttons.addStretch(1)
+        buttons.addWidget(self.reset_button)
+        layout.addLayout(buttons)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL)
+
+        # Connect signals to slots
+        self.timer.timeout.connect(self.refresh)
+        self.log_cb.toggled.connect(self.setLogging)
+        self.reset_button.clicked.connect(self.resetCounters)
+
+    def views(self):
+        """The views of the workspace that record profiling counters.
+
+        :Returns: a list of `(title, stats)` tuples
+        """
+
+        views = []
+        for window in self.workspace.subWindowList():
+            model = getattr(window, 'leaf_model', None)
+            stats = getattr(model, 'stats', None)
+            if stats is not None:
+                views.append((window.windowTitle().strip(), stats))
+        return views
+
+    def refresh(self):
+        """Display the current value of the counters."""
+
+        views = self.views()
+        self.table.setRowCount(len(views))
+        for row, (title, stats) in enumerate(views):
+            counters = stats.snapshot()
+            ratio = stats.hitRatio()
+            values = [
+                title,
+                counters['faults'],
+                '' if ratio is None else f'{ratio:.0%}',
+                counters['reads'],
+                counters['rows_read'],
+                f'{counters["bytes_read"] / 2 ** 20:.1f}',
+                f'{counters["read_time"] * 1000:.0f}',
+                counters['cells_formatted'],
+                f'{counters["format_time"] * 1000:.0f}',
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(str(value))
+
+    def resetCounters(self):
+        """Set the counters of every view to zero."""
+
+        for title, stats in self.views():
+            stats.reset()
+        self.refresh()
+
+    def setLogging(self, enabled):
+        """Enable or disable the structured log records of buffer faults.
+
+        :Parameter enabled: True if the records must be logged
+        """
+
+        level = logging.INFO if enabled else logging.NOTSET
+        logging.getLogger(readstats.__name__).setLevel(level)
+
+    def showEvent(self, event):
+        """Start refreshing the panel when it is shown."""
+
+        self.refresh()
+        self.timer.start()
+        super(PerformancePanel, self).showEvent(event)
+
+    def hideEvent(self, event):
+        """Stop refreshing the panel when it is hidden."""
+
+        self.timer.stop()
+        super(PerformancePanel, self).hideEvent(event)
@@ -20,14 +20,30 @@
 
 """
 Display recursively the content of a given cell of a view.
+
+The content of the cell is displayed by a table view backed by a
+:class:`ZoomModel`. The model formats the cells lazily, a block of rows
+of a column at a time, with the vectorized formatting functions used by
+leaf views (see :func:`vitables.utils.formatArrayColumn`). So zooming a
+cell with millions of elements creates only the texts of the displayed
+blocks.
 """
 
+import collections
+
 from qtpy import QtCore, QtWidgets
 
 import vitables.utils
 
 __docformat__ = 'restructuredtext'
 
+#: The number of rows of the blocks formatted at once.
+BLOCK_ROWS = 1024
+
+#: The maximum number of formatted blocks kept by a model.
+MAX_BLOCKS = 256
+
+
 def getArrayDimensions(shape):
     """
     Get the dimensions of the grid where the cell will be zoomed.
@@ -55,135 +71,49 @@ def getArrayDimensions(shape):
 
     return (nrows, ncols)
 
-class ZoomCell(QtWidgets.QMdiSubWindow):
-    """
-    Display an array/table cell on its own view (table widget).
-
-    When a leaf is displayed in a view, is quite usual that the content
-    of some cells is not fully visible because it doesn't fit into
-    the cell. To alleviate this problem this class provides a way to,
-    recursively, display the content of any cell on its own view.
-    The cell content depends on the kind of leaf and the shape of its
-    atom. Cells of `Table` views and `E/C/Array` views can be:
-
-    - a ``numpy`` scalar. `Atom` shape is ()
-    - a ``numpy`` array. `Atom` shape is not ()
-
-    In addition, cells of `VLArray` views can be:
-
-    - a serialized `Python` object. `Atom` kind is `object`, shape is ()
-    - a `Python` string. `Atom` kind is `vlstring`, shape is ()
 
-    Finally, cells of `Table` views also can be:
+class ZoomModel(QtCore.QAbstractTableModel):
+    """
+    A read-only model of the content of a zoomed cell.
 
-    - a `numpy.void` object when the cell corresponds to nested field of the
-        record
+    The content of the cell is not copied. Its elements are formatted the
+    first time they are displayed, a block of `BLOCK_ROWS` rows of a
+    column at a time, and the most recently used blocks are kept.
 
     :Parameters:
 
         - `data`: the value stored in the cell being zoomed
-        - `title`: the base string for the zoomed view title
-        - `workspace`: the parent of the zoomed view
-        - `leaf`: a LeafNode instance
+        - `parent`: the parent of the model
     """
 
-    def __init__(self, data, title, workspace, leaf):
-        """
-        Creates a zoom view for a given cell.
-
-        The passed cell is an element of a given dataset. It is always
-        a (potentially nested) `numpy` array. See cell accessor methods
-        in the `Buffer` class for details.
-        """
+    def __init__(self, data, parent=None):
+        """Setup the model of a given cell content."""
 
-        self.data = data
-        self.title = title
-        self.workspace = workspace
+        super(ZoomModel, self).__init__(parent)
+        self.content = data
         self.data_shape = self.hasShape()
         self.field_names = []
 
-        # Create and customise the widget that will display the zoomed cell
-        # The pindex attribute is required to keep working the code for
-        # synchronising workspace and tree of databases view.
-        # The leaf attribute is required to keep working the code for
-        # cleaning the workspace when a file is closed.
-        # The WA_DeleteOnClose flag makes that when the widget is
-        # closed either programatically (see VTAPP.windowClose)
-        # or by the user (clicking the close button in the titlebar)
-        # the widget is hidden AND destroyed --> the workspace
-        # updates automatically its list of open windows --> the
-        # Windows menu content is automatically updated
-        super(ZoomCell, self).__init__(workspace)
-        self.pindex = None
-        self.dbt_leaf = leaf
-        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
-        # The internal widget
-        self.grid = QtWidgets.QTableWidget()
-        self.setWidget(self.grid)
-        # Configure the titlebar
-        self.setWindowTitle(self.title)
-        icons_dictionary = vitables.utils.getIcons()
-        self.setWindowIcon(icons_dictionary['zoom-in'])
-
         # Decide how the cell content will be formatted. Content can be:
         # - a numpy array
         # - either a string or a unicode string
         # - other Python object
         if self.data_shape:
             self.formatContent = vitables.utils.formatArrayContent
-        elif isinstance(self.data, str):
+        elif isinstance(self.content, str):
             self.formatContent = vitables.utils.formatStringContent
         else:
             self.formatContent = vitables.utils.formatObjectContent
 
-        # Setup grid dimensions
-        (nrows, ncols) = self.getGridDimensions()
-        self.grid.setColumnCount(ncols)
-        self.grid.setRowCount(nrows)
-
-        # Setup grid editing
-        self.grid.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-
-        # Setup grid horizontal header
-        if self.field_names:
-            for section in range(0, ncols):
-                item = QtWidgets.QTableWidgetItem()
-                item.setText(self.field_names[section])
-                self.grid.setHorizontalHeaderItem(section, item)
-        else:
-            for section in range(0, ncols):
-                item = QtWidgets.QTableWidgetItem()
-                item.setText(f'{section}')
-                self.grid.setHorizontalHeaderItem(section, item)
-
-        # Setup grid vertical header
-        for section in range(0,nrows):
-            item = QtWidgets.QTableWidgetItem()
-            item.setText(f'{section}')
-            self.grid.setVerticalHeaderItem(section, item)
-
-        # Fill the grid
-        if self.field_names:
-            self.zoomTable()
-        else:
-            self.zoomArray()
-
-        self.show()
-
-        rmode = QtWidgets.QHeaderView.Stretch
-        if self.grid.columnCount() == 1:
-            self.grid.horizontalHeader().setSectionResizeMode(rmode)
-        if self.grid.rowCount() == 1:
-            self.grid.verticalHeader().setSectionResizeMode(rmode)
-
-        # Connect signals to slots
-        self.grid.cellDoubleClicked.connect(self.zoomView)
+        (self.numrows, self.numcols) = self.getGridDimensions()
 
+        # The formatted blocks, mapping (column, block number) keys to
+        # lists of texts. The most recently used blocks are at the end
+        self.blocks = collections.OrderedDict()
 
     def hasShape(self):
         """Find out if the zoomed cell has a shape attribute."""
-        return hasattr(self.data, 'shape')
-
+        return hasattr(self.content, 'shape')
 
     def getGridDimensions(self):
         """
@@ -194,8 +124,8 @@ class ZoomCell(QtWidgets.QMdiSubWindow):
 
         if self.data_shape:
             # The cell contains a numpy object
-            shape = self.data.shape
-            dtype = self.data.dtype
+            shape = self.content.shape
+            dtype = self.content.dtype
             if dtype.fields is None:
                 # Arrays with nested fields come here
                 return getArrayDimensions(shape)
@@ -206,7 +136,6 @@ class ZoomCell(QtWidgets.QMdiSubWindow):
             # The cell contains a Python object
             return self.getPyObjectDimensions()
 
-
     def getPyObjectDimensions(self):
         """
         Get the dimensions of the grid where the cell will be zoomed.
@@ -216,12 +145,11 @@ class ZoomCell(QtWidgets.QMdiSubWindow):
         :Returns: a tuple (rows, columns)
         """
 
-        if isinstance(self.data, list) or isinstance(self.data, tuple):
-            return (len(self.data), 1)
+        if isinstance(self.content, (list, tuple)):
+            return (len(self.content), 1)
         else:
             return (1, 1)
 
-
     def getNestedFieldDimensions(self):
         """
         Get the dimensions of the grid where the cell will be zoomed.
@@ -240,83 +168,216 @@ class ZoomCell(QtWidgets.QMdiSubWindow):
         :Returns: a tuple (rows, columns)
         """
 
-        self.field_names = [item[0] for item in self.data.dtype.descr]
+        self.field_names = [item[0] for item in self.content.dtype.descr]
         ncols = len(self.field_names)
         nrows = 1
 
         return (nrows, ncols)
 
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """The number of rows of the zoomed cell."""
+        return 0 if parent.isValid() else self.numrows
 
-    def zoomTable(self):
-        """Fill the zoom view with the content of the clicked nested field."""
-
-        for column in range(0, self.grid.columnCount()):
-            content = self.data[self.field_names[column]]
-            text = self.formatContent(content)
-            item = QtWidgets.QTableWidgetItem(text)
-            self.grid.setItem(0, column, item)
-
-
-    def zoomArray(self):
-        """Fill the zoom view with the content of the clicked cell."""
-
-        num_rows = self.grid.rowCount()
-        num_cols = self.grid.columnCount()
-        # Numpy scalars are displayed in a 1x1 grid
-        if num_rows == num_cols == 1:
-            content = self.data
-            text = self.formatContent(content)
-            item = QtWidgets.QTableWidgetItem(text)
-            self.grid.setItem(0, 0, item)
-        # 1-D arrays
-        elif num_cols == 1:
-            for row in range(0, num_rows):
-                content = self.data[row]
-                text = self.formatContent(content)
-                item = QtWidgets.QTableWidgetItem(text)
-                self.grid.setItem(row, 0, item)
-        # N-D arrays
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """The number of columns of the zoomed cell."""
+        return 0 if parent.isValid() else self.numcols
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Returns the label of a given header section.
+
+        :Parameters:
+
+        - `section`: the header section being inspected
+        - `orientation`: the header orientation (horizontal or vertical)
+        - `role`: the role of the header section being inspected
+        """
+
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if (orientation == QtCore.Qt.Horizontal) and self.field_names:
+            return self.field_names[section]
+        return f'{section}'
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the formatted content of a given element of the cell.
+
+        :Parameters:
+
+        - `index`: the index of the element
+        - `role`: the role being returned
+        """
+
+        if (role != QtCore.Qt.DisplayRole) or not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        block, offset = divmod(row, BLOCK_ROWS)
+        key = (col, block)
+        texts = self.blocks.get(key)
+        if texts is None:
+            texts = self.blocks[key] = self.formatBlock(col, block)
+            if len(self.blocks) > MAX_BLOCKS:
+                self.blocks.popitem(last=False)
         else:
-            for row in range(0, num_rows):
-                for column in range(0, num_cols):
-                    content = self.data[row][column]
-                    text = self.formatContent(content)
-                    item = QtWidgets.QTableWidgetItem(text)
-                    self.grid.setItem(row, column, item)
+            self.blocks.move_to_end(key)
+        return texts[offset]
 
+    def formatBlock(self, col, block):
+        """Format a block of rows of a column of the cell in one pass.
 
-    def zoomView(self, row, col):
-        """Makes the content of the clicked cell fully visible.
+        :Parameters:
+
+        - `col`: the column of the block
+        - `block`: the number of the block
+
+        :Returns: a list with the formatted elements of the block
+        """
+
+        start = block * BLOCK_ROWS
+        stop = min(start + BLOCK_ROWS, self.numrows)
+        content = self.content
+        if self.field_names:
+            # A single row with a column per field
+            return [self.formatContent(content[self.field_names[col]])]
+        if not (self.data_shape and content.shape) and \
+                not isinstance(content, (list, tuple)):
+            # Scalars, strings and other Python objects
+            return [self.formatContent(content)]
+        if self.data_shape and (len(content.shape) > 1):
+            column = content[start:stop, col]
+        else:
+            column = content[start:stop]
+        if self.formatContent is vitables.utils.formatArrayContent:
+            return vitables.utils.formatArrayColumn(column)
+        return [self.formatContent(element) for element in column]
+
+    def cell(self, row, col):
+        """The content of a given element of the cell.
 
         :Parameters:
 
-        - `row`: the row of the clicked cell
-        - `col`: the column of the clicked cell
+        - `row`: the row of the element
+        - `col`: the column of the element
+
+        :Returns: the element or None if it cannot be zoomed
         """
 
+        content = self.content
         # Check if the zoom has to be done
         if self.data_shape:
-            if not (self.data.shape !=() or self.field_names):
-                return
-        elif not (isinstance(self.data, list) or isinstance(self.data, tuple)):
-            return
+            if not (content.shape != () or self.field_names):
+                return None
+        elif not isinstance(content, (list, tuple)):
+            return None
 
-        # Get data
         if self.data_shape:
             # Arrays and table nested fields
             if self.field_names:
-                cell = self.data[self.field_names[col]]
-            elif len(self.data.shape) > 1:
-                cell = self.data[row][col]
-            elif len(self.data.shape) == 1:
-                cell = self.data[row]
-        else:
-            # Python lists and tuples
-            cell = self.data[row]
+                return content[self.field_names[col]]
+            elif len(content.shape) > 1:
+                return content[row, col]
+            return content[row]
+        # Python lists and tuples
+        return content[row]
+
+
+class ZoomCell(QtWidgets.QMdiSubWindow):
+    """
+    Display an array/table cell on its own view (table view).
+
+    When a leaf is displayed in a view, is quite usual that the content
+    of some cells is not fully visible because it doesn't fit into
+    the cell. To alleviate this problem this class provides a way to,
+    recursively, display the content of any cell on its own view.
+    The cell content depends on the kind of leaf and the shape of its
+    atom. Cells of `Table` views and `E/C/Array` views can be:
+
+    - a ``numpy`` scalar. `Atom` shape is ()
+    - a ``numpy`` array. `Atom` shape is not ()
+
+    In addition, cells of `VLArray` views can be:
+
+    - a serialized `Python` object. `Atom` kind is `object`, shape is ()
+    - a `Python` string. `Atom` kind is `vlstring`, shape is ()
+
+    Finally, cells of `Table` views also can be:
+
+    - a `numpy.void` object when the cell corresponds to nested field of the
+        record
+
+    :Parameters:
+
+        - `data`: the value stored in the cell being zoomed
+        - `title`: the base string for the zoomed view title
+        - `workspace`: the parent of the zoomed view
+        - `leaf`: a LeafNode instance
+    """
+
+    def __init__(self, data, title, workspace, leaf):
+        """
+        Creates a zoom view for a given cell.
+
+        The passed cell is an element of a given dataset. It is always
+        a (potentially nested) `numpy` array. See cell accessor methods
+        in the `Buffer` class for details.
+        """
+
+        self.data = data
+        self.title = title
+        self.workspace = workspace
+
+        # Create and customise the widget that will display the zoomed cell
+        # The pindex attribute is required to keep working the code for
+        # synchronising workspace and tree of databases view.
+        # The leaf attribute is required to keep working the code for
+        # cleaning the workspace when a file is closed.
+        # The WA_DeleteOnClose flag makes that when the widget is
+        # closed either programatically (see VTAPP.windowClose)
+        # or by the user (clicking the close button in the titlebar)
+        # the widget is hidden AND destroyed --> the workspace
+        # updates automatically its list of open windows --> the
+        # Windows menu content is automatically updated
+        super(ZoomCell, self).__init__(workspace)
+        self.pindex = None
+        self.dbt_leaf = leaf
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        # The internal widget
+        self.grid = QtWidgets.QTableView()
+        self.model = ZoomModel(data, self.grid)
+        self.grid.setModel(self.model)
+        self.setWidget(self.grid)
+        # Configure the titlebar
+        self.setWindowTitle(self.title)
+        icons_dictionary = vitables.utils.getIcons()
+        self.setWindowIcon(icons_dictionary['zoom-in'])
+
+        # Setup grid editing
+        self.grid.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        self.show()
+
+        rmode = QtWidgets.QHeaderView.Stretch
+        if self.model.numcols == 1:
+            self.grid.horizontalHeader().setSectionResizeMode(rmode)
+        if self.model.numrows == 1:
+            self.grid.verticalHeader().setSectionResizeMode(rmode)
+
+        # Connect signals to slots
+        self.grid.doubleClicked.connect(self.zoomView)
+
+    def zoomView(self, index):
+        """Makes the content of the clicked cell fully visible.
+
+        :Parameter index: the model index of the clicked cell
+        """
+
+        row, col = index.row(), index.column()
+        cell = self.model.cell(row, col)
+        if cell is None:
+            return
 
         # Get caption
-        if self.field_names:
-            caption = f'{self.title}: {self.field_names[col]}[{row}]'
+        if self.model.field_names:
+            caption = f'{self.title}: {self.model.field_names[col]}[{row}]'
         else:
             caption = f'{self.title}: ({row}, {col})'
         ZoomCell(cell, caption, self.workspace, self.dbt_leaf)